@@ -31,16 +31,23 @@ class Settings(BaseSettings):
     GCS_BUCKET_NAME: str
     GCS_PROJECT_ID: str
     GCS_CREDENTIALS_PATH: str = ""  # 서비스 계정 키 파일 경로 (선택사항)
+    GCS_MAX_WORKERS: int = 16  # GCS 호출 전용 스레드 풀 / HTTP 커넥션 풀 크기
+    SIGNED_URL_CACHE_MAX_ENTRIES: int = 50000  # 서명 URL 캐시 최대 항목 수 (0이면 캐시 안 함)
+    SIGNED_URL_REFRESH_MARGIN_SECONDS: int = 3600  # 만료까지 이 시간보다 적게 남은 URL은 다시 서명
 
     #ML sever URL
     ML_SERVER_URL: str
     STT_SERVER_URL: str
+    STT_BATCH_FALLBACK_TIMEOUT_SECONDS: float = 30.0  # 세션 완료 시 누락 STT 보충 배치 요청 제한 시간 (완료 요청을 오래 막지 않도록)
 
     # ElevenLabs API Key
     ELEVENLABS_API_KEY: str = ""
 
     # Wav2Lip Processing Control
     ENABLE_WAV2LIP: bool = True  # wav2lip 처리 활성화 여부
+    WAV2LIP_POLL_INTERVAL_SECONDS: float = 2.0  # Wav2Lip 작업 상태 조회 간격
+    WAV2LIP_POLL_MAX_FAILURES: int = 10  # 상태 조회가 연속으로 이 횟수만큼 실패(연결 오류/5xx)하면 폴링 중단
+    WAV2LIP_POLL_MAX_BACKOFF_SECONDS: float = 60.0  # 상태 조회 재시도 간격 상한 (지수 백오프)
 
     # OPEN_AI_API_KEY
     OPEN_AI_API_KEY: str = ""
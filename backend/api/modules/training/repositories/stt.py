@@ -32,6 +32,25 @@ class SttResultsRepository(BaseRepository[TrainingItemSttResults]):
         await self.db.flush()
         return stt_record
     
+    async def upsert_and_flush(
+        self,
+        training_item_id: int,
+        ai_model_id: int,
+        stt_result: str
+    ) -> TrainingItemSttResults:
+        """
+        아이템의 STT 결과 저장 (이미 있으면 최신 결과를 갱신, 없으면 생성)
+        
+        아이템별 백그라운드 STT와 세션 완료 시 배치 보충이 같은 아이템에 결과를 중복으로 만들지 않도록 사용한다.
+        """
+        stt_record = await self.get_by_training_item_id(training_item_id)
+        if stt_record is None:
+            return await self.create_and_flush(training_item_id, ai_model_id, stt_result)
+        stt_record.ai_model_id = ai_model_id
+        stt_record.stt_result = stt_result
+        await self.db.flush()
+        return stt_record
+    
     async def get_by_training_item_id(
         self,
         training_item_id: int
@@ -1,27 +1,78 @@
+import asyncio
+import functools
+import logging
 import os
-import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from google.cloud import storage
 from google.cloud.exceptions import NotFound
 from api.core.config import Settings
 from api.shared.utils.file_utils import sanitize_username_for_path, generate_file_path
+from .signed_url import LocalV4Signer, SignedUrlCache
+
+logger = logging.getLogger(__name__)
+
+# GCS batch 요청 하나에 넣을 수 있는 최대 호출 수
+GCS_BATCH_LIMIT = 100
 
 
 class GCSService:
-    """GCS 파일 관리 서비스"""
+    """
+    GCS 파일 관리 서비스
+    
+    google-cloud-storage 호출은 모두 블로킹이므로 전용 스레드 풀(GCS_MAX_WORKERS)에서 실행하여
+    이벤트 루프를 막지 않는다. 클라이언트의 HTTP 커넥션 풀도 같은 크기로 맞춰 동시 호출이 연결을 재사용한다.
+    서명 URL은 서비스 계정 키가 있으면 로컬에서 V4로 서명하고, 만료 직전까지 캐시해 재사용한다.
+    """
     
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, client: Optional[storage.Client] = None):
+        """
+        Args:
+            settings: 애플리케이션 설정
+            client: storage.Client 대체 객체 (벤치마크용, None이면 새로 생성)
+        """
         self.bucket_name = settings.GCS_BUCKET_NAME
         self.project_id = settings.GCS_PROJECT_ID
         self.credentials_path = settings.GCS_CREDENTIALS_PATH
+        self.max_workers = settings.GCS_MAX_WORKERS
         
         # GCS 클라이언트 초기화
-        if self.credentials_path and os.path.exists(self.credentials_path):
-            os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = self.credentials_path
+        if client is None:
+            if self.credentials_path and os.path.exists(self.credentials_path):
+                os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = self.credentials_path
+            client = storage.Client(project=self.project_id)
+            self._configure_connection_pool(client, self.max_workers)
         
-        self.client = storage.Client(project=self.project_id)
+        self.client = client
         self.bucket = self.client.bucket(self.bucket_name)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gcs")
+        
+        # 서명 URL: 로컬 V4 서명기 (키가 없으면 None → 클라이언트로 서명) + URL 캐시
+        self.url_signer = LocalV4Signer.from_credentials(getattr(self.client, "_credentials", None), self.bucket_name)
+        self.url_cache = (
+            SignedUrlCache(settings.SIGNED_URL_CACHE_MAX_ENTRIES, settings.SIGNED_URL_REFRESH_MARGIN_SECONDS)
+            if settings.SIGNED_URL_CACHE_MAX_ENTRIES > 0 else None
+        )
+        if self.url_signer is None:
+            logger.info("서비스 계정 키가 없어 서명 URL을 클라이언트(IAM)로 생성합니다")
+    
+    @staticmethod
+    def _configure_connection_pool(client: storage.Client, pool_size: int):
+        """스레드 수만큼 HTTP 커넥션을 유지 (기본 풀 10개를 넘는 동시 호출은 매번 새로 연결됨)"""
+        try:
+            from requests.adapters import HTTPAdapter
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            client._http.mount("https://", adapter)
+        except Exception as e:
+            logger.warning(f"GCS 커넥션 풀 설정 실패: {e}")
+    
+    async def _run(self, fn, *args, **kwargs):
+        """블로킹 GCS 호출을 전용 스레드 풀에서 실행"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
     
     def generate_video_path(
         self, 
@@ -93,24 +144,23 @@ class GCSService:
                 item_index=item_index
             )
             
-            # GCS 객체 생성
-            blob = self.bucket.blob(object_path)
-            
-            # 메타데이터 설정
-            blob.metadata = {
-                "username": username,
-                "session_id": session_id,
-                "train_id": str(train_id) if train_id else None,
-                "result_id": str(result_id) if result_id else None,
-                "word_id": str(word_id) if word_id else None,
-                "sentence_id": str(sentence_id) if sentence_id else None,
-                "original_filename": original_filename,
-                "upload_date": datetime.now().isoformat(),
-                "file_type": "video"
-            }
-            
-            # 파일 업로드
-            blob.upload_from_filename(file_path, content_type=content_type)
+            # 메타데이터와 함께 파일 업로드
+            await self.upload_file(
+                object_path,
+                file_path,
+                content_type=content_type,
+                metadata={
+                    "username": username,
+                    "session_id": session_id,
+                    "train_id": str(train_id) if train_id else None,
+                    "result_id": str(result_id) if result_id else None,
+                    "word_id": str(word_id) if word_id else None,
+                    "sentence_id": str(sentence_id) if sentence_id else None,
+                    "original_filename": original_filename,
+                    "upload_date": datetime.now().isoformat(),
+                    "file_type": "video"
+                }
+            )
             
             # 공개 URL 생성 (필요시)
             public_url = f"https://storage.googleapis.com/{self.bucket_name}/{object_path}"
@@ -134,6 +184,101 @@ class GCSService:
                 "object_path": None
             }
     
+    def _upload(
+        self,
+        object_path: str,
+        data: Optional[bytes],
+        file_path: Optional[str],
+        content_type: str,
+        metadata: Optional[dict]
+    ):
+        """업로드 (스레드 풀에서 실행). 메타데이터는 업로드 요청에 함께 실어 보내 별도 patch 호출이 없다"""
+        blob = self.bucket.blob(object_path)
+        if metadata:
+            blob.metadata = metadata
+        if file_path is not None:
+            blob.upload_from_filename(file_path, content_type=content_type)
+        else:
+            blob.upload_from_string(data, content_type=content_type)
+    
+    async def upload_bytes(
+        self,
+        object_path: str,
+        data: bytes,
+        content_type: str,
+        metadata: Optional[dict] = None
+    ) -> None:
+        """
+        메모리의 데이터를 GCS에 업로드 (실패 시 예외 전파)
+        
+        Args:
+            object_path: GCS 객체 경로
+            data: 업로드할 데이터
+            content_type: MIME 타입
+            metadata: 객체 메타데이터 (선택사항)
+        """
+        await self._run(self._upload, object_path, data, None, content_type, metadata)
+    
+    async def upload_file(
+        self,
+        object_path: str,
+        file_path: str,
+        content_type: str,
+        metadata: Optional[dict] = None
+    ) -> None:
+        """
+        로컬 파일을 GCS에 업로드 (실패 시 예외 전파)
+        
+        Args:
+            object_path: GCS 객체 경로
+            file_path: 업로드할 파일의 로컬 경로
+            content_type: MIME 타입
+            metadata: 객체 메타데이터 (선택사항)
+        """
+        await self._run(self._upload, object_path, None, file_path, content_type, metadata)
+    
+    async def upload_batch(self, uploads: list[dict]) -> dict[str, bool]:
+        """
+        여러 객체를 동시에 업로드 (스레드 풀 크기만큼 병렬)
+        
+        Args:
+            uploads: {"object_path", "content_type", "data" 또는 "file_path", "metadata"(선택)} 리스트
+            
+        Returns:
+            dict: {object_path: 업로드 성공 여부}
+        """
+        results = await asyncio.gather(*[
+            self._run(
+                self._upload,
+                upload["object_path"],
+                upload.get("data"),
+                upload.get("file_path"),
+                upload["content_type"],
+                upload.get("metadata")
+            )
+            for upload in uploads
+        ], return_exceptions=True)
+        
+        upload_map = {}
+        for upload, result in zip(uploads, results):
+            if isinstance(result, Exception):
+                logger.error(f"배치 업로드 오류 ({upload['object_path']}): {result}")
+            upload_map[upload["object_path"]] = not isinstance(result, Exception)
+        return upload_map
+    
+    async def get_object_size(self, object_path: str) -> Optional[int]:
+        """
+        GCS 객체 크기 (바이트)
+        
+        Returns:
+            int: 파일 크기 또는 None (없거나 실패 시)
+        """
+        try:
+            blob = await self._run(self.bucket.get_blob, object_path)
+            return blob.size if blob is not None else None
+        except Exception as e:
+            logger.error(f"객체 크기 조회 오류 ({object_path}): {e}")
+            return None
     
     async def download_video(self, object_path: str) -> Optional[bytes]:
         """
@@ -146,11 +291,9 @@ class GCSService:
             bytes: 파일 바이너리 데이터 또는 None
         """
         try:
+            # exists() 확인 없이 바로 받음 (없으면 NotFound) - 왕복 1회
             blob = self.bucket.blob(object_path)
-            if not blob.exists():
-                return None
-            
-            return blob.download_as_bytes()
+            return await self._run(blob.download_as_bytes)
             
         except NotFound:
             return None
@@ -170,7 +313,7 @@ class GCSService:
         """
         try:
             blob = self.bucket.blob(object_path)
-            blob.delete()
+            await self._run(blob.delete)
             return True
             
         except NotFound:
@@ -179,13 +322,59 @@ class GCSService:
             print(f"삭제 오류: {e}")
             return False
     
+    def _delete_chunk(self, object_paths: list[str]) -> dict[str, bool]:
+        """
+        GCS batch 요청 하나로 삭제 (스레드 풀에서 실행)
+        
+        batch 안에서 하나라도 실패(없는 객체 등)하면 예외가 나므로, 그 경우 해당 묶음만 개별 삭제로 다시 확인한다.
+        """
+        try:
+            with self.client.batch():
+                for object_path in object_paths:
+                    self.bucket.blob(object_path).delete()
+            return {object_path: True for object_path in object_paths}
+        except Exception as e:
+            logger.warning(f"배치 삭제 일부 실패, 개별 삭제로 확인: {e}")
+        
+        results = {}
+        for object_path in object_paths:
+            try:
+                self.bucket.blob(object_path).delete()
+                results[object_path] = True
+            except NotFound:
+                # batch에서 이미 삭제됐거나 원래 없던 객체 (어느 쪽이든 남아 있지 않음)
+                results[object_path] = True
+            except Exception as e:
+                logger.error(f"삭제 오류 ({object_path}): {e}")
+                results[object_path] = False
+        return results
+    
+    async def delete_videos_batch(self, object_paths: list[str]) -> dict[str, bool]:
+        """
+        여러 객체를 일괄 삭제 (GCS batch 요청, 최대 100개씩 묶어 병렬 전송)
+        
+        Args:
+            object_paths: GCS 객체 경로 리스트
+            
+        Returns:
+            dict: {object_path: 삭제 성공 여부} (이미 없는 객체도 True)
+        """
+        object_paths = list(dict.fromkeys(object_paths))
+        chunks = [object_paths[i:i + GCS_BATCH_LIMIT] for i in range(0, len(object_paths), GCS_BATCH_LIMIT)]
+        results = await asyncio.gather(*[self._run(self._delete_chunk, chunk) for chunk in chunks])
+        
+        delete_map = {}
+        for result in results:
+            delete_map.update(result)
+        return delete_map
+    
     async def get_signed_url(
         self, 
         object_path: str, 
         expiration_hours: int = 1
     ) -> Optional[str]:
         """
-        서명된 URL 생성 (임시 접근용)
+        서명된 URL 생성 (임시 접근용, 캐시된 URL이 있으면 재사용)
         
         Args:
             object_path: GCS 객체 경로
@@ -194,15 +383,8 @@ class GCSService:
         Returns:
             str: 서명된 URL 또는 None
         """
-        try:
-            blob = self.bucket.blob(object_path)
-            expiration = datetime.utcnow() + timedelta(hours=expiration_hours)
-            return blob.generate_signed_url(expiration=expiration)
-        except NotFound:
-            return None
-        except Exception as e:
-            print(f"서명된 URL 생성 오류: {e}")
-            return None
+        url_map = await self.get_signed_urls_batch([object_path], expiration_hours)
+        return url_map.get(object_path)
     
     async def get_signed_urls_batch(
         self, 
@@ -210,7 +392,9 @@ class GCSService:
         expiration_hours: int = 1
     ) -> dict[str, Optional[str]]:
         """
-        여러 객체에 대한 서명된 URL을 일괄 생성 (병렬 처리)
+        여러 객체에 대한 서명된 URL을 일괄 생성
+        
+        캐시에 없는 경로만 모아 한 번에 서명한다 (로컬 서명기: 스레드 풀 호출 1회, 없으면 경로별 병렬 서명).
         
         Args:
             object_paths: GCS 객체 경로 리스트
@@ -219,27 +403,49 @@ class GCSService:
         Returns:
             dict: {object_path: signed_url} 매핑 (실패 시 None)
         """
-        import asyncio
+        expiration_seconds = int(expiration_hours * 3600)
+        url_map: dict[str, Optional[str]] = {}
+        misses = []
+        for path in dict.fromkeys(object_paths):
+            url = self.url_cache.get(path, expiration_seconds) if self.url_cache is not None else None
+            if url is None:
+                misses.append(path)
+            else:
+                url_map[path] = url
+        if not misses:
+            return url_map
         
-        async def get_url_safe(path: str) -> tuple[str, Optional[str]]:
-            """개별 URL 생성을 안전하게 수행"""
-            url = await self.get_signed_url(path, expiration_hours)
-            return (path, url)
+        signed_at = time.monotonic()
+        if self.url_signer is not None:
+            try:
+                signed = await self._run(self.url_signer.sign_many, misses, expiration_seconds)
+            except Exception as e:
+                print(f"서명된 URL 생성 오류: {e}")
+                signed = {}
+        else:
+            signed = await self._sign_with_client(misses, expiration_seconds)
         
-        # 모든 URL 생성을 병렬로 실행
-        tasks = [get_url_safe(path) for path in object_paths]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if self.url_cache is not None:
+            self.url_cache.put_many(signed, expiration_seconds, signed_at)
+        for path in misses:
+            url_map[path] = signed.get(path)
+        return url_map
+    
+    async def _sign_with_client(self, object_paths: list[str], expiration_seconds: int) -> dict[str, Optional[str]]:
+        """서명 키가 없는 자격 증명 (IAM signBlob 호출) - 경로별로 스레드 풀에서 병렬 서명"""
+        expiration = timedelta(seconds=expiration_seconds)
+        results = await asyncio.gather(*[
+            self._run(self.bucket.blob(path).generate_signed_url, version="v4", expiration=expiration)
+            for path in object_paths
+        ], return_exceptions=True)
         
-        # 결과를 딕셔너리로 변환
-        url_map = {}
-        for result in results:
+        signed = {}
+        for path, result in zip(object_paths, results):
             if isinstance(result, Exception):
-                print(f"배치 URL 생성 오류: {result}")
+                print(f"서명된 URL 생성 오류: {result}")
                 continue
-            path, url = result
-            url_map[path] = url
-        
-        return url_map
+            signed[path] = result
+        return signed
     
     async def list_user_videos(
         self, 
@@ -263,7 +469,8 @@ class GCSService:
             if session_filter:
                 prefix += f"{session_filter}/"
             
-            blobs = self.client.list_blobs(self.bucket_name, prefix=prefix)
+            # 페이지 조회(HTTP)는 순회 중에 일어나므로 목록 전체를 스레드 풀에서 받음
+            blobs = await self._run(lambda: list(self.client.list_blobs(self.bucket_name, prefix=prefix)))
             
             videos = []
             for blob in blobs:
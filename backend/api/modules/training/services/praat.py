@@ -388,15 +388,9 @@ async def get_praat_analysis_from_db(
                 item_index=item.item_index,
                 stored_image_url=item.image_url
             )
-            tried: set[str] = set()
-            for object_key in candidate_keys:
-                if not object_key or object_key in tried:
-                    continue
-                tried.add(object_key)
-                signed_url = await gcs_service.get_signed_url(object_key, expiration_hours=24)
-                if signed_url:
-                    refreshed_image_url = signed_url
-                    break
+            # 서명은 객체 존재 여부를 확인하지 않으므로 첫 후보만 서명 (캐시된 URL은 재사용)
+            if candidate_keys:
+                refreshed_image_url = await gcs_service.get_signed_url(candidate_keys[0], expiration_hours=24)
         analysis_dict["image_url"] = refreshed_image_url or item.image_url
 
     return PraatFeaturesResponse(**analysis_dict)
\ No newline at end of file
@@ -2,7 +2,6 @@
 Response converters for training session endpoints.
 DB 모델을 API Response 스키마로 변환하는 헬퍼 함수들
 """
-import asyncio
 from typing import Optional, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,14 +23,12 @@ from api.shared.utils.file_utils import build_graph_image_candidate_keys
 _NOT_PROVIDED = object()
 
 
-async def _generate_graph_image_signed_url(
-    item,
-    username: str,
-    session_id: int,
-    gcs_service: GCSService,
-    expiration_hours: int = 24
-) -> Optional[str]:
-    """저장된 image_url을 기반으로 VOCAL 그래프 이미지를 재서명"""
+def _graph_image_object_key(item, username: str, session_id: int) -> Optional[str]:
+    """
+    재서명할 VOCAL 그래프 이미지 object key (저장된 image_url 기준 첫 번째 후보)
+    
+    서명은 객체 존재 여부를 확인하지 않으므로 첫 후보의 서명이 실패하면 나머지 후보도 같은 이유로 실패한다.
+    """
     if not item or item.item_index is None:
         return None
 
@@ -45,16 +42,21 @@ async def _generate_graph_image_signed_url(
         item_index=item.item_index,
         stored_image_url=item.image_url
     )
+    return candidate_keys[0] if candidate_keys else None
+
 
-    tried: set[str] = set()
-    for object_key in candidate_keys:
-        if not object_key or object_key in tried:
-            continue
-        tried.add(object_key)
-        signed_url = await gcs_service.get_signed_url(object_key, expiration_hours=expiration_hours)
-        if signed_url:
-            return signed_url
-    return None
+async def _generate_graph_image_signed_url(
+    item,
+    username: str,
+    session_id: int,
+    gcs_service: GCSService,
+    expiration_hours: int = 24
+) -> Optional[str]:
+    """저장된 image_url을 기반으로 VOCAL 그래프 이미지를 재서명"""
+    object_key = _graph_image_object_key(item, username, session_id)
+    if not object_key:
+        return None
+    return await gcs_service.get_signed_url(object_key, expiration_hours=expiration_hours)
 
 
 async def get_composited_media_info(
@@ -105,49 +107,35 @@ async def build_current_item_response(
     word = item.word.word if item.word else None
     sentence = item.sentence.sentence if item.sentence else None
     
-    # 서명된 URL 생성을 위한 task 리스트
-    url_tasks = []
-
-    # 1. 원본 비디오 URL 생성 task
-    if item.video_url and item.media_file_id:
-        # Eager loading으로 이미 로드된 media_file 사용 (DB 조회 방지)
-        media_file = item.media_file
-        if media_file:
-            url_tasks.append(gcs_service.get_signed_url(media_file.object_key, expiration_hours=24))
-        else:
-            url_tasks.append(asyncio.sleep(0, result=None)) # 순서 유지를 위한 더미
-    else:
-        url_tasks.append(asyncio.sleep(0, result=None))
+    # 서명할 object key 수집 (없는 항목은 None)
+    # 1. 원본 비디오 (Eager loading으로 이미 로드된 media_file 사용 - DB 조회 방지)
+    video_object_key = None
+    if item.video_url and item.media_file_id and item.media_file:
+        video_object_key = item.media_file.object_key
     
-    # 2. Composited media URL 생성 task
+    # 2. Composited media
+    composited_object_key = None
     composited_media_file_id = None
     if composited_media is _NOT_PROVIDED:
         _, composited_media_file_id = await get_composited_media_info(service.db, gcs_service, username, session_id, item.id)
         composited_object_key = f"results/{username}/{session_id}/result_item_{item.id}.mp4"
-        url_tasks.append(gcs_service.get_signed_url(composited_object_key, expiration_hours=24))
     elif composited_media:
         composited_media_file_id = composited_media.id
-        url_tasks.append(gcs_service.get_signed_url(composited_media.object_key, expiration_hours=24))
-    else:
-        url_tasks.append(asyncio.sleep(0, result=None))
+        composited_object_key = composited_media.object_key
     
-    # 3. 가이드 음성 URL 생성 task
+    # 3. 가이드 음성 / 4. 그래프 이미지
     guide_audio_object_key = f"guides/{username}/{session_id}/guide_item_{item.id}.wav"
-    url_tasks.append(gcs_service.get_signed_url(guide_audio_object_key, expiration_hours=24))
+    graph_image_object_key = _graph_image_object_key(item, username, session_id)
 
-    # 모든 URL 요청을 병렬로 실행
-    video_url, composited_video_url, integrate_voice_url = await asyncio.gather(*url_tasks, return_exceptions=True)
-    # 예외 발생 시 None으로 처리
-    video_url = video_url if not isinstance(video_url, Exception) else None
-    composited_video_url = composited_video_url if not isinstance(composited_video_url, Exception) else None
-    integrate_voice_url = integrate_voice_url if not isinstance(integrate_voice_url, Exception) else None
-
-    refreshed_image_url = await _generate_graph_image_signed_url(
-        item=item,
-        username=username,
-        session_id=session_id,
-        gcs_service=gcs_service
+    # 모든 URL을 한 번에 서명 (캐시된 URL은 재사용)
+    object_keys = [video_object_key, composited_object_key, guide_audio_object_key, graph_image_object_key]
+    signed_urls = await gcs_service.get_signed_urls_batch(
+        [key for key in object_keys if key],
+        expiration_hours=24
     )
+    video_url, composited_video_url, integrate_voice_url, refreshed_image_url = [
+        signed_urls.get(key) if key else None for key in object_keys
+    ]
     if refreshed_image_url:
         item.image_url = refreshed_image_url
 
@@ -400,16 +388,23 @@ async def convert_session_to_response(
             composited_media = composited_media_map.get(composited_object_key)
             items_with_media.append((item, composited_media))
         
-        signed_composited_urls: Dict[str, Optional[str]] = {}
+        # Composited media + VOCAL 그래프 이미지 URL을 한 번에 서명 (캐시된 URL은 재사용)
+        signed_urls: Dict[str, Optional[str]] = {}
+        graph_image_keys: Dict[int, Optional[str]] = {}
         if include_media_urls:
             composited_keys = [
                 composited_media.object_key
                 for _, composited_media in items_with_media
                 if composited_media
             ]
-            if composited_keys:
-                signed_composited_urls = await gcs_service.get_signed_urls_batch(
-                    composited_keys,
+            graph_image_keys = {
+                item.id: _graph_image_object_key(item, username, session.id)
+                for item, _ in items_with_media
+            }
+            object_keys = composited_keys + [key for key in graph_image_keys.values() if key]
+            if object_keys:
+                signed_urls = await gcs_service.get_signed_urls_batch(
+                    object_keys,
                     expiration_hours=24
                 )
         
@@ -471,23 +466,17 @@ async def convert_session_to_response(
             # URL 생성 결과 가져오기
             composited_video_url = None
             if include_media_urls and composited_media:
-                composited_video_url = signed_composited_urls.get(composited_media.object_key)
+                composited_video_url = signed_urls.get(composited_media.object_key)
             
             composited_media_file_id = composited_media.id if composited_media else None
             
             # Item feedback 가져오기
             item_feedback = item_feedback_map.get(item.id)
             
-            refreshed_image_url = None
-            if include_media_urls:
-                refreshed_image_url = await _generate_graph_image_signed_url(
-                    item=item,
-                    username=username,
-                    session_id=session.id,
-                    gcs_service=gcs_service
-                )
-                if refreshed_image_url:
-                    item.image_url = refreshed_image_url
+            graph_image_key = graph_image_keys.get(item.id)
+            refreshed_image_url = signed_urls.get(graph_image_key) if graph_image_key else None
+            if refreshed_image_url:
+                item.image_url = refreshed_image_url
 
             item_response = TrainingItemResponse(
                 item_id=item.id,
@@ -0,0 +1,167 @@
+"""
+서명 URL 로컬 생성 및 캐시
+
+세션 조회마다 아이템별 24시간 서명 URL을 다시 만드는 비용을 줄이기 위해
+- LocalV4Signer: 서비스 계정 키로 V4 서명 URL을 직접 만든다 (blob 메타데이터 조회 / IAM signBlob 호출 없음).
+- SignedUrlCache: (object key, 만료 시간) 별로 URL을 보관하고 만료 직전까지 재사용한다.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import quote
+
+SIGNING_HOST = "storage.googleapis.com"
+SIGNING_ALGORITHM = "GOOG4-RSA-SHA256"
+# V4 서명 URL 최대 유효 기간 (7일)
+V4_MAX_EXPIRATION_SECONDS = 7 * 24 * 3600
+
+
+def clamp_expiration(expiration_seconds: int) -> int:
+    """V4 서명 URL에 실제로 쓰이는 유효 기간 (최대 7일)"""
+    return min(int(expiration_seconds), V4_MAX_EXPIRATION_SECONDS)
+
+
+class LocalV4Signer:
+    """서비스 계정 개인 키로 GET용 V4 서명 URL을 생성 (네트워크 호출 없음)"""
+
+    def __init__(self, signer, signer_email: str, bucket_name: str):
+        """
+        Args:
+            signer: sign(bytes) -> bytes 를 제공하는 RSA 서명 객체 (google.auth.crypt.Signer)
+            signer_email: 서비스 계정 이메일
+            bucket_name: 버킷 이름
+        """
+        self.signer = signer
+        self.signer_email = signer_email
+        self.bucket_name = bucket_name
+
+    @classmethod
+    def from_credentials(cls, credentials, bucket_name: str) -> Optional["LocalV4Signer"]:
+        """
+        개인 키를 가진 서비스 계정 자격 증명이면 서명기 생성, 아니면 None
+
+        Compute Engine 등 기본 자격 증명도 signer를 갖지만 IAM API로 서명하므로 (요청마다 네트워크) 제외한다.
+        """
+        try:
+            from google.oauth2 import service_account
+        except ImportError:
+            return None
+        if not isinstance(credentials, service_account.Credentials):
+            return None
+        return cls(credentials.signer, credentials.signer_email, bucket_name)
+
+    def sign_many(
+        self,
+        object_paths: list[str],
+        expiration_seconds: int,
+        now: Optional[datetime] = None
+    ) -> dict[str, str]:
+        """
+        여러 객체의 서명 URL을 한 번에 생성 (같은 타임스탬프 / credential scope 공유)
+
+        blob.generate_signed_url(version="v4", method="GET")과 같은 URL을 만든다 (tests/unit/services/test_signed_url.py).
+
+        Args:
+            object_paths: 객체 경로 리스트
+            expiration_seconds: 유효 기간 (V4 최대 7일로 제한)
+            now: 서명 시각 (None이면 현재 시각, 테스트용)
+
+        Returns:
+            dict: {object_path: signed_url}
+        """
+        expiration_seconds = clamp_expiration(expiration_seconds)
+        now = now or datetime.now(timezone.utc)
+        request_timestamp = now.strftime("%Y%m%dT%H%M%SZ")
+        datestamp = now.strftime("%Y%m%d")
+        credential_scope = f"{datestamp}/auto/storage/goog4_request"
+
+        query_params = sorted({
+            "X-Goog-Algorithm": SIGNING_ALGORITHM,
+            "X-Goog-Credential": f"{self.signer_email}/{credential_scope}",
+            "X-Goog-Date": request_timestamp,
+            "X-Goog-Expires": str(expiration_seconds),
+            "X-Goog-SignedHeaders": "host",
+        }.items())
+        canonical_query_string = "&".join(
+            f"{quote(key, safe='')}={quote(value, safe='')}" for key, value in query_params
+        )
+
+        urls = {}
+        for object_path in object_paths:
+            canonical_uri = f"/{self.bucket_name}/{quote(object_path, safe='/~')}"
+            canonical_request = "\n".join([
+                "GET",
+                canonical_uri,
+                canonical_query_string,
+                f"host:{SIGNING_HOST}\n",
+                "host",
+                "UNSIGNED-PAYLOAD",
+            ])
+            string_to_sign = "\n".join([
+                SIGNING_ALGORITHM,
+                request_timestamp,
+                credential_scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            ])
+            signature = self.signer.sign(string_to_sign.encode()).hex()
+            urls[object_path] = (
+                f"https://{SIGNING_HOST}{canonical_uri}?{canonical_query_string}&X-Goog-Signature={signature}"
+            )
+        return urls
+
+
+class SignedUrlCache:
+    """
+    (object key, 만료 시간) -> 서명 URL 캐시 (LRU, 항목 수 제한)
+
+    남은 유효 시간이 refresh_margin보다 짧아지면 만료로 보고 다시 서명한다.
+    유효 기간이 짧은 URL은 유효 기간의 절반을 margin으로 쓴다.
+    만료 시간은 서명기와 같이 V4 최대 7일로 제한한 값으로 다룬다 (7일 초과 요청은 7일 항목을 공유).
+    """
+
+    def __init__(self, max_entries: int = 50000, refresh_margin_seconds: int = 3600):
+        self.max_entries = max_entries
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, int], tuple[str, float]] = OrderedDict()  # -> (url, 재사용 마감 시각)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, object_path: str, expiration_seconds: int) -> Optional[str]:
+        key = (object_path, clamp_expiration(expiration_seconds))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put_many(self, urls: dict[str, str], expiration_seconds: int, signed_at: float):
+        """signed_at: 서명 직전의 time.monotonic() (서명에 쓰인 시각보다 늦지 않게)"""
+        expiration_seconds = clamp_expiration(expiration_seconds)
+        margin = min(self.refresh_margin_seconds, expiration_seconds / 2)
+        reuse_until = signed_at + expiration_seconds - margin
+        with self._lock:
+            for object_path, url in urls.items():
+                if url is None:
+                    continue
+                key = (object_path, expiration_seconds)
+                self._entries[key] = (url, reuse_until)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
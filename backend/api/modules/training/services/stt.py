@@ -4,7 +4,7 @@ ML 서버에 STT 요청을 보내고 결과를 처리하는 서비스
 """
 import httpx
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from api.core.config import settings
 
@@ -70,6 +70,69 @@ class SttService:
             logger.error(f"[STT] ❌ STT 요청 중 예외 발생: {e}", exc_info=True)
             return None
 
+    
+    @staticmethod
+    async def transcribe_audio_batch(
+        audio_gs_paths: List[str],
+        batch_size: int = 8,
+        timeout: float = 300.0,
+        lang: Optional[str] = "kor_Hang",
+        model_size: str = "300M"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        ML 서버에 여러 오디오의 STT를 한 번에 요청 (세션 아이템 일괄 처리용)
+        
+        Args:
+            audio_gs_paths: GCS 오디오 파일 경로 리스트
+            batch_size: ML 서버에서 한 번에 인식할 파일 수
+            timeout: 요청 타임아웃 (초)
+            lang: 모든 파일에 적용할 언어 코드 (None이면 자동 감지, 기본값은 단건 요청과 동일)
+            model_size: 모델 크기 (기본값은 단건 요청과 동일)
+            
+        Returns:
+            배치 STT 결과 딕셔너리:
+            {
+                "success": bool,
+                "transcriptions": List[str],  # 요청 순서, 실패 항목은 ""
+                "results": List[dict],  # 파일별 success / transcription / error
+                "failed_count": int,
+                "process_time_ms": float
+            }
+            요청 자체가 실패하면 None 반환 (파일별 실패는 results로 확인)
+        """
+        STT_BATCH_API_URL = f"{settings.STT_SERVER_URL}/api/v1/stt/transcribe-batch"
+        
+        payload = {
+            "audio_files": audio_gs_paths,
+            "batch_size": batch_size,
+            "model_size": model_size
+        }
+        if lang:
+            payload["langs"] = [lang] * len(audio_gs_paths)
+        
+        try:
+            logger.info(f"[STT] ML 서버로 배치 STT 요청 전송 중... URL: {STT_BATCH_API_URL}, files: {len(audio_gs_paths)}")
+            
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.post(STT_BATCH_API_URL, json=payload)
+                response.raise_for_status()
+                
+                result = response.json()
+                logger.info(
+                    f"[STT] ✅ 배치 STT 요청 완료: {len(audio_gs_paths) - result.get('failed_count', 0)}/{len(audio_gs_paths)} 성공"
+                )
+                return result
+                
+        except httpx.TimeoutException as e:
+            logger.error(f"[STT] ❌ 배치 STT 요청 타임아웃: {e}")
+            return None
+        except httpx.HTTPStatusError as e:
+            logger.error(f"[STT] ❌ 배치 STT 요청 HTTP 오류: {e.response.status_code} - {e.response.text}")
+            return None
+        except Exception as e:
+            logger.error(f"[STT] ❌ 배치 STT 요청 중 예외 발생: {e}", exc_info=True)
+            return None
+
 
 async def request_stt_transcription(
     audio_gs_path: str,
@@ -87,3 +150,25 @@ async def request_stt_transcription(
     """
     return await SttService.transcribe_audio(audio_gs_path, timeout)
 
+
+async def request_stt_batch_transcription(
+    audio_gs_paths: List[str],
+    batch_size: int = 8,
+    timeout: float = 300.0,
+    lang: Optional[str] = "kor_Hang",
+    model_size: str = "300M"
+) -> Optional[Dict[str, Any]]:
+    """
+    여러 오디오의 STT 요청을 한 번에 보내는 헬퍼 함수
+    
+    Args:
+        audio_gs_paths: GCS 오디오 파일 경로 리스트
+        batch_size: ML 서버에서 한 번에 인식할 파일 수
+        timeout: 요청 타임아웃 (초)
+        lang: 모든 파일에 적용할 언어 코드
+        model_size: 모델 크기
+        
+    Returns:
+        배치 STT 결과 또는 None
+    """
+    return await SttService.transcribe_audio_batch(audio_gs_paths, batch_size, timeout, lang, model_size)
@@ -27,19 +27,34 @@ from ..schemas.training_sessions import (
     DailyTrainingResponse
 )
 from ..models.media import MediaFile, MediaType
-from ..services.gcs import GCSService
+from ..services.gcs import GCSService, get_gcs_service
 from ..services.video import VideoProcessor
 from ..services.media import MediaService
 from ..services.text_to_speech import TextToSpeechService
 from ..services.praat import get_praat_analysis_from_db, extract_all_features
 from ..services.praat_session import save_session_praat_result
-from ..services.stt import request_stt_transcription
+from ..services.stt import request_stt_transcription, request_stt_batch_transcription
 from api.modules.user.models.model import User
 from api.core.config import settings
 from api.shared.utils.file_utils import sanitize_username_for_path
 
 logger = logging.getLogger(__name__)
 
+# 진행 중인 아이템별 백그라운드 STT task (item_id -> task). 세션 완료 시 배치 보충 대상에서 제외하고, task 참조를 유지한다.
+_pending_item_stt: Dict[int, asyncio.Task] = {}
+
+
+def _track_item_stt(item_id: int, task: asyncio.Task):
+    """아이템별 STT task를 끝날 때까지 _pending_item_stt에 등록 (재제출로 교체된 경우 새 task만 유지)"""
+    _pending_item_stt[item_id] = task
+    
+    def _forget(done: asyncio.Task):
+        if _pending_item_stt.get(item_id) is done:
+            del _pending_item_stt[item_id]
+    
+    task.add_done_callback(_forget)
+
+
 class TrainingSessionService:
     """통합된 훈련 세션 서비스"""
     
@@ -200,7 +215,9 @@ class TrainingSessionService:
         # WORD/SENTENCE 타입인 경우 STT 결과가 모두 완료될 때까지 대기
         if session.type in (TrainingType.WORD, TrainingType.SENTENCE):
             logger.info(f"[Complete] {session.type.value} 세션 완료 - STT 결과 대기 시작: session_id={session_id}")
-            await self._wait_for_stt_completion(session_id, session.total_items, max_wait_seconds=60)
+            if not await self._wait_for_stt_completion(session_id, session.total_items, max_wait_seconds=60):
+                # 아이템별 STT가 실패/지연된 아이템은 배치 요청 한 번으로 보충
+                await self._transcribe_missing_stt(session_id)
         
         # 세션 상태를 완료로 변경
         await self.repo.update_status(
@@ -278,7 +295,7 @@ class TrainingSessionService:
         expected_count: int,
         max_wait_seconds: int = 60,
         check_interval: float = 1.0
-    ):
+    ) -> bool:
         """
         세션의 모든 STT 결과가 완료될 때까지 대기
         
@@ -287,6 +304,9 @@ class TrainingSessionService:
             expected_count: 예상 STT 결과 개수 (total_items)
             max_wait_seconds: 최대 대기 시간 (초)
             check_interval: 확인 간격 (초)
+            
+        Returns:
+            bool: 시간 안에 모든 결과가 모였는지 여부
         """
         start_time = time.time()
         elapsed = 0
@@ -300,7 +320,7 @@ class TrainingSessionService:
             
             if current_count >= expected_count:
                 logger.info(f"[STT Wait] ✅ 모든 STT 처리 완료 - session_id={session_id}, 총 대기 시간: {elapsed:.1f}초")
-                return
+                return True
             
             # 대기
             await asyncio.sleep(check_interval)
@@ -314,6 +334,54 @@ class TrainingSessionService:
             f"완료: {current_count}/{expected_count}, 대기 시간: {elapsed:.1f}초"
         )
         # 타임아웃이어도 예외를 발생시키지 않고 계속 진행 (LLM 피드백은 가능한 결과만 사용)
+        return False
+    
+    async def _transcribe_missing_stt(self, session_id: int):
+        """
+        STT 결과가 없는 아이템을 배치 STT 요청 한 번으로 보충
+        
+        아이템 제출 시 예약한 STT가 실패한 아이템만 파일마다 다시 요청하지 않고 한 번에 보낸다.
+        - 아이템별 STT task가 아직 진행 중인 아이템은 그 task가 결과를 저장하므로 제외
+        - 결과는 training_item_id 기준으로 upsert (다른 워커의 task와 겹쳐도 아이템당 한 행)
+        - 요청은 STT_BATCH_FALLBACK_TIMEOUT_SECONDS 안에서만 기다린다 (세션 완료 요청을 오래 막지 않음)
+        파일별 실패는 건너뛴다 (세션 완료는 계속 진행).
+        """
+        stt_results = await self.stt_repo.get_by_session_id(session_id)
+        done_item_ids = {result.training_item_id for result in stt_results}
+        items = await self.item_repo.get_session_items(session_id)
+        pending = [item.id for item in items if item.id in _pending_item_stt]
+        if pending:
+            logger.info(f"[STT Batch] 아이템별 STT 진행 중 - 보충 대상에서 제외: session_id={session_id}, items={pending}")
+        missing = [
+            (item.id, f"gs://{settings.GCS_BUCKET_NAME}/{item.media_file.object_key.replace('.mp4', '.wav')}")
+            for item in items
+            if item.id not in done_item_ids and item.id not in _pending_item_stt and item.media_file is not None
+        ]
+        if not missing:
+            return
+        
+        logger.info(f"[STT Batch] 누락된 STT 보충 요청 - session_id={session_id}, items={len(missing)}")
+        response = await request_stt_batch_transcription(
+            [audio_gs_path for _, audio_gs_path in missing],
+            timeout=settings.STT_BATCH_FALLBACK_TIMEOUT_SECONDS
+        )
+        if not response or not response.get("results"):
+            logger.warning(f"[STT Batch] ❌ 배치 STT 요청 실패 - session_id={session_id}")
+            return
+        
+        ai_model = await self.ai_model_repo.get_or_create(response.get("model_version", "whisper-large-v3"))
+        saved = 0
+        for (item_id, audio_gs_path), result in zip(missing, response["results"]):
+            if not result.get("success"):
+                logger.warning(f"[STT Batch] 파일 STT 실패 - item_id: {item_id}, {audio_gs_path}: {result.get('error')}")
+                continue
+            await self.stt_repo.upsert_and_flush(
+                training_item_id=item_id,
+                ai_model_id=ai_model.id,
+                stt_result=result.get("transcription", "")
+            )
+            saved += 1
+        logger.info(f"[STT Batch] ✅ 보충 완료 - session_id={session_id}, {saved}/{len(missing)}")
     
     @staticmethod
     async def _process_stt_with_independent_session(audio_gs_path: str, item_id: int):
@@ -361,7 +429,7 @@ class TrainingSessionService:
                     ai_model = await ai_model_repo.get_or_create(model_version)
                     
                     # STT 결과 저장
-                    stt_result = await stt_repo.create_and_flush(
+                    stt_result = await stt_repo.upsert_and_flush(
                         training_item_id=item_id,
                         ai_model_id=ai_model.id,
                         stt_result=transcription
@@ -387,9 +455,14 @@ class TrainingSessionService:
         user_id: int,
         output_object_key: str
     ):
-        """외부 wav2lip 서버에 처리를 요청하는 백그라운드 작업"""
+        """외부 wav2lip 서버에 처리를 요청하는 백그라운드 작업
+        
+        ML 서버에 비동기 작업을 제출하고(job_id 즉시 반환) 끝날 때까지 상태를 폴링한 뒤 결과 MediaFile을 기록한다.
+        처리 시간 동안 HTTP 연결을 붙잡고 있지 않으므로 타임아웃 없는 요청이 필요 없다.
+        상태 조회가 끊겨도 결과 파일이 GCS에 올라와 있으면 완료로 보고 기록한다.
+        """
         start_time = time.time()
-        WAV2LIP_API_URL = f"{settings.ML_SERVER_URL}/api/v1/lip-video"
+        WAV2LIP_JOBS_URL = f"{settings.ML_SERVER_URL}/api/v1/lip-video/jobs"
         
         payload = {
             "gen_audio_gs": f"gs://{guide_audio_gs_path}",  # ElevenLabs 생성 오디오
@@ -399,37 +472,52 @@ class TrainingSessionService:
 
         try:
             # 외부 API 호출 (httpx 라이브러리 필요)
-            print(f"[WAV2LIP] ML 서버로 Wav2Lip 요청 전송 중... URL: {WAV2LIP_API_URL}")
+            print(f"[WAV2LIP] ML 서버로 Wav2Lip 작업 제출 중... URL: {WAV2LIP_JOBS_URL}")
             print(f"[WAV2LIP] Payload: {payload}")
             
-            # Wav2Lip 처리 시간은 예측 어려움 → 타임아웃 제거
-            async with httpx.AsyncClient(timeout=None) as client:
-                response = await client.post(WAV2LIP_API_URL, json=payload)
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                # 1. 작업 제출 (202 + job_id)
+                response = await client.post(WAV2LIP_JOBS_URL, json=payload)
                 response.raise_for_status()
-                logger.info(f"Wav2Lip 작업 요청 성공: {response.json()}")
+                job_id = response.json()["job_id"]
+                logger.info(f"Wav2Lip 작업 제출 성공: job_id={job_id}")
+
+                # 2. 완료될 때까지 상태 폴링
+                job = await self._wait_for_wav2lip_job(client, f"{WAV2LIP_JOBS_URL}/{job_id}")
+
+            if job is not None and job["status"] != "succeeded":
+                logger.error(f"Wav2Lip 작업 실패: job_id={job_id}, error={job.get('error')}")
+                return
 
-                gcs_service = GCSService(settings)
+            gcs_service = get_gcs_service(settings)
 
-                # 2. GCS에서 결과 파일의 메타데이터(정보) 가져오기
-                blob = gcs_service.bucket.get_blob(output_object_key)
+            # 3. GCS에서 결과 파일의 메타데이터(정보) 가져오기
+            file_size = await gcs_service.get_object_size(output_object_key)
+            if job is None:
+                # 상태를 확인하지 못함: 결과 파일이 이미 올라와 있으면 완료로 기록
+                if file_size is None:
+                    logger.error(f"Wav2Lip 작업 상태를 확인할 수 없고 결과 파일도 없습니다: job_id={job_id}")
+                    return
+                logger.warning(f"Wav2Lip 작업 상태를 확인할 수 없어 GCS 결과 파일로 완료 처리합니다: job_id={job_id}")
+            else:
+                logger.info(f"Wav2Lip 작업 완료: {job}")
+            if file_size is not None:
+                print(f"[WAV2LIP] GCS 결과 파일 크기: {file_size} bytes")
+            else:
                 file_size = 0
-                if blob:
-                    file_size = blob.size # 파일 크기(bytes)
-                    print(f"[WAV2LIP] GCS 결과 파일 크기: {file_size} bytes")
-                else:
-                    logger.warning(f"GCS에서 {output_object_key} 파일을 찾을 수 없어 파일 크기를 0으로 저장합니다.")
-
-                # 3. MediaFile 객체 생성 시 file_size_bytes에 값 할당
-                result_media_file = await self.media_repo.create_and_flush(
-                    user_id=user_id,
-                    object_key=output_object_key,
-                    media_type=MediaType.TRAIN,
-                    file_name=output_object_key.split('/')[-1],
-                    format="mp4",
-                    file_size_bytes=file_size,
-                )
-                await self.db.commit()
-                logger.info(f"Wav2Lip 결과 미디어 파일 정보 저장 성공: {result_media_file.id}")
+                logger.warning(f"GCS에서 {output_object_key} 파일을 찾을 수 없어 파일 크기를 0으로 저장합니다.")
+
+            # 4. MediaFile 객체 생성 시 file_size_bytes에 값 할당
+            result_media_file = await self.media_repo.create_and_flush(
+                user_id=user_id,
+                object_key=output_object_key,
+                media_type=MediaType.TRAIN,
+                file_name=output_object_key.split('/')[-1],
+                format="mp4",
+                file_size_bytes=file_size,
+            )
+            await self.db.commit()
+            logger.info(f"Wav2Lip 결과 미디어 파일 정보 저장 성공: {result_media_file.id}")
         
         except httpx.RequestError as e:
             elapsed_time = time.time() - start_time
@@ -441,6 +529,47 @@ class TrainingSessionService:
             elapsed_time = time.time() - start_time
             logger.info(f"Wav2Lip 처리 작업 완료. (총 소요 시간: {elapsed_time:.2f}초)")
     
+    async def _wait_for_wav2lip_job(self, client: httpx.AsyncClient, status_url: str) -> Optional[Dict[str, Any]]:
+        """Wav2Lip 작업이 끝날 때까지 상태를 폴링
+        
+        작업이 진행 중이면 시간 제한 없이 기다린다 (종료 여부는 ML 서버가 succeeded / failed로 알려줌).
+        - 4xx (알 수 없는 job_id 등): 재시도해도 소용없으므로 즉시 None
+        - 연결 오류 / 타임아웃 / 5xx: 지수 백오프로 재시도, WAV2LIP_POLL_MAX_FAILURES번 연속 실패하면 None
+        """
+        interval = settings.WAV2LIP_POLL_INTERVAL_SECONDS
+        delay = interval
+        failures = 0
+        last_stage = None
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                response = await client.get(status_url)
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code < 500:
+                    logger.error(f"Wav2Lip 작업 상태 조회 실패 (중단): {e}")
+                    return None
+                error = e
+            except httpx.TransportError as e:
+                error = e
+            else:
+                failures = 0
+                delay = interval
+                job = response.json()
+                if job.get("stage") != last_stage:
+                    last_stage = job.get("stage")
+                    print(f"[WAV2LIP] 진행 단계: {last_stage} ({job.get('progress', 0.0) * 100:.0f}%)")
+                if job["status"] in ("succeeded", "failed"):
+                    return job
+                continue
+
+            failures += 1
+            if failures >= settings.WAV2LIP_POLL_MAX_FAILURES:
+                logger.error(f"Wav2Lip 작업 상태 조회 {failures}회 연속 실패 (중단): {error}")
+                return None
+            delay = min(interval * 2 ** failures, settings.WAV2LIP_POLL_MAX_BACKOFF_SECONDS)
+            logger.warning(f"Wav2Lip 작업 상태 조회 실패 ({failures}/{settings.WAV2LIP_POLL_MAX_FAILURES}, {delay:.0f}초 후 재시도): {error}")
+    
     async def trigger_guide_audio_generation(
         self,
         *,
@@ -505,8 +634,7 @@ class TrainingSessionService:
             print(f"[ELEVENLABS] WAV 변환 완료 - 크기: {len(wav_bytes)} bytes")
 
             # 4. GCS에 '가이드 음성'을 다른 이름으로 업로드
-            guide_audio_blob = gcs_service.bucket.blob(guide_audio_object_key)
-            guide_audio_blob.upload_from_string(wav_bytes, content_type="audio/wav")
+            await gcs_service.upload_bytes(guide_audio_object_key, wav_bytes, content_type="audio/wav")
             logger.info(f"가이드 음성 GCS 업로드 성공: {guide_audio_object_key}")
 
             # 5. MediaFile DB에 '가이드 음성' 정보 저장 또는 업데이트
@@ -661,8 +789,7 @@ class TrainingSessionService:
             if audio_path and os.path.exists(audio_path):
                 # 5-1. 음성 파일을 GCS에 업로드
                 audio_object_key = object_key.replace('.mp4', '.wav')
-                audio_blob = gcs_service.bucket.blob(audio_object_key)
-                audio_blob.upload_from_filename(audio_path, content_type="audio/wav")
+                await gcs_service.upload_file(audio_object_key, audio_path, content_type="audio/wav")
                 logger.info(f"[_submit_item_with_video] 추출된 음성 파일 GCS 업로드 완료: {audio_object_key}")
 
                 # 5-2. 음성 파일 정보 DB 저장
@@ -693,9 +820,10 @@ class TrainingSessionService:
                 logger.info(f"[_submit_item_with_video] STT 백그라운드 처리 예약 (병렬) - item_id: {item.id}, audio_gs_path: {audio_gs_path}")
                 
                 # asyncio.create_task로 병렬 처리 (BackgroundTasks 순차 실행 문제 회피)
-                asyncio.create_task(
+                stt_task = asyncio.create_task(
                     self._process_stt_with_independent_session(audio_gs_path, item.id)
                 )
+                _track_item_stt(item.id, stt_task)
 
             # 7-1. 가이드 음성 생성 백그라운드 작업 추가 (STT 이후 처리)
             if (item.word or item.sentence) and audio_media_file:
@@ -904,8 +1032,7 @@ class TrainingSessionService:
             if audio_path and os.path.exists(audio_path):
                 # 5-1. 음성 파일을 GCS에 업로드
                 audio_object_key = object_key.replace('.mp4', '.wav')
-                audio_blob = gcs_service.bucket.blob(audio_object_key)
-                audio_blob.upload_from_filename(audio_path, content_type="audio/wav")
+                await gcs_service.upload_file(audio_object_key, audio_path, content_type="audio/wav")
                 logger.info(f"[resubmit_item_video] 추출된 음성 파일 GCS 업로드 완료: {audio_object_key}")
 
                 # 5-2. 음성 파일 정보 DB 업데이트 또는 생성
@@ -1264,49 +1391,51 @@ class TrainingSessionService:
         if item.is_completed:
             raise ValueError("이미 완료된 아이템입니다.")
         
-        # 3. 오디오 파일 GCS 업로드
+        # 3-4. 오디오 / 그래프 이미지 GCS 동시 업로드 (메타데이터는 업로드 요청에 포함)
         audio_object_key = f"audios/{user.username}/{session_id}/audio_item_{item.id}.wav"
-        audio_blob = gcs_service.bucket.blob(audio_object_key)
-        audio_blob.upload_from_string(
-            audio_file_bytes,
-            content_type=audio_content_type
-        )
-        audio_blob.metadata = {
-            "username": user.username,
-            "session_id": str(session_id),
-            "item_id": str(item.id),
-            "upload_date": datetime.now().isoformat(),
-            "file_type": "audio"
-        }
-        audio_blob.patch()
-        
-        # 오디오 파일에 대한 서명 URL 생성
-        audio_url = await gcs_service.get_signed_url(audio_object_key, expiration_hours=24)
-        if not audio_url:
-            raise RuntimeError("오디오 파일 URL 생성에 실패했습니다.")
-        
-        # 4. 그래프 이미지 GCS 업로드
         safe_username = sanitize_username_for_path(user.username)
         # 이미지 파일 확장자 추출
         image_ext = image_filename.split('.')[-1] if '.' in image_filename else "png"
         image_object_key = f"images/{safe_username}/{session_id}/graph_item_{item_index}.{image_ext}"
-        image_blob = gcs_service.bucket.blob(image_object_key)
-        image_blob.upload_from_string(
-            graph_image_bytes,
-            content_type=image_content_type
+        upload_results = await gcs_service.upload_batch([
+            {
+                "object_path": audio_object_key,
+                "data": audio_file_bytes,
+                "content_type": audio_content_type,
+                "metadata": {
+                    "username": user.username,
+                    "session_id": str(session_id),
+                    "item_id": str(item.id),
+                    "upload_date": datetime.now().isoformat(),
+                    "file_type": "audio"
+                }
+            },
+            {
+                "object_path": image_object_key,
+                "data": graph_image_bytes,
+                "content_type": image_content_type,
+                "metadata": {
+                    "username": user.username,
+                    "session_id": str(session_id),
+                    "item_id": str(item.id),
+                    "item_index": str(item_index),
+                    "upload_date": datetime.now().isoformat(),
+                    "file_type": "image"
+                }
+            },
+        ])
+        if not upload_results[audio_object_key]:
+            raise RuntimeError("오디오 파일 업로드에 실패했습니다.")
+        if not upload_results[image_object_key]:
+            raise RuntimeError("그래프 이미지 업로드에 실패했습니다.")
+        
+        # 오디오 / 그래프 이미지 서명 URL 생성
+        audio_url, image_url = await asyncio.gather(
+            gcs_service.get_signed_url(audio_object_key, expiration_hours=24),
+            gcs_service.get_signed_url(image_object_key, expiration_hours=24)
         )
-        image_blob.metadata = {
-            "username": user.username,
-            "session_id": str(session_id),
-            "item_id": str(item.id),
-            "item_index": str(item_index),
-            "upload_date": datetime.now().isoformat(),
-            "file_type": "image"
-        }
-        image_blob.patch()
-        
-        # 그래프 이미지에 대한 서명 URL 생성
-        image_url = await gcs_service.get_signed_url(image_object_key, expiration_hours=24)
+        if not audio_url:
+            raise RuntimeError("오디오 파일 URL 생성에 실패했습니다.")
         if not image_url:
             raise RuntimeError("그래프 이미지 URL 생성에 실패했습니다.")
         
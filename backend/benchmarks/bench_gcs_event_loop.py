@@ -0,0 +1,151 @@
+"""
+GCSService 이벤트 루프 지연 부하 테스트 (블로킹 호출 vs 전용 스레드 풀)
+
+동시 요청 여러 개가 세션 응답을 만드는 상황(서명 URL 일괄 생성 + 업로드 2개)을 흉내 내면서
+5ms 간격 ticker가 실제로 깨어난 시각과의 차이(이벤트 루프 지연)를 측정한다.
+- blocking: 기존처럼 async 함수 안에서 google-cloud-storage 블로킹 호출을 바로 실행
+- executor: GCSService._run으로 전용 스레드 풀(GCS_MAX_WORKERS)에서 실행
+
+기본은 GCS 호출마다 --latency-ms 만큼 걸리는 가짜 클라이언트를 사용한다 (서명 = IAM signBlob 왕복 등).
+--real 을 주면 .env 설정의 실제 버킷에 대해 서명 URL만 측정한다 (업로드/삭제 없음).
+
+사용법 (backend 디렉토리, .env 필요):
+    python -m benchmarks.bench_gcs_event_loop --requests 20 --urls 12 --latency-ms 20
+    python -m benchmarks.bench_gcs_event_loop --real --requests 20 --urls 12
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from api.core.config import settings  # noqa: E402
+from api.modules.training.services.gcs import GCSService  # noqa: E402
+
+TICK_SECONDS = 0.005
+
+
+class FakeBlob:
+    """GCS 호출마다 latency만큼 블로킹되는 Blob 대체 객체"""
+
+    def __init__(self, name, latency):
+        self.name = name
+        self.latency = latency
+        self.metadata = None
+
+    def generate_signed_url(self, expiration=None, **kwargs):
+        time.sleep(self.latency)
+        return f"https://storage.googleapis.com/fake/{self.name}?X-Goog-Signature=0"
+
+    def upload_from_string(self, data, content_type=None):
+        time.sleep(self.latency)
+
+    def upload_from_filename(self, file_path, content_type=None):
+        time.sleep(self.latency)
+
+    def delete(self):
+        time.sleep(self.latency)
+
+
+class FakeBucket:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def blob(self, name):
+        return FakeBlob(name, self.latency)
+
+
+class FakeClient:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def bucket(self, name):
+        return FakeBucket(self.latency)
+
+    @contextlib.contextmanager
+    def batch(self):
+        yield
+        time.sleep(self.latency)
+
+
+class BlockingGCSService(GCSService):
+    """기존 동작: 블로킹 호출을 이벤트 루프 스레드에서 바로 실행"""
+
+    async def _run(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+
+async def _ticker(lags, stop):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def _request(service, index, urls, upload):
+    paths = [f"bench/{index}/media_{i}.mp4" for i in range(urls)]
+    await service.get_signed_urls_batch(paths, expiration_hours=1)
+    if upload:
+        await service.upload_batch([
+            {"object_path": f"bench/{index}/audio.wav", "data": b"0" * 1024, "content_type": "audio/wav"},
+            {"object_path": f"bench/{index}/graph.png", "data": b"0" * 1024, "content_type": "image/png"},
+        ])
+
+
+async def _run(service, args, upload):
+    lags = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*[_request(service, i, args.urls, upload) for i in range(args.requests)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return elapsed, lags
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20, help="동시 요청 수")
+    parser.add_argument("--urls", type=int, default=12, help="요청당 서명 URL 수")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="가짜 클라이언트의 GCS 호출당 지연")
+    parser.add_argument("--real", action="store_true", help="실제 GCS 버킷 사용 (서명 URL만)")
+    args = parser.parse_args()
+
+    if args.real:
+        modes = {
+            "blocking": BlockingGCSService(settings),
+            "executor": GCSService(settings),
+        }
+    else:
+        latency = args.latency_ms / 1000
+        modes = {
+            "blocking": BlockingGCSService(settings, client=FakeClient(latency)),
+            "executor": GCSService(settings, client=FakeClient(latency)),
+        }
+
+    print(f"requests={args.requests} urls/request={args.urls} workers={settings.GCS_MAX_WORKERS} "
+          f"client={'real' if args.real else f'fake({args.latency_ms}ms)'}")
+    for name, service in modes.items():
+        elapsed, lags = asyncio.run(_run(service, args, upload=not args.real))
+        print(f"  {name:<9} total={elapsed * 1000:>8.1f} ms  loop lag p50={statistics.median(lags) if lags else 0:.1f} "
+              f"p99={_percentile(lags, 0.99):.1f} max={max(lags, default=0):.1f} ms  ticks={len(lags)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+세션 목록 서명 URL 지연 벤치마크 (50개 아이템 세션)
+
+convert_session_to_response가 세션마다 만드는 URL(아이템별 합성 영상 + VOCAL 그래프 이미지)을 같은 순서로 생성하여
+세션 목록 한 번을 응답하는 데 걸리는 서명 시간을 비교한다.
+- client:       google-cloud-storage blob.generate_signed_url, 그래프 이미지는 아이템마다 순서대로 (기존 방식)
+- local:        LocalV4Signer로 세션당 한 번에 서명 (캐시 없음)
+- local+cache:  같은 목록을 다시 조회 (SignedUrlCache hit)
+
+--key-file이 없으면 임시 RSA 키로 만든 서비스 계정 자격 증명을 사용한다 (서명만 하므로 네트워크 호출 없음).
+
+사용법 (backend 디렉토리, .env 필요):
+    python -m benchmarks.bench_signed_urls --sessions 10 --items 50
+    python -m benchmarks.bench_signed_urls --key-file service-account.json
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from google.cloud import storage  # noqa: E402
+from google.oauth2 import service_account  # noqa: E402
+
+from api.core.config import settings  # noqa: E402
+from api.modules.training.services.gcs import GCSService  # noqa: E402
+from api.modules.training.services.response_converters import _graph_image_object_key  # noqa: E402
+
+USERNAME = "bench_user"
+
+
+def _throwaway_credentials():
+    """임시 RSA 키로 서비스 계정 자격 증명 생성"""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return service_account.Credentials.from_service_account_info({
+        "type": "service_account",
+        "client_email": "bench@bench.iam.gserviceaccount.com",
+        "private_key": pem,
+        "private_key_id": "bench",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    })
+
+
+def _make_sessions(n_sessions, n_items):
+    """VOCAL 세션 (아이템마다 합성 영상 + 그래프 이미지)"""
+    sessions = []
+    for session_id in range(1, n_sessions + 1):
+        items = []
+        for index in range(n_items):
+            item_id = session_id * 1000 + index
+            items.append((
+                SimpleNamespace(
+                    id=item_id,
+                    item_index=index,
+                    image_url=f"https://storage.googleapis.com/bench/images/{USERNAME}/{session_id}/graph_item_{index}.png",
+                ),
+                SimpleNamespace(object_key=f"results/{USERNAME}/{session_id}/result_item_{item_id}.mp4"),
+            ))
+        sessions.append((session_id, items))
+    return sessions
+
+
+async def _list_client(service, sessions):
+    """기존: 합성 영상은 일괄, 그래프 이미지는 아이템마다 순서대로"""
+    for session_id, items in sessions:
+        await service.get_signed_urls_batch([media.object_key for _, media in items], expiration_hours=24)
+        for item, _ in items:
+            await service.get_signed_url(_graph_image_object_key(item, USERNAME, session_id), expiration_hours=24)
+
+
+async def _list_batched(service, sessions):
+    """변경 후: 세션당 한 번에 서명"""
+    for session_id, items in sessions:
+        object_keys = [media.object_key for _, media in items]
+        object_keys += [_graph_image_object_key(item, USERNAME, session_id) for item, _ in items]
+        await service.get_signed_urls_batch(object_keys, expiration_hours=24)
+
+
+def _measure(run, service, sessions, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(run(service, sessions))
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=10, help="세션 목록 한 번에 포함되는 세션 수")
+    parser.add_argument("--items", type=int, default=50, help="세션당 아이템 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--key-file", help="서비스 계정 키 JSON (없으면 임시 키)")
+    args = parser.parse_args()
+
+    if args.key_file:
+        credentials = service_account.Credentials.from_service_account_file(args.key_file)
+    else:
+        credentials = _throwaway_credentials()
+    client = storage.Client(project=settings.GCS_PROJECT_ID, credentials=credentials)
+    sessions = _make_sessions(args.sessions, args.items)
+    n_urls = args.sessions * args.items * 2
+
+    client_service = GCSService(settings, client=client)
+    client_service.url_signer = None
+    client_service.url_cache = None
+    local_service = GCSService(settings, client=client)
+    local_cache = local_service.url_cache
+    local_service.url_cache = None
+
+    results = {
+        "client": _measure(_list_client, client_service, sessions, args.repeat),
+        "local": _measure(_list_batched, local_service, sessions, args.repeat),
+    }
+    local_service.url_cache = local_cache
+    asyncio.run(_list_batched(local_service, sessions))  # 캐시 채움
+    results["local+cache"] = _measure(_list_batched, local_service, sessions, args.repeat)
+
+    print(f"session list: {args.sessions} sessions x {args.items} items ({n_urls} URLs)")
+    baseline = statistics.median(results["client"])
+    for name, times in results.items():
+        median = statistics.median(times)
+        print(f"  {name:<12} median={median:>8.1f} ms  per-session={median / args.sessions:>6.2f} ms  "
+              f"speedup={baseline / median:.1f}x")
+    if local_cache is not None:
+        print(f"  cache: {local_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
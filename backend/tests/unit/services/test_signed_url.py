@@ -0,0 +1,101 @@
+"""
+서명 URL 로컬 생성 / 캐시 테스트
+
+LocalV4Signer는 V4 서명을 직접 계산하므로, 같은 자격 증명 / 서명 시각 / 경로에서
+google-cloud-storage의 blob.generate_signed_url과 바이트 단위로 같은 URL을 만드는지 확인한다.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.modules.training.services.signed_url import (
+    LocalV4Signer,
+    SignedUrlCache,
+    V4_MAX_EXPIRATION_SECONDS,
+)
+
+BUCKET = "test-bucket"
+SIGNED_AT = datetime(2025, 3, 4, 5, 6, 7, tzinfo=timezone.utc)
+OBJECT_PATHS = [
+    "results/user/1/result_item_1.mp4",
+    "images/user name/1/graph item (1).png",  # 공백 / 괄호
+    "videos/사용자/세션 1/영상.mp4",  # 비 ASCII
+    "audio/a~b/c+d=e&f?g#h.wav",  # 예약 문자
+]
+
+
+@pytest.fixture(scope="module")
+def credentials():
+    """임시 RSA 키로 만든 서비스 계정 자격 증명 (서명만 하므로 네트워크 호출 없음)"""
+    service_account = pytest.importorskip("google.oauth2.service_account")
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return service_account.Credentials.from_service_account_info({
+        "type": "service_account",
+        "client_email": "signer@test-project.iam.gserviceaccount.com",
+        "private_key": pem,
+        "private_key_id": "test",
+        "token_uri": "https://oauth2.googleapis.com/token",
+    })
+
+
+@pytest.fixture
+def bucket(credentials, monkeypatch):
+    """서명 시각을 SIGNED_AT으로 고정한 google-cloud-storage 버킷"""
+    storage = pytest.importorskip("google.cloud.storage")
+    from google.cloud.storage import _signing
+
+    monkeypatch.setattr(
+        _signing,
+        "get_v4_now_dtstamps",
+        lambda: (SIGNED_AT.strftime("%Y%m%dT%H%M%SZ"), SIGNED_AT.strftime("%Y%m%d")),
+    )
+    return storage.Client(project="test-project", credentials=credentials).bucket(BUCKET)
+
+
+@pytest.mark.parametrize("expiration_seconds", [3600, 24 * 3600, V4_MAX_EXPIRATION_SECONDS])
+def test_sign_many_matches_generate_signed_url(credentials, bucket, expiration_seconds):
+    signer = LocalV4Signer.from_credentials(credentials, BUCKET)
+    urls = signer.sign_many(OBJECT_PATHS, expiration_seconds, now=SIGNED_AT)
+
+    for path in OBJECT_PATHS:
+        expected = bucket.blob(path).generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=expiration_seconds),
+            method="GET",
+            credentials=credentials,
+        )
+        assert urls[path] == expected
+
+
+def test_sign_many_clamps_expiration(credentials, bucket):
+    signer = LocalV4Signer.from_credentials(credentials, BUCKET)
+    path = OBJECT_PATHS[0]
+    url = signer.sign_many([path], 30 * 24 * 3600, now=SIGNED_AT)[path]
+
+    assert f"X-Goog-Expires={V4_MAX_EXPIRATION_SECONDS}&" in url
+    assert url == signer.sign_many([path], V4_MAX_EXPIRATION_SECONDS, now=SIGNED_AT)[path]
+
+
+def test_cache_reuses_url_only_within_clamped_expiration():
+    cache = SignedUrlCache(refresh_margin_seconds=3600)
+    requested = 30 * 24 * 3600
+
+    # 서명 URL은 7일만 유효하므로 7일 - margin이 지나면 요청한 만료 시간과 관계없이 다시 서명해야 한다
+    expired_at = time.monotonic() - (V4_MAX_EXPIRATION_SECONDS - 3600) - 10
+    cache.put_many({"a.mp4": "https://signed/a"}, requested, signed_at=expired_at)
+    assert cache.get("a.mp4", requested) is None
+
+    # 7일 초과 요청과 7일 요청은 같은 URL이므로 같은 항목을 공유한다
+    cache.put_many({"b.mp4": "https://signed/b"}, requested, signed_at=time.monotonic())
+    assert cache.get("b.mp4", requested) == "https://signed/b"
+    assert cache.get("b.mp4", V4_MAX_EXPIRATION_SECONDS) == "https://signed/b"
@@ -13,12 +13,101 @@ class Settings(BaseSettings):
     GCP_PROJECT_ID: str
     GCS_BUCKET: str
     GCS_CREDENTIAL_PATH: str | None
+    # 스토리지 백엔드: "gcs" 또는 "local" (STORAGE_LOCAL_ROOT/<bucket>/<path>를 GCS 대신 사용, 오프라인 벤치마크/테스트용)
+    STORAGE_BACKEND: str = "gcs"
+    STORAGE_LOCAL_ROOT: str = str(BASE_DIR / "local_storage")
+    # 전송 스레드 풀 크기 (= GCS HTTP 커넥션 풀 크기, 요청 간 공유)
+    STORAGE_MAX_WORKERS: int = 16
+    # 이 크기 이상 파일은 STORAGE_CHUNK_MB 단위 range 요청을 병렬로 받아 한 파일에 기록
+    STORAGE_PARALLEL_THRESHOLD_MB: int = 32
+    STORAGE_CHUNK_MB: int = 8
+    # 스트리밍 업로드(resumable) 요청 한 개의 크기 (MB, 256KB 배수)
+    STORAGE_UPLOAD_CHUNK_MB: int = 8
+    # 미디어 캐시: GCS 객체(경로 + generation)를 로컬 디스크에 보관하여 재시도/재제출 시 다운로드 생략 (LRU, 바이트 한도)
+    MEDIA_CACHE_ENABLED: bool = False
+    MEDIA_CACHE_DIR: str = str(BASE_DIR / "cache" / "media")
+    MEDIA_CACHE_MAX_MB: int = 10240
 
     # ---------- 로컬 모델 경로 ----------
     # 상대 경로로 설정하되 환경 변수로 덮어쓰기 가능
     LOCAL_MODEL_BASE_PATH: str = str(BASE_DIR / "models")
     LOCAL_WAV2LIP_PATH: str = str(BASE_DIR / "models" / "Wav2Lip")
 
+    # ---------- Wav2Lip 추론 ----------
+    # 스트리밍 모드: 전체 프레임을 메모리에 올리지 않고 window 단위로 디코딩/감지/합성
+    WAV2LIP_STREAMING: bool = False
+    WAV2LIP_STREAM_WINDOW: int = 64
+    # 요청 간 배치 스케줄러: 동시 요청의 배치를 모아 한 번의 forward로 실행
+    WAV2LIP_CROSS_REQUEST_BATCHING: bool = False
+    WAV2LIP_MAX_BATCH: int | None = None  # None이면 GPU 메모리 기반 자동 배치 크기
+    WAV2LIP_MAX_WAIT_MS: float = 20.0  # 다른 요청의 배치를 기다리는 최대 시간
+    WAV2LIP_MAX_CONCURRENT_JOBS: int = 4  # 동시에 inference 단계를 실행하는 요청 수
+    # 얼굴 감지기: scrfd(insightface) → 초기화 실패 시 sfd 로 fallback
+    # scrfd_onnx(SCRFD ONNX 직접 배치 실행)는 opt-in, 초기화 실패 시 scrfd → sfd 순으로 fallback
+    WAV2LIP_FACE_DETECTOR: str = "scrfd"
+    # 키프레임 얼굴 감지: k 프레임마다(또는 움직임이 임계값을 넘을 때) 감지하고 사이는 보간
+    # (1 = 전 프레임 감지, 단 MOTION_THRESHOLD 지정 시 간격 제한 없이 움직임으로만 감지)
+    WAV2LIP_KEYFRAME_INTERVAL: int = 1
+    WAV2LIP_MOTION_THRESHOLD: float | None = None  # 64x64 썸네일 평균 밝기 차 (0~255)
+    # 단일 패스 인코딩: 합성 프레임을 ffmpeg 파이프로 보내 스케일/FPS/오디오 합성/인코딩을 한 번에 (False면 AVI → mux → 리사이즈)
+    WAV2LIP_SINGLE_PASS_ENCODE: bool = False
+    # 스트리밍 업로드: 단일 패스 인코더가 조각 MP4를 내보내는 동안 GCS resumable 업로드로 바로 전송 (업로드 단계를 인코딩과 겹침)
+    # opt-in: 결과 파일 형식이 faststart MP4에서 조각 MP4(frag_keyframe + empty_moov)로 바뀜 (WAV2LIP_SINGLE_PASS_ENCODE 필요)
+    WAV2LIP_STREAMING_UPLOAD: bool = False
+    # inference 루프 파이프라이닝: 배치 생성을 N개 앞서 백그라운드로 준비, forward(pinned 비동기 복사)와 합성을 겹침 (0 = 순차)
+    WAV2LIP_PREFETCH_DEPTH: int = 0
+    # 배치 크기 bucketing: torch.compile 모델 입력을 2의 거듭제곱 ~ 최대 배치 bucket으로 패딩 (shape별 재컴파일 방지)
+    WAV2LIP_SHAPE_BUCKETS: bool = True
+    # 얼굴 감지 박스 캐시: 같은 영상(내용 digest 기준) 재처리 시 감지 생략
+    FACE_BOX_CACHE_ENABLED: bool = False
+    FACE_BOX_CACHE_DIR: str = str(BASE_DIR / "cache" / "face_boxes")
+    FACE_BOX_CACHE_MAX_ENTRIES: int = 2048
+    FACE_BOX_CACHE_MAX_MB: int = 256
+    # 가이드 오디오 mel 캐시: 같은 오디오(파일 digest + 배속) 재제출 시 디코딩/배속/mel 생략 (메모리)
+    MEL_CACHE_ENABLED: bool = False
+    MEL_CACHE_MAX_MB: int = 64
+    WAV2LIP_MEL_DEVICE: str | None = None  # mel STFT device (None이면 NumPy, "cuda"면 torch.stft)
+    # 요청별 작업 디렉토리 상위 경로 (None이면 시스템 임시 디렉토리)
+    WORKSPACE_ROOT: str | None = None
+    # ffmpeg/ffprobe 실행 제한 시간 (초과 시 프로세스 종료)
+    MEDIA_TOOL_TIMEOUT_SECONDS: float = 600.0
+    FFPROBE_TIMEOUT_SECONDS: float = 30.0
+
+    # ---------- STT ----------
+    # 모델 레지스트리: 여러 크기의 ASR 파이프라인을 예산 안에서 동시에 유지 (초과 시 가장 오래 안 쓴 모델 제거)
+    STT_MODEL_MEMORY_BUDGET_MB: int = 20480
+    STT_MAX_LOADED_MODELS: int = 2
+    # 마이크로 배치: 단일 파일 요청을 최대 STT_MAX_WAIT_MS 동안(또는 STT_MAX_BATCH개까지) 모아 언어별로 한 번에 인식
+    STT_BATCHING_ENABLED: bool = True
+    STT_MAX_BATCH: int = 8
+    STT_MAX_WAIT_MS: float = 200.0
+    # 메모리 오디오 입력: GCS 오디오를 임시 파일 없이 받아 16kHz 배열로 한 번 디코딩 (초과 크기는 디스크)
+    STT_IN_MEMORY_AUDIO: bool = True
+    STT_IN_MEMORY_MAX_BYTES: int = 16 * 1024 * 1024
+    # 결과 캐시: 같은 오디오(디코딩 PCM digest) + 모델 + 언어 재요청 시 ASR 생략 (디스크 유지, TTL + LRU)
+    STT_RESULT_CACHE_ENABLED: bool = False
+    STT_RESULT_CACHE_DIR: str = str(BASE_DIR / "cache" / "stt_results")
+    STT_RESULT_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    STT_RESULT_CACHE_MAX_ENTRIES: int = 50000
+    STT_RESULT_CACHE_MAX_MB: int = 64
+    # 배치 엔드포인트: GCS 동시 다운로드 수
+    STT_DOWNLOAD_CONCURRENCY: int = 8
+
+    # ---------- Warm-up / readiness ----------
+    # 서버 시작 시 합성 입력으로 모델을 미리 실행 (torch.compile 그래프 캡처, cuDNN autotune, STT 지연 로드)
+    # warm-up이 끝나기 전까지 /ready는 503 (로드밸런서 readiness probe용)
+    WARMUP_ENABLED: bool = True
+    WAV2LIP_WARMUP_BATCH_SIZES: list[int] = []  # 비어 있으면 shape bucket 전체 (bucketing 미사용 시 [자동 배치 크기, 스케줄러 max_batch])
+    WAV2LIP_WARMUP_ITERATIONS: int = 3  # 배치 크기별 반복 횟수 (CUDA graph는 두 번째 이후 실행에서 캡처)
+    WARMUP_FRAME_SIZE: str = "1280x720"  # 얼굴 감지 warm-up 프레임 크기 (widthxheight)
+    STT_WARMUP_MODEL_SIZES: list[str] = ["300M"]  # STT_MAX_LOADED_MODELS 이하로 지정
+    STT_WARMUP_AUDIO_SECONDS: float = 3.0
+
+    # ---------- 립싱크 비동기 작업 ----------
+    LIP_VIDEO_JOB_TTL_SECONDS: int = 3600  # 완료된 작업 상태를 보관하는 시간
+    LIP_VIDEO_CALLBACK_TIMEOUT_SECONDS: float = 10.0
+    LIP_VIDEO_CALLBACK_RETRIES: int = 3
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -4,7 +4,9 @@ from fastapi.responses import JSONResponse
 from api.core.config import settings
 from api.core.middleware import register_middlewares
 from api.core.logger import logger, log_success, log_error
+from api.service.warmup import warmup_tracker
 
+import asyncio
 import os
 
 # 포트에 따라 다른 라우터 로드
@@ -22,7 +24,10 @@ if PORT == 8000:
     # Wav2Lip 서버 (8000 포트)
     try:
         from api.routes.lip_video import router as lip_video_router
+        from api.service.ai_service import ai_service
         app.include_router(lip_video_router)
+        warmup_tracker.register("face_detector", lambda: asyncio.to_thread(ai_service.warmup_face_detector))
+        warmup_tracker.register("wav2lip", lambda: asyncio.to_thread(ai_service.warmup_wav2lip))
         logger.info("Wav2Lip 서버 모드로 시작 (포트 8000) - Lip video router loaded")
     except Exception as e:
         logger.warning(f"Failed to load lip video router: {e}")
@@ -31,13 +36,23 @@ elif PORT == 8080:
     # STT 서버 (8080 포트)
     try:
         from api.routes.stt import router as stt_router
+        from api.service.stt import warmup_stt_models
         app.include_router(stt_router)
+        warmup_tracker.register("stt", warmup_stt_models)
         logger.info("STT 서버 모드로 시작 (포트 8080) - STT router loaded")
     except Exception as e:
         logger.warning(f"Failed to load STT router: {e}")
 else:
     logger.warning(f"Unknown port {PORT}, no routers loaded. Use PORT=8000 for Wav2Lip or PORT=8080 for STT")
 
+@app.on_event("startup")
+async def start_warmup():
+    """모델 warm-up을 백그라운드로 시작 (완료 전까지 /ready는 503)"""
+    if settings.WARMUP_ENABLED:
+        warmup_tracker.start()
+    else:
+        warmup_tracker.mark_ready()
+
 @app.get("/")
 def endpoint_check():
     return {"server_status": "running", "port": PORT, "mode": "wav2lip" if PORT == 8000 else "stt" if PORT == 8080 else "unknown"}
@@ -53,19 +68,22 @@ async def health_check():
             
             log_success("Health check completed", wav2lip_model=wav2lip_model_exists)
             return {
-                "status": "ok" if wav2lip_model_exists else "warning",
+                "status": _health_status("ok" if wav2lip_model_exists else "warning"),
                 "port": PORT,
                 "mode": "wav2lip",
-                "models_ready": wav2lip_model_exists,
-                "wav2lip_model_exists": wav2lip_model_exists
+                "models_ready": wav2lip_model_exists and warmup_tracker.ready,
+                "wav2lip_model_exists": wav2lip_model_exists,
+                "warmup": warmup_tracker.status
             }
         elif PORT == 8080:
             # STT 서버의 경우 기본 헬스 체크
             log_success("Health check completed", mode="stt")
             return {
-                "status": "ok",
+                "status": _health_status("ok"),
                 "port": PORT,
-                "mode": "stt"
+                "mode": "stt",
+                "models_ready": warmup_tracker.ready,
+                "warmup": warmup_tracker.status
             }
         else:
             return {
@@ -79,4 +97,23 @@ async def health_check():
         return JSONResponse(
             status_code=500,
             content={"status": "error", "message": str(e), "port": PORT}
-        )
\ No newline at end of file
+        )
+
+
+def _health_status(status: str) -> str:
+    """warm-up 중이면 "warming_up" (프로세스는 살아 있으므로 HTTP 200 유지)"""
+    return status if warmup_tracker.ready else "warming_up"
+
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness 엔드포인트 (로드밸런서 / readiness probe용)
+    
+    warm-up이 끝나기 전에는 503, 끝나면 200. 단계별 warm-up 시간을 함께 반환한다.
+    일부 단계가 실패하면 status="degraded"로 200을 반환한다 (해당 모델은 첫 요청에서 지연 초기화).
+    """
+    report = {"port": PORT, **warmup_tracker.report()}
+    if not warmup_tracker.ready:
+        return JSONResponse(status_code=503, content=report)
+    return report
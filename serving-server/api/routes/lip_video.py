@@ -3,13 +3,40 @@
 """
 
 from fastapi import APIRouter, HTTPException
-from api.service.dto import LipVideoGenerationRequest, LipVideoGenerationResponse
+from api.service.dto import (
+    LipVideoGenerationRequest,
+    LipVideoGenerationResponse,
+    LipVideoJobSubmitRequest,
+    LipVideoJobSubmitResponse,
+    LipVideoJobStatusResponse,
+)
 from api.service.ai_service import ai_service
+from api.service.lip_video_jobs import lip_video_job_manager, JOB_SUCCEEDED
 from api.core.logger import logger, log_api_call, log_error
 
 router = APIRouter()
 
 
+def _resolve_target_fps(req: LipVideoGenerationRequest) -> int:
+    """
+    🎓 음성장애인 학습용: 자동 FPS 조정
+    target_fps가 지정되지 않았다면 텍스트 길이로 자동 결정
+    """
+    if req.target_fps is not None:
+        logger.info(f"Using specified FPS: {req.target_fps}fps")
+        return req.target_fps
+    
+    if req.word:
+        # 공백 포함 10자 이상이면 문장으로 간주
+        is_sentence = len(req.word) >= 10
+        target_fps = 15 if is_sentence else 18
+        logger.info(f"Auto FPS: {'Sentence' if is_sentence else 'Word'} detected, using {target_fps}fps")
+    else:
+        target_fps = 18  # 기본값
+        logger.info(f"No text provided, using default {target_fps}fps")
+    return target_fps
+
+
 @router.post("/api/v1/lip-video")
 @log_api_call
 async def generate_lip_video(req: LipVideoGenerationRequest):
@@ -21,21 +48,7 @@ async def generate_lip_video(req: LipVideoGenerationRequest):
     """
     try:
         logger.info(f"Request received - Video: {req.user_video_gs}, Audio: {req.gen_audio_gs}, Text: {req.word}")
-        
-        # 🎓 음성장애인 학습용: 자동 FPS 조정
-        # target_fps가 지정되지 않았다면 텍스트 길이로 자동 결정
-        if req.target_fps is None:
-            if req.word:
-                # 공백 포함 10자 이상이면 문장으로 간주
-                is_sentence = len(req.word) >= 10
-                target_fps = 15 if is_sentence else 18
-                logger.info(f"Auto FPS: {'Sentence' if is_sentence else 'Word'} detected, using {target_fps}fps")
-            else:
-                target_fps = 18  # 기본값
-                logger.info(f"No text provided, using default {target_fps}fps")
-        else:
-            target_fps = req.target_fps
-            logger.info(f"Using specified FPS: {target_fps}fps")
+        target_fps = _resolve_target_fps(req)
         
         # AI 서비스 파이프라인 실행
         result = await ai_service.process_lip_video_pipeline(
@@ -59,3 +72,80 @@ async def generate_lip_video(req: LipVideoGenerationRequest):
         log_error("Unexpected error in lip video generation", error=e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+
+@router.post("/api/v1/lip-video/jobs", status_code=202, response_model=LipVideoJobSubmitResponse)
+@log_api_call
+async def submit_lip_video_job(req: LipVideoJobSubmitRequest):
+    """
+    립싱크 영상 생성 작업 제출 (비동기)
+    - 작업을 등록하고 즉시 job_id 반환 (202)
+    - 진행 상황은 GET /api/v1/lip-video/jobs/{job_id} 로 조회
+    - callback_url 지정 시 완료/실패 후 작업 상태를 POST로 전달
+    """
+    logger.info(f"Job request received - Video: {req.user_video_gs}, Audio: {req.gen_audio_gs}, Text: {req.word}")
+    job = lip_video_job_manager.submit(
+        user_video_gs=req.user_video_gs,
+        gen_audio_gs=req.gen_audio_gs,
+        output_video_gs=req.output_video_gs,
+        target_fps=_resolve_target_fps(req),
+        callback_url=req.callback_url
+    )
+    return LipVideoJobSubmitResponse(
+        job_id=job.job_id,
+        status=job.status,
+        status_url=f"/api/v1/lip-video/jobs/{job.job_id}"
+    )
+
+
+@router.get("/api/v1/lip-video/jobs/{job_id}", response_model=LipVideoJobStatusResponse)
+async def get_lip_video_job(job_id: str):
+    """
+    립싱크 작업 상태 조회
+    - status: queued, running, succeeded, failed
+    - stage / progress: 현재 파이프라인 단계와 진행률
+    """
+    job = lip_video_job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return LipVideoJobStatusResponse(**job.to_dict())
+
+
+@router.get("/api/v1/lip-video/jobs/{job_id}/result", response_model=LipVideoGenerationResponse)
+async def get_lip_video_job_result(job_id: str):
+    """
+    립싱크 작업 결과 조회
+    - 완료 전: 409, 실패: 500 (error 포함), 없는 작업: 404
+    """
+    job = lip_video_job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    if not job.finished:
+        raise HTTPException(status_code=409, detail=f"Job not finished yet (status={job.status}, stage={job.stage})")
+    if job.status != JOB_SUCCEEDED:
+        raise HTTPException(status_code=500, detail=f"Job failed: {job.error}")
+    return LipVideoGenerationResponse(
+        success=True,
+        result_video_gs=job.result_video_gs,
+        process_time_ms=job.process_time_ms
+    )
+
+
+@router.get("/api/v1/lip-video/metrics")
+async def get_lip_video_metrics():
+    """
+    Wav2Lip 배치 스케줄러 / 얼굴 박스 캐시 / mel 캐시 / shape bucket / 스토리지 메트릭
+    - queue_depth: 대기 중인 배치 수 / 프레임 수
+    - avg_batch_fill: forward 한 번에 채워진 프레임 비율 (frames / max_batch)
+    - avg_requests_per_batch: forward 한 번에 합쳐진 요청 수
+    - face_box_cache: hits / misses / hit_rate / evictions
+    - mel_cache: hits / misses / hit_rate / evictions
+    - shape_buckets: bucket별 calls / padding_ratio / avg_forward_ms, distinct_input_shapes (bucket 수 이하면 재컴파일 없음)
+    - storage: downloads / parallel_downloads / avg_download_mbps / avg_upload_ms
+    """
+    return {
+        "scheduler": ai_service.get_scheduler_metrics(),
+        "face_box_cache": ai_service.get_face_box_cache_metrics(),
+        "mel_cache": ai_service.get_mel_cache_metrics(),
+        "shape_buckets": ai_service.get_shape_bucket_metrics(),
+        "storage": ai_service.get_storage_metrics(),
+    }
@@ -9,8 +9,14 @@ from api.service.dto import (
     STTBatchRequest, 
     STTBatchResponse
 )
-from api.service.stt import get_stt_service
+from api.service.stt import (
+    get_stt_service,
+    get_stt_registry_metrics,
+    get_stt_batcher_metrics,
+    get_stt_result_cache_metrics
+)
 from api.core.logger import logger, log_api_call, log_error
+from api.utils.async_storage import storage
 
 router = APIRouter()
 
@@ -33,7 +39,7 @@ async def transcribe_audio(req: STTRequest):
             raise ValueError("Either audio_gs or audio_url must be provided")
         
         # STT 서비스 가져오기
-        stt_service = get_stt_service(model_size=req.model_size)
+        stt_service = await get_stt_service(model_size=req.model_size)
         
         # 음성 인식 실행
         audio_source = req.audio_gs or req.audio_url
@@ -55,7 +61,9 @@ async def transcribe_audio(req: STTRequest):
             success=result["success"],
             transcription=result["transcription"],
             language=result["language"],
-            process_time_ms=result["process_time_ms"]
+            process_time_ms=result["process_time_ms"],
+            cache_hit=result["cache_hit"],
+            cached_at=result["cached_at"]
         )
         
     except ValueError as e:
@@ -66,3 +74,56 @@ async def transcribe_audio(req: STTRequest):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.post("/api/v1/stt/transcribe-batch", response_model=STTBatchResponse)
+@log_api_call
+async def transcribe_audio_batch(req: STTBatchRequest):
+    """
+    배치 오디오 파일 음성 인식 API
+    
+    - 여러 오디오를 동시에 다운로드하고 batch_size개씩 묶어 인식 (다운로드와 인식이 겹쳐 진행)
+    - 파일별 실패는 results[i].success / error로 보고하고 나머지 파일은 그대로 처리
+    - transcriptions는 audio_files 순서 (실패 항목은 빈 문자열)
+    
+    **주의**: 현재 40초 이하의 오디오만 지원
+    """
+    try:
+        stt_service = await get_stt_service(model_size=req.model_size)
+        
+        logger.info(f"Batch transcription request - Files: {len(req.audio_files)}, Model: {req.model_size}, Batch size: {req.batch_size}")
+        
+        result = await stt_service.transcribe_batch(
+            audio_sources=req.audio_files,
+            langs=req.langs,
+            batch_size=req.batch_size
+        )
+        
+        if not result["results"]:
+            raise ValueError("Batch transcription failed")
+        
+        return STTBatchResponse(**result)
+        
+    except ValueError as e:
+        log_error("Business logic error in batch STT", error=e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        log_error("Unexpected error in batch STT transcription", error=e)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/api/v1/stt/metrics")
+async def get_stt_metrics():
+    """
+    STT 모델 레지스트리 / 마이크로 배처 / 결과 캐시 메트릭
+    - loaded: 올라간 모델별 추정 메모리 / 사용 횟수 / 유휴 시간 (LRU 순서, 앞쪽이 먼저 제거됨)
+    - hits / misses / shared_loads: 재사용 / 새 로드 / 진행 중인 로드를 함께 기다린 요청 수
+    - loads / load_failures / avg_load_seconds / evictions
+    - batchers: 모델별 avg_batch_size / avg_queue_wait_ms / avg_transcribe_ms / fallbacks (묶음 실패 후 개별 재실행)
+    - result_cache: hits / misses / hit_rate / expired / evictions
+    - storage: 다운로드 횟수 / 처리량 / media_cache (hits / misses / hit_rate / coalesced / evictions)
+    """
+    return {
+        "registry": get_stt_registry_metrics(),
+        "batchers": get_stt_batcher_metrics(),
+        "result_cache": get_stt_result_cache_metrics(),
+        "storage": storage.metrics(),
+    }
@@ -2,17 +2,20 @@
 AI Service - Wav2Lip 립싱크 처리
 """
 
+import asyncio
 import os
 import sys
-import subprocess
 import tempfile
 import time
+import numpy as np
 import torch
 import shutil
-from typing import Optional
-from api.utils.gcs_client import gcs_client
+from typing import Callable, Optional, Tuple
+from api.utils.async_storage import storage
+from api.utils import media_tools
 from api.core.config import settings
 from api.core.logger import logger, log_step, log_success, log_error
+from api.service.wav2lip_scheduler import Wav2LipBatchScheduler
 
 # Wav2Lip inference 모듈은 _load_wav2lip_model에서 동적으로 import
 WAV2LIP_AVAILABLE = False
@@ -22,10 +25,16 @@ class AIService:
     """AI 모델 서비스 클래스"""
     
     def __init__(self):
-        self.gcs_client = gcs_client
+        self.storage = storage  # 비동기 스토리지 (전송 스레드 풀 + 병렬 range 다운로드)
         self._optimal_batch_size = self._detect_optimal_batch_size()
         self._wav2lip_model = None  # 모델을 메모리에 상주
         self._model_device = None
+        self._batch_scheduler: Optional[Wav2LipBatchScheduler] = None  # 요청 간 배치 스케줄러
+        self._face_box_cache = None  # 얼굴 감지 박스 캐시 (재제출/재시도 시 감지 생략)
+        self._mel_cache = None  # 가이드 오디오 mel 캐시 (재제출 시 Step 1 생략)
+        self._bucketed_model = None  # 배치 크기 bucketing 래퍼 (torch.compile 사용 시)
+        # 동시에 inference 단계에 들어갈 수 있는 요청 수 (디코딩/감지/합성은 요청별 스레드에서 병렬 실행)
+        self._inference_slots = asyncio.Semaphore(settings.WAV2LIP_MAX_CONCURRENT_JOBS)
         self._load_wav2lip_model()  # 서버 시작 시 모델 로드
     
     async def process_lip_video_pipeline(
@@ -33,7 +42,8 @@ class AIService:
         user_video_gs: str,
         gen_audio_gs: str,
         output_video_gs: str,
-        target_fps: int = 18
+        target_fps: int = 18,
+        progress_callback: Optional[Callable[[str], None]] = None
     ) -> dict:
         """
         립싱크 영상 생성 파이프라인 실행
@@ -42,64 +52,59 @@ class AIService:
             user_video_gs: 사용자 업로드 영상 GCS 경로
             gen_audio_gs: 생성된 오디오 GCS 경로
             output_video_gs: 결과 영상 업로드 경로
+            progress_callback: 단계 시작 시 단계 이름으로 호출 (download → Wav2Lip step0~5 → postprocess → upload)
             
         Returns:
             dict: 처리 결과 정보
         """
         start_time = time.time()
-        temp_files = []
         step_times = {}
         
+        # 요청별 작업 디렉토리: 모든 중간 파일을 이 안에 두고 종료 시 통째로 삭제
+        # (동시 요청 간 temp/result.avi, /tmp/video_*.mp4 등의 경로 충돌 방지)
+        workspace = tempfile.mkdtemp(prefix="lipvideo_", dir=settings.WORKSPACE_ROOT)
+        
         try:
-            # 1. GCS에서 영상 다운로드
+            # 1. GCS에서 영상 / 오디오 동시 다운로드
             step_start = time.time()
-            log_step("Downloading video from GCS")
-            video_local_path = await self._download_file_from_gcs(
-                user_video_gs, 
-                f"video_{int(time.time())}.mp4"
+            if progress_callback:
+                progress_callback("download")
+            log_step("Downloading video and audio from GCS")
+            video_local_path, audio_local_path = await asyncio.gather(
+                self._download_file_from_gcs(user_video_gs, os.path.join(workspace, "face_input.mp4")),
+                self._download_file_from_gcs(gen_audio_gs, os.path.join(workspace, "audio.wav"))
             )
             if not video_local_path:
                 raise ValueError("Failed to download video from GCS")
-            temp_files.append(video_local_path)
-            step_times["1_download_video"] = time.time() - step_start
-            log_success(f"Video downloaded ({step_times['1_download_video']:.2f}s)", path=video_local_path)
-            
-            # 2. GCS에서 오디오 다운로드
-            step_start = time.time()
-            log_step("Downloading audio from GCS")
-            audio_local_path = await self._download_file_from_gcs(
-                gen_audio_gs, 
-                f"audio_{int(time.time())}.wav"
-            )
             if not audio_local_path:
                 raise ValueError("Failed to download audio from GCS")
-            temp_files.append(audio_local_path)
-            step_times["2_download_audio"] = time.time() - step_start
-            log_success(f"Audio downloaded ({step_times['2_download_audio']:.2f}s)", path=audio_local_path)
+            step_times["1_download"] = time.time() - step_start
+            log_success(f"Video and audio downloaded ({step_times['1_download']:.2f}s)", path=video_local_path)
             
-            # 3. Wav2Lip 립싱크
+            # 2. Wav2Lip 립싱크
             step_start = time.time()
             log_step("Running Wav2Lip inference and uploading to GCS")
             result_video_path = await self._run_wav2lip_inference(
                 face_video_path=video_local_path,
                 audio_path=audio_local_path,
                 output_gs_path=output_video_gs,
+                workspace=workspace,
                 use_gpu=True,
-                target_fps=target_fps
+                target_fps=target_fps,
+                progress_callback=progress_callback
             )
             if not result_video_path:
                 raise ValueError("Failed to run Wav2Lip inference or upload to GCS")
-            step_times["3_wav2lip"] = time.time() - step_start
-            log_success(f"Wav2Lip completed ({step_times['3_wav2lip']:.2f}s)", path=result_video_path)
+            step_times["2_wav2lip"] = time.time() - step_start
+            log_success(f"Wav2Lip completed ({step_times['2_wav2lip']:.2f}s)", path=result_video_path)
             
             process_time_ms = (time.time() - start_time) * 1000
             
             # 성능 분석 로그
             logger.info("=" * 60)
             logger.info("Performance Analysis:")
-            logger.info(f"  1. Download Video:    {step_times['1_download_video']:>7.2f}s ({step_times['1_download_video']/process_time_ms*100000:.1f}%)")
-            logger.info(f"  2. Download Audio:    {step_times['2_download_audio']:>7.2f}s ({step_times['2_download_audio']/process_time_ms*100000:.1f}%)")
-            logger.info(f"  3. Wav2Lip:           {step_times['3_wav2lip']:>7.2f}s ({step_times['3_wav2lip']/process_time_ms*100000:.1f}%)")
+            logger.info(f"  1. Download (V+A):    {step_times['1_download']:>7.2f}s ({step_times['1_download']/process_time_ms*100000:.1f}%)")
+            logger.info(f"  2. Wav2Lip:           {step_times['2_wav2lip']:>7.2f}s ({step_times['2_wav2lip']/process_time_ms*100000:.1f}%)")
             logger.info(f"  Total:                {process_time_ms/1000:>7.2f}s (100.0%)")
             logger.info("=" * 60)
             
@@ -114,17 +119,9 @@ class AIService:
             raise
         
         finally:
-            # 임시 파일 정리
-            cleaned_count = 0
-            for temp_file in temp_files:
-                if temp_file and os.path.exists(temp_file):
-                    try:
-                        os.unlink(temp_file)
-                        cleaned_count += 1
-                    except Exception as e:
-                        logger.warning(f"Failed to clean up {temp_file}: {e}")
-            if cleaned_count > 0:
-                logger.info(f"Cleaned up {cleaned_count} temporary files")
+            # 작업 디렉토리 정리
+            shutil.rmtree(workspace, ignore_errors=True)
+            logger.info(f"Cleaned up workspace: {workspace}")
     
     def _load_wav2lip_model(self):
         """Wav2Lip 모델을 GPU 메모리에 로드 (서버 시작 시 한 번만)"""
@@ -137,11 +134,24 @@ class AIService:
         
         # 동적 import 시도
         try:
-            from wav2lip_inference import run_wav2lip_inference
+            from wav2lip_inference import run_wav2lip_inference, warmup_face_detector
             from models import Wav2Lip
             WAV2LIP_AVAILABLE = True
             self._run_wav2lip_inference_func = run_wav2lip_inference
+            self._warmup_face_detector_func = warmup_face_detector
             logger.info("Wav2Lip inference module imported successfully")
+            if settings.FACE_BOX_CACHE_ENABLED:
+                from api.service.box_cache import FaceBoxCache
+                self._face_box_cache = FaceBoxCache(
+                    cache_dir=settings.FACE_BOX_CACHE_DIR,
+                    max_entries=settings.FACE_BOX_CACHE_MAX_ENTRIES,
+                    max_bytes=settings.FACE_BOX_CACHE_MAX_MB * 1024 * 1024
+                )
+                logger.info(f"Face box cache enabled: {settings.FACE_BOX_CACHE_DIR}")
+            if settings.MEL_CACHE_ENABLED:
+                from mel_engine import MelCache
+                self._mel_cache = MelCache(max_bytes=settings.MEL_CACHE_MAX_MB * 1024 * 1024)
+                logger.info(f"Mel cache enabled: {settings.MEL_CACHE_MAX_MB}MB")
         except ImportError as e:
             logger.warning(f"Could not import Wav2Lip inference module: {e}, will use subprocess method")
             WAV2LIP_AVAILABLE = False
@@ -153,6 +163,8 @@ class AIService:
             self._model_device = 'cpu'
         else:
             self._model_device = 'cuda'
+            # 고정 입력 크기(96x96)이므로 cuDNN autotune 결과를 재사용 (autotune 비용은 warm-up에서 지불)
+            torch.backends.cudnn.benchmark = True
         
         try:
             model_path = os.path.join(settings.LOCAL_WAV2LIP_PATH, "checkpoints", "wav2lip_gan.pth")
@@ -181,23 +193,154 @@ class AIService:
                 except Exception as e:
                     logger.warning(f"Could not convert to FP16: {e}, using FP32")
             
-            # torch.compile
+            # torch.compile (shape별 정적 그래프: bucketing으로 shape 수를 bucket 수로 제한)
+            compiled = False
             try:
                 if hasattr(torch, 'compile') and self._model_device == 'cuda':
-                    model = torch.compile(model, mode='reduce-overhead')
+                    model = torch.compile(model, mode='reduce-overhead', dynamic=False)
+                    compiled = True
                     logger.info("Model compiled with torch.compile")
             except Exception as e:
                 logger.debug(f"torch.compile not available: {e}")
             
             model.eval()
+            
+            # 배치 크기 bucketing: 마지막 배치/스케줄러가 합친 배치 등을 고정 bucket 크기로 패딩 (재컴파일/그래프 재캡처 방지)
+            if compiled and settings.WAV2LIP_SHAPE_BUCKETS:
+                from shape_buckets import BucketedModel, bucket_sizes
+                max_bucket = max(self._optimal_batch_size, settings.WAV2LIP_MAX_BATCH or self._optimal_batch_size)
+                model = BucketedModel(model, bucket_sizes(max_bucket))
+                self._bucketed_model = model
+                logger.info(f"Wav2Lip shape buckets: {model.buckets}")
+            
             self._wav2lip_model = model
             
+            # 요청 간 배치 스케줄러 (여러 요청의 배치를 모아 한 번의 forward로 실행)
+            if settings.WAV2LIP_CROSS_REQUEST_BATCHING:
+                from wav2lip_inference import predict_batch
+                from prefetch import CudaBatchRunner
+                device = self._model_device
+                if CudaBatchRunner.available(device):
+                    # pinned 버퍼 + 비동기 H2D/D2H (스케줄러 스레드 전용)
+                    forward_fn = CudaBatchRunner(model, device).run
+                else:
+                    forward_fn = lambda img_batch, mel_batch: predict_batch(model, img_batch, mel_batch, device)
+                self._batch_scheduler = Wav2LipBatchScheduler(
+                    forward_fn=forward_fn,
+                    max_batch=settings.WAV2LIP_MAX_BATCH or self._optimal_batch_size,
+                    max_wait_ms=settings.WAV2LIP_MAX_WAIT_MS
+                )
+                logger.info(
+                    f"Wav2Lip batch scheduler enabled (max_batch={self._batch_scheduler.max_batch}, "
+                    f"max_wait={settings.WAV2LIP_MAX_WAIT_MS}ms)"
+                )
+            
             logger.info("✅ Wav2Lip model loaded and ready in GPU memory (will be reused for all requests)")
             
         except Exception as e:
             logger.error(f"Failed to load Wav2Lip model: {e}, will use subprocess method")
             self._wav2lip_model = None
     
+    def warmup_wav2lip(self) -> dict:
+        """
+        합성 배치로 Wav2Lip forward 실행 (torch.compile 그래프 캡처 / cuDNN autotune을 첫 요청 전에 완료)
+        
+        실제 요청과 같은 경로(스케줄러 또는 pinned CudaBatchRunner)로 배치 크기별 WAV2LIP_WARMUP_ITERATIONS회 실행한다.
+        
+        Returns:
+            dict: 배치 크기별 첫 실행 / 마지막 실행 시간 (ms)
+        """
+        if self._wav2lip_model is None:
+            raise RuntimeError("Wav2Lip model not loaded")
+        
+        device = self._model_device
+        model = self._wav2lip_model
+        batch_sizes = settings.WAV2LIP_WARMUP_BATCH_SIZES
+        if not batch_sizes and self._bucketed_model is not None:
+            # bucket마다 한 번씩 컴파일/캡처
+            batch_sizes = self._bucketed_model.buckets
+        elif not batch_sizes:
+            batch_sizes = {self._batch_sizes(device)[0]}
+            if self._batch_scheduler is not None:
+                batch_sizes.add(self._batch_scheduler.max_batch)
+        
+        from wav2lip_inference import predict_batch
+        from prefetch import CudaBatchRunner
+        if self._batch_scheduler is not None:
+            forward = self._batch_scheduler.predict
+        elif settings.WAV2LIP_PREFETCH_DEPTH > 0 and CudaBatchRunner.available(device):
+            forward = CudaBatchRunner(model, device).run
+        else:
+            forward = lambda img_batch, mel_batch: predict_batch(model, img_batch, mel_batch, device)
+        
+        forward_ms = {}
+        for batch_size in sorted(batch_sizes):
+            # _prepare_model_inputs 출력과 같은 형태: (N, 96, 96, 6) 0~1, (N, 80, 16, 1)
+            img_batch = np.random.randint(0, 256, (batch_size, 96, 96, 6)) / 255.
+            mel_batch = np.random.randn(batch_size, 80, 16, 1).astype(np.float32)
+            times = []
+            for _ in range(max(1, settings.WAV2LIP_WARMUP_ITERATIONS)):
+                start = time.time()
+                forward(img_batch, mel_batch)
+                times.append((time.time() - start) * 1000)
+            forward_ms[str(batch_size)] = {"first_ms": times[0], "last_ms": times[-1]}
+            logger.info(f"Wav2Lip warm-up batch={batch_size}: first {times[0]:.0f}ms, last {times[-1]:.0f}ms")
+        
+        return {"device": device, "forward": forward_ms}
+    
+    def warmup_face_detector(self) -> dict:
+        """빈 프레임 배치로 얼굴 감지기 초기화 + 감지 한 번 (SCRFD 세션 생성 / autotune)"""
+        if not WAV2LIP_AVAILABLE:
+            raise RuntimeError("Wav2Lip inference module not available")
+        
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        _, face_det_batch = self._batch_sizes(device)
+        width, height = (int(v) for v in settings.WARMUP_FRAME_SIZE.split("x"))
+        init_time, detect_time = self._warmup_face_detector_func(
+            device, settings.WAV2LIP_FACE_DETECTOR, face_det_batch, (width, height)
+        )
+        return {
+            "detector": settings.WAV2LIP_FACE_DETECTOR,
+            "batch_size": face_det_batch,
+            "frame_size": settings.WARMUP_FRAME_SIZE,
+            "init_ms": init_time * 1000,
+            "detect_ms": detect_time * 1000,
+        }
+    
+    def _batch_sizes(self, device: str) -> Tuple[int, int]:
+        """device별 (Wav2Lip 배치 크기, 얼굴 감지 배치 크기) (L4 GPU 최적화)"""
+        if device == "cuda":
+            return self._optimal_batch_size, min(self._optimal_batch_size, 24)
+        return 8, 4
+    
+    def get_face_box_cache_metrics(self) -> dict:
+        """얼굴 박스 캐시 hit/miss 메트릭 (비활성화 시 enabled=False)"""
+        if self._face_box_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._face_box_cache.stats()}
+    
+    def get_mel_cache_metrics(self) -> dict:
+        """가이드 오디오 mel 캐시 hit/miss 메트릭 (비활성화 시 enabled=False)"""
+        if self._mel_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._mel_cache.stats()}
+    
+    def get_shape_bucket_metrics(self) -> dict:
+        """bucket별 forward 호출 수 / 지연, 관측된 입력 shape 수와 재컴파일 카운터 (비활성화 시 enabled=False)"""
+        if self._bucketed_model is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._bucketed_model.metrics()}
+    
+    def get_storage_metrics(self) -> dict:
+        """GCS 전송 메트릭 (다운로드/업로드 수, 병렬 range 다운로드 수, 평균 처리량)"""
+        return self.storage.metrics()
+    
+    def get_scheduler_metrics(self) -> dict:
+        """요청 간 배치 스케줄러 메트릭 (비활성화 시 enabled=False)"""
+        if self._batch_scheduler is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._batch_scheduler.metrics()}
+    
     def _detect_optimal_batch_size(self) -> int:
         """GPU 메모리에 따라 최적 배치 크기 자동 감지 (L4 GPU 최적화)"""
         if not torch.cuda.is_available():
@@ -225,16 +368,14 @@ class AIService:
         logger.info(f"Optimal batch size determined: {batch_size} (GPU: {gpu_name}, {gpu_memory_gb:.2f}GB)")
         return batch_size
     
-    async def _download_file_from_gcs(self, gs_path: str, filename: str) -> Optional[str]:
-        """GCS에서 파일 다운로드"""
+    async def _download_file_from_gcs(self, gs_path: str, local_path: str) -> Optional[str]:
+        """GCS에서 파일 다운로드 (요청 작업 디렉토리 내 local_path로 저장)"""
         try:
-            local_path = f"/tmp/{filename}"
-            
-            if not self.gcs_client.download_file(gs_path, local_path):
+            if not await self.storage.download_file(gs_path, local_path):
                 logger.error(f"Failed to download file: {gs_path}")
                 return None
             
-            logger.info(f"File downloaded to tmp: {local_path}")
+            logger.info(f"File downloaded to workspace: {local_path}")
             return local_path
             
         except Exception as e:
@@ -246,209 +387,196 @@ class AIService:
         face_video_path: str,
         audio_path: str,
         output_gs_path: str,
+        workspace: str,
         use_gpu: bool = True,
-        target_fps: int = 18
+        target_fps: int = 18,
+        progress_callback: Optional[Callable[[str], None]] = None
     ) -> Optional[str]:
         """Wav2Lip 립싱크 (모델 재사용 - GPU 메모리 상주)"""
         try:
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                # 오디오 파일 처리
-                audio_local = os.path.join(tmp_dir, "audio.wav")
-                shutil.copy2(audio_path, audio_local)
+            audio_local = audio_path
+            face_local = face_video_path
+            
+            # 원본 영상 해상도/비트레이트 추출 (FFprobe 한 번)
+            original_resolution, original_bitrate = await self._probe_video(face_local)
+            logger.info(f"Original video resolution: {original_resolution}")
+            
+            output_temp = os.path.join(workspace, "lipsynced_temp.mp4")  # 임시 출력
+            output_local = os.path.join(workspace, "lipsynced.mp4")  # 최종 출력
+            # Wav2Lip 중간 파일 (result.avi, temp.wav 등)도 요청 작업 디렉토리 안에 기록
+            wav2lip_temp_dir = os.path.join(workspace, "temp")
+            os.makedirs(wav2lip_temp_dir, exist_ok=True)
+            
+            streaming_upload = None  # 인코딩 중 스트리밍 업로드 (단일 패스 인코딩일 때)
+            
+            # GPU 사용 여부 확인
+            device = "cuda" if torch.cuda.is_available() and use_gpu else "cpu"
+            logger.info(f"Running Wav2Lip on {device.upper()}")
+            
+            # GPU 파라미터 설정 (L4 GPU 최적화)
+            batch_size, face_det_batch = self._batch_sizes(device)
+            if device == "cuda":
+                logger.info(f"L4 GPU detected: Using batch_size={batch_size}, face_det_batch={face_det_batch}")
+            
+            # 모델이 메모리에 로드되어 있으면 직접 사용 (빠름!)
+            if self._wav2lip_model is not None and WAV2LIP_AVAILABLE and hasattr(self, '_run_wav2lip_inference_func'):
+                logger.info("🚀 Using pre-loaded model from GPU memory (fast path - no model reload!)")
                 
-                # 영상 파일 처리
-                face_local = os.path.join(tmp_dir, "face_input.mp4")
-                shutil.copy2(face_video_path, face_local)
+                # 직접 inference 함수 호출 (모델 재사용)
+                # 동기 함수이므로 스레드에서 실행하여 이벤트 루프(/health 등)를 막지 않음
+                predict_fn = self._batch_scheduler.predict if self._batch_scheduler is not None else None
+                # 단일 패스 인코딩: 합성 프레임을 ffmpeg 파이프로 보내 리사이즈/FPS/오디오 합성까지 한 번에 처리
+                encode_options = None
+                if settings.WAV2LIP_SINGLE_PASS_ENCODE:
+                    encode_options = {
+                        "resolution": original_resolution,
+                        "target_fps": target_fps,
+                        "gpu_encoding": torch.cuda.is_available(),
+                        "bitrate": original_bitrate,
+                        # 인코더 ffmpeg도 이벤트 루프의 비동기 subprocess로 실행 (timeout / 취소 시 종료)
+                        "open_process": media_tools.thread_pipe_opener(
+                            asyncio.get_running_loop(), settings.MEDIA_TOOL_TIMEOUT_SECONDS
+                        ),
+                    }
+                    output_temp = output_local
+                    if settings.WAV2LIP_STREAMING_UPLOAD:
+                        # 인코더가 조각 MP4를 내보내는 동안 GCS resumable 업로드로 바로 전송 (완료/취소는 인코더가 처리)
+                        streaming_upload = self.storage.open_upload(output_gs_path, "video/mp4")
+                        encode_options["upload"] = streaming_upload
+                try:
+                    async with self._inference_slots:
+                        await asyncio.to_thread(
+                            self._run_wav2lip_inference_func,
+                            model=self._wav2lip_model,
+                            face_video_path=face_local,
+                            audio_path=audio_local,
+                            output_path=output_temp,
+                            device=device,
+                            wav2lip_batch_size=batch_size,
+                            face_det_batch_size=face_det_batch,
+                            face_detector=settings.WAV2LIP_FACE_DETECTOR,
+                            pads=[0, 15, 0, 0],
+                            resize_factor=1,
+                            box=[-1, -1, -1, -1],
+                            static=False,
+                            nosmooth=False,
+                            video_speed=1.0,  # 영상 배속 (1.0 = 정상)
+                            audio_speed=0.8,  # 오디오를 0.8배속으로 느리게 (1.25배 느리게)
+                            streaming=settings.WAV2LIP_STREAMING,  # 프레임 전체를 메모리에 올리지 않음
+                            stream_window_size=settings.WAV2LIP_STREAM_WINDOW,
+                            temp_dir=wav2lip_temp_dir,
+                            predict_fn=predict_fn,
+                            progress_callback=progress_callback,
+                            box_cache=self._face_box_cache,
+                            keyframe_interval=settings.WAV2LIP_KEYFRAME_INTERVAL,
+                            motion_threshold=settings.WAV2LIP_MOTION_THRESHOLD,
+                            encode_options=encode_options,
+                            # 오디오 합성(5단계) ffmpeg도 이벤트 루프의 비동기 subprocess로 실행
+                            run_command=media_tools.thread_runner(
+                                asyncio.get_running_loop(), settings.MEDIA_TOOL_TIMEOUT_SECONDS
+                            ),
+                            mel_cache=self._mel_cache,
+                            mel_device=settings.WAV2LIP_MEL_DEVICE,
+                            prefetch_depth=settings.WAV2LIP_PREFETCH_DEPTH
+                        )
+                except Exception:
+                    # 인코더가 열리기 전에 실패한 경우 (인코더가 연 뒤의 실패는 인코더가 취소)
+                    if streaming_upload is not None:
+                        streaming_upload.abort()
+                    raise
                 
-                # 원본 영상 해상도 추출 (FFprobe)
-                original_resolution = await self._get_video_resolution(face_local)
-                logger.info(f"Original video resolution: {original_resolution}")
+                if streaming_upload is None and not os.path.exists(output_temp):
+                    logger.error(f"Wav2Lip output file not found: {output_temp}")
+                    return None
+            else:
+                # Fallback: subprocess 방식 (모델 로드 실패 시)
+                logger.warning("Using subprocess method (model not pre-loaded)")
+                model_local = os.path.join(settings.LOCAL_WAV2LIP_PATH, "checkpoints", "wav2lip_gan.pth")
+                if not os.path.exists(model_local):
+                    logger.error(f"Wav2Lip model not found: {model_local}")
+                    return None
                 
-                output_temp = os.path.join(tmp_dir, "lipsynced_temp.mp4")  # 임시 출력
-                output_local = os.path.join(tmp_dir, "lipsynced.mp4")  # 최종 출력
+                inference_path = os.path.join(settings.LOCAL_WAV2LIP_PATH, "inference.py")
+                python_exec = sys.executable if hasattr(sys, 'executable') else "python3"
                 
-                # GPU 사용 여부 확인
-                device = "cuda" if torch.cuda.is_available() and use_gpu else "cpu"
-                logger.info(f"Running Wav2Lip on {device.upper()}")
+                cmd = [
+                    python_exec, inference_path,
+                    "--checkpoint_path", model_local,
+                    "--face", face_local,
+                    "--audio", audio_local,
+                    "--outfile", output_temp,
+                    "--pads", "0", "15", "0", "0",
+                    "--wav2lip_batch_size", str(batch_size),
+                    "--face_det_batch_size", str(face_det_batch),
+                    "--resize_factor", "1",
+                    "--box", "-1", "-1", "-1", "-1",
+                    "--face_detector", "scrfd",
+                ]
                 
-                # GPU 파라미터 설정 (L4 GPU 최적화)
-                if device == "cuda":
-                    batch_size = self._optimal_batch_size
-                    face_det_batch = min(self._optimal_batch_size, 24)
-                    logger.info(f"L4 GPU detected: Using batch_size={batch_size}, face_det_batch={face_det_batch}")
-                else:
-                    batch_size = 8
-                    face_det_batch = 4
+                logger.info(f"Running Wav2Lip inference (subprocess): {' '.join(cmd)}")
+                # inference.py는 상대 경로 temp/ 를 사용하므로 작업 디렉토리를 cwd로 지정
+                result = await media_tools.run_command(cmd, cwd=workspace)
                 
-                # 모델이 메모리에 로드되어 있으면 직접 사용 (빠름!)
-                if self._wav2lip_model is not None and WAV2LIP_AVAILABLE and hasattr(self, '_run_wav2lip_inference_func'):
-                    logger.info("🚀 Using pre-loaded model from GPU memory (fast path - no model reload!)")
-                    
-                    # temp 디렉토리 생성
-                    temp_dir = os.path.join(settings.LOCAL_WAV2LIP_PATH, "temp")
-                    os.makedirs(temp_dir, exist_ok=True)
-                    
-                    # 직접 inference 함수 호출 (모델 재사용)
-                    self._run_wav2lip_inference_func(
-                        model=self._wav2lip_model,
-                        face_video_path=face_local,
-                        audio_path=audio_local,
-                        output_path=output_temp,
-                        device=device,
-                        wav2lip_batch_size=batch_size,
-                        face_det_batch_size=face_det_batch,
-                        face_detector='scrfd',
-                        pads=[0, 15, 0, 0],
-                        resize_factor=1,
-                        box=[-1, -1, -1, -1],
-                        static=False,
-                        nosmooth=False,
-                        video_speed=1.0,  # 영상 배속 (1.0 = 정상)
-                        audio_speed=0.8  # 오디오를 0.8배속으로 느리게 (1.25배 느리게)
-                    )
-                    
-                    if not os.path.exists(output_temp):
-                        logger.error(f"Wav2Lip output file not found: {output_temp}")
-                        return None
-                else:
-                    # Fallback: subprocess 방식 (모델 로드 실패 시)
-                    logger.warning("Using subprocess method (model not pre-loaded)")
-                    model_local = os.path.join(settings.LOCAL_WAV2LIP_PATH, "checkpoints", "wav2lip_gan.pth")
-                    if not os.path.exists(model_local):
-                        logger.error(f"Wav2Lip model not found: {model_local}")
-                        return None
-                    
-                    wav2lip_dir = settings.LOCAL_WAV2LIP_PATH
-                    inference_path = os.path.join(wav2lip_dir, "inference.py")
-                    python_exec = sys.executable if hasattr(sys, 'executable') else "python3"
-                    
-                    cmd = [
-                        python_exec, inference_path,
-                        "--checkpoint_path", model_local,
-                        "--face", face_local,
-                        "--audio", audio_local,
-                        "--outfile", output_temp,
-                        "--pads", "0", "15", "0", "0",
-                        "--wav2lip_batch_size", str(batch_size),
-                        "--face_det_batch_size", str(face_det_batch),
-                        "--resize_factor", "1",
-                        "--box", "-1", "-1", "-1", "-1",
-                        "--face_detector", "scrfd",
-                    ]
-                    
-                    logger.info(f"Running Wav2Lip inference (subprocess): {' '.join(cmd)}")
-                    result = subprocess.run(cmd, capture_output=True, text=True, cwd=wav2lip_dir)
-                    
-                    if result.returncode != 0:
-                        logger.error(f"Wav2Lip inference failed: {result.stderr}")
-                        return None
-                    
-                    if not os.path.exists(output_temp):
-                        logger.error(f"Wav2Lip output file not found: {output_temp}")
-                        return None
+                if result.returncode != 0:
+                    logger.error(f"Wav2Lip inference failed: {result.stderr.decode(errors='replace')}")
+                    return None
                 
-                # 후처리: 원본 해상도로 리사이즈 (고품질 스케일링) + FPS 조정
+                if not os.path.exists(output_temp):
+                    logger.error(f"Wav2Lip output file not found: {output_temp}")
+                    return None
+            
+            # 후처리: 원본 해상도로 리사이즈 (고품질 스케일링) + FPS 조정 (단일 패스 인코딩이면 이미 적용됨)
+            if output_temp != output_local:
+                if progress_callback:
+                    progress_callback("postprocess")
                 logger.info(f"Resizing output to original resolution: {original_resolution} @ {target_fps}fps with HIGH QUALITY (GPU accel: {torch.cuda.is_available()})")
                 resize_success = await self._resize_video_to_resolution(
                     input_path=output_temp,
                     output_path=output_local,
                     resolution=original_resolution,
                     target_fps=target_fps,
-                    original_video_path=face_local  # 원본 영상 경로 전달 (비트레이트 추출용)
+                    original_bitrate=original_bitrate  # 원본 화질 유지
                 )
                 
                 if not resize_success or not os.path.exists(output_local):
                     logger.error("Failed to resize video to original resolution")
                     return None
-                
-                # GCS에 업로드
-                logger.info(f"Uploading to GCS: {output_local} -> {output_gs_path}")
-                if not self.gcs_client.upload_file(output_local, output_gs_path):
-                    logger.error("Failed to upload Wav2Lip output to GCS")
-                    return None
-                    
-                logger.info(f"Wav2Lip inference completed: {output_gs_path}")
+            
+            if streaming_upload is not None:
+                logger.info(f"Wav2Lip output streamed to GCS while encoding: {output_gs_path} ({streaming_upload.bytes_written} bytes)")
                 return output_gs_path
-                    
+            
+            # GCS에 업로드
+            if progress_callback:
+                progress_callback("upload")
+            logger.info(f"Uploading to GCS: {output_local} -> {output_gs_path}")
+            if not await self.storage.upload_file(output_local, output_gs_path):
+                logger.error("Failed to upload Wav2Lip output to GCS")
+                return None
+                
+            logger.info(f"Wav2Lip inference completed: {output_gs_path}")
+            return output_gs_path
+                
         except Exception as e:
             logger.error(f"Failed to run Wav2Lip inference: {e}")
             return None
     
-    async def _get_video_resolution(self, video_path: str) -> str:
+    async def _probe_video(self, video_path: str) -> Tuple[str, Optional[str]]:
         """
-        FFprobe를 사용하여 영상의 해상도를 추출
+        FFprobe 한 번으로 영상의 해상도와 비트레이트를 추출
         
         Returns:
-            str: "widthxheight" 형식 (예: "1280x720")
+            (해상도 "widthxheight" (예: "1280x720"), 비트레이트 (예: "5000k") 또는 None)
         """
         try:
-            cmd = [
-                "ffprobe",
-                "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=width,height",
-                "-of", "csv=s=x:p=0",
-                video_path
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            resolution = result.stdout.strip()
-            logger.info(f"Detected video resolution: {resolution}")
-            return resolution
-            
-        except subprocess.CalledProcessError as e:
-            logger.error(f"FFprobe failed: {e.stderr}")
-            return "1280x720"  # 기본값
-        except Exception as e:
-            logger.error(f"Failed to get video resolution: {e}")
-            return "1280x720"  # 기본값
-    
-    async def _get_video_bitrate(self, video_path: str) -> str:
-        """
-        FFprobe를 사용하여 영상의 비트레이트를 추출
+            probe = await media_tools.probe_video(video_path, timeout=settings.FFPROBE_TIMEOUT_SECONDS)
+        except (media_tools.MediaToolError, ValueError, KeyError) as e:
+            logger.error(f"FFprobe failed: {e}")
+            return "1280x720", None  # 기본값
         
-        Returns:
-            str: 비트레이트 (예: "5000k") 또는 None
-        """
-        try:
-            cmd = [
-                "ffprobe",
-                "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=bit_rate",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                video_path
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            bitrate = result.stdout.strip()
-            if bitrate and bitrate.isdigit():
-                # bps를 kbps로 변환
-                bitrate_kbps = int(int(bitrate) / 1000)
-                logger.info(f"Detected video bitrate: {bitrate_kbps}k")
-                return f"{bitrate_kbps}k"
-            
+        if probe.bitrate_k is None:
             logger.warning("Could not detect bitrate, will use CRF mode")
-            return None
-            
-        except subprocess.CalledProcessError as e:
-            logger.error(f"FFprobe bitrate detection failed: {e.stderr}")
-            return None
-        except Exception as e:
-            logger.error(f"Failed to get video bitrate: {e}")
-            return None
+        return probe.resolution, probe.bitrate_k
     
     async def _resize_video_to_resolution(
         self,
@@ -456,7 +584,7 @@ class AIService:
         output_path: str,
         resolution: str,
         target_fps: int = 18,
-        original_video_path: str = None
+        original_bitrate: Optional[str] = None
     ) -> bool:
         """
         FFmpeg를 사용하여 영상을 특정 해상도로 리사이즈 (하이브리드 방식)
@@ -471,25 +599,18 @@ class AIService:
             output_path: 출력 영상 경로
             resolution: 목표 해상도 "widthxheight" (예: "1280x720")
             target_fps: 목표 프레임률 (기본값: 18fps)
-            original_video_path: 원본 영상 경로 (비트레이트 추출용)
+            original_bitrate: 원본 비트레이트 (예: "5000k", None이면 CRF/QP 모드)
             
         Returns:
             bool: 성공 여부
         """
         try:
-            # 원본 비트레이트 추출 (원본 화질 유지)
-            original_bitrate = None
-            if original_video_path:
-                original_bitrate = await self._get_video_bitrate(original_video_path)
-            
             # GPU 인코딩 가능 여부 확인
             gpu_encoding_available = torch.cuda.is_available()
             
             # 하이브리드 파이프라인: CPU 스케일링 + GPU 인코딩 (속도 최적화)
             # 스케일링 필터: fast_bilinear (lanczos보다 빠르지만 여전히 좋은 품질)
-            cmd = [
-                "ffmpeg",
-                "-y",
+            args = [
                 "-i", input_path,
                 "-vf", f"scale={resolution}:flags=fast_bilinear,fps={target_fps}",  # 빠른 스케일링
                 "-c:v", "h264_nvenc" if gpu_encoding_available else "libx264",  # GPU 인코딩 (가능 시)
@@ -499,7 +620,7 @@ class AIService:
             # 비트레이트 또는 CRF 설정
             if original_bitrate:
                 logger.info(f"Using original bitrate: {original_bitrate}")
-                cmd.extend([
+                args.extend([
                     "-b:v", original_bitrate,
                     "-maxrate", original_bitrate,
                     "-bufsize", f"{int(original_bitrate.replace('k', '')) * 2}k",
@@ -507,34 +628,29 @@ class AIService:
             else:
                 if gpu_encoding_available:
                     # NVENC: QP 21 (19보다 약간 빠르지만 여전히 고품질)
-                    cmd.extend(["-rc", "constqp", "-qp", "21"])
+                    args.extend(["-rc", "constqp", "-qp", "21"])
                     logger.info("Using NVENC QP 21 (fast high quality)")
                 else:
                     # CPU: CRF 18 (15보다 빠르지만 여전히 좋은 품질) + 멀티스레딩
-                    cmd.extend(["-crf", "18", "-threads", "0"])
+                    args.extend(["-crf", "18", "-threads", "0"])
                     logger.info("Using CRF 18 with multithreading (fast high quality)")
             
             # 공통 옵션
-            cmd.extend([
+            args.extend([
                 "-pix_fmt", "yuv420p",
                 "-c:a", "copy",  # 오디오 복사
                 output_path
             ])
             
-            logger.info(f"Hybrid pipeline (CPU scale + {'GPU' if gpu_encoding_available else 'CPU'} encode): {' '.join(cmd)}")
+            logger.info(f"Hybrid pipeline (CPU scale + {'GPU' if gpu_encoding_available else 'CPU'} encode): ffmpeg {' '.join(args)}")
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            await media_tools.run_ffmpeg(args, timeout=settings.MEDIA_TOOL_TIMEOUT_SECONDS)
             
             logger.info(f"Video resized successfully to {resolution} @ {target_fps}fps")
             return True
             
-        except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg resize failed: {e.stderr}")
+        except media_tools.MediaToolError as e:
+            logger.error(f"FFmpeg resize failed: {e}")
             return False
         except Exception as e:
             logger.error(f"Failed to resize video: {e}")
@@ -0,0 +1,94 @@
+"""
+얼굴 감지 박스 캐시
+
+같은 사용자 영상이 재제출/재시도로 다시 립싱크될 때 SCRFD 감지를 건너뛰기 위해
+(영상 내용 digest, detector, pads, resize_factor) 단위로 프레임별 박스를 디스크에 저장한다.
+
+저장하는 값은 패딩 적용 후, 스무딩 전의 박스 (N, 4) [x1, y1, x2, y2] 이다.
+스무딩은 감지한 프레임 구간에 따라 결과가 달라지므로 (잘린 영상의 끝부분 등)
+조회한 쪽에서 필요한 길이만큼 잘라 다시 적용한다.
+
+AIService가 만들어 run_wav2lip_inference(box_cache=...)로 전달한다
+(Wav2Lip 모듈은 video_digest / make_key / get / put 인터페이스만 사용하고 api 패키지를 import하지 않음).
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from api.utils.disk_lru import DiskLRUCache, file_digest, param_key
+
+# 감지/패딩 로직이 바뀌면 올려서 이전 캐시를 무효화
+BOX_CACHE_VERSION = 1
+
+
+class FaceBoxCache(DiskLRUCache):
+    """
+    디스크 기반 얼굴 박스 캐시 (LRU, 항목 수 / 총 바이트 제한)
+
+    항목은 cache_dir/<key>.npz 로 저장되며 마지막 사용 시각 기준으로 오래된 항목부터 삭제한다.
+    한 항목은 영상 앞부분 M 프레임의 박스를 담고, 영상 끝까지 감지했으면 complete=True 이다.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 512, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__(cache_dir, ".npz", max_entries=max_entries, max_bytes=max_bytes)
+
+    @staticmethod
+    def video_digest(path: str) -> str:
+        """영상 파일 내용의 digest (경로/파일명과 무관)"""
+        return file_digest(path)
+
+    @staticmethod
+    def make_key(digest: str, face_detector: str, pads: Sequence[int], resize_factor: int, variant: str = "") -> str:
+        """캐시 키: 영상 digest + 박스 결과에 영향을 주는 감지 파라미터 (variant: 키프레임 감지 설정 등)"""
+        params = "v{}|{}|{}|{}".format(BOX_CACHE_VERSION, face_detector, ",".join(str(int(p)) for p in pads), int(resize_factor))
+        if variant:
+            params += "|" + variant
+        return param_key(digest, params)
+
+    def get(self, key: str, n_frames: int) -> Optional[np.ndarray]:
+        """
+        앞에서부터 n_frames 프레임의 박스 조회
+
+        Returns:
+            np.ndarray (n, 4) 복사본. 캐시된 구간이 n_frames보다 짧으면 None (영상 전체를 감지한 항목이면 전체 반환)
+        """
+        path = self._path(key)
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            try:
+                with np.load(path) as data:
+                    boxes = data["boxes"]
+                    complete = bool(data["complete"])
+            except (OSError, KeyError, ValueError):
+                # 손상된 항목은 버림
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            if len(boxes) < n_frames and not complete:
+                self.misses += 1
+                return None
+
+            self._touch(key)
+            return boxes[:n_frames].copy()
+
+    def put(self, key: str, boxes, complete: bool):
+        """박스 저장 (이미 더 긴 구간이 저장되어 있으면 유지)"""
+        boxes = np.asarray(boxes)
+        path = self._path(key)
+        with self._lock:
+            if key in self._index:
+                try:
+                    with np.load(path) as data:
+                        if len(data["boxes"]) >= len(boxes) or bool(data["complete"]):
+                            return
+                except (OSError, KeyError, ValueError):
+                    pass
+
+            tmp_path = self.temp_path(key)
+            with open(tmp_path, "wb") as f:
+                np.savez(f, boxes=boxes, complete=np.array(complete))
+            self._install(key, tmp_path)
@@ -11,6 +11,10 @@ class LipVideoGenerationRequest(BaseModel):
     word: Optional[str] = Field(None, description="발음할 단어/문장 텍스트 (FPS 자동 조정용)")
     target_fps: Optional[int] = Field(None, description="출력 영상의 프레임률 (미지정시 자동: 문장 15fps, 단어 18fps)", ge=15, le=60)
 
+class LipVideoJobSubmitRequest(LipVideoGenerationRequest):
+    """비동기 립싱크 작업 제출 요청"""
+    callback_url: Optional[str] = Field(None, description="작업 완료/실패 시 상태를 POST로 받을 URL (선택)")
+
 # ---------- 응답 DTO ----------
 
 class LipVideoGenerationResponse(BaseModel):
@@ -19,6 +23,25 @@ class LipVideoGenerationResponse(BaseModel):
     result_video_gs: str = Field(..., description="생성된 합성 영상의 GCS 경로")
     process_time_ms: float | None = Field(None, description="총 처리 시간 (ms)")
 
+class LipVideoJobSubmitResponse(BaseModel):
+    """비동기 립싱크 작업 제출 응답"""
+    job_id: str = Field(..., description="작업 ID")
+    status: str = Field(..., description="작업 상태 (queued, running, succeeded, failed)")
+    status_url: str = Field(..., description="작업 상태 조회 경로")
+
+class LipVideoJobStatusResponse(BaseModel):
+    """비동기 립싱크 작업 상태"""
+    job_id: str = Field(..., description="작업 ID")
+    status: str = Field(..., description="작업 상태 (queued, running, succeeded, failed)")
+    stage: Optional[str] = Field(None, description="현재 진행 단계 (download, step0_read_video ~ step5_audio_mux, postprocess, upload)")
+    progress: float = Field(0.0, description="진행률 (0.0 ~ 1.0)")
+    result_video_gs: Optional[str] = Field(None, description="생성된 합성 영상의 GCS 경로 (성공 시)")
+    error: Optional[str] = Field(None, description="실패 사유 (실패 시)")
+    created_at: float = Field(..., description="작업 생성 시각 (epoch seconds)")
+    started_at: Optional[float] = Field(None, description="작업 시작 시각")
+    finished_at: Optional[float] = Field(None, description="작업 종료 시각")
+    process_time_ms: Optional[float] = Field(None, description="파이프라인 처리 시간 (ms)")
+
 # ---------- STT 요청 DTO ----------
 
 class STTRequest(BaseModel):
@@ -34,7 +57,7 @@ class STTBatchRequest(BaseModel):
     """배치 음성 인식 요청"""
     model_config = ConfigDict(protected_namespaces=())  # model_ 네임스페이스 경고 해제
     
-    audio_files: List[Union[str, Dict]] = Field(..., description="GCS 경로 또는 URL 리스트")
+    audio_files: List[Union[str, Dict]] = Field(..., description="GCS 경로 또는 URL 리스트 (dict 항목: audio_gs 또는 audio_url + lang)", min_length=1, max_length=256)
     langs: Optional[List[str]] = Field(None, description="각 오디오에 대한 언어 코드 리스트")
     model_size: Optional[str] = Field("7B", description="모델 크기 (300M, 1B, 3B, 7B)")
     batch_size: Optional[int] = Field(2, description="배치 처리 크기", ge=1, le=32)
@@ -47,10 +70,24 @@ class STTResponse(BaseModel):
     transcription: str = Field(..., description="인식된 텍스트")
     language: Optional[str] = Field(None, description="감지된 언어 코드")
     process_time_ms: float = Field(..., description="처리 시간 (ms)")
+    cache_hit: bool = Field(False, description="결과 캐시에서 반환되었는지 여부 (같은 오디오 + 모델 + 언어)")
+    cached_at: Optional[float] = Field(None, description="캐시된 결과의 최초 인식 시각 (epoch seconds, cache_hit일 때)")
+
+class STTBatchItemResult(BaseModel):
+    """배치 음성 인식의 파일별 결과"""
+    index: int = Field(..., description="audio_files 내 위치")
+    source: str = Field(..., description="GCS 경로 또는 URL")
+    success: bool = Field(..., description="해당 파일 처리 성공 여부")
+    transcription: str = Field("", description="인식된 텍스트 (실패 시 빈 문자열)")
+    language: Optional[str] = Field(None, description="언어 코드")
+    error: Optional[str] = Field(None, description="실패 사유 (다운로드/인식)")
+    cache_hit: bool = Field(False, description="결과 캐시에서 반환되었는지 여부")
 
 class STTBatchResponse(BaseModel):
     """배치 음성 인식 응답"""
-    success: bool = Field(..., description="처리 성공 여부")
-    transcriptions: List[str] = Field(..., description="인식된 텍스트 리스트")
-    languages: Optional[List[str]] = Field(None, description="각 오디오의 언어 코드 리스트")
+    success: bool = Field(..., description="처리 성공 여부 (하나 이상 성공)")
+    transcriptions: List[str] = Field(..., description="인식된 텍스트 리스트 (audio_files 순서, 실패 항목은 빈 문자열)")
+    languages: Optional[List[Optional[str]]] = Field(None, description="각 오디오의 언어 코드 리스트")
+    results: List[STTBatchItemResult] = Field(default_factory=list, description="파일별 결과")
+    failed_count: int = Field(0, description="실패한 파일 수")
     process_time_ms: float = Field(..., description="총 처리 시간 (ms)")
@@ -0,0 +1,187 @@
+"""
+립싱크 비동기 작업 관리 - 제출 후 즉시 job_id 반환, 상태 조회 / 결과 조회 / 완료 콜백
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Dict, Optional
+
+import aiohttp
+
+from api.core.config import settings
+from api.core.logger import logger, log_error
+from api.service.ai_service import ai_service
+
+# 파이프라인 단계별 진행률 (단계 시작 시점 기준, wav2lip_inference.PIPELINE_STEPS와 이름 일치)
+STAGE_PROGRESS = {
+    "queued": 0.0,
+    "download": 0.02,
+    "step0_read_video": 0.08,
+    "step1_audio": 0.12,
+    "step2_frame_adjust": 0.18,
+    "step3_face_detection": 0.2,
+    "step4_inference": 0.4,
+    "step5_audio_mux": 0.8,
+    "postprocess": 0.85,
+    "upload": 0.95,
+    "done": 1.0,
+}
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class LipVideoJob:
+    """립싱크 작업 한 건의 상태"""
+
+    def __init__(self, job_id: str, user_video_gs: str, gen_audio_gs: str, output_video_gs: str,
+                 target_fps: int, callback_url: Optional[str] = None):
+        self.job_id = job_id
+        self.user_video_gs = user_video_gs
+        self.gen_audio_gs = gen_audio_gs
+        self.output_video_gs = output_video_gs
+        self.target_fps = target_fps
+        self.callback_url = callback_url
+
+        self.status = JOB_QUEUED
+        self.stage: Optional[str] = "queued"
+        self.progress = 0.0
+        self.result_video_gs: Optional[str] = None
+        self.error: Optional[str] = None
+        self.process_time_ms: Optional[float] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+    def set_stage(self, stage: str):
+        """단계 갱신 (inference 스레드에서도 호출됨, 진행률은 감소하지 않음)"""
+        self.stage = stage
+        self.progress = max(self.progress, STAGE_PROGRESS.get(stage, self.progress))
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "result_video_gs": self.result_video_gs,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "process_time_ms": self.process_time_ms,
+        }
+
+
+class LipVideoJobManager:
+    """
+    립싱크 작업 관리자
+
+    submit()은 작업을 등록하고 백그라운드 태스크로 ai_service 파이프라인을 실행한다.
+    작업 상태는 메모리에 보관하며, 종료 후 LIP_VIDEO_JOB_TTL_SECONDS가 지나면 정리한다.
+    """
+
+    def __init__(self, ttl_seconds: int = 3600):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, LipVideoJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, user_video_gs: str, gen_audio_gs: str, output_video_gs: str,
+               target_fps: int, callback_url: Optional[str] = None) -> LipVideoJob:
+        """작업 등록 후 즉시 반환 (이벤트 루프 안에서 호출)"""
+        self._purge_expired()
+        job = LipVideoJob(
+            job_id=uuid.uuid4().hex,
+            user_video_gs=user_video_gs,
+            gen_audio_gs=gen_audio_gs,
+            output_video_gs=output_video_gs,
+            target_fps=target_fps,
+            callback_url=callback_url,
+        )
+        self._jobs[job.job_id] = job
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+        logger.info(f"Lip video job submitted: {job.job_id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[LipVideoJob]:
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: LipVideoJob):
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        try:
+            result = await ai_service.process_lip_video_pipeline(
+                user_video_gs=job.user_video_gs,
+                gen_audio_gs=job.gen_audio_gs,
+                output_video_gs=job.output_video_gs,
+                target_fps=job.target_fps,
+                progress_callback=job.set_stage,
+            )
+            job.result_video_gs = result["result_video_gs"]
+            job.process_time_ms = result["process_time_ms"]
+            job.set_stage("done")
+            job.status = JOB_SUCCEEDED
+        except asyncio.CancelledError:
+            # 서버 종료 등으로 태스크가 취소된 경우: running으로 남지 않도록 실패 처리하고 콜백은 한 번만 시도
+            logger.warning(f"Lip video job cancelled: {job.job_id}")
+            job.error = "Job cancelled"
+            job.status = JOB_FAILED
+            job.finished_at = time.time()
+            if job.callback_url:
+                await self._send_callback(job, attempts=1)
+            raise
+        except Exception as e:
+            log_error(f"Lip video job failed: {job.job_id}", error=e)
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = job.finished_at or time.time()
+
+        if job.callback_url:
+            await self._send_callback(job)
+
+    async def _send_callback(self, job: LipVideoJob, attempts: Optional[int] = None):
+        """
+        완료 콜백 POST (실패 시 지수 백오프로 재시도, 최종 실패해도 작업 상태는 유지)
+
+        attempts: 최대 시도 횟수 (None이면 LIP_VIDEO_CALLBACK_RETRIES)
+        """
+        payload = job.to_dict()
+        timeout = aiohttp.ClientTimeout(total=settings.LIP_VIDEO_CALLBACK_TIMEOUT_SECONDS)
+        attempts = attempts or settings.LIP_VIDEO_CALLBACK_RETRIES
+        for attempt in range(1, attempts + 1):
+            try:
+                async with aiohttp.ClientSession(timeout=timeout) as session:
+                    async with session.post(job.callback_url, json=payload) as resp:
+                        if resp.status < 400:
+                            logger.info(f"Callback delivered for job {job.job_id} ({resp.status})")
+                            return
+                        logger.warning(f"Callback for job {job.job_id} returned {resp.status} (attempt {attempt})")
+            except Exception as e:
+                logger.warning(f"Callback for job {job.job_id} failed (attempt {attempt}): {e}")
+            if attempt < attempts:
+                await asyncio.sleep(2 ** (attempt - 1))
+        logger.error(f"Giving up callback for job {job.job_id}: {job.callback_url}")
+
+    def _purge_expired(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# 싱글톤 인스턴스
+lip_video_job_manager = LipVideoJobManager(ttl_seconds=settings.LIP_VIDEO_JOB_TTL_SECONDS)
@@ -2,12 +2,34 @@
 STT Service - Omnilingual ASR을 사용한 다국어 음성 인식
 """
 
+import asyncio
 import os
+import threading
 import time
 import tempfile
 from typing import Optional, List, Union, Dict
-from api.utils.gcs_client import gcs_client
+import numpy as np
+from api.utils.audio_decode import ASR_SAMPLE_RATE, decode_audio_bytes
+from api.utils.async_storage import storage
+from api.core.config import settings
 from api.core.logger import logger, log_step, log_success, log_error
+from api.service.stt_batcher import STTMicroBatcher
+from api.service.stt_cache import STTResultCache, file_digest, pcm_digest
+from api.service.stt_registry import STTModelRegistry
+
+
+# STT 결과 캐시 (오디오 digest + 모델 + 언어, 디스크에 유지되어 재시작 후에도 재사용)
+stt_result_cache: Optional[STTResultCache] = None
+if settings.STT_RESULT_CACHE_ENABLED:
+    try:
+        stt_result_cache = STTResultCache(
+            cache_dir=settings.STT_RESULT_CACHE_DIR,
+            ttl_seconds=settings.STT_RESULT_CACHE_TTL_SECONDS,
+            max_entries=settings.STT_RESULT_CACHE_MAX_ENTRIES,
+            max_bytes=settings.STT_RESULT_CACHE_MAX_MB * 1024 * 1024
+        )
+    except Exception as e:
+        logger.warning(f"STT result cache disabled: {e}")
 
 
 class STTService:
@@ -28,10 +50,20 @@ class STTService:
         Args:
             model_size: 모델 크기 (300M, 1B, 3B, 7B, 7B_ZS)
         """
-        self.gcs_client = gcs_client
+        self.storage = storage
         self.model_size = model_size
+        self.result_cache = stt_result_cache
         self.pipeline = None
+        self._pipeline_lock = threading.Lock()  # 배처/배치 엔드포인트의 transcribe 호출 직렬화
         self._initialize_pipeline()
+        # 단일 파일 요청을 모아 한 번의 transcribe로 실행하는 마이크로 배처
+        self.batcher: Optional[STTMicroBatcher] = None
+        if settings.STT_BATCHING_ENABLED:
+            self.batcher = STTMicroBatcher(
+                transcribe_fn=self._transcribe_inputs,
+                max_batch=settings.STT_MAX_BATCH,
+                max_wait_ms=settings.STT_MAX_WAIT_MS
+            )
     
     def _initialize_pipeline(self):
         """Omnilingual ASR 파이프라인 초기화 (Lazy Loading)"""
@@ -53,6 +85,36 @@ class STTService:
             log_error(f"Failed to initialize Omnilingual ASR pipeline: {e}")
             self.pipeline = None
     
+    def _transcribe_inputs(self, audio_inputs: List, langs: Optional[List[str]], batch_size: int) -> List[str]:
+        """
+        pipeline.transcribe 호출 (마이크로 배처 워커 / 배치 엔드포인트에서 스레드로 실행)
+        
+        audio_inputs 항목은 파일 경로 또는 {"waveform": 16kHz float32 배열, "sample_rate": 16000}
+        """
+        with self._pipeline_lock:
+            return self.pipeline.transcribe(audio_inputs, lang=langs, batch_size=batch_size)
+    
+    def warmup(self, batch_sizes: List[int], audio_seconds: float) -> Dict[str, float]:
+        """
+        합성 16kHz 오디오로 pipeline.transcribe 실행 (CUDA 커널 로드/autotune을 첫 요청 전에 완료)
+        
+        Returns:
+            dict: 배치 크기별 실행 시간 (ms)
+        """
+        if self.pipeline is None:
+            raise RuntimeError(f"STT pipeline not loaded: {self.model_size}")
+        
+        # 무음이면 디코더가 바로 끝나므로 약한 노이즈 사용
+        waveform = (np.random.randn(int(audio_seconds * ASR_SAMPLE_RATE)) * 0.01).astype(np.float32)
+        audio_input = {"waveform": waveform, "sample_rate": ASR_SAMPLE_RATE}
+        timings = {}
+        for batch_size in batch_sizes:
+            start = time.time()
+            self._transcribe_inputs([audio_input] * batch_size, None, batch_size)
+            timings[str(batch_size)] = (time.time() - start) * 1000
+            logger.info(f"STT warm-up {self.model_size} batch={batch_size}: {timings[str(batch_size)]:.0f}ms")
+        return timings
+    
     async def transcribe_single(
         self,
         audio_source: str,
@@ -72,7 +134,9 @@ class STTService:
                 "success": bool,
                 "transcription": str,
                 "language": str or None,
-                "process_time_ms": float
+                "process_time_ms": float,
+                "cache_hit": bool,
+                "cached_at": float or None
             }
         """
         start_time = time.time()
@@ -82,28 +146,42 @@ class STTService:
             if self.pipeline is None:
                 raise ValueError("Omnilingual ASR pipeline not initialized")
             
-            # 1. 오디오 파일 준비
+            # 1. 오디오 준비 (GCS: 메모리 다운로드 + 16kHz 디코딩, 큰 파일은 임시 파일)
             if is_gcs:
                 log_step(f"Downloading audio from GCS: {audio_source}")
-                temp_file = await self._download_audio_from_gcs(audio_source)
-                if not temp_file:
-                    raise ValueError("Failed to download audio from GCS")
-                audio_path = temp_file
-            else:
-                audio_path = audio_source
+            audio_input, temp_file = await self._prepare_audio_input(audio_source, is_gcs)
             
-            # 2. 음성 인식 실행
-            log_step(f"Running transcription (lang: {lang or 'auto'})")
-            transcriptions = self.pipeline.transcribe(
-                [audio_path],
-                lang=[lang] if lang else None,
-                batch_size=1
-            )
+            # 2. 결과 캐시 조회 (같은 오디오 + 모델 + 언어)
+            cache_key, cached = await self._lookup_cache(audio_input, temp_file, lang)
+            if cached is not None:
+                process_time_ms = (time.time() - start_time) * 1000
+                log_success(
+                    f"Transcription cache hit ({process_time_ms:.0f}ms)",
+                    text=cached["transcription"][:100]
+                )
+                return {
+                    "success": True,
+                    "transcription": cached["transcription"],
+                    "language": lang,
+                    "process_time_ms": process_time_ms,
+                    "cache_hit": True,
+                    "cached_at": cached["created_at"]
+                }
             
-            if not transcriptions or len(transcriptions) == 0:
-                raise ValueError("No transcription result")
-            
-            transcription = transcriptions[0]
+            # 3. 음성 인식 실행 (배처가 있으면 다른 요청과 묶어서 실행)
+            log_step(f"Running transcription (lang: {lang or 'auto'})")
+            if self.batcher is not None:
+                transcription = await self.batcher.transcribe(audio_input, lang)
+            else:
+                transcriptions = await asyncio.to_thread(
+                    self._transcribe_inputs, [audio_input], [lang] if lang else None, 1
+                )
+                
+                if not transcriptions or len(transcriptions) == 0:
+                    raise ValueError("No transcription result")
+                
+                transcription = transcriptions[0]
+            await self._store_cache(cache_key, transcription, lang)
             process_time_ms = (time.time() - start_time) * 1000
             
             log_success(
@@ -115,7 +193,9 @@ class STTService:
                 "success": True,
                 "transcription": transcription,
                 "language": lang,
-                "process_time_ms": process_time_ms
+                "process_time_ms": process_time_ms,
+                "cache_hit": False,
+                "cached_at": None
             }
             
         except Exception as e:
@@ -124,7 +204,9 @@ class STTService:
                 "success": False,
                 "transcription": "",
                 "language": None,
-                "process_time_ms": (time.time() - start_time) * 1000
+                "process_time_ms": (time.time() - start_time) * 1000,
+                "cache_hit": False,
+                "cached_at": None
             }
         
         finally:
@@ -146,17 +228,25 @@ class STTService:
         """
         배치 오디오 파일 음성 인식
         
+        - 다운로드는 STT_DOWNLOAD_CONCURRENCY개씩 동시에 진행
+        - batch_size개 단위 chunk의 다운로드가 끝나는 대로 인식 → 뒤 chunk 다운로드와 앞 chunk 인식이 겹침
+        - 파일별 실패(다운로드/인식)는 해당 항목만 실패로 표시 (chunk 인식이 실패하면 파일별로 재시도)
+        - 결과 캐시에 있는 파일은 인식하지 않음 (results[i].cache_hit)
+        
         Args:
             audio_sources: GCS 경로 또는 URL 리스트
+                (dict 항목은 {"audio_gs": ..., "lang": ...} 또는 {"audio_url": ..., "lang": ...})
             langs: 각 오디오에 대한 언어 코드 리스트 (None이면 자동 감지)
             batch_size: 배치 처리 크기
-            is_gcs: True이면 GCS에서 다운로드, False이면 URL 직접 사용
+            is_gcs: True이면 GCS에서 다운로드, False이면 URL 직접 사용 (문자열 항목 기준)
             
         Returns:
             dict: {
                 "success": bool,
-                "transcriptions": List[str],
+                "transcriptions": List[str] (실패 항목은 ""),
                 "languages": List[str] or None,
+                "results": List[dict] (파일별 success / transcription / error / cache_hit),
+                "failed_count": int,
                 "process_time_ms": float
             }
         """
@@ -166,42 +256,84 @@ class STTService:
         try:
             if self.pipeline is None:
                 raise ValueError("Omnilingual ASR pipeline not initialized")
+            if langs is not None and len(langs) != len(audio_sources):
+                raise ValueError(f"langs length {len(langs)} does not match audio_files length {len(audio_sources)}")
             
-            # 1. 오디오 파일 준비
-            audio_paths = []
-            for audio_source in audio_sources:
-                if is_gcs:
-                    log_step(f"Downloading audio from GCS: {audio_source}")
-                    temp_file = await self._download_audio_from_gcs(audio_source)
-                    if not temp_file:
-                        raise ValueError(f"Failed to download audio: {audio_source}")
-                    temp_files.append(temp_file)
-                    audio_paths.append(temp_file)
-                else:
-                    audio_paths.append(audio_source)
+            items = [self._batch_item(i, source, langs, is_gcs) for i, source in enumerate(audio_sources)]
             
-            # 2. 배치 음성 인식 실행
-            log_step(f"Running batch transcription ({len(audio_paths)} files, batch_size={batch_size})")
-            transcriptions = self.pipeline.transcribe(
-                audio_paths,
-                lang=langs if langs else None,
-                batch_size=batch_size
-            )
+            # 1. 전체 다운로드를 동시 실행 수 제한 하에 시작
+            semaphore = asyncio.Semaphore(max(1, settings.STT_DOWNLOAD_CONCURRENCY))
+            
+            async def prepare(item: Dict):
+                """다운로드 + 캐시 조회 (실패는 해당 항목의 error로 기록, 배치 전체를 실패시키지 않음)"""
+                if item["error"] is not None:
+                    return None
+                try:
+                    async with semaphore:
+                        audio_input, temp_file = await self._prepare_audio_input(item["source"], item["is_gcs"])
+                    if temp_file:
+                        temp_files.append(temp_file)
+                    item["cache_key"], cached = await self._lookup_cache(audio_input, temp_file, item["lang"])
+                except Exception as e:
+                    item["error"] = str(e)
+                    return None
+                if cached is not None:
+                    item["transcription"] = cached["transcription"]
+                    item["cache_hit"] = True
+                return audio_input
+            
+            downloads = [asyncio.create_task(prepare(item)) for item in items]
             
-            if not transcriptions:
-                raise ValueError("No transcription results")
+            # 2. chunk 단위로 다운로드 완료를 기다려 인식 (뒤 chunk 다운로드는 계속 진행)
+            log_step(f"Running batch transcription ({len(items)} files, batch_size={batch_size})")
+            try:
+                for chunk_start in range(0, len(items), batch_size):
+                    chunk = items[chunk_start:chunk_start + batch_size]
+                    inputs = await asyncio.gather(*downloads[chunk_start:chunk_start + batch_size])
+                    ready = []
+                    for item, audio_input in zip(chunk, inputs):
+                        if audio_input is not None and not item["cache_hit"]:
+                            item["input"] = audio_input
+                            ready.append(item)
+                    await self._transcribe_chunk(ready)
+                    for item in ready:
+                        if item["error"] is None:
+                            try:
+                                await self._store_cache(item["cache_key"], item["transcription"], item["lang"])
+                            except Exception as e:
+                                logger.warning(f"Failed to store STT cache for audio_files[{item['index']}]: {e}")
+            finally:
+                for task in downloads:
+                    task.cancel()
+                await asyncio.gather(*downloads, return_exceptions=True)
             
+            results = [
+                {
+                    "index": item["index"],
+                    "source": item["source"],
+                    "success": item["error"] is None,
+                    "transcription": item["transcription"] or "",
+                    "language": item["lang"],
+                    "error": item["error"],
+                    "cache_hit": item["cache_hit"],
+                }
+                for item in items
+            ]
+            failed_count = sum(1 for r in results if not r["success"])
             process_time_ms = (time.time() - start_time) * 1000
             
             log_success(
                 f"Batch transcription completed ({process_time_ms:.0f}ms)",
-                count=len(transcriptions)
+                count=len(results),
+                failed=failed_count
             )
             
             return {
-                "success": True,
-                "transcriptions": transcriptions,
-                "languages": langs,
+                "success": failed_count < len(results),
+                "transcriptions": [r["transcription"] for r in results],
+                "languages": [r["language"] for r in results] if any(r["language"] for r in results) else None,
+                "results": results,
+                "failed_count": failed_count,
                 "process_time_ms": process_time_ms
             }
             
@@ -211,6 +343,8 @@ class STTService:
                 "success": False,
                 "transcriptions": [],
                 "languages": None,
+                "results": [],
+                "failed_count": len(audio_sources),
                 "process_time_ms": (time.time() - start_time) * 1000
             }
         
@@ -227,6 +361,144 @@ class STTService:
             if cleaned_count > 0:
                 logger.debug(f"Cleaned up {cleaned_count} temporary files")
     
+    @staticmethod
+    def _batch_item(index: int, source: Union[str, Dict], langs: Optional[List[str]], is_gcs: bool) -> Dict:
+        """
+        배치 요청 항목 정규화 (문자열 경로 또는 {"audio_gs"/"audio_url", "lang"} dict)
+        
+        형식이 잘못된 항목은 error가 채워진 항목으로 반환 (해당 파일만 실패 처리)
+        """
+        lang = langs[index] if langs else None
+        error = None
+        if isinstance(source, dict):
+            lang = source.get("lang", lang)
+            if source.get("audio_gs"):
+                is_gcs, source = True, source["audio_gs"]
+            elif source.get("audio_url"):
+                is_gcs, source = False, source["audio_url"]
+            else:
+                error = f"audio_files[{index}] must have audio_gs or audio_url"
+        if not isinstance(source, str):
+            error = error or f"audio_files[{index}] must be a path string or an object"
+            source = str(source)
+        return {
+            "index": index,
+            "source": source,
+            "is_gcs": is_gcs,
+            "lang": lang,
+            "input": None,
+            "transcription": None,
+            "error": error,
+            "cache_key": None,
+            "cache_hit": False,
+        }
+    
+    async def _transcribe_chunk(self, items: List[Dict]):
+        """다운로드된 chunk 한 번에 인식 (실패 시 파일별로 재시도하여 실패 항목만 표시)"""
+        if not items:
+            return
+        langs = [item["lang"] for item in items]
+        langs = langs if any(langs) else None
+        try:
+            transcriptions = await asyncio.to_thread(
+                self._transcribe_inputs, [item["input"] for item in items], langs, len(items)
+            )
+            if not transcriptions or len(transcriptions) != len(items):
+                raise ValueError(f"Expected {len(items)} transcriptions, got {len(transcriptions) if transcriptions else 0}")
+            for item, text in zip(items, transcriptions):
+                item["transcription"] = text
+            return
+        except Exception as e:
+            if len(items) == 1:
+                items[0]["error"] = str(e)
+                return
+            logger.warning(f"Chunk transcription failed ({len(items)} files), retrying individually: {e}")
+        
+        for item in items:
+            try:
+                transcriptions = await asyncio.to_thread(
+                    self._transcribe_inputs, [item["input"]], [item["lang"]] if item["lang"] else None, 1
+                )
+                if not transcriptions:
+                    raise ValueError("No transcription result")
+                item["transcription"] = transcriptions[0]
+            except Exception as e:
+                item["error"] = str(e)
+    
+    async def _lookup_cache(self, audio_input, temp_file: Optional[str], lang: Optional[str]):
+        """
+        결과 캐시 조회 → (캐시 키 또는 None, 캐시 항목 또는 None)
+        
+        키는 메모리 디코딩한 오디오면 PCM digest, 임시 파일이면 파일 내용 digest.
+        URL 입력은 내용을 읽지 않으므로 캐시하지 않는다.
+        """
+        if self.result_cache is None:
+            return None, None
+        try:
+            if isinstance(audio_input, dict):
+                digest = pcm_digest(audio_input["waveform"])
+            elif temp_file:
+                digest = await asyncio.to_thread(file_digest, temp_file)
+            else:
+                return None, None
+            key = self.result_cache.make_key(digest, self.model_size, lang)
+            return key, await asyncio.to_thread(self.result_cache.get, key)
+        except Exception as e:
+            logger.warning(f"STT result cache lookup failed: {e}")
+            return None, None
+    
+    async def _store_cache(self, cache_key: Optional[str], transcription: str, lang: Optional[str]):
+        """인식 결과를 캐시에 저장 (실패해도 요청에는 영향 없음)"""
+        if self.result_cache is None or cache_key is None:
+            return
+        try:
+            await asyncio.to_thread(self.result_cache.put, cache_key, transcription, lang, self.model_size)
+        except Exception as e:
+            logger.warning(f"STT result cache store failed: {e}")
+    
+    async def _prepare_audio_input(self, audio_source: str, is_gcs: bool):
+        """
+        파이프라인 입력 준비 → (입력, 정리할 임시 파일 경로 또는 None)
+        
+        - URL: 그대로 전달
+        - GCS (STT_IN_MEMORY_AUDIO): 메모리로 다운로드 → 16kHz 배열 한 번 디코딩 → waveform dict
+          STT_IN_MEMORY_MAX_BYTES보다 큰 파일이나 메모리 디코딩 실패 시 기존처럼 임시 파일 경로
+        
+        Raises:
+            ValueError: 다운로드 실패
+        """
+        if not is_gcs:
+            return audio_source, None
+        
+        if settings.STT_IN_MEMORY_AUDIO:
+            limit = settings.STT_IN_MEMORY_MAX_BYTES
+            # limit + 1 바이트까지만 받아 limit 초과 여부 판단
+            data = await self.storage.download_bytes(audio_source, limit + 1)
+            if data is None:
+                raise ValueError(f"Failed to download audio: {audio_source}")
+            if len(data) <= limit:
+                try:
+                    waveform = await decode_audio_bytes(data, timeout=settings.MEDIA_TOOL_TIMEOUT_SECONDS)
+                    return {"waveform": waveform, "sample_rate": ASR_SAMPLE_RATE}, None
+                except Exception as e:
+                    logger.warning(f"In-memory audio decode failed, falling back to file: {audio_source} ({e})")
+                    temp_file = await asyncio.to_thread(self._write_temp_audio, audio_source, data)
+                    return temp_file, temp_file
+            logger.info(f"Audio larger than {limit} bytes, downloading to disk: {audio_source}")
+        
+        temp_file = await self._download_audio_from_gcs(audio_source)
+        if not temp_file:
+            raise ValueError(f"Failed to download audio: {audio_source}")
+        return temp_file, temp_file
+    
+    @staticmethod
+    def _write_temp_audio(gs_path: str, data: bytes) -> str:
+        """메모리로 받은 오디오를 임시 파일로 기록 (확장자 유지)"""
+        ext = os.path.splitext(gs_path)[1] or ".wav"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=ext, prefix="stt_audio_") as f:
+            f.write(data)
+            return f.name
+    
     async def _download_audio_from_gcs(self, gs_path: str) -> Optional[str]:
         """
         GCS에서 오디오 파일 다운로드
@@ -248,9 +520,10 @@ class STTService:
             temp_path = temp_file.name
             temp_file.close()
             
-            # GCS에서 다운로드
-            if not self.gcs_client.download_file(gs_path, temp_path):
+            # GCS에서 다운로드 (전송 스레드 풀, 큰 파일은 range 병렬)
+            if not await self.storage.download_file(gs_path, temp_path):
                 logger.error(f"Failed to download audio from GCS: {gs_path}")
+                os.unlink(temp_path)
                 return None
             
             logger.debug(f"Audio downloaded to: {temp_path}")
@@ -288,24 +561,65 @@ class STTService:
         return lang in supported
 
 
-# STT 서비스 인스턴스 (Lazy Loading)
-_stt_service: Optional[STTService] = None
+# STT 모델 레지스트리 (model_size별 파이프라인을 메모리 예산 안에서 유지, Lazy Loading)
+stt_registry = STTModelRegistry(
+    loader=STTService,
+    max_bytes=settings.STT_MODEL_MEMORY_BUDGET_MB * 1024 * 1024,
+    max_models=settings.STT_MAX_LOADED_MODELS,
+)
 
 
-def get_stt_service(model_size: str = "7B") -> STTService:
+async def get_stt_service(model_size: str = "7B") -> STTService:
     """
-    STT 서비스 싱글톤 인스턴스 조회
-    
+    model_size의 STT 서비스 조회
+
+    레지스트리에 올라간 모델은 그대로 재사용하고, 없으면 백그라운드 스레드에서 로드한다
+    (같은 모델의 동시 요청은 한 번의 로드를 함께 기다림, 예산 초과 시 LRU 모델 제거).
+
     Args:
         model_size: 모델 크기 (300M, 1B, 3B, 7B)
-        
+
     Returns:
         STTService: STT 서비스 인스턴스
     """
-    global _stt_service
-    
-    if _stt_service is None or _stt_service.model_size != model_size:
-        _stt_service = STTService(model_size=model_size)
+    return await stt_registry.get(model_size)
+
+
+async def warmup_stt_models() -> dict:
+    """
+    STT_WARMUP_MODEL_SIZES 모델을 레지스트리에 로드하고 합성 오디오로 warm-up
     
-    return _stt_service
+    배치 크기는 단일 요청(1)과 마이크로 배처 최대 크기(STT_MAX_BATCH).
+    """
+    batch_sizes = sorted({1, settings.STT_MAX_BATCH if settings.STT_BATCHING_ENABLED else 1})
+    results = {}
+    for model_size in settings.STT_WARMUP_MODEL_SIZES:
+        start = time.time()
+        service = await stt_registry.get(model_size)
+        load_ms = (time.time() - start) * 1000
+        transcribe_ms = await asyncio.to_thread(
+            service.warmup, batch_sizes, settings.STT_WARMUP_AUDIO_SECONDS
+        )
+        results[model_size] = {"load_ms": load_ms, "transcribe_ms": transcribe_ms}
+    return {"models": results}
+
+
+def get_stt_registry_metrics() -> dict:
+    """STT 모델 레지스트리 메트릭 (로드/제거/hit, 올라간 모델)"""
+    return stt_registry.metrics()
+
+
+def get_stt_result_cache_metrics() -> dict:
+    """STT 결과 캐시 메트릭 (hit/miss, 만료/제거, 사용량)"""
+    if stt_result_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **stt_result_cache.stats()}
+
 
+def get_stt_batcher_metrics() -> dict:
+    """올라간 모델별 마이크로 배처 메트릭"""
+    return {
+        model_size: service.batcher.metrics()
+        for model_size, service in stt_registry.loaded_services().items()
+        if service.batcher is not None
+    }
@@ -0,0 +1,172 @@
+"""
+STT 동적 마이크로 배치 - 단일 파일 요청을 짧은 시간 모아 언어별로 한 번의 pipeline.transcribe로 처리
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+from api.core.logger import logger
+
+
+class _PendingTranscription:
+    """배처 큐에 들어간 요청 한 건"""
+
+    __slots__ = ("audio_input", "lang", "future", "enqueued_at")
+
+    def __init__(self, audio_input, lang: Optional[str], future: asyncio.Future):
+        self.audio_input = audio_input
+        self.lang = lang
+        self.future = future
+        self.enqueued_at = time.time()
+
+
+class STTMicroBatcher:
+    """
+    STT 요청 간 마이크로 배처
+
+    각 요청은 transcribe()로 (오디오 입력, 언어)를 제출하고 결과를 기다린다.
+    워커 태스크는 첫 요청이 들어온 시점부터 max_wait_ms 동안(또는 max_batch개가 찰 때까지) 요청을 모은 뒤
+    언어별로 묶어 transcribe_fn(inputs, langs, batch_size)을 스레드에서 실행하고 결과를 요청별로 돌려준다.
+    묶음 실행이 실패하면 요청별로 한 번씩 다시 실행한다 (잘못된 파일 하나가 다른 요청을 실패시키지 않도록).
+    """
+
+    def __init__(
+        self,
+        transcribe_fn: Callable[[List, Optional[List[str]], int], List[str]],
+        max_batch: int = 8,
+        max_wait_ms: float = 200.0
+    ):
+        """
+        Args:
+            transcribe_fn: (audio_inputs, langs 또는 None, batch_size) -> 텍스트 리스트 (pipeline.transcribe 래핑)
+            max_batch: 한 번의 transcribe에 넣을 최대 파일 수
+            max_wait_ms: 첫 요청 도착 후 다른 요청을 기다리는 최대 시간 (ms)
+        """
+        self.transcribe_fn = transcribe_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self._batches_run = 0
+        self._requests_run = 0
+        self._fallbacks = 0
+        self._transcribe_time = 0.0
+        self._queue_wait_time = 0.0
+        self._max_queue_depth = 0
+
+    async def transcribe(self, audio_input, lang: Optional[str] = None) -> str:
+        """요청을 제출하고 해당 오디오의 인식 결과만 반환 (audio_input: 파일 경로 또는 waveform dict)"""
+        pending = _PendingTranscription(audio_input, lang, asyncio.get_running_loop().create_future())
+        self._ensure_worker()
+        self._queue.append(pending)
+        self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+        self._wakeup.set()
+        return await pending.future
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _collect(self) -> list:
+        """max_wait 동안 max_batch개까지 대기열에서 요청을 모음 (취소된 요청은 제외)"""
+        while not self._queue:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+        group = []
+        deadline = time.time() + self.max_wait
+        while len(group) < self.max_batch:
+            if self._queue:
+                pending = self._queue.popleft()
+                if not pending.future.done():
+                    group.append(pending)
+                continue
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+        return group
+
+    async def _run(self):
+        while True:
+            group = await self._collect()
+            if not group:
+                continue
+
+            # 같은 언어끼리 한 번의 transcribe (도착 순서 유지)
+            by_lang = {}
+            for pending in group:
+                by_lang.setdefault(pending.lang, []).append(pending)
+
+            for lang, members in by_lang.items():
+                await self._run_group(lang, members)
+
+    async def _run_group(self, lang: Optional[str], members: list):
+        started = time.time()
+        inputs = [p.audio_input for p in members]
+        langs = [lang] * len(members) if lang else None
+        try:
+            results = await asyncio.to_thread(self.transcribe_fn, inputs, langs, len(members))
+            if not results or len(results) != len(members):
+                raise ValueError(f"Expected {len(members)} transcriptions, got {len(results) if results else 0}")
+        except Exception as e:
+            if len(members) == 1:
+                self._set_exception(members[0], e)
+                results = None
+            else:
+                logger.warning(f"STT batch transcription failed ({len(members)} requests), retrying individually: {e}")
+                self._fallbacks += 1
+                results = []
+                for pending in members:
+                    try:
+                        single = await asyncio.to_thread(self.transcribe_fn, [pending.audio_input], [lang] if lang else None, 1)
+                        if not single:
+                            raise ValueError("No transcription result")
+                        results.append(single[0])
+                    except Exception as single_error:
+                        self._set_exception(pending, single_error)
+                        results.append(None)
+
+        elapsed = time.time() - started
+        self._batches_run += 1
+        self._requests_run += len(members)
+        self._transcribe_time += elapsed
+        self._queue_wait_time += sum(started - p.enqueued_at for p in members)
+
+        if results is None:
+            return
+        for pending, text in zip(members, results):
+            if text is not None and not pending.future.done():
+                pending.future.set_result(text)
+
+    @staticmethod
+    def _set_exception(pending: _PendingTranscription, error: Exception):
+        if not pending.future.done():
+            pending.future.set_exception(error)
+
+    def metrics(self) -> dict:
+        """큐 깊이 / 배치 크기 등 배처 메트릭"""
+        batches = self._batches_run
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self._max_queue_depth,
+            "batches_run": batches,
+            "requests_run": self._requests_run,
+            "avg_batch_size": (self._requests_run / batches) if batches else 0.0,
+            "fallbacks": self._fallbacks,
+            "avg_transcribe_ms": (self._transcribe_time / batches * 1000) if batches else 0.0,
+            "avg_queue_wait_ms": (self._queue_wait_time / self._requests_run * 1000) if self._requests_run else 0.0,
+        }
@@ -0,0 +1,95 @@
+"""
+STT 결과 캐시 - 같은 오디오(디코딩된 PCM digest) + 모델 + 언어의 인식 결과를 재사용
+
+재제출/세션 재시도로 같은 녹음이 다시 들어오면 ASR을 다시 돌리지 않는다.
+값은 cache_dir/<key>.json 으로 디스크에 저장되어 재시작 후에도 유지되고,
+TTL(생성 후 경과 시간)과 항목 수 / 총 바이트 한도(LRU)로 정리한다.
+"""
+
+import json
+import time
+from typing import Optional
+
+import numpy as np
+
+from api.utils.disk_lru import DiskLRUCache, new_hasher, param_key
+from api.utils.disk_lru import file_digest as _file_digest
+
+# 디코딩/전처리 방식이 바뀌면 올려서 이전 캐시를 무효화
+STT_CACHE_VERSION = 1
+
+
+def pcm_digest(waveform: np.ndarray) -> str:
+    """디코딩된 PCM 배열의 digest (컨테이너/파일명과 무관)"""
+    hasher = new_hasher()
+    hasher.update(np.ascontiguousarray(waveform, dtype=np.float32).tobytes())
+    return "pcm-" + hasher.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """파일 내용 digest (메모리 디코딩을 거치지 않은 큰 파일용)"""
+    return "file-" + _file_digest(path)
+
+
+class STTResultCache(DiskLRUCache):
+    """
+    디스크 기반 STT 결과 캐시 (TTL + LRU, 항목 수 / 총 바이트 제한)
+
+    항목은 {"transcription", "language", "model_size", "created_at"} JSON 한 개.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 50000, max_bytes: int = 64 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.expired = 0
+        super().__init__(cache_dir, ".json", max_entries=max_entries, max_bytes=max_bytes)
+
+    @staticmethod
+    def make_key(digest: str, model_size: str, lang: Optional[str]) -> str:
+        """캐시 키: 오디오 digest + 모델 크기 + 언어"""
+        return param_key(digest, "v{}|{}|{}".format(STT_CACHE_VERSION, model_size, lang or "auto"))
+
+    def get(self, key: str) -> Optional[dict]:
+        """캐시된 결과 dict 또는 None (만료/손상 항목은 삭제)"""
+        path = self._path(key)
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+                created_at = float(entry["created_at"])
+                if not isinstance(entry.get("transcription"), str):
+                    raise ValueError("missing transcription")
+            except (OSError, KeyError, ValueError, TypeError):
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            now = time.time()
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._remove(key)
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self._touch(key)
+            return entry
+
+    def put(self, key: str, transcription: str, language: Optional[str], model_size: str):
+        """결과 저장 (같은 키는 덮어씀)"""
+        entry = {
+            "transcription": transcription,
+            "language": language,
+            "model_size": model_size,
+            "created_at": time.time(),
+        }
+        tmp_path = self.temp_path(key)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        with self._lock:
+            self._install(key, tmp_path)
+
+    def _extra_stats(self) -> dict:
+        return {"ttl_seconds": self.ttl_seconds, "expired": self.expired}
@@ -0,0 +1,241 @@
+"""
+STT 모델 레지스트리 - 여러 크기의 Omnilingual ASR 파이프라인을 메모리 예산 안에서 동시에 유지 (LRU 제거)
+"""
+
+import asyncio
+import gc
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from api.core.logger import logger, log_step, log_success
+
+# 모델 크기별 파라미터 수 (메모리 추정용, 로드한 파이프라인의 파라미터 크기를 알 수 있으면 그 값을 사용)
+MODEL_PARAMS = {
+    "300M": 0.3e9,
+    "1B": 1.0e9,
+    "3B": 3.0e9,
+    "7B": 7.0e9,
+    "7B_ZS": 7.0e9,
+}
+BYTES_PER_PARAM = 2  # bf16/fp16 가중치
+
+
+def estimate_model_bytes(model_size: str) -> int:
+    """파라미터 수 기반 모델 메모리 추정치 (알 수 없는 크기는 7B로 간주)"""
+    return int(MODEL_PARAMS.get(model_size, MODEL_PARAMS["7B"]) * BYTES_PER_PARAM)
+
+
+def _pipeline_bytes(pipeline) -> Optional[int]:
+    """
+    로드된 파이프라인 모델의 파라미터 + 버퍼 크기 (알 수 없으면 None)
+
+    로드 전후 memory_allocated 차이는 다른 모델의 추론이 함께 돌면 흔들리므로 텐서 크기를 직접 합산한다.
+    """
+    model = getattr(pipeline, "model", None)
+    if model is None or not hasattr(model, "parameters"):
+        return None
+    tensors = list(model.parameters()) + list(model.buffers())
+    total = sum(t.numel() * t.element_size() for t in tensors)
+    return total or None
+
+
+def _release_memory():
+    """제거된 파이프라인의 GPU 메모리 반환"""
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+class _LoadedModel:
+    """레지스트리에 올라간 파이프라인 한 개"""
+
+    __slots__ = ("service", "size_bytes", "loaded_at", "last_used", "uses")
+
+    def __init__(self, service, size_bytes: int):
+        self.service = service
+        self.size_bytes = size_bytes
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.uses = 0
+
+
+class STTModelRegistry:
+    """
+    model_size별 STTService 레지스트리
+
+    - 이미 올라간 모델은 바로 반환 (LRU 순서 갱신)
+    - 없는 모델은 스레드에서 로드 (이벤트 루프 비차단). 같은 모델을 동시에 요청하면 한 번의 로드를 함께 기다림
+    - 서로 다른 모델의 로드는 한 번에 하나씩 (예산 계산이 섞이지 않도록)
+    - 로드 전에 추정 크기(estimate_model_bytes)만큼 자리를 비워, 교체 중에도 기존 모델과 새 모델이 함께 예산(max_bytes)을 넘지 않게 함
+      (가장 오래 안 쓴 모델부터 제거, 최대 개수 max_models도 함께 적용. 제거된 모델을 사용 중인 요청은 참조를 쥐고 있으므로
+      그대로 끝까지 실행되고, 이후 메모리가 반환됨)
+    - 로드 후에는 실제 크기로 다시 계산하여 추정보다 크면 추가로 제거
+    - 로드에 실패한 파이프라인과 혼자서 예산을 넘는 파이프라인은 캐시하지 않음 (해당 요청에만 사용)
+    """
+
+    def __init__(self, loader: Callable[[str], Any], max_bytes: int, max_models: int = 2):
+        """
+        Args:
+            loader: model_size -> STTService (로드 실패 시 pipeline이 None인 서비스)
+            max_bytes: 동시에 올려 둘 모델 메모리 예산
+            max_models: 동시에 올려 둘 최대 모델 수
+        """
+        self.loader = loader
+        self.max_bytes = max_bytes
+        self.max_models = max(1, max_models)
+        self._models: "OrderedDict[str, _LoadedModel]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._lock = asyncio.Lock()
+        self._load_lock = asyncio.Lock()
+        self._tasks = set()  # 진행 중인 로드 태스크 (GC 방지)
+
+        self.hits = 0
+        self.misses = 0
+        self.shared_loads = 0  # 진행 중인 로드를 기다린 요청 수 (single-flight)
+        self.loads = 0
+        self.load_failures = 0
+        self.over_budget = 0  # 예산보다 커서 캐시하지 않은 로드 수
+        self.load_time_total = 0.0
+        self.evictions = 0
+
+    @property
+    def used_bytes(self) -> int:
+        return sum(m.size_bytes for m in self._models.values())
+
+    async def get(self, model_size: str):
+        """model_size 파이프라인 반환 (없으면 로드, 동시 로드는 한 번만)"""
+        async with self._lock:
+            entry = self._models.get(model_size)
+            if entry is not None:
+                self._models.move_to_end(model_size)
+                entry.last_used = time.time()
+                entry.uses += 1
+                self.hits += 1
+                return entry.service
+
+            future = self._loading.get(model_size)
+            if future is None:
+                self.misses += 1
+                future = asyncio.get_running_loop().create_future()
+                self._loading[model_size] = future
+                task = asyncio.create_task(self._load(model_size, future))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            else:
+                self.shared_loads += 1
+
+        # 요청이 취소되어도 로드 자체는 계속 진행되도록 shield
+        return await asyncio.shield(future)
+
+    def prefetch(self, model_size: str):
+        """백그라운드 로드 시작 (결과를 기다리지 않음)"""
+        task = asyncio.create_task(self.get(model_size))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _load(self, model_size: str, future: asyncio.Future):
+        try:
+            async with self._load_lock:
+                log_step(f"Loading STT model into registry: {model_size}")
+                estimated_bytes = estimate_model_bytes(model_size)
+                async with self._lock:
+                    # 로드 중 최대 사용량이 예산을 넘지 않도록 미리 자리를 비움 (추정치가 예산보다 크면 모두 제거)
+                    self._evict_for(min(estimated_bytes, self.max_bytes))
+                start = time.time()
+                service = await asyncio.to_thread(self.loader, model_size)
+                load_time = time.time() - start
+
+                if service.pipeline is None:
+                    # 실패한 파이프라인은 기존처럼 요청에 돌려주되 캐시하지 않음 (기존 모델도 그대로 유지)
+                    self.load_failures += 1
+                    future.set_result(service)
+                    return
+
+                size_bytes = _pipeline_bytes(service.pipeline) or estimate_model_bytes(model_size)
+                if size_bytes > self.max_bytes:
+                    # 다른 모델을 모두 내려도 예산을 넘으므로 이번 요청에만 사용하고 캐시하지 않음
+                    self.over_budget += 1
+                    logger.error(
+                        f"STT model {model_size} exceeds memory budget "
+                        f"({size_bytes / 1024 / 1024:.0f}MB > {self.max_bytes / 1024 / 1024:.0f}MB), not caching"
+                    )
+                    future.set_result(service)
+                    return
+
+                async with self._lock:
+                    # 실제 크기가 추정보다 크면 추가로 제거
+                    self._evict_for(size_bytes)
+                    entry = _LoadedModel(service, size_bytes)
+                    entry.uses = 1
+                    self._models[model_size] = entry
+            self.loads += 1
+            self.load_time_total += load_time
+            log_success(
+                f"STT model loaded: {model_size} ({load_time:.1f}s)",
+                size_mb=round(size_bytes / 1024 / 1024),
+                loaded=list(self._models.keys()),
+            )
+            future.set_result(service)
+        except BaseException as e:
+            self.load_failures += 1
+            if not future.done():
+                future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self._loading.pop(model_size, None)
+
+    def _evict_for(self, incoming_bytes: int):
+        """incoming_bytes를 올릴 자리가 생길 때까지 LRU 제거 (self._lock 안에서 호출)"""
+        evicted = False
+        while self._models and (
+            len(self._models) >= self.max_models
+            or self.used_bytes + incoming_bytes > self.max_bytes
+        ):
+            model_size, entry = self._models.popitem(last=False)
+            self.evictions += 1
+            evicted = True
+            logger.info(
+                f"Evicting STT model {model_size} "
+                f"(idle {time.time() - entry.last_used:.0f}s, {entry.size_bytes / 1024 / 1024:.0f}MB)"
+            )
+            del entry
+        if evicted:
+            _release_memory()
+
+    def loaded_services(self) -> dict:
+        """현재 올라간 model_size -> 서비스 (LRU 순서)"""
+        return {model_size: entry.service for model_size, entry in self._models.items()}
+
+    def metrics(self) -> dict:
+        """로드/제거/hit 카운터와 현재 올라간 모델"""
+        lookups = self.hits + self.misses + self.shared_loads
+        return {
+            "loaded": [
+                {
+                    "model_size": model_size,
+                    "size_mb": round(entry.size_bytes / 1024 / 1024, 1),
+                    "uses": entry.uses,
+                    "idle_seconds": round(time.time() - entry.last_used, 1),
+                }
+                for model_size, entry in self._models.items()
+            ],
+            "loading": list(self._loading.keys()),
+            "used_mb": round(self.used_bytes / 1024 / 1024, 1),
+            "max_mb": round(self.max_bytes / 1024 / 1024, 1),
+            "max_models": self.max_models,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_loads": self.shared_loads,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "loads": self.loads,
+            "load_failures": self.load_failures,
+            "over_budget": self.over_budget,
+            "avg_load_seconds": (self.load_time_total / self.loads) if self.loads else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,100 @@
+"""
+서버 시작 warm-up - 합성 입력으로 모델을 미리 실행하여 첫 요청의 컴파일/autotune/지연 로드 비용을 없앰
+
+단계(Wav2Lip forward, 얼굴 감지, STT 등)를 등록해 두면 시작 시 순서대로 실행하고
+단계별 소요 시간을 기록한다. 모든 단계가 끝나기 전까지 /ready는 503을 반환하여
+로드밸런서가 cold 인스턴스로 트래픽을 보내지 않게 한다.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from api.core.logger import logger, log_step, log_success, log_error
+
+WARMUP_PENDING = "pending"
+WARMUP_RUNNING = "running"
+WARMUP_READY = "ready"
+WARMUP_DEGRADED = "degraded"  # 일부 단계 실패 (해당 모델은 첫 요청에서 기존처럼 지연 초기화)
+
+
+class WarmupTracker:
+    """warm-up 단계 실행 및 readiness 상태"""
+
+    def __init__(self):
+        self._steps: List[Tuple[str, Callable[[], Awaitable[Optional[dict]]]]] = []
+        self._results: Dict[str, dict] = {}
+        self.status = WARMUP_PENDING
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, step: Callable[[], Awaitable[Optional[dict]]]):
+        """warm-up 단계 등록 (step은 세부 정보 dict 또는 None을 반환하는 코루틴 함수)"""
+        self._steps.append((name, step))
+        self._results[name] = {"status": WARMUP_PENDING}
+
+    @property
+    def ready(self) -> bool:
+        return self.status in (WARMUP_READY, WARMUP_DEGRADED)
+
+    def mark_ready(self):
+        """warm-up 없이 바로 ready (WARMUP_ENABLED=False)"""
+        self.status = WARMUP_READY
+
+    def start(self) -> asyncio.Task:
+        """백그라운드로 warm-up 시작 (/health 등은 warm-up 중에도 응답)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def run(self):
+        self.status = WARMUP_RUNNING
+        self.started_at = time.time()
+        failed = False
+
+        for name, step in self._steps:
+            log_step(f"Warm-up: {name}")
+            self._results[name] = {"status": WARMUP_RUNNING}
+            start = time.time()
+            try:
+                details = await step()
+                self._results[name] = {
+                    "status": WARMUP_READY,
+                    "time_ms": (time.time() - start) * 1000,
+                    **(details or {}),
+                }
+                log_success(f"Warm-up {name} completed ({time.time() - start:.2f}s)")
+            except Exception as e:
+                failed = True
+                self._results[name] = {
+                    "status": "failed",
+                    "time_ms": (time.time() - start) * 1000,
+                    "error": str(e),
+                }
+                log_error(f"Warm-up {name} failed", error=e)
+
+        self.finished_at = time.time()
+        self.status = WARMUP_DEGRADED if failed else WARMUP_READY
+
+        logger.info("=" * 60)
+        logger.info("Warm-up Analysis:")
+        for name, result in self._results.items():
+            logger.info(f"  {name:<24} {result.get('time_ms', 0) / 1000:>7.2f}s  {result['status']}")
+        logger.info(f"  Total:                   {self.finished_at - self.started_at:>7.2f}s  {self.status}")
+        logger.info("=" * 60)
+
+    def report(self) -> dict:
+        """readiness 상태와 단계별 warm-up 시간"""
+        total_ms = None
+        if self.started_at is not None:
+            total_ms = ((self.finished_at or time.time()) - self.started_at) * 1000
+        return {
+            "ready": self.ready,
+            "status": self.status,
+            "total_time_ms": total_ms,
+            "steps": dict(self._results),
+        }
+
+
+warmup_tracker = WarmupTracker()
@@ -0,0 +1,173 @@
+"""
+Wav2Lip GPU 배치 스케줄러 - 여러 요청의 배치를 모아 한 번의 forward로 처리
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import numpy as np
+
+from api.core.logger import logger
+
+
+class _PendingBatch:
+    """스케줄러 큐에 들어간 요청 한 건의 배치"""
+
+    __slots__ = ("img_batch", "mel_batch", "future", "enqueued_at")
+
+    def __init__(self, img_batch: np.ndarray, mel_batch: np.ndarray):
+        self.img_batch = img_batch
+        self.mel_batch = mel_batch
+        self.future: Future = Future()
+        self.enqueued_at = time.time()
+
+    def __len__(self):
+        return len(self.img_batch)
+
+
+class Wav2LipBatchScheduler:
+    """
+    요청 간 배치 스케줄러
+
+    각 요청의 inference 스레드는 predict()로 자기 배치(얼굴 crop + mel chunk)를 제출하고 결과를 기다린다.
+    워커 스레드는 첫 배치가 들어온 시점부터 max_wait_ms 동안(또는 max_batch 프레임이 찰 때까지)
+    다른 요청의 배치를 모아 하나의 Wav2Lip.forward로 실행한 뒤, 결과를 요청별로 잘라 돌려준다.
+    묶음 실행이 실패하면 요청별로 한 번씩 다시 실행하여 실패한 요청에만 오류를 돌려준다.
+    짧은 단어 클립처럼 배치를 다 채우지 못하는 요청이 동시에 여러 개 들어올 때 GPU 활용률이 올라간다.
+    """
+
+    def __init__(
+        self,
+        forward_fn: Callable[[np.ndarray, np.ndarray], np.ndarray],
+        max_batch: int,
+        max_wait_ms: float = 20.0
+    ):
+        """
+        Args:
+            forward_fn: (img_batch, mel_batch) -> pred 배열 (wav2lip_inference.predict_batch 래핑)
+            max_batch: 한 번의 forward에 넣을 최대 프레임 수
+            max_wait_ms: 첫 배치 도착 후 다른 요청을 기다리는 최대 시간 (ms)
+        """
+        self.forward_fn = forward_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+        # 메트릭
+        self._batches_run = 0
+        self._frames_run = 0
+        self._requests_run = 0
+        self._fallbacks = 0
+        self._forward_time = 0.0
+        self._queue_wait_time = 0.0
+        self._max_queue_depth = 0
+
+    def predict(self, img_batch: np.ndarray, mel_batch: np.ndarray) -> np.ndarray:
+        """배치를 제출하고 해당 요청의 예측 결과만 반환 (블로킹, inference 스레드에서 호출)"""
+        pending = _PendingBatch(img_batch, mel_batch)
+        with self._cond:
+            self._ensure_worker()
+            self._queue.append(pending)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            self._cond.notify()
+        return pending.future.result()
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="wav2lip-batch-scheduler", daemon=True)
+            self._worker.start()
+
+    def _collect(self) -> list:
+        """max_wait 동안 max_batch 프레임까지 대기열에서 배치를 모음 (락 보유 상태에서 호출)"""
+        while not self._queue:
+            self._cond.wait()
+
+        group = [self._queue.popleft()]
+        frames = len(group[0])
+        deadline = time.time() + self.max_wait
+
+        while frames < self.max_batch:
+            if self._queue:
+                # 다음 배치가 들어가지 않으면 다음 forward로 넘김 (배치를 쪼개지 않음)
+                if frames + len(self._queue[0]) > self.max_batch:
+                    break
+                pending = self._queue.popleft()
+                group.append(pending)
+                frames += len(pending)
+                continue
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            self._cond.wait(timeout=remaining)
+        return group
+
+    def _run(self):
+        while True:
+            with self._cond:
+                group = self._collect()
+
+            started = time.time()
+            try:
+                if len(group) == 1:
+                    preds = [self.forward_fn(group[0].img_batch, group[0].mel_batch)]
+                else:
+                    img_batch = np.concatenate([p.img_batch for p in group], axis=0)
+                    mel_batch = np.concatenate([p.mel_batch for p in group], axis=0)
+                    pred = self.forward_fn(img_batch, mel_batch)
+                    if len(pred) != len(img_batch):
+                        raise ValueError(f"Expected {len(img_batch)} predictions, got {len(pred)}")
+                    splits = np.cumsum([len(p) for p in group])[:-1]
+                    preds = np.split(pred, splits, axis=0)
+            except Exception as e:
+                if len(group) == 1:
+                    logger.error(f"Wav2Lip batch forward failed: {e}")
+                    group[0].future.set_exception(e)
+                    continue
+                # 잘못된 배치 하나가 같이 묶인 다른 요청을 실패시키지 않도록 요청별로 다시 실행
+                logger.warning(f"Wav2Lip merged forward failed ({len(group)} requests), retrying individually: {e}")
+                self._fallbacks += 1
+                preds = []
+                for pending in group:
+                    try:
+                        preds.append(self.forward_fn(pending.img_batch, pending.mel_batch))
+                    except Exception as single_error:
+                        logger.error(f"Wav2Lip batch forward failed: {single_error}")
+                        pending.future.set_exception(single_error)
+                        preds.append(None)
+
+            elapsed = time.time() - started
+            with self._cond:
+                self._batches_run += 1
+                self._frames_run += sum(len(p) for p in group)
+                self._requests_run += len(group)
+                self._forward_time += elapsed
+                self._queue_wait_time += sum(started - p.enqueued_at for p in group)
+
+            for pending, pred in zip(group, preds):
+                if pred is not None:
+                    pending.future.set_result(pred)
+
+    def metrics(self) -> dict:
+        """큐 깊이 / 배치 채움률 등 스케줄러 메트릭"""
+        with self._cond:
+            batches = self._batches_run
+            return {
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+                "queue_depth": len(self._queue),
+                "queue_depth_frames": sum(len(p) for p in self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "batches_run": batches,
+                "frames_run": self._frames_run,
+                "avg_batch_fill": (self._frames_run / (batches * self.max_batch)) if batches else 0.0,
+                "avg_requests_per_batch": (self._requests_run / batches) if batches else 0.0,
+                "fallbacks": self._fallbacks,
+                "avg_forward_ms": (self._forward_time / batches * 1000) if batches else 0.0,
+                "avg_queue_wait_ms": (self._queue_wait_time / self._requests_run * 1000) if self._requests_run else 0.0,
+            }
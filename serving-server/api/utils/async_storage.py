@@ -0,0 +1,259 @@
+"""
+비동기 스토리지 계층 - 블로킹 GCS 클라이언트 호출을 전용 스레드 풀에서 실행
+
+- 모든 전송은 크기 제한된 스레드 풀(STORAGE_MAX_WORKERS)에서 실행되어 이벤트 루프를 막지 않고,
+  GCS 클라이언트는 같은 크기의 HTTP 커넥션 풀을 재사용한다.
+- STORAGE_PARALLEL_THRESHOLD_MB 이상 파일은 STORAGE_CHUNK_MB 단위 range 요청을 병렬로 받아
+  미리 할당한 파일의 해당 위치에 기록한다 (단일 스트림 처리량 한계 회피).
+- 미디어 캐시가 있으면 (경로, generation) 단위로 로컬 디스크에서 먼저 찾는다.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from api.core.config import settings
+from api.core.logger import logger
+from api.utils.gcs_client import gcs_client
+from api.utils.media_cache import MediaCache
+
+
+class AsyncStorage:
+    """GCSClient / LocalStorageClient의 비동기 래퍼 (전송 스레드 풀 + 병렬 range 다운로드)"""
+
+    def __init__(
+        self,
+        client,
+        max_workers: int = 16,
+        parallel_threshold: int = 32 * 1024 * 1024,
+        chunk_size: int = 8 * 1024 * 1024,
+        upload_chunk_size: int = 8 * 1024 * 1024,
+        cache: Optional[MediaCache] = None
+    ):
+        """
+        Args:
+            client: download_file / download_bytes / upload_file / get_object_info / download_range 를 제공하는 동기 클라이언트
+            max_workers: 전송 스레드 수 (요청 간 공유)
+            parallel_threshold: 이 크기 이상이면 range 병렬 다운로드
+            chunk_size: range 요청 한 개의 크기
+            upload_chunk_size: 스트리밍(resumable) 업로드 요청 한 개의 크기 (256KB 배수)
+            cache: 로컬 미디어 캐시 (None이면 항상 GCS에서 받음)
+        """
+        self.client = client
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = max(1, chunk_size)
+        self.upload_chunk_size = upload_chunk_size
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage")
+
+        # 메트릭
+        self._downloads = 0
+        self._parallel_downloads = 0
+        self._uploads = 0
+        self._streaming_uploads = 0
+        self._failures = 0
+        self._bytes_downloaded = 0
+        self._download_time = 0.0
+        self._upload_time = 0.0
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def download_file(self, gs_path: str, local_path: str) -> bool:
+        """GCS 파일을 local_path로 다운로드 (미디어 캐시 우선, 큰 파일은 range 병렬)"""
+        info = await self._run(self.client.get_object_info, gs_path)
+        if info is None:
+            logger.error(f"File not found or inaccessible: {gs_path}")
+            self._failures += 1
+            return False
+
+        if self.cache is not None and self.cache.admits(info["size"]):
+            cached = await self._cached(
+                gs_path, info, lambda tmp_path: self._fetch_file(gs_path, tmp_path, info["size"])
+            )
+            if cached is not None and await self._run(self.cache.materialize, cached, local_path):
+                return True
+
+        return await self._fetch_file(gs_path, local_path, info["size"])
+
+    async def _fetch_file(self, gs_path: str, local_path: str, size: Optional[int]) -> bool:
+        """GCS에서 실제로 받음 (size 이상이면 range 병렬)"""
+        start = time.time()
+        if size is not None and size >= self.parallel_threshold:
+            ok = await self._download_parallel(gs_path, local_path, size)
+            self._parallel_downloads += int(ok)
+        else:
+            ok = await self._run(self.client.download_file, gs_path, local_path)
+            if ok and size is None:
+                size = os.path.getsize(local_path)
+
+        if not ok:
+            self._failures += 1
+            return False
+        self._downloads += 1
+        self._bytes_downloaded += size or 0
+        self._download_time += time.time() - start
+        return True
+
+    async def _cached(self, gs_path: str, info: dict, fetch) -> Optional[str]:
+        """
+        미디어 캐시 경로 (hit 또는 이번에 채움). 실패 시 None
+        
+        같은 객체를 동시에 요청하면 한 요청만 fetch(임시 경로)로 받고 나머지는 그 결과를 기다린다.
+        """
+        key = self.cache.make_key(gs_path, info["generation"])
+        path = self.cache.lookup(key)
+        if path is not None:
+            return path
+
+        future, owner = self.cache.claim(key)
+        if not owner:
+            return await asyncio.wrap_future(future)
+
+        path = None
+        tmp_path = self.cache.temp_path(key)
+        try:
+            if await fetch(tmp_path):
+                path = await self._run(self.cache.commit, key, tmp_path)
+        except Exception as e:
+            logger.warning(f"Media cache fill failed for {gs_path}: {e}")
+        finally:
+            if path is None:
+                self.cache.discard_temp(tmp_path)
+            self.cache.release(key, future, path)
+        return path
+
+    async def _download_parallel(self, gs_path: str, local_path: str, size: int) -> bool:
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        with open(local_path, "wb") as f:
+            f.truncate(size)
+
+        ranges = [(offset, min(offset + self.chunk_size, size) - 1) for offset in range(0, size, self.chunk_size)]
+        results = await asyncio.gather(
+            *[self._run(self._download_chunk, gs_path, local_path, begin, end) for begin, end in ranges],
+            return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            logger.error(f"Parallel download failed for {gs_path} ({len(errors)}/{len(ranges)} chunks): {errors[0]}")
+            try:
+                os.unlink(local_path)
+            except OSError:
+                pass
+            return False
+
+        logger.info(f"Downloaded {gs_path} to {local_path} ({size} bytes, {len(ranges)} parallel ranges)")
+        return True
+
+    def _download_chunk(self, gs_path: str, local_path: str, begin: int, end: int):
+        """[begin, end] 구간을 받아 파일의 같은 위치에 기록 (전송 스레드에서 실행)"""
+        data = self.client.download_range(gs_path, begin, end)
+        if len(data) != end - begin + 1:
+            raise IOError(f"Short range read {begin}-{end}: {len(data)} bytes")
+        fd = os.open(local_path, os.O_WRONLY)
+        try:
+            os.pwrite(fd, data, begin)
+        finally:
+            os.close(fd)
+
+    async def download_bytes(self, gs_path: str, limit: Optional[int] = None) -> Optional[bytes]:
+        """GCS 파일을 메모리로 다운로드 (limit 지정 시 앞에서부터 limit 바이트까지, limit 이하 객체는 미디어 캐시 사용)"""
+        if self.cache is not None:
+            info = await self._run(self.client.get_object_info, gs_path)
+            if info is not None and self.cache.admits(info["size"]) and (limit is None or info["size"] <= limit):
+                async def fetch(tmp_path: str) -> bool:
+                    data = await self._fetch_bytes(gs_path, None)
+                    if data is None:
+                        return False
+                    await self._run(_write_file, tmp_path, data)
+                    return True
+
+                cached = await self._cached(gs_path, info, fetch)
+                if cached is not None:
+                    data = await self._run(_read_file, cached)
+                    if data is not None:
+                        return data
+
+        return await self._fetch_bytes(gs_path, limit)
+
+    async def _fetch_bytes(self, gs_path: str, limit: Optional[int]) -> Optional[bytes]:
+        start = time.time()
+        data = await self._run(self.client.download_bytes, gs_path, limit)
+        if data is None:
+            self._failures += 1
+            return None
+        self._downloads += 1
+        self._bytes_downloaded += len(data)
+        self._download_time += time.time() - start
+        return data
+
+    async def upload_file(self, local_path: str, gs_path: str) -> bool:
+        """로컬 파일을 GCS에 업로드"""
+        start = time.time()
+        ok = await self._run(self.client.upload_file, local_path, gs_path)
+        if not ok:
+            self._failures += 1
+            return False
+        self._uploads += 1
+        self._upload_time += time.time() - start
+        return True
+
+    def open_upload(self, gs_path: str, content_type: str = "video/mp4"):
+        """
+        스트리밍 업로드 객체 (write(bytes) / close() / abort(), 동기 - 인코더 스레드에서 사용)
+        
+        인코더가 출력을 내는 동안 청크를 바로 보내 인코딩 완료 후 업로드 단계를 없앤다.
+        """
+        self._streaming_uploads += 1
+        return self.client.open_upload(gs_path, content_type, self.upload_chunk_size)
+
+    def metrics(self) -> dict:
+        """다운로드/업로드 횟수, 병렬 다운로드 수, 평균 처리량, 미디어 캐시 hit/miss"""
+        return {
+            "downloads": self._downloads,
+            "parallel_downloads": self._parallel_downloads,
+            "uploads": self._uploads,
+            "streaming_uploads": self._streaming_uploads,
+            "failures": self._failures,
+            "bytes_downloaded": self._bytes_downloaded,
+            "avg_download_mbps": (
+                self._bytes_downloaded / self._download_time / (1024 * 1024) if self._download_time else 0.0
+            ),
+            "avg_upload_ms": (self._upload_time / self._uploads * 1000) if self._uploads else 0.0,
+            "media_cache": {"enabled": True, **self.cache.stats()} if self.cache is not None else {"enabled": False},
+        }
+
+
+def _write_file(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read_file(path: str) -> Optional[bytes]:
+    """캐시 파일 읽기 (그 사이 LRU로 삭제됐으면 None)"""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+# 로컬 미디어 캐시 (GCS 경로 + generation, 재시도/재제출 시 다운로드 생략)
+media_cache: Optional[MediaCache] = None
+if settings.MEDIA_CACHE_ENABLED:
+    try:
+        media_cache = MediaCache(settings.MEDIA_CACHE_DIR, max_bytes=settings.MEDIA_CACHE_MAX_MB * 1024 * 1024)
+    except OSError as e:
+        logger.warning(f"Media cache disabled: {e}")
+
+# 전역 비동기 스토리지 인스턴스 (전송 스레드 풀 / 커넥션 풀 / 미디어 캐시 공유)
+storage = AsyncStorage(
+    gcs_client,
+    max_workers=settings.STORAGE_MAX_WORKERS,
+    parallel_threshold=settings.STORAGE_PARALLEL_THRESHOLD_MB * 1024 * 1024,
+    chunk_size=settings.STORAGE_CHUNK_MB * 1024 * 1024,
+    upload_chunk_size=settings.STORAGE_UPLOAD_CHUNK_MB * 1024 * 1024,
+    cache=media_cache
+)
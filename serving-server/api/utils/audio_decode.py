@@ -0,0 +1,59 @@
+"""
+메모리 내 오디오 디코딩 - 바이트를 한 번에 16kHz mono float32 배열로 변환 (임시 파일 없이)
+
+- wav/flac/ogg 등 libsndfile이 읽는 형식: soundfile로 디코딩 후 soxr 리샘플 (스레드에서 실행)
+- 그 외(mp3/m4a/webm 등): ffmpeg에 stdin으로 넘겨 f32le 16kHz mono로 받음
+"""
+
+import asyncio
+import io
+from typing import Optional
+
+import numpy as np
+
+from api.utils import media_tools
+
+ASR_SAMPLE_RATE = 16000
+
+
+def _decode_soundfile(data: bytes, sample_rate: int) -> np.ndarray:
+    import soundfile as sf
+    import soxr
+
+    wav, sr = sf.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    wav = wav.mean(axis=1) if wav.shape[1] > 1 else wav[:, 0]
+    if sr != sample_rate:
+        wav = soxr.resample(wav, sr, sample_rate)
+    return np.ascontiguousarray(wav, dtype=np.float32)
+
+
+async def _decode_ffmpeg(data: bytes, sample_rate: int, timeout: Optional[float]) -> np.ndarray:
+    result = await media_tools.run_checked([
+        "ffmpeg", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "f32le", "-ac", "1", "-ar", str(sample_rate),
+        "pipe:1",
+    ], timeout, input=data)
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+async def decode_audio_bytes(
+    data: bytes,
+    sample_rate: int = ASR_SAMPLE_RATE,
+    timeout: Optional[float] = None
+) -> np.ndarray:
+    """
+    오디오 바이트 → sample_rate mono float32 배열
+
+    Raises:
+        media_tools.MediaToolError: soundfile/ffmpeg 모두 디코딩하지 못한 경우
+        ValueError: 디코딩 결과가 비어 있는 경우
+    """
+    try:
+        wav = await asyncio.to_thread(_decode_soundfile, data, sample_rate)
+    except Exception:
+        # libsndfile이 모르는 컨테이너/코덱은 ffmpeg로
+        wav = await _decode_ffmpeg(data, sample_rate, timeout)
+    if wav.size == 0:
+        raise ValueError("Decoded audio is empty")
+    return wav
@@ -0,0 +1,178 @@
+"""
+디스크 LRU 캐시 공통 부분 - 얼굴 박스 캐시 / STT 결과 캐시 / 미디어 캐시가 함께 사용
+
+- 내용 digest (xxhash가 없으면 blake2b) 와 파라미터 해시를 붙인 캐시 키
+- cache_dir/<key><suffix> 파일 한 개가 항목 한 개, 임시 파일에 쓴 뒤 os.replace로 넣어 부분 파일이 보이지 않음
+- 마지막 사용 시각은 파일 mtime으로 유지하여 재시작 시 LRU 순서를 복원
+- 항목 수 / 총 바이트 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+try:
+    import xxhash
+    _HASHER = xxhash.xxh3_128
+except ImportError:  # xxhash 미설치 환경
+    _HASHER = hashlib.blake2b
+
+_DIGEST_CHUNK_SIZE = 4 * 1024 * 1024
+# temp_path()가 만드는 임시 파일 이름 (<key>.<uuid hex>.tmp)
+_TEMP_NAME = re.compile(r"^.+\.[0-9a-f]{32}\.tmp$")
+# 이보다 오래된 임시 파일만 시작 시 정리 (같은 디렉토리를 쓰는 다른 워커가 쓰는 중인 파일은 유지)
+STALE_TEMP_SECONDS = 3600
+
+
+def new_hasher():
+    """내용 digest용 hasher"""
+    return _HASHER()
+
+
+def file_digest(path: str) -> str:
+    """파일 내용 digest (경로/파일명과 무관)"""
+    hasher = _HASHER()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_DIGEST_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def param_key(digest: str, params: str) -> str:
+    """캐시 키: 내용 digest + 결과에 영향을 주는 파라미터 문자열의 해시"""
+    return "{}_{}".format(digest, hashlib.sha1(params.encode()).hexdigest()[:12])
+
+
+class DiskLRUCache:
+    """
+    디스크 기반 LRU 캐시 (항목 수 / 총 바이트 제한)
+
+    하위 클래스는 값의 직렬화만 구현한다. 인덱스 조작(_install / _touch / _remove)은 self._lock을 잡고 호출한다.
+    """
+
+    def __init__(self, cache_dir: str, suffix: str, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리
+            suffix: 항목 파일 확장자 (".npz" 등)
+            max_entries: 최대 항목 수 (None이면 제한 없음)
+            max_bytes: 최대 총 바이트 (None이면 제한 없음)
+        """
+        self.cache_dir = cache_dir
+        self.suffix = suffix
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, list] = {}  # key -> [last_used, size_bytes]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_index()
+
+    def _load_index(self):
+        """재시작 시 기존 캐시 파일을 인덱스로 복원 (이 캐시가 남긴 오래된 임시 파일만 삭제)"""
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if _TEMP_NAME.match(name):
+                if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            elif name.endswith(self.suffix):
+                self._index[name[:-len(self.suffix)]] = [stat.st_mtime, stat.st_size]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.suffix)
+
+    def temp_path(self, key: str) -> str:
+        """key 항목을 쓸 임시 파일 경로 (호출마다 다름)"""
+        return os.path.join(self.cache_dir, f"{key}.{uuid.uuid4().hex}.tmp")
+
+    @staticmethod
+    def discard_temp(tmp_path: str):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _, size in self._index.values())
+
+    def _touch(self, key: str):
+        """hit 처리: 마지막 사용 시각 갱신 (mtime에도 기록)"""
+        self.hits += 1
+        now = time.time()
+        self._index[key][0] = now
+        try:
+            os.utime(self._path(key), (now, now))
+        except OSError:
+            pass
+
+    def _install(self, key: str, tmp_path: str, keep: Optional[str] = None) -> str:
+        """임시 파일을 항목으로 넣고 한도를 넘으면 LRU 삭제 (keep 항목은 삭제하지 않음) → 항목 경로"""
+        path = self._path(key)
+        os.replace(tmp_path, path)
+        self._index[key] = [time.time(), os.path.getsize(path)]
+        self._evict(keep)
+        return path
+
+    def _remove(self, key: str):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _over_limit(self, total_bytes: int) -> bool:
+        return (
+            (self.max_entries is not None and len(self._index) > self.max_entries)
+            or (self.max_bytes is not None and total_bytes > self.max_bytes)
+        )
+
+    def _evict(self, keep: Optional[str] = None):
+        """LRU 삭제: 항목 수 / 총 바이트가 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        total_bytes = self.total_bytes
+        if not self._over_limit(total_bytes):
+            return
+        for key in sorted(self._index, key=lambda k: self._index[k][0]):
+            if not self._over_limit(total_bytes):
+                break
+            if key == keep:
+                continue
+            total_bytes -= self._index[key][1]
+            self._remove(key)
+            self.evictions += 1
+
+    def _extra_stats(self) -> dict:
+        """하위 클래스별 추가 통계 (self._lock 안에서 호출)"""
+        return {}
+
+    def stats(self) -> dict:
+        """hit/miss 카운터와 현재 사용량"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "entries": len(self._index),
+                "bytes": self.total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+            stats.update(self._extra_stats())
+            return stats
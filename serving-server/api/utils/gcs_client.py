@@ -1,4 +1,7 @@
 import os
+import shutil
+from typing import Optional
+import requests
 from google.cloud import storage
 from google.cloud.exceptions import NotFound
 from api.core.config import settings
@@ -20,12 +23,22 @@ class GCSClient:
             
             self.client = storage.Client(project=settings.GCP_PROJECT_ID)
             self.bucket = self.client.bucket(settings.GCS_BUCKET)
+            self._configure_connection_pool(settings.STORAGE_MAX_WORKERS)
             logger.info(f"GCS client initialized for bucket: {settings.GCS_BUCKET}")
             
         except Exception as e:
             logger.error(f"Failed to initialize GCS client: {e}")
             raise
 
+    def _configure_connection_pool(self, pool_size: int):
+        """전송 스레드 수만큼 HTTP 커넥션을 유지 (기본 풀 10개를 넘는 동시 전송은 매번 새로 연결됨)"""
+        try:
+            from requests.adapters import HTTPAdapter
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.client._http.mount("https://", adapter)
+        except Exception as e:
+            logger.warning(f"Could not configure GCS connection pool: {e}")
+
     def download_file(self, gs_path: str, local_path: str) -> bool:
         """
         GCS에서 파일 다운로드
@@ -56,6 +69,62 @@ class GCSClient:
             logger.error(f"Failed to download {gs_path}: {e}")
             return False
     
+    def download_bytes(self, gs_path: str, limit: Optional[int] = None) -> Optional[bytes]:
+        """
+        GCS 파일을 메모리로 다운로드
+        
+        Args:
+            gs_path: GCS 경로 (gs://bucket/path/to/file)
+            limit: 지정 시 앞에서부터 limit 바이트까지만 다운로드
+                (호출 측은 limit보다 큰 파일인지 len(data) == limit으로 판단)
+            
+        Returns:
+            bytes: 파일 내용 또는 None (실패 시)
+        """
+        try:
+            blob_name = self._extract_blob_name(gs_path)
+            blob = self.bucket.blob(blob_name)
+            
+            if limit is not None:
+                data = blob.download_as_bytes(start=0, end=limit - 1)
+            else:
+                data = blob.download_as_bytes()
+            logger.info(f"Downloaded {gs_path} into memory ({len(data)} bytes)")
+            return data
+            
+        except NotFound:
+            logger.error(f"File not found in GCS: {gs_path}")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to download {gs_path}: {e}")
+            return None
+    
+    def get_object_info(self, gs_path: str) -> Optional[dict]:
+        """
+        GCS 객체 크기 / generation (로컬 미디어 캐시 키용)
+        
+        Returns:
+            dict: {"size": int, "generation": str} 또는 None (없거나 실패 시)
+        """
+        try:
+            blob = self.bucket.get_blob(self._extract_blob_name(gs_path))
+            if blob is None:
+                return None
+            return {"size": blob.size, "generation": str(blob.generation or blob.etag)}
+        except Exception as e:
+            logger.error(f"Failed to get metadata of {gs_path}: {e}")
+            return None
+    
+    def download_range(self, gs_path: str, start: int, end: int) -> bytes:
+        """
+        GCS 파일의 [start, end] 바이트 구간 다운로드 (end 포함, 병렬 range 다운로드용)
+        
+        Raises:
+            NotFound 등 google.cloud 예외 (호출 측에서 처리)
+        """
+        blob = self.bucket.blob(self._extract_blob_name(gs_path))
+        return blob.download_as_bytes(start=start, end=end)
+    
     def upload_file(self, local_path: str, gs_path: str) -> bool:
         """
         로컬 파일을 GCS에 업로드
@@ -80,6 +149,18 @@ class GCSClient:
             logger.error(f"Failed to upload {local_path} to {gs_path}: {e}")
             return False
     
+    def open_upload(self, gs_path: str, content_type: str = "video/mp4", chunk_size: int = 8 * 1024 * 1024) -> "GCSStreamingUpload":
+        """
+        청크 단위로 기록하는 resumable 업로드 열기 (인코딩 중 스트리밍 업로드용)
+        
+        Args:
+            gs_path: GCS 업로드 경로
+            content_type: 객체 Content-Type
+            chunk_size: resumable 업로드 요청 한 번의 크기 (256KB 배수)
+        """
+        blob = self.bucket.blob(self._extract_blob_name(gs_path))
+        return GCSStreamingUpload(blob, gs_path, content_type, chunk_size)
+    
     def _extract_blob_name(self, gs_path: str) -> str:
         """
         gs://bucket/path/to/file에서 path/to/file 추출
@@ -100,5 +181,182 @@ class GCSClient:
         return gs_path
 
 
+class GCSStreamingUpload:
+    """
+    resumable 업로드 세션에 청크를 순서대로 기록 (write → close로 완료, abort로 취소)
+    
+    세션은 blob.create_resumable_upload_session으로 만들고, 청크는 세션 URI에 Content-Range PUT으로 보낸다
+    (세션 URI 자체가 업로드 권한이므로 인증 헤더가 필요 없음).
+    객체는 close()에서 마지막 청크를 보낼 때 생성되므로, abort()하면 부분 객체가 남지 않는다.
+    """
+    
+    CHUNK_ALIGNMENT = 256 * 1024  # 마지막이 아닌 청크는 256KB 배수여야 함
+    REQUEST_TIMEOUT_SECONDS = 60
+    
+    def __init__(self, blob, gs_path: str, content_type: str, chunk_size: int):
+        self.gs_path = gs_path
+        self.bytes_written = 0
+        self.chunk_size = max(self.CHUNK_ALIGNMENT, chunk_size // self.CHUNK_ALIGNMENT * self.CHUNK_ALIGNMENT)
+        self._session_url = blob.create_resumable_upload_session(content_type=content_type)
+        self._http = requests.Session()
+        self._buffer = bytearray()
+        self._offset = 0  # 서버에 저장된 바이트 수
+        self._finished = False
+    
+    def _put(self, chunk: bytes, final: bool) -> int:
+        """청크 한 개 전송 → 서버가 저장한 바이트 수 (마지막이 아닌 청크는 일부만 저장될 수 있음)"""
+        total = str(self._offset + len(chunk)) if final else "*"
+        if chunk:
+            content_range = f"bytes {self._offset}-{self._offset + len(chunk) - 1}/{total}"
+        else:
+            content_range = f"bytes */{total}"
+        response = self._http.put(
+            self._session_url,
+            data=chunk,
+            headers={"Content-Range": content_range},
+            timeout=self.REQUEST_TIMEOUT_SECONDS,
+        )
+        if final:
+            if response.status_code not in (200, 201):
+                raise RuntimeError(f"Failed to finalize upload {self.gs_path} ({response.status_code}): {response.text[:200]}")
+            return len(chunk)
+        if response.status_code != 308:
+            raise RuntimeError(f"Failed to upload chunk to {self.gs_path} ({response.status_code}): {response.text[:200]}")
+        # Range: bytes=0-N (저장된 마지막 바이트), 없으면 아직 저장된 바이트 없음
+        received = response.headers.get("Range")
+        persisted = int(received.rsplit("-", 1)[1]) + 1 if received else 0
+        sent = persisted - self._offset
+        if sent <= 0:
+            raise RuntimeError(f"Upload of {self.gs_path} made no progress at offset {self._offset}")
+        self._offset = persisted
+        return sent
+    
+    def write(self, data: bytes):
+        self._buffer += data
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.chunk_size:
+            sent = self._put(bytes(self._buffer[:self.chunk_size]), final=False)
+            del self._buffer[:sent]
+    
+    def close(self):
+        """마지막 청크 전송 후 객체 생성"""
+        if self._finished:
+            return
+        self._put(bytes(self._buffer), final=True)
+        self._buffer.clear()
+        self._finished = True
+        self._http.close()
+        logger.info(f"Streaming upload completed: {self.gs_path} ({self.bytes_written} bytes)")
+    
+    def abort(self):
+        """업로드 세션 취소 (세션 URI에 DELETE, 실패해도 완료하지 않은 세션은 객체를 만들지 않고 만료됨)"""
+        if self._finished:
+            return
+        self._finished = True
+        try:
+            self._http.delete(self._session_url, timeout=self.REQUEST_TIMEOUT_SECONDS)
+        except requests.RequestException as e:
+            logger.warning(f"Failed to cancel resumable upload session for {self.gs_path}: {e}")
+        finally:
+            self._http.close()
+        logger.info(f"Streaming upload aborted: {self.gs_path} ({self.bytes_written} bytes written)")
+
+
+class LocalStorageClient:
+    """
+    로컬 디렉토리 기반 GCS 대체 클라이언트 (오프라인 벤치마크/테스트용)
+    
+    gs://bucket/path/to/file → root/bucket/path/to/file. GCSClient와 같은 메서드를 제공한다.
+    """
+    
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        logger.info(f"Local storage backend: {root}")
+    
+    def _local_path(self, gs_path: str) -> str:
+        path = gs_path[len("gs://"):] if gs_path.startswith("gs://") else f"{settings.GCS_BUCKET}/{gs_path}"
+        return os.path.join(self.root, path)
+    
+    def download_file(self, gs_path: str, local_path: str) -> bool:
+        src = self._local_path(gs_path)
+        if not os.path.exists(src):
+            logger.error(f"File not found in local storage: {gs_path}")
+            return False
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        shutil.copyfile(src, local_path)
+        return True
+    
+    def download_bytes(self, gs_path: str, limit: Optional[int] = None) -> Optional[bytes]:
+        try:
+            with open(self._local_path(gs_path), "rb") as f:
+                return f.read() if limit is None else f.read(limit)
+        except OSError as e:
+            logger.error(f"Failed to read {gs_path} from local storage: {e}")
+            return None
+    
+    def get_object_info(self, gs_path: str) -> Optional[dict]:
+        try:
+            stat = os.stat(self._local_path(gs_path))
+        except OSError:
+            return None
+        return {"size": stat.st_size, "generation": f"{stat.st_mtime_ns}-{stat.st_size}"}
+    
+    def download_range(self, gs_path: str, start: int, end: int) -> bytes:
+        with open(self._local_path(gs_path), "rb") as f:
+            f.seek(start)
+            return f.read(end - start + 1)
+    
+    def open_upload(self, gs_path: str, content_type: str = "video/mp4", chunk_size: int = 8 * 1024 * 1024) -> "LocalStreamingUpload":
+        return LocalStreamingUpload(self._local_path(gs_path))
+    
+    def upload_file(self, local_path: str, gs_path: str) -> bool:
+        try:
+            dst = self._local_path(gs_path)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copyfile(local_path, dst)
+            return True
+        except OSError as e:
+            logger.error(f"Failed to upload {local_path} to local storage {gs_path}: {e}")
+            return False
+
+
+class LocalStreamingUpload:
+    """로컬 스토리지용 스트리밍 업로드 (.part 파일에 기록 → close 시 이름 변경, abort 시 삭제)"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.bytes_written = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._part_path = path + ".part"
+        self._file = open(self._part_path, "wb")
+    
+    def write(self, data: bytes):
+        self._file.write(data)
+        self.bytes_written += len(data)
+    
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        os.replace(self._part_path, self.path)
+    
+    def abort(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        try:
+            os.remove(self._part_path)
+        except OSError:
+            pass
+
+
+def _create_storage_client():
+    """STORAGE_BACKEND에 따라 GCS 또는 로컬 디렉토리 클라이언트 생성"""
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageClient(settings.STORAGE_LOCAL_ROOT)
+    return GCSClient()
+
+
 # 전역 GCS 클라이언트 인스턴스
-gcs_client = GCSClient()
+gcs_client = _create_storage_client()
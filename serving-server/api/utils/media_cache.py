@@ -0,0 +1,104 @@
+"""
+로컬 미디어 캐시 - GCS 객체(경로 + generation)를 서빙 노드 디스크에 보관
+
+재시도/재제출/subprocess fallback 등으로 같은 사용자 영상·가이드 오디오를 다시 받을 때 다운로드를 생략한다.
+키는 gs 경로와 객체 generation이므로 같은 경로에 새 파일이 올라가면 자동으로 다른 항목이 된다.
+바이트 한도를 넘으면 마지막 사용 시각 기준 LRU로 삭제하고, 같은 객체를 동시에 요청하면 한 요청만 받고
+나머지는 그 결과를 기다린다 (claim / release).
+"""
+
+import hashlib
+import os
+import shutil
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from api.utils.disk_lru import DiskLRUCache
+
+
+class MediaCache(DiskLRUCache):
+    """
+    디스크 기반 GCS 객체 캐시 (LRU, 총 바이트 제한, 동시 채우기 단일화)
+
+    항목은 cache_dir/<key>.bin 이고, 임시 파일에 받은 뒤 os.replace로 넣으므로 부분 파일이 보이지 않는다.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 10 * 1024 * 1024 * 1024):
+        self._filling: Dict[str, Future] = {}  # key -> 채우는 중인 요청의 결과 (캐시 경로 또는 None)
+        self.coalesced = 0  # 다른 요청이 채우는 것을 기다려 받은 횟수
+        super().__init__(cache_dir, ".bin", max_bytes=max_bytes)
+
+    @staticmethod
+    def make_key(gs_path: str, generation: str) -> str:
+        """캐시 키: gs 경로 + 객체 generation"""
+        return hashlib.sha1(f"{gs_path}#{generation}".encode()).hexdigest()
+
+    def admits(self, size: Optional[int]) -> bool:
+        """캐시에 넣을 수 있는 크기인지 (크기를 모르거나 한도보다 크면 캐시하지 않음)"""
+        return size is not None and size <= self.max_bytes
+
+    def lookup(self, key: str) -> Optional[str]:
+        """캐시 파일 경로 또는 None (hit이면 마지막 사용 시각 갱신)"""
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._touch(key)
+            return self._path(key)
+
+    def claim(self, key: str) -> Tuple[Future, bool]:
+        """
+        채우기 권한 확보 → (future, owner)
+
+        owner=True면 호출 측이 temp_path(key)에 받아 commit → release 해야 하고,
+        False면 이미 채우는 요청이 있으므로 future 결과(캐시 경로 또는 None)를 기다린다.
+        """
+        with self._lock:
+            future = self._filling.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            if key in self._index:
+                # lookup 이후 다른 요청이 채움
+                future = Future()
+                future.set_result(self._path(key))
+                return future, False
+            future = Future()
+            self._filling[key] = future
+            return future, True
+
+    def commit(self, key: str, tmp_path: str) -> Optional[str]:
+        """받은 임시 파일을 캐시에 넣고 캐시 경로 반환 (한도 초과 시 LRU 삭제)"""
+        try:
+            size = os.path.getsize(tmp_path)
+        except OSError:
+            return None
+        if not self.admits(size):
+            os.remove(tmp_path)
+            return None
+        with self._lock:
+            return self._install(key, tmp_path, keep=key)
+
+    def release(self, key: str, future: Future, path: Optional[str]):
+        """채우기 종료 (기다리던 요청에 결과 전달)"""
+        with self._lock:
+            self._filling.pop(key, None)
+        if not future.done():
+            future.set_result(path)
+
+    @staticmethod
+    def materialize(cache_path: str, local_path: str) -> bool:
+        """
+        캐시 파일을 요청 작업 경로로 복사. 그 사이 삭제됐으면 False
+
+        hard link는 작업 디렉토리에서 파일을 수정하면 캐시 항목까지 바뀌므로 쓰지 않는다.
+        """
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        try:
+            shutil.copyfile(cache_path, local_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _extra_stats(self) -> dict:
+        return {"coalesced": self.coalesced, "filling": len(self._filling)}
@@ -0,0 +1,342 @@
+"""
+비동기 ffmpeg / ffprobe 실행 유틸리티
+
+asyncio.create_subprocess_exec로 실행하므로 인코딩/프로브 중에도 이벤트 루프(/health 등)가 멈추지 않는다.
+- timeout 초과 시 프로세스를 종료하고 MediaToolTimeout
+- 호출한 task가 취소되면 프로세스를 종료하고 CancelledError를 그대로 전파
+- 워커 스레드(run_wav2lip_inference 등)에서는 thread_runner()로 메인 루프에 위임
+- 프레임을 stdin으로 흘려보내는 인코더처럼 오래 사는 프로세스는 open_pipe() / thread_pipe_opener()
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from api.core.logger import logger
+
+
+class MediaToolError(Exception):
+    """ffmpeg/ffprobe 실행 실패 (종료 코드와 stderr 포함)"""
+
+    def __init__(self, message: str, returncode: Optional[int] = None, stderr: str = ""):
+        super().__init__(f"{message}: {stderr}" if stderr else message)
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+class MediaToolTimeout(MediaToolError):
+    """ffmpeg/ffprobe 실행 시간 초과"""
+
+
+@dataclass
+class CommandResult:
+    returncode: int
+    stdout: bytes
+    stderr: bytes
+
+
+@dataclass
+class MediaProbe:
+    """ffprobe 한 번으로 얻은 영상 정보 (값을 얻지 못한 항목은 None)"""
+    width: int
+    height: int
+    fps: Optional[float] = None
+    bitrate: Optional[int] = None  # bps
+    duration: Optional[float] = None  # 초
+
+    @property
+    def resolution(self) -> str:
+        """"widthxheight" 형식 (예: "1280x720")"""
+        return f"{self.width}x{self.height}"
+
+    @property
+    def bitrate_k(self) -> Optional[str]:
+        """ffmpeg -b:v 형식의 비트레이트 (예: "5000k")"""
+        if not self.bitrate:
+            return None
+        return f"{self.bitrate // 1000}k"
+
+
+async def _terminate(proc: asyncio.subprocess.Process):
+    """프로세스 강제 종료 후 회수 (이미 종료된 경우 무시)"""
+    if proc.returncode is not None:
+        return
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        return
+    await proc.wait()
+
+
+async def run_command(
+    cmd: List[str],
+    timeout: Optional[float] = None,
+    cwd: Optional[str] = None,
+    input: Optional[bytes] = None
+) -> CommandResult:
+    """
+    명령을 비동기로 실행하고 stdout/stderr를 모아 반환 (종료 코드는 검사하지 않음)
+
+    input이 주어지면 stdin으로 전달한다 (예: 메모리의 오디오를 ffmpeg pipe:0으로 디코딩).
+
+    Raises:
+        MediaToolTimeout: timeout 초 안에 끝나지 않은 경우 (프로세스는 종료됨)
+        asyncio.CancelledError: 호출 task가 취소된 경우 (프로세스는 종료됨)
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(input), timeout)
+    except asyncio.TimeoutError:
+        await _terminate(proc)
+        raise MediaToolTimeout(f"{cmd[0]} timed out after {timeout}s")
+    except asyncio.CancelledError:
+        await _terminate(proc)
+        raise
+    return CommandResult(proc.returncode, stdout, stderr)
+
+
+async def run_checked(
+    cmd: List[str],
+    timeout: Optional[float] = None,
+    cwd: Optional[str] = None,
+    input: Optional[bytes] = None
+) -> CommandResult:
+    """run_command + 종료 코드 검사 (0이 아니면 MediaToolError)"""
+    result = await run_command(cmd, timeout, cwd, input)
+    if result.returncode != 0:
+        raise MediaToolError(
+            f"{cmd[0]} exited with code {result.returncode}",
+            returncode=result.returncode,
+            stderr=result.stderr.decode(errors="replace").strip(),
+        )
+    return result
+
+
+async def run_ffmpeg(args: List[str], timeout: Optional[float] = None) -> CommandResult:
+    """ffmpeg -y -loglevel error <args> 실행 (실패 시 MediaToolError)"""
+    return await run_checked(["ffmpeg", "-y", "-loglevel", "error", *args], timeout)
+
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """ffprobe 프레임률 문자열("30000/1001", "18/1") → float"""
+    if not rate or rate == "0/0":
+        return None
+    num, _, den = rate.partition("/")
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _parse_number(value, cast):
+    try:
+        return cast(value) if value not in (None, "", "N/A") else None
+    except ValueError:
+        return None
+
+
+async def probe_video(path: str, timeout: Optional[float] = None) -> MediaProbe:
+    """
+    ffprobe JSON 한 번으로 해상도/비트레이트/fps/길이를 함께 조회
+
+    비트레이트는 영상 스트림 값만 사용한다 (webm 등 스트림 값이 없으면 None → 인코딩은 CRF/QP 모드).
+    길이는 스트림 값이 없으면 컨테이너 값을 사용한다.
+
+    Raises:
+        MediaToolError: ffprobe 실패 또는 영상 스트림이 없는 경우
+    """
+    result = await run_checked([
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=width,height,avg_frame_rate,r_frame_rate,bit_rate,duration:format=duration",
+        "-of", "json",
+        path,
+    ], timeout)
+    info = json.loads(result.stdout or b"{}")
+    streams = info.get("streams") or []
+    if not streams:
+        raise MediaToolError(f"No video stream found: {path}")
+    stream, fmt = streams[0], info.get("format") or {}
+
+    probe = MediaProbe(
+        width=int(stream["width"]),
+        height=int(stream["height"]),
+        fps=_parse_rate(stream.get("avg_frame_rate")) or _parse_rate(stream.get("r_frame_rate")),
+        bitrate=_parse_number(stream.get("bit_rate"), int),
+        duration=_parse_number(stream.get("duration"), float) or _parse_number(fmt.get("duration"), float),
+    )
+    logger.info(
+        f"Probed {path}: {probe.resolution}, fps={probe.fps}, "
+        f"bitrate={probe.bitrate_k}, duration={probe.duration}"
+    )
+    return probe
+
+
+def thread_runner(loop: asyncio.AbstractEventLoop, timeout: Optional[float] = None) -> Callable[[List[str]], None]:
+    """
+    워커 스레드용 동기 실행 함수 생성
+
+    반환된 run(cmd)는 명령을 loop에서 run_checked로 실행하고 끝날 때까지 블록한다.
+    (asyncio.to_thread 안의 Wav2Lip 파이프라인이 ffmpeg를 직접 띄우지 않도록 메인 루프에 위임)
+    """
+    def run(cmd: List[str]) -> None:
+        asyncio.run_coroutine_threadsafe(run_checked(cmd, timeout), loop).result()
+    return run
+
+
+class PipeProcess:
+    """
+    stdin(과 stdout) 파이프로 데이터를 주고받는 프로세스 (프레임을 흘려보내는 ffmpeg 인코더 등)
+
+    - stderr는 백그라운드 task가 계속 읽어 파이프 버퍼가 차서 멈추는 일이 없게 한다.
+    - timeout 초 안에 끝나지 않으면 프로세스를 종료하고 wait()에서 MediaToolTimeout
+    - 감시 task가 취소되면 (이벤트 루프 종료 등) 프로세스를 종료
+    """
+
+    def __init__(self, cmd: List[str], proc: asyncio.subprocess.Process, timeout: Optional[float]):
+        self.cmd = cmd
+        self.proc = proc
+        self.timeout = timeout
+        self.timed_out = False
+        self._stderr = bytearray()
+        self._stderr_task = asyncio.ensure_future(self._drain_stderr())
+        self._watchdog = asyncio.ensure_future(self._watch())
+
+    async def _drain_stderr(self):
+        while True:
+            chunk = await self.proc.stderr.read(65536)
+            if not chunk:
+                return
+            self._stderr += chunk
+
+    async def _watch(self):
+        try:
+            await asyncio.wait_for(self.proc.wait(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out = True
+            logger.warning(f"{self.cmd[0]} timed out after {self.timeout}s, terminating")
+            await _terminate(self.proc)
+        except asyncio.CancelledError:
+            await _terminate(self.proc)
+            raise
+
+    async def write(self, data) -> None:
+        """stdin에 기록 (프로세스가 이미 종료되었으면 BrokenPipeError)"""
+        # 다차원 버퍼(numpy 프레임의 memoryview)도 바이트 단위로 다루도록 1차원으로 변환
+        data = memoryview(data).cast("B")
+        try:
+            self.proc.stdin.write(data)
+            await self.proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise BrokenPipeError(f"{self.cmd[0]} stdin closed: {e}") from e
+
+    async def read(self, size: int) -> bytes:
+        """stdout에서 지금 읽을 수 있는 만큼 (최대 size 바이트) 읽음 (EOF면 b"")"""
+        return await self.proc.stdout.read(size)
+
+    async def close_stdin(self) -> None:
+        """stdin을 닫아 입력 끝을 알림 (프로세스가 이미 종료되었으면 무시)"""
+        self.proc.stdin.close()
+        try:
+            await self.proc.stdin.wait_closed()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    async def wait(self) -> int:
+        """
+        종료까지 대기 → 종료 코드
+
+        Raises:
+            MediaToolTimeout: timeout 초과로 종료된 경우
+        """
+        await self._watchdog
+        await self._stderr_task
+        if self.timed_out:
+            raise MediaToolTimeout(
+                f"{self.cmd[0]} timed out after {self.timeout}s",
+                returncode=self.proc.returncode,
+                stderr=self.error_output(),
+            )
+        return self.proc.returncode
+
+    async def kill(self) -> None:
+        """
+        강제 종료 신호만 보냄 (회수는 wait())
+
+        asyncio는 stdout을 끝까지 읽은 뒤에야 종료를 알리므로, stdout을 읽는 스레드에서도 막히지 않게 기다리지 않는다.
+        """
+        try:
+            self.proc.kill()
+        except ProcessLookupError:
+            pass
+
+    def error_output(self) -> str:
+        return self._stderr.decode(errors="replace").strip()
+
+
+async def open_pipe(cmd: List[str], timeout: Optional[float] = None, read_stdout: bool = False) -> PipeProcess:
+    """
+    stdin 파이프를 연 채로 명령 실행 (read_stdout이면 stdout도 파이프, 아니면 버림)
+
+    종료 코드는 검사하지 않는다 (wait()의 반환값을 호출한 쪽이 확인).
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE if read_stdout else asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    return PipeProcess(cmd, proc, timeout)
+
+
+class ThreadPipe:
+    """PipeProcess의 동기 facade (워커 스레드용, 각 호출을 loop에서 실행하고 끝날 때까지 블록)"""
+
+    def __init__(self, pipe: PipeProcess, loop: asyncio.AbstractEventLoop):
+        self._pipe = pipe
+        self._loop = loop
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def write(self, data) -> None:
+        self._call(self._pipe.write(data))
+
+    def read(self, size: int) -> bytes:
+        return self._call(self._pipe.read(size))
+
+    def close_stdin(self) -> None:
+        self._call(self._pipe.close_stdin())
+
+    def wait(self) -> int:
+        return self._call(self._pipe.wait())
+
+    def kill(self) -> None:
+        self._call(self._pipe.kill())
+
+    def error_output(self) -> str:
+        return self._pipe.error_output()
+
+
+def thread_pipe_opener(
+    loop: asyncio.AbstractEventLoop,
+    timeout: Optional[float] = None
+) -> Callable[..., ThreadPipe]:
+    """
+    워커 스레드용 파이프 프로세스 실행 함수 생성
+
+    반환된 open(cmd, read_stdout=False)는 loop에서 open_pipe로 프로세스를 띄우고 동기 ThreadPipe를 반환한다.
+    (video_encoder.FFmpegPipeWriter의 open_process로 전달)
+    """
+    def open(cmd: List[str], read_stdout: bool = False) -> ThreadPipe:
+        pipe = asyncio.run_coroutine_threadsafe(open_pipe(cmd, timeout, read_stdout), loop).result()
+        return ThreadPipe(pipe, loop)
+    return open
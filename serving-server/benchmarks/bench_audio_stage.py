@@ -0,0 +1,75 @@
+"""
+Wav2Lip Step 1 (오디오 처리) 벤치마크 (기존 ffmpeg 왕복 vs 메모리 내 audio_stage)
+
+- legacy: ffmpeg WAV 변환(비 WAV 입력) → ffmpeg atempo → librosa 16kHz 재디코딩 → mel
+- in-memory: 한 번 디코딩 → WSOLA 배속 → soxr 16kHz → mel (배속 트랙은 한 번만 기록)
+
+두 경로의 mel 차이(평균 절대 오차)와 프레임 수도 함께 출력한다.
+
+사용법:
+    python -m benchmarks.bench_audio_stage --audio guide.mp3
+    python -m benchmarks.bench_audio_stage --audio guide.wav --speed 0.8 --repeat 5
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import Timer
+import audio
+import audio_stage
+from hparams import hparams as hp
+
+
+def legacy_prepare_audio(audio_path, audio_speed, tmp_dir):
+    """기존 Step 1 (ffmpeg 변환 + atempo + librosa 재디코딩) → mel (atempo 범위 0.5 ~ 2.0)"""
+    if not audio_path.endswith(".wav"):
+        temp_wav = os.path.join(tmp_dir, "temp.wav")
+        subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-i", audio_path, "-strict", "-2", temp_wav], check=True)
+        audio_path = temp_wav
+    if audio_speed != 1.0:
+        slowed = os.path.join(tmp_dir, "temp_slowed_legacy.wav")
+        subprocess.run([
+            "ffmpeg", "-y", "-loglevel", "error", "-i", audio_path,
+            "-af", f"atempo={audio_speed}", "-strict", "-2", slowed,
+        ], check=True)
+        audio_path = slowed
+    wav = audio.load_wav(audio_path, 16000)
+    return audio.melspectrogram(wav)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--audio", required=True, help="가이드 오디오 (wav/mp3 등)")
+    parser.add_argument("--speed", type=float, default=0.8, help="audio_speed (0.5 ~ 2.0)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    legacy_times, new_times = [], []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for _ in range(args.repeat):
+            with Timer() as t:
+                legacy_mel = legacy_prepare_audio(args.audio, args.speed, tmp_dir)
+            legacy_times.append(t.elapsed)
+            with Timer() as t:
+                wav, _, _, _ = audio_stage.prepare_audio(args.audio, args.speed, os.path.join(tmp_dir, "temp_slowed.wav"))
+                new_mel = audio.melspectrogram(wav)
+            new_times.append(t.elapsed)
+
+    frames = min(legacy_mel.shape[1], new_mel.shape[1])
+    mel_mae = float(np.mean(np.abs(legacy_mel[:, :frames] - new_mel[:, :frames])))
+    legacy_ms, new_ms = np.median(legacy_times) * 1000, np.median(new_times) * 1000
+
+    print(f"Audio: {args.audio}, speed={args.speed}, repeat={args.repeat}")
+    print(f"  legacy Step 1 (ffmpeg + librosa):  {legacy_ms:>8.1f} ms (median)")
+    print(f"  in-memory Step 1 (audio_stage):    {new_ms:>8.1f} ms (median)")
+    print(f"  speedup:                           {legacy_ms / new_ms:>8.2f}x")
+    print(f"  mel frames: legacy={legacy_mel.shape[1]}, in-memory={new_mel.shape[1]}")
+    print(f"  mel mean abs diff: {mel_mae:.4f} (value range ±{hp.max_abs_value})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+mel 계산 + chunk 생성 벤치마크 (audio.melspectrogram + chunk 루프 vs MelEngine + MelChunks)
+
+16kHz로 디코딩한 오디오 한 개에 대해 Step 1-3/1-4만 반복 측정하고
+두 결과의 최대 차이(mel 값 범위 ±hp.max_abs_value 기준)를 출력한다.
+
+사용법:
+    python -m benchmarks.bench_mel_engine --audio guide.wav
+    python -m benchmarks.bench_mel_engine --audio guide.wav --device cuda --repeat 20
+"""
+
+import argparse
+
+import numpy as np
+
+from benchmarks.common import Timer
+import audio
+import mel_engine
+from hparams import hparams as hp
+
+FPS = 18.0
+
+
+def legacy_mel_chunks(wav):
+    """기존 Step 1-3 ~ 1-4: librosa STFT + chunk별 슬라이스 리스트"""
+    mel = audio.melspectrogram(wav)
+    mel_chunks = []
+    mel_idx_multiplier = 80. / FPS
+    i = 0
+    while 1:
+        start_idx = int(i * mel_idx_multiplier)
+        if start_idx + mel_engine.MEL_STEP_SIZE > len(mel[0]):
+            mel_chunks.append(mel[:, len(mel[0]) - mel_engine.MEL_STEP_SIZE:])
+            break
+        mel_chunks.append(mel[:, start_idx: start_idx + mel_engine.MEL_STEP_SIZE])
+        i += 1
+    return mel_chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--audio", required=True, help="가이드 오디오")
+    parser.add_argument("--device", default=None, help="torch device (기본: NumPy)")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    wav = audio.load_wav(args.audio, hp.sample_rate)
+    engine = mel_engine.get_mel_engine(args.device)
+
+    with Timer() as legacy_timer:
+        for _ in range(args.repeat):
+            legacy = legacy_mel_chunks(wav)
+    with Timer() as engine_timer:
+        for _ in range(args.repeat):
+            chunks = mel_engine.MelChunks(engine.melspectrogram(wav), FPS)
+
+    max_diff = max(float(np.abs(a - b).max()) for a, b in zip(legacy, chunks))
+
+    print(f"Audio: {len(wav) / hp.sample_rate:.2f}s, {len(chunks)} chunks, device={args.device or 'numpy'}")
+    print(f"  audio.melspectrogram + loop: {legacy_timer.elapsed * 1000 / args.repeat:>8.2f} ms")
+    print(f"  MelEngine + MelChunks:       {engine_timer.elapsed * 1000 / args.repeat:>8.2f} ms")
+    print(f"  speedup:                     {legacy_timer.elapsed / engine_timer.elapsed:>8.2f}x")
+    print(f"  chunks: legacy={len(legacy)}, engine={len(chunks)}, max abs diff={max_diff:.5f} (range ±{hp.max_abs_value})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Wav2Lip inference 루프 파이프라이닝 벤치마크 (순차 루프 vs prefetch + pinned 비동기 복사)
+
+같은 영상/오디오로 prefetch_depth를 바꿔 가며 run_wav2lip_inference를 실행하고
+Step 4 처리량(frames/s)을 비교한다. 단계별 누적 시간/겹친 시간은 [4-P] 로그에 출력된다.
+
+사용법:
+    python -m benchmarks.bench_prefetch_loop --video sample.mp4 --audio guide.wav
+    python -m benchmarks.bench_prefetch_loop --video sample.mp4 --audio guide.wav --depths 0 1 2 4
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.common import Timer, load_wav2lip_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--video", required=True, help="얼굴이 포함된 입력 영상")
+    parser.add_argument("--audio", required=True, help="가이드 오디오")
+    parser.add_argument("--checkpoint", default=None, help="wav2lip_gan.pth 경로")
+    parser.add_argument("--batch-size", type=int, default=24)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 2])
+    parser.add_argument("--streaming", action="store_true", help="스트리밍 모드로 실행")
+    args = parser.parse_args()
+
+    import cv2
+    from wav2lip_inference import run_wav2lip_inference
+
+    model, device = load_wav2lip_model(args.checkpoint, None)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for depth in args.depths:
+            output_path = os.path.join(tmp_dir, f"out_{depth}.mp4")
+            with Timer() as t:
+                run_wav2lip_inference(
+                    model=model,
+                    face_video_path=args.video,
+                    audio_path=args.audio,
+                    output_path=output_path,
+                    device=device,
+                    wav2lip_batch_size=args.batch_size,
+                    streaming=args.streaming,
+                    temp_dir=tmp_dir,
+                    prefetch_depth=depth,
+                )
+            stream = cv2.VideoCapture(output_path)
+            frames = int(stream.get(cv2.CAP_PROP_FRAME_COUNT))
+            stream.release()
+            results.append((depth, frames, t.elapsed))
+
+    print(f"\ndevice={device}, batch_size={args.batch_size}, streaming={args.streaming}")
+    print(f"{'prefetch_depth':>14} {'frames':>7} {'seconds':>8} {'fps':>8}")
+    for depth, frames, seconds in results:
+        print(f"{depth:>14} {frames:>7} {seconds:>8.2f} {frames / seconds if seconds else 0:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
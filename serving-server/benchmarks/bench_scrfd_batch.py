@@ -0,0 +1,118 @@
+"""
+SCRFD 얼굴 감지 처리량 벤치마크 (insightface 경로 vs ONNX 배치 경로)
+
+- scrfd:      SCRFDDetector.detect_from_batch (insightface FaceAnalysis, 이미지별 app.get 병렬 호출)
+- scrfd_onnx: SCRFDOnnxDetector.detect_from_batch (detection ONNX 직접 로드, 배치 한 번에 session.run)
+
+두 경로 모두 FaceAlignment.get_detections_for_batch와 같은 RGB 배치를 입력으로 받으며,
+배치 크기별 images/s와 가장 높은 score 박스의 IoU(두 경로 간 일치도)를 출력한다.
+
+사용법:
+    python -m benchmarks.bench_scrfd_batch --video sample.mp4
+    python -m benchmarks.bench_scrfd_batch --video sample.mp4 --device cpu --batch-sizes 1 8 16
+"""
+
+import argparse
+import json
+
+import cv2
+import numpy as np
+
+from benchmarks.common import Timer
+
+
+def read_frames(path: str, limit: int) -> np.ndarray:
+    """영상 앞부분 limit 프레임을 RGB 배열로 읽음"""
+    stream = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ok, frame = stream.read()
+        if not ok:
+            break
+        frames.append(frame[..., ::-1])
+    stream.release()
+    if not frames:
+        raise ValueError(f"No frames read from {path}")
+    return np.ascontiguousarray(np.stack(frames))
+
+
+def top_box_iou(a, b) -> float:
+    """두 감지 결과의 최고 score 박스 IoU (어느 한쪽이라도 미검출이면 0)"""
+    if len(a) == 0 or len(b) == 0:
+        return 0.0
+    a, b = np.asarray(a[0][:4], dtype=np.float64), np.asarray(b[0][:4], dtype=np.float64)
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def run_detector(detector, frames: np.ndarray, batch_size: int, repeat: int):
+    """batch_size 단위로 전체 프레임을 repeat 회 감지하고 (images/s, 마지막 결과) 반환"""
+    # 첫 호출(세션 warm-up, cuDNN autotune 등)은 측정에서 제외
+    detector.detect_from_batch(frames[:batch_size].copy())
+
+    results = []
+    with Timer() as t:
+        for _ in range(repeat):
+            results = []
+            for start in range(0, len(frames), batch_size):
+                results.extend(detector.detect_from_batch(frames[start:start + batch_size].copy()))
+    return len(frames) * repeat / t.elapsed, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--video", required=True, help="얼굴이 포함된 입력 영상")
+    parser.add_argument("--frames", type=int, default=128, help="사용할 프레임 수")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 16, 32])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--onnx-model", default=None, help="SCRFD detection ONNX 경로 (기본: buffalo_l det_10g.onnx)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    if args.device is None:
+        import torch
+        args.device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    from face_detection.detection.scrfd import FaceDetector as SCRFDDetector
+    from face_detection.detection.scrfd_onnx import FaceDetector as SCRFDOnnxDetector
+
+    frames = read_frames(args.video, args.frames)
+    detectors = {
+        "scrfd": SCRFDDetector(device=args.device, verbose=False),
+        "scrfd_onnx": SCRFDOnnxDetector(device=args.device, path_to_detector=args.onnx_model, verbose=False),
+    }
+
+    rows = []
+    for batch_size in args.batch_sizes:
+        throughput, outputs = {}, {}
+        for name, detector in detectors.items():
+            throughput[name], outputs[name] = run_detector(detector, frames, batch_size, args.repeat)
+        ious = [top_box_iou(a, b) for a, b in zip(outputs["scrfd"], outputs["scrfd_onnx"])]
+        rows.append({
+            "batch_size": batch_size,
+            "frames": len(frames),
+            "scrfd_images_per_s": throughput["scrfd"],
+            "scrfd_onnx_images_per_s": throughput["scrfd_onnx"],
+            "speedup": throughput["scrfd_onnx"] / throughput["scrfd"],
+            "top_box_iou_mean": float(np.mean(ious)),
+            "top_box_iou_min": float(np.min(ious)),
+        })
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'batch':>5} {'scrfd img/s':>12} {'onnx img/s':>11} {'speedup':>8} {'IoU mean':>9} {'IoU min':>8}")
+    for r in rows:
+        print(
+            f"{r['batch_size']:>5} {r['scrfd_images_per_s']:>12.1f} {r['scrfd_onnx_images_per_s']:>11.1f} "
+            f"{r['speedup']:>7.2f}x {r['top_box_iou_mean']:>9.4f} {r['top_box_iou_min']:>8.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
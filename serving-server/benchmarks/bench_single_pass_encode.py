@@ -0,0 +1,114 @@
+"""
+Wav2Lip 결과 인코딩 벤치마크 (기존 3단계 인코딩 vs 단일 패스 ffmpeg 파이프)
+
+모델 없이 입력 영상 프레임을 합성 결과 대신 그대로 기록하여 인코딩 단계만 측정한다.
+- legacy: DIVX result.avi (cv2.VideoWriter) → 오디오 mux (-q:v 1) → 스케일/FPS 리사이즈
+- single-pass: raw BGR 프레임 → ffmpeg stdin (스케일/FPS/오디오 합성 한 번에)
+
+품질은 두 결과를 각각 원본 프레임과 비교한 PSNR, 그리고 서로 간 PSNR로 확인한다.
+
+사용법:
+    python -m benchmarks.bench_single_pass_encode --video sample.mp4 --audio guide.wav
+    python -m benchmarks.bench_single_pass_encode --video sample.mp4 --audio guide.wav --resolution 1920x1080 --gpu
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+
+import cv2
+import numpy as np
+
+from benchmarks.common import Timer
+from video_encoder import FFmpegPipeWriter, encoder_args
+from wav2lip_inference import _mux_audio, iter_video_frames
+
+FPS = 18.0
+
+
+def encode_legacy(frames, audio_path, output_path, tmp_dir, resolution, target_fps, gpu_encoding, bitrate):
+    """기존 경로: result.avi → _mux_audio → AIService._resize_video_to_resolution과 같은 리사이즈"""
+    height, width = frames[0].shape[:2]
+    avi_path = os.path.join(tmp_dir, "result.avi")
+    muxed_path = os.path.join(tmp_dir, "lipsynced_temp.mp4")
+
+    out = cv2.VideoWriter(avi_path, cv2.VideoWriter_fourcc(*"DIVX"), FPS, (width, height))
+    for frame in frames:
+        out.write(frame)
+    out.release()
+
+    _mux_audio(audio_path, avi_path, muxed_path)
+
+    cmd = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-i", muxed_path,
+        "-vf", f"scale={resolution.replace('x', ':')}:flags=fast_bilinear,fps={target_fps}",
+    ]
+    cmd += encoder_args(gpu_encoding, bitrate)
+    cmd += ["-c:a", "copy", output_path]
+    subprocess.run(cmd, check=True)
+
+
+def encode_single_pass(frames, audio_path, output_path, resolution, target_fps, gpu_encoding, bitrate):
+    height, width = frames[0].shape[:2]
+    out = FFmpegPipeWriter(output_path, (width, height), FPS, audio_path, resolution, target_fps, gpu_encoding, bitrate)
+    for frame in frames:
+        out.write(frame)
+    out.release()
+
+
+def psnr(a, b):
+    mse = np.mean((a.astype(np.float64) - b.astype(np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+
+def mean_psnr(frames_a, frames_b):
+    n = min(len(frames_a), len(frames_b))
+    return float(np.mean([psnr(a, b) for a, b in zip(frames_a[:n], frames_b[:n])])), n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--video", required=True, help="입력 영상 (합성 결과 대신 기록할 프레임)")
+    parser.add_argument("--audio", required=True, help="합성할 오디오 (wav)")
+    parser.add_argument("--frames", type=int, default=360, help="기록할 프레임 수")
+    parser.add_argument("--resolution", default=None, help="출력 해상도 widthxheight (기본: 입력과 동일)")
+    parser.add_argument("--target-fps", type=int, default=18)
+    parser.add_argument("--bitrate", default=None, help="예: 5000k (기본: CRF/QP 모드)")
+    parser.add_argument("--gpu", action="store_true", help="h264_nvenc 사용")
+    args = parser.parse_args()
+
+    frames = list(iter_video_frames(args.video, limit=args.frames))
+    height, width = frames[0].shape[:2]
+    resolution = args.resolution or f"{width}x{height}"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path = os.path.join(tmp_dir, "legacy.mp4")
+        single_path = os.path.join(tmp_dir, "single_pass.mp4")
+
+        with Timer() as legacy_timer:
+            encode_legacy(frames, args.audio, legacy_path, tmp_dir, resolution, args.target_fps, args.gpu, args.bitrate)
+        with Timer() as single_timer:
+            encode_single_pass(frames, args.audio, single_path, resolution, args.target_fps, args.gpu, args.bitrate)
+
+        legacy_frames = list(iter_video_frames(legacy_path))
+        single_frames = list(iter_video_frames(single_path))
+
+    out_w, out_h = (int(v) for v in resolution.split("x"))
+    reference = frames if (out_w, out_h) == (width, height) else [cv2.resize(f, (out_w, out_h)) for f in frames]
+    legacy_psnr, _ = mean_psnr(reference, legacy_frames)
+    single_psnr, _ = mean_psnr(reference, single_frames)
+    cross_psnr, compared = mean_psnr(legacy_frames, single_frames)
+
+    print(f"Input: {width}x{height}, {len(frames)} frames -> {resolution} @ {args.target_fps}fps ({'nvenc' if args.gpu else 'libx264'})")
+    print(f"  legacy (avi + mux + resize): {legacy_timer.elapsed:>7.2f}s ({len(frames) / legacy_timer.elapsed:.1f} frames/s)")
+    print(f"  single-pass pipe:            {single_timer.elapsed:>7.2f}s ({len(frames) / single_timer.elapsed:.1f} frames/s)")
+    print(f"  speedup:                     {legacy_timer.elapsed / single_timer.elapsed:>7.2f}x")
+    print(f"  output frames:               legacy={len(legacy_frames)}, single-pass={len(single_frames)}")
+    print(f"  PSNR vs source:              legacy={legacy_psnr:.2f} dB, single-pass={single_psnr:.2f} dB")
+    print(f"  PSNR single-pass vs legacy:  {cross_psnr:.2f} dB ({compared} frames)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+스토리지 전송 벤치마크 (순차 vs 동시 입력 다운로드, 단일 스트림 vs range 병렬)
+
+- sequential: 영상 → 오디오 순서로 download_file (기존 파이프라인)
+- concurrent: 영상 / 오디오를 asyncio.gather로 동시에 (AsyncStorage, 단일 스트림)
+- parallel:   concurrent + 큰 파일 range 병렬 다운로드
+
+--video/--audio 로컬 파일을 주면 임시 디렉토리를 로컬 스토리지 백엔드로 사용해 오프라인으로 측정한다.
+로컬 디스크는 스트림당 대역폭 제한이 없으므로 --stream-mbps로 연결당 대역폭(GCS 단일 스트림 한계)을 흉내낸다.
+
+사용법:
+    STORAGE_BACKEND=local python -m benchmarks.bench_storage --video sample.mp4 --audio guide.wav --stream-mbps 40
+    python -m benchmarks.bench_storage --video-gs gs://bucket/v.mp4 --audio-gs gs://bucket/a.wav
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+SERVING_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVING_DIR not in sys.path:
+    sys.path.insert(0, SERVING_DIR)
+
+
+class ThrottledClient:
+    """연결(호출)당 대역폭을 stream_mbps로 제한하는 클라이언트 래퍼"""
+
+    def __init__(self, client, stream_mbps: float):
+        self.client = client
+        self.bytes_per_sec = stream_mbps * 1024 * 1024
+
+    def _throttle(self, nbytes: int, started: float):
+        remaining = nbytes / self.bytes_per_sec - (time.perf_counter() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def get_object_info(self, gs_path):
+        return self.client.get_object_info(gs_path)
+
+    def download_file(self, gs_path, local_path):
+        started = time.perf_counter()
+        ok = self.client.download_file(gs_path, local_path)
+        if ok:
+            self._throttle(os.path.getsize(local_path), started)
+        return ok
+
+    def download_range(self, gs_path, start, end):
+        started = time.perf_counter()
+        data = self.client.download_range(gs_path, start, end)
+        self._throttle(len(data), started)
+        return data
+
+    def download_bytes(self, gs_path, limit=None):
+        return self.client.download_bytes(gs_path, limit)
+
+    def upload_file(self, local_path, gs_path):
+        return self.client.upload_file(local_path, gs_path)
+
+
+async def _sequential(storage, video_gs, audio_gs, workdir):
+    await storage.download_file(video_gs, os.path.join(workdir, "video"))
+    await storage.download_file(audio_gs, os.path.join(workdir, "audio"))
+
+
+async def _concurrent(storage, video_gs, audio_gs, workdir):
+    await asyncio.gather(
+        storage.download_file(video_gs, os.path.join(workdir, "video")),
+        storage.download_file(audio_gs, os.path.join(workdir, "audio")),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--video", help="로컬 영상 파일 (로컬 스토리지 백엔드로 측정)")
+    parser.add_argument("--audio", help="로컬 오디오 파일")
+    parser.add_argument("--video-gs", help="GCS 영상 경로")
+    parser.add_argument("--audio-gs", help="GCS 오디오 경로")
+    parser.add_argument("--stream-mbps", type=float, default=None, help="연결당 대역폭 제한 (MB/s)")
+    parser.add_argument("--chunk-mb", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from api.utils.async_storage import AsyncStorage
+    from api.utils.gcs_client import LocalStorageClient, gcs_client
+
+    root = None
+    if args.video and args.audio:
+        root = tempfile.mkdtemp(prefix="bench_storage_")
+        os.makedirs(os.path.join(root, "bench"))
+        shutil.copyfile(args.video, os.path.join(root, "bench", "video"))
+        shutil.copyfile(args.audio, os.path.join(root, "bench", "audio"))
+        client = LocalStorageClient(root)
+        video_gs, audio_gs = "gs://bench/video", "gs://bench/audio"
+    elif args.video_gs and args.audio_gs:
+        client = gcs_client
+        video_gs, audio_gs = args.video_gs, args.audio_gs
+    else:
+        parser.error("--video/--audio 또는 --video-gs/--audio-gs 가 필요합니다")
+    if args.stream_mbps:
+        client = ThrottledClient(client, args.stream_mbps)
+
+    chunk_size = args.chunk_mb * 1024 * 1024
+    modes = {
+        "sequential": (AsyncStorage(client, args.workers, parallel_threshold=float("inf")), _sequential),
+        "concurrent": (AsyncStorage(client, args.workers, parallel_threshold=float("inf")), _concurrent),
+        "parallel": (AsyncStorage(client, args.workers, parallel_threshold=chunk_size, chunk_size=chunk_size), _concurrent),
+    }
+
+    try:
+        video_size = client.get_object_info(video_gs)["size"]
+        print(f"video={video_gs} ({video_size} bytes), audio={audio_gs}, "
+              f"stream limit={args.stream_mbps or 'none'} MB/s, chunk={args.chunk_mb}MB")
+        baseline = None
+        for name, (storage, run) in modes.items():
+            times = []
+            for _ in range(args.repeat):
+                workdir = tempfile.mkdtemp(prefix="bench_storage_out_")
+                try:
+                    start = time.perf_counter()
+                    asyncio.run(run(storage, video_gs, audio_gs, workdir))
+                    times.append(time.perf_counter() - start)
+                finally:
+                    shutil.rmtree(workdir, ignore_errors=True)
+            best = min(times)
+            baseline = baseline or best
+            print(f"  {name:<11} best={best * 1000:>8.1f} ms  speedup={baseline / best:.2f}x  "
+                  f"parallel_downloads={storage.metrics()['parallel_downloads']}")
+    finally:
+        if root:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
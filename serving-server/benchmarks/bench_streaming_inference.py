@@ -0,0 +1,88 @@
+"""
+run_wav2lip_inference 메모리/처리량 벤치마크 (기존 경로 vs 스트리밍 모드)
+
+각 (해상도, 모드) 조합을 별도 자식 프로세스에서 실행하여
+peak RSS(ru_maxrss)와 frames/s를 측정한다.
+
+사용법:
+    python -m benchmarks.bench_streaming_inference --video sample.mp4 --audio guide.wav
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import Timer, load_wav2lip_model, scale_video
+
+RESOLUTIONS = [720, 1080]
+
+
+def _child(args):
+    """자식 프로세스: 한 번의 inference를 실행하고 결과를 JSON으로 출력"""
+    import cv2
+    from wav2lip_inference import run_wav2lip_inference
+
+    model, device = load_wav2lip_model(args.checkpoint)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "out.mp4")
+        with Timer() as t:
+            run_wav2lip_inference(
+                model=model,
+                face_video_path=args.video,
+                audio_path=args.audio,
+                output_path=output_path,
+                device=device,
+                wav2lip_batch_size=args.batch_size,
+                streaming=args.mode == "streaming",
+            )
+        stream = cv2.VideoCapture(output_path)
+        frame_count = int(stream.get(cv2.CAP_PROP_FRAME_COUNT))
+        stream.release()
+
+    # Linux ru_maxrss 단위는 KB
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({
+        "frames": frame_count,
+        "seconds": t.elapsed,
+        "peak_rss_mb": peak_rss_mb,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--video", required=True, help="얼굴이 포함된 입력 영상")
+    parser.add_argument("--audio", required=True, help="가이드 오디오")
+    parser.add_argument("--checkpoint", default=None, help="wav2lip_gan.pth 경로")
+    parser.add_argument("--batch-size", type=int, default=24)
+    parser.add_argument("--mode", choices=["legacy", "streaming"], default=None)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args)
+        return
+
+    print(f"{'resolution':>10} {'mode':>10} {'frames':>7} {'fps':>8} {'peak RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for height in RESOLUTIONS:
+            scaled = scale_video(args.video, os.path.join(tmp_dir, f"input_{height}p.mp4"), height)
+            for mode in ("legacy", "streaming"):
+                cmd = [
+                    sys.executable, "-m", "benchmarks.bench_streaming_inference", "--child",
+                    "--video", scaled, "--audio", args.audio,
+                    "--batch-size", str(args.batch_size), "--mode", mode,
+                ]
+                if args.checkpoint:
+                    cmd += ["--checkpoint", args.checkpoint]
+                proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
+                result = json.loads(proc.stdout.strip().splitlines()[-1])
+                fps = result["frames"] / result["seconds"] if result["seconds"] > 0 else 0.0
+                print(f"{height:>9}p {mode:>10} {result['frames']:>7} {fps:>8.2f} {result['peak_rss_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
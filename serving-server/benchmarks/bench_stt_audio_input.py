@@ -0,0 +1,93 @@
+"""
+STT 오디오 입력 방식 벤치마크 (임시 파일 경로 vs 메모리 16kHz 배열)
+
+GCS 다운로드 결과(바이트)를 가정하고 요청 한 건의 입력 준비 + 인식 지연을 비교한다.
+- file:   바이트를 NamedTemporaryFile에 기록 → 경로를 pipeline.transcribe에 전달 (파이프라인이 다시 읽고 디코딩)
+- memory: decode_audio_bytes로 16kHz 배열 한 번 디코딩 → waveform dict 전달
+
+--no-model이면 파이프라인 없이 입력 준비 단계만 측정한다 (file: 기록 + librosa 16kHz 로드).
+
+사용법:
+    python -m benchmarks.bench_stt_audio_input --audio clip.wav --model-size 300M --repeat 20
+    python -m benchmarks.bench_stt_audio_input --audio clip.m4a --no-model
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SERVING_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVING_DIR not in sys.path:
+    sys.path.insert(0, SERVING_DIR)
+
+
+def _file_input(data: bytes, ext: str, transcribe):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=ext, prefix="stt_audio_") as f:
+        f.write(data)
+        path = f.name
+    try:
+        return transcribe(path)
+    finally:
+        os.unlink(path)
+
+
+async def _memory_input(data: bytes, transcribe):
+    from api.utils.audio_decode import ASR_SAMPLE_RATE, decode_audio_bytes
+    waveform = await decode_audio_bytes(data)
+    return transcribe({"waveform": waveform, "sample_rate": ASR_SAMPLE_RATE})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--audio", required=True, help="짧은 오디오 클립 (2~5초 권장)")
+    parser.add_argument("--model-size", default="300M")
+    parser.add_argument("--lang", default="kor_Hang")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-model", action="store_true", help="파이프라인 없이 입력 준비만 측정")
+    args = parser.parse_args()
+
+    with open(args.audio, "rb") as f:
+        data = f.read()
+    ext = os.path.splitext(args.audio)[1] or ".wav"
+
+    if args.no_model:
+        import librosa
+        transcribe_file = lambda path: librosa.load(path, sr=16000)[0]
+        transcribe_memory = lambda item: item["waveform"]
+    else:
+        from omnilingual_asr.models.inference.pipeline import ASRInferencePipeline
+        pipeline = ASRInferencePipeline(model_card=f"omniASR_LLM_{args.model_size}")
+        transcribe_file = lambda path: pipeline.transcribe([path], lang=[args.lang], batch_size=1)[0]
+        transcribe_memory = lambda item: pipeline.transcribe([item], lang=[args.lang], batch_size=1)[0]
+        # 첫 호출(CUDA 초기화 등)은 측정에서 제외
+        _file_input(data, ext, transcribe_file)
+
+    file_ms, memory_ms = [], []
+    file_out = memory_out = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        file_out = _file_input(data, ext, transcribe_file)
+        file_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        memory_out = asyncio.run(_memory_input(data, transcribe_memory))
+        memory_ms.append((time.perf_counter() - start) * 1000)
+
+    print(f"Audio: {args.audio} ({len(data)} bytes), repeat={args.repeat}, "
+          f"{'input preparation only' if args.no_model else f'model={args.model_size}'}")
+    for name, ms in (("file (temp path)", file_ms), ("memory (16kHz array)", memory_ms)):
+        print(f"  {name:<22} p50={np.percentile(ms, 50):>8.1f} ms  p95={np.percentile(ms, 95):>8.1f} ms")
+    print(f"  p50 speedup: {np.percentile(file_ms, 50) / np.percentile(memory_ms, 50):.2f}x")
+    if not args.no_model:
+        print(f"  same transcription: {file_out == memory_out}")
+        print(f"    file:   {file_out}")
+        print(f"    memory: {memory_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+벤치마크 공통 유틸리티
+
+serving-server 디렉토리에서 실행하는 것을 기준으로 한다.
+    python -m benchmarks.<script> ...
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+SERVING_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WAV2LIP_DIR = os.path.join(SERVING_DIR, "models", "Wav2Lip")
+
+if WAV2LIP_DIR not in sys.path:
+    sys.path.insert(0, WAV2LIP_DIR)
+
+
+def load_wav2lip_model(checkpoint_path: str = None, device: str = None):
+    """AIService._load_wav2lip_model과 동일한 방식으로 Wav2Lip 모델 로드 (torch.compile 제외)"""
+    import torch
+    from models import Wav2Lip
+
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    if checkpoint_path is None:
+        checkpoint_path = os.path.join(WAV2LIP_DIR, "checkpoints", "wav2lip_gan.pth")
+
+    checkpoint = torch.load(checkpoint_path, map_location=device)
+    state_dict = {k.replace("module.", ""): v for k, v in checkpoint["state_dict"].items()}
+
+    model = Wav2Lip()
+    model.load_state_dict(state_dict)
+    model = model.to(device)
+    if device == "cuda":
+        model = model.half()
+    model.eval()
+    return model, device
+
+
+def scale_video(src_path: str, dst_path: str, height: int) -> str:
+    """ffmpeg로 입력 영상을 지정 높이로 스케일 (720p/1080p 입력 생성용)"""
+    cmd = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-i", src_path,
+        "-vf", f"scale=-2:{height}",
+        "-c:v", "libx264", "-crf", "18",
+        "-an", dst_path,
+    ]
+    subprocess.run(cmd, check=True)
+    return dst_path
+
+
+class Timer:
+    """with 블록 경과 시간 측정"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        return False
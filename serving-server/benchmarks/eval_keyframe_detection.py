@@ -0,0 +1,122 @@
+"""
+키프레임 얼굴 감지 평가 (전 프레임 감지 대비 박스 IoU / 감지 시간 절감)
+
+각 평가 클립에 대해 전 프레임 감지 결과를 기준으로,
+키프레임 간격 / 움직임 임계값 조합별 스무딩 후 박스 IoU와 감지 시간을 비교한다.
+
+사용법:
+    python -m benchmarks.eval_keyframe_detection --clips eval_clips/*.mp4
+    python -m benchmarks.eval_keyframe_detection --clips a.mp4 b.mp4 --intervals 3 5 8 --motion 4 8
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from benchmarks.common import Timer
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """프레임별 [x1, y1, x2, y2] 박스 IoU (N,)"""
+    a = a.astype(np.float64)
+    b = b.astype(np.float64)
+    ix1 = np.maximum(a[:, 0], b[:, 0])
+    iy1 = np.maximum(a[:, 1], b[:, 1])
+    ix2 = np.minimum(a[:, 2], b[:, 2])
+    iy2 = np.minimum(a[:, 3], b[:, 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-9)
+
+
+def _configs(intervals, motions):
+    """(keyframe_interval, motion_threshold) 평가 조합"""
+    configs = [(k, None) for k in intervals]
+    # 움직임 감지 조합은 가장 긴 간격을 상한으로 사용
+    configs += [(max(intervals), m) for m in motions]
+    return configs
+
+
+def evaluate_clip(path, args):
+    from wav2lip_inference import detect_face_boxes, get_smoothened_boxes, iter_video_frames, select_keyframes
+
+    frames = list(iter_video_frames(path, args.resize_factor))
+    detect_kwargs = dict(
+        device=args.device,
+        face_detector=args.face_detector,
+        face_det_batch_size=args.batch_size,
+        pads=args.pads,
+    )
+
+    with Timer() as full_timer:
+        full_boxes = detect_face_boxes(frames, **detect_kwargs)
+    reference = get_smoothened_boxes(full_boxes.copy(), T=5)
+
+    rows = []
+    for keyframe_interval, motion_threshold in _configs(args.intervals, args.motion):
+        with Timer() as t:
+            boxes = detect_face_boxes(
+                frames, keyframe_interval=keyframe_interval, motion_threshold=motion_threshold, **detect_kwargs
+            )
+        boxes = get_smoothened_boxes(boxes, T=5)
+        iou = box_iou(reference, boxes)
+        detected = len(select_keyframes(frames, keyframe_interval, motion_threshold))
+        rows.append({
+            "clip": path,
+            "frames": len(frames),
+            "keyframe_interval": keyframe_interval,
+            "motion_threshold": motion_threshold,
+            "detected_frames": detected,
+            "iou_mean": float(iou.mean()),
+            "iou_p5": float(np.percentile(iou, 5)),
+            "iou_min": float(iou.min()),
+            "full_detect_s": full_timer.elapsed,
+            "keyframe_detect_s": t.elapsed,
+            "time_saving_pct": (1 - t.elapsed / full_timer.elapsed) * 100,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clips", nargs="+", required=True, help="평가용 얼굴 영상")
+    parser.add_argument("--intervals", nargs="+", type=int, default=[3, 5, 8], help="키프레임 간격")
+    parser.add_argument("--motion", nargs="*", type=float, default=[4.0, 8.0], help="움직임 임계값 (0~255)")
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--face-detector", default="scrfd")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--pads", nargs=4, type=int, default=[0, 15, 0, 0])
+    parser.add_argument("--resize-factor", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    if args.device is None:
+        import torch
+        args.device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    # detector 초기화 비용이 첫 클립 측정에 섞이지 않도록 미리 로드
+    from wav2lip_inference import _get_face_detector
+    _get_face_detector(args.device, args.face_detector)
+
+    rows = []
+    for clip in args.clips:
+        rows.extend(evaluate_clip(clip, args))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{'clip':<32} {'k':>3} {'motion':>7} {'det/frames':>11} {'IoU mean':>9} {'IoU p5':>7} {'IoU min':>8} {'full s':>7} {'kf s':>7} {'saving':>7}")
+    for r in rows:
+        motion = "-" if r["motion_threshold"] is None else f"{r['motion_threshold']:.1f}"
+        print(
+            f"{r['clip'][-32:]:<32} {r['keyframe_interval']:>3} {motion:>7} "
+            f"{r['detected_frames']:>5}/{r['frames']:<5} {r['iou_mean']:>9.4f} {r['iou_p5']:>7.4f} {r['iou_min']:>8.4f} "
+            f"{r['full_detect_s']:>7.2f} {r['keyframe_detect_s']:>7.2f} {r['time_saving_pct']:>6.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
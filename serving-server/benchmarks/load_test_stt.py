@@ -0,0 +1,98 @@
+"""
+/api/v1/stt/transcribe 부하 테스트 (마이크로 배치 효과 확인)
+
+실행 중인 STT 서버에 동시 요청 N개를 총 M건 보내고 지연 시간 분포(p50/p95/p99)와 처리량을 출력한다.
+끝난 뒤 /api/v1/stt/metrics의 배처 메트릭(avg_batch_size, avg_queue_wait_ms)도 함께 출력한다.
+STT_BATCHING_ENABLED=false로 띄운 서버와 비교하면 배치 효과를 볼 수 있다.
+같은 오디오를 반복해서 보내므로 결과 캐시가 적중하지 않도록 STT_RESULT_CACHE_ENABLED=false로 띄운 서버에서 측정한다.
+
+사용법:
+    python -m benchmarks.load_test_stt --audio-gs gs://bucket/sample.wav -c 16 -n 128
+    python -m benchmarks.load_test_stt --audio-gs gs://bucket/a.wav gs://bucket/b.wav --langs kor_Hang eng_Latn
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+import numpy as np
+
+
+async def _worker(session, url, queue, payloads, latencies, failures):
+    while True:
+        try:
+            i = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        payload = payloads[i % len(payloads)]
+        started = time.perf_counter()
+        try:
+            async with session.post(url, json=payload) as resp:
+                body = await resp.json()
+                if resp.status != 200 or not body.get("success"):
+                    failures.append((resp.status, body))
+                    continue
+        except Exception as e:
+            failures.append((None, str(e)))
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(args):
+    base = args.url.rstrip("/")
+    langs = args.langs or [None]
+    payloads = [
+        {"audio_gs": gs, "lang": langs[i % len(langs)], "model_size": args.model_size}
+        for i, gs in enumerate(args.audio_gs)
+    ]
+    queue = asyncio.Queue()
+    for i in range(args.num_requests):
+        queue.put_nowait(i)
+
+    latencies, failures = [], []
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        # 모델 로드 시간이 측정에 섞이지 않도록 한 번 먼저 호출
+        async with session.post(f"{base}/api/v1/stt/transcribe", json=payloads[0]) as resp:
+            await resp.read()
+
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            _worker(session, f"{base}/api/v1/stt/transcribe", queue, payloads, latencies, failures)
+            for _ in range(args.concurrency)
+        ])
+        wall = time.perf_counter() - started
+
+        async with session.get(f"{base}/api/v1/stt/metrics") as resp:
+            metrics = await resp.json() if resp.status == 200 else None
+
+    print(f"requests={args.num_requests} concurrency={args.concurrency} model={args.model_size}")
+    print(f"  succeeded: {len(latencies)}, failed: {len(failures)}")
+    if latencies:
+        ms = np.array(latencies) * 1000
+        print(f"  latency p50={np.percentile(ms, 50):.0f}ms p95={np.percentile(ms, 95):.0f}ms "
+              f"p99={np.percentile(ms, 99):.0f}ms max={ms.max():.0f}ms")
+        print(f"  throughput: {len(latencies) / wall:.2f} req/s (wall {wall:.1f}s)")
+    for status, body in failures[:5]:
+        print(f"  failure: status={status} body={body}")
+    if metrics is not None:
+        print("  batcher metrics:")
+        print(json.dumps(metrics.get("batchers", {}), indent=2, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--audio-gs", nargs="+", required=True, help="요청에 번갈아 사용할 GCS 오디오 경로")
+    parser.add_argument("--langs", nargs="+", default=None, help="요청에 번갈아 사용할 언어 코드")
+    parser.add_argument("--model-size", default="300M")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-n", "--num-requests", type=int, default=128)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Wav2Lip 1단계 오디오 처리 (메모리 내)
+
+기존: ffmpeg로 WAV 변환(temp.wav) → ffmpeg atempo(temp_slowed.wav) → librosa로 다시 16kHz 디코딩
+변경: 한 번 디코딩 → WSOLA 시간 늘이기(피치 유지, atempo와 같은 방식) → soxr로 16kHz 리샘플
+- 16kHz 배열을 그대로 mel 계산에 전달
+- 최종 mux용 배속 트랙은 원본 샘플레이트로 한 번만 기록
+"""
+
+import librosa
+import numpy as np
+import soxr
+from scipy.io import wavfile
+
+MEL_SAMPLE_RATE = 16000
+
+
+def decode_audio(path):
+	"""오디오 파일을 원본 샘플레이트의 mono float32 배열로 한 번 디코딩 → (wav, sr)"""
+	wav, sr = librosa.load(path, sr=None, mono=True)
+	return np.ascontiguousarray(wav, dtype=np.float32), sr
+
+
+def resample(wav, sr, target_sr=MEL_SAMPLE_RATE):
+	"""soxr HQ 리샘플 (librosa.load(sr=16000)의 기본 리샘플러와 동일)"""
+	if sr == target_sr:
+		return wav
+	return soxr.resample(wav, sr, target_sr).astype(np.float32, copy=False)
+
+
+def time_stretch(wav, speed, sr, window_ms=40.0, tolerance_ms=10.0):
+	"""
+	WSOLA 시간 늘이기/줄이기 (피치 유지)
+
+	출력 hop(window/2)마다 입력의 speed * hop 위치 근처 ±tolerance 안에서
+	직전 구간의 자연스러운 이어짐과 상관이 가장 큰 구간을 골라 Hann 창으로 overlap-add 한다.
+
+	Args:
+		wav: mono float32 배열
+		speed: 재생 배속 (0.8 = 1.25배 길어짐)
+		sr: 샘플레이트
+
+	Returns:
+		길이 round(len(wav) / speed)의 float32 배열
+	"""
+	if speed <= 0:
+		raise ValueError(f'audio speed must be positive: {speed}')
+	if speed == 1.0 or len(wav) == 0:
+		return wav
+
+	win = max(32, int(sr * window_ms / 1000) // 2 * 2)
+	hop = win // 2
+	tol = max(1, int(sr * tolerance_ms / 1000))
+	# periodic Hann은 50% overlap에서 합이 정확히 1
+	window = np.hanning(win + 1)[:-1].astype(np.float32)
+
+	out_len = int(round(len(wav) / speed))
+	n_frames = out_len // hop + 2
+	in_hop = hop * speed
+
+	# 프레임 k는 출력 k*hop을 중심으로 놓이므로 입력 시작은 (중심 - hop)
+	lead = win + tol
+	needed = lead + int(np.ceil((n_frames - 1) * in_hop)) + tol + win + hop + 1
+	x = np.zeros(max(needed, lead + len(wav)), dtype=np.float32)
+	x[lead:lead + len(wav)] = wav
+
+	out = np.zeros(n_frames * hop + win, dtype=np.float32)
+	prev = None
+	for k in range(n_frames):
+		ideal = lead + int(round(k * in_hop)) - hop
+		if prev is None:
+			pos = ideal
+		else:
+			target = x[prev + hop: prev + hop + win]
+			region = x[ideal - tol: ideal + tol + win]
+			pos = ideal - tol + int(np.argmax(np.correlate(region, target, mode='valid')))
+		out[k * hop: k * hop + win] += x[pos: pos + win] * window
+		prev = pos
+
+	return out[hop: hop + out_len]
+
+
+def write_wav(path, wav, sr):
+	"""16bit PCM WAV 기록 (ffmpeg atempo 출력과 같은 형식, 정규화 없음)"""
+	wavfile.write(path, sr, (np.clip(wav, -1.0, 1.0) * 32767).astype(np.int16))
+
+
+def prepare_audio(audio_path, audio_speed=1.0, slowed_path=None):
+	"""
+	디코딩 → 배속 조정 → 16kHz 리샘플
+
+	audio_speed != 1.0이면 배속 트랙을 slowed_path에 한 번 기록하고 그 경로를 mux용으로 돌려준다.
+
+	Returns:
+		(16kHz wav 배열, mux에 쓸 오디오 경로, 원본 샘플레이트 배속 트랙 또는 None, 원본 샘플레이트)
+	"""
+	wav, sr = decode_audio(audio_path)
+	track = None
+	if audio_speed != 1.0:
+		wav = track = time_stretch(wav, audio_speed, sr)
+		write_wav(slowed_path, wav, sr)
+		audio_path = slowed_path
+	return resample(wav, sr), audio_path, track, sr
@@ -0,0 +1,90 @@
+"""
+Wav2Lip 후처리 합성기
+
+예측된 입 영역을 원본 프레임에 페더링 마스크로 합성한다.
+- 페더링 마스크는 (w, h)에만 의존하므로 크기별로 한 번만 만들어 캐시
+- 블렌딩은 8bit 고정소수점(uint16 누산)으로 float 변환 없이 계산
+- 크기별 리사이즈/누산 버퍼를 재사용하고 원본 프레임 영역에 직접 기록 (프레임당 임시 배열 할당 없음)
+"""
+
+import cv2
+import numpy as np
+
+# 마스크 가중치 정밀도 (256 = 1.0)
+_FIXED_ONE = 256
+_FIXED_SHIFT = 8
+
+
+def feather_mask(width, height):
+	"""(height, width) float32 페더링 마스크 (가장자리 feather_amount 픽셀에서 선형 감쇠)"""
+	feather_amount = min(15, max(5, width // 15, height // 15))
+	mask = np.ones((height, width), dtype=np.float32)
+	fade_range = np.arange(feather_amount, dtype=np.float32) / feather_amount
+
+	mask[:feather_amount, :] *= fade_range[:, np.newaxis]
+	mask[-feather_amount:, :] *= fade_range[::-1, np.newaxis]
+	mask[:, :feather_amount] *= fade_range[np.newaxis, :]
+	mask[:, -feather_amount:] *= fade_range[np.newaxis, ::-1]
+	return mask
+
+
+class _SizeSlot:
+	"""한 (w, h) 크기에 대한 고정소수점 마스크와 재사용 버퍼"""
+
+	__slots__ = ('weight', 'inv_weight', 'resized', 'acc', 'tmp')
+
+	def __init__(self, width, height):
+		mask = np.rint(feather_mask(width, height) * _FIXED_ONE).astype(np.uint16)
+		# 채널 축까지 펼쳐 두면 (h, w, 1) broadcasting보다 ufunc가 훨씬 빠름
+		self.weight = np.ascontiguousarray(np.repeat(mask[:, :, np.newaxis], 3, axis=2))
+		self.inv_weight = _FIXED_ONE - self.weight
+		self.resized = np.empty((height, width, 3), dtype=np.uint8)
+		self.acc = np.empty((height, width, 3), dtype=np.uint16)
+		self.tmp = np.empty((height, width, 3), dtype=np.uint16)
+
+
+class FeatherCompositor:
+	"""
+	페더링 합성기 (스레드당/요청당 하나씩 사용, 버퍼를 공유하므로 스레드 안전하지 않음)
+
+	한 클립 안에서 얼굴 박스 크기는 스무딩 후 몇 가지 값만 나오므로 크기별 슬롯을 캐시한다.
+	"""
+
+	def __init__(self, max_cached_sizes=64):
+		self.max_cached_sizes = max_cached_sizes
+		self._slots = {}
+
+	def _slot(self, width, height):
+		slot = self._slots.get((width, height))
+		if slot is None:
+			if len(self._slots) >= self.max_cached_sizes:
+				self._slots.clear()
+			slot = self._slots[(width, height)] = _SizeSlot(width, height)
+		return slot
+
+	def blend(self, p, f, c):
+		"""
+		uint8 예측 p를 프레임 f의 c=(y1, y2, x1, x2) 영역에 합성 (f를 in-place 수정하고 반환)
+
+		결과 = (p * w + f * (256 - w)) >> 8, w = round(mask * 256)
+		"""
+		y1, y2, x1, x2 = int(c[0]), int(c[1]), int(c[2]), int(c[3])
+		width, height = x2 - x1, y2 - y1
+		slot = self._slot(width, height)
+
+		cv2.resize(p, (width, height), dst=slot.resized)
+		region = f[y1:y2, x1:x2]
+		np.multiply(slot.resized, slot.weight, out=slot.acc)
+		np.multiply(region, slot.inv_weight, out=slot.tmp)
+		np.add(slot.acc, slot.tmp, out=slot.acc)
+		np.right_shift(slot.acc, _FIXED_SHIFT, out=slot.acc)
+		np.copyto(region, slot.acc, casting='unsafe')
+		return f
+
+	def composite_batch(self, pred, frames, coords, write):
+		"""배치 예측을 한 번에 uint8로 변환한 뒤 프레임별로 합성하여 write(frame) 호출"""
+		pred = np.asarray(pred)
+		if pred.dtype != np.uint8:
+			pred = pred.astype(np.uint8)
+		for p, f, c in zip(pred, frames, coords):
+			write(self.blend(p, f, c))
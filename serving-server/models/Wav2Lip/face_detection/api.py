@@ -57,6 +57,21 @@ class FaceAlignment:
             torch.backends.cudnn.benchmark = True
 
         # Get the face detector
+        # SCRFD ONNX 배치 감지기: 모델 파일/onnxruntime이 없으면 insightface SCRFD로 fallback
+        if face_detector == 'scrfd_onnx':
+            try:
+                from .detection.scrfd_onnx import FaceDetector as SCRFDOnnxDetector
+                self.face_detector = SCRFDOnnxDetector(device=device, verbose=verbose)
+                return
+            except Exception as e:
+                if verbose:
+                    import warnings
+                    warnings.warn(
+                        f"SCRFD ONNX detector initialization failed ({type(e).__name__}: {e}). "
+                        "Falling back to insightface SCRFD detector."
+                    )
+                face_detector = 'scrfd'
+
         # If SCRFD is requested but insightface is not available, fallback to SFD
         if face_detector == 'scrfd':
             try:
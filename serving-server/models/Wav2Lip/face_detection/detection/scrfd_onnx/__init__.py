@@ -0,0 +1 @@
+from .scrfd_onnx_detector import SCRFDOnnxDetector as FaceDetector
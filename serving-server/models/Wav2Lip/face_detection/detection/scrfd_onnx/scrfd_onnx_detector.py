@@ -0,0 +1,277 @@
+"""
+SCRFD ONNX Batch Face Detector
+insightface FaceAnalysis 없이 SCRFD detection ONNX 모델을 직접 로드하여 배치 단위로 감지
+
+- ONNX 세션 / 입출력 이름 / anchor 구성은 생성 시 한 번만 결정
+- letterbox 전처리, anchor decode는 배치 전체에 대해 NumPy로 벡터화
+- 입력 batch 축이 1로 고정된 모델(buffalo_l det_10g.onnx 등)은 동적 batch 축으로 변환한 사본을 사용
+"""
+
+import os
+import cv2
+import numpy as np
+
+from ..core import FaceDetector
+
+ONNXRUNTIME_AVAILABLE = False
+IMPORT_ERROR = None
+
+try:
+    import onnxruntime
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError as e:
+    IMPORT_ERROR = str(e)
+
+# insightface FaceAnalysis(name='buffalo_l')가 내려받는 SCRFD detection 모델
+DEFAULT_MODEL_PATH = os.path.join(os.path.expanduser('~'), '.insightface', 'models', 'buffalo_l', 'det_10g.onnx')
+
+# 출력 개수 -> (feature map 수, feature map 위치당 anchor 수) (insightface SCRFD와 동일)
+_OUTPUT_LAYOUTS = {
+    6: (3, 2),    # scores/bboxes x 3 strides
+    9: (3, 2),    # + keypoints
+    10: (5, 1),
+    15: (5, 1),
+}
+_STRIDES = {3: [8, 16, 32], 5: [8, 16, 32, 64, 128]}
+
+
+def make_batch_dynamic(model_path, output_path):
+    """입력 batch 축이 1로 고정된 ONNX 모델을 동적 batch 축으로 바꿔 저장"""
+    import onnx
+
+    model = onnx.load(model_path)
+    for tensor in model.graph.input:
+        dim = tensor.type.tensor_type.shape.dim[0]
+        dim.ClearField('dim_value')
+        dim.dim_param = 'batch'
+    for tensor in model.graph.output:
+        dim = tensor.type.tensor_type.shape.dim[0]
+        dim.ClearField('dim_value')
+        dim.dim_param = 'n'
+    # 중간 텐서 shape 정보는 batch=1 기준이므로 제거 (onnxruntime이 다시 추론)
+    del model.graph.value_info[:]
+    onnx.save(model, output_path)
+    return output_path
+
+
+def nms(dets, thresh):
+    """score 내림차순 정렬된 [x1, y1, x2, y2, score] 배열의 NMS (insightface SCRFD.nms와 동일)"""
+    x1, y1, x2, y2 = dets[:, 0], dets[:, 1], dets[:, 2], dets[:, 3]
+    areas = (x2 - x1 + 1) * (y2 - y1 + 1)
+    order = np.arange(len(dets))
+
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        xx1 = np.maximum(x1[i], x1[order[1:]])
+        yy1 = np.maximum(y1[i], y1[order[1:]])
+        xx2 = np.minimum(x2[i], x2[order[1:]])
+        yy2 = np.minimum(y2[i], y2[order[1:]])
+
+        w = np.maximum(0.0, xx2 - xx1 + 1)
+        h = np.maximum(0.0, yy2 - yy1 + 1)
+        inter = w * h
+        ovr = inter / (areas[i] + areas[order[1:]] - inter)
+        order = order[np.where(ovr <= thresh)[0] + 1]
+    return keep
+
+
+class SCRFDOnnxDetector(FaceDetector):
+    """
+    SCRFD ONNX Batch Face Detector
+
+    detect_from_batch는 RGB 이미지 배치(FaceAlignment.get_detections_for_batch 입력)를 받아
+    이미지별 [x1, y1, x2, y2, score] 배열을 score 내림차순으로 반환한다.
+    """
+
+    def __init__(self, device, path_to_detector=None, verbose=True, det_size=(640, 640),
+                 det_thresh=0.5, nms_thresh=0.4, max_batch_size=32, providers=None):
+        super(SCRFDOnnxDetector, self).__init__(device, verbose)
+
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError(f"onnxruntime is required for SCRFD ONNX detector: {IMPORT_ERROR}")
+
+        model_path = path_to_detector or os.environ.get('SCRFD_ONNX_PATH') or DEFAULT_MODEL_PATH
+        if not os.path.isfile(model_path):
+            raise RuntimeError(f"SCRFD ONNX model not found: {model_path}")
+
+        self.det_thresh = det_thresh
+        self.nms_thresh = nms_thresh
+        self.max_batch_size = max_batch_size
+
+        if providers is None:
+            available = onnxruntime.get_available_providers()
+            if 'cuda' in device and 'CUDAExecutionProvider' in available:
+                providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
+            else:
+                providers = ['CPUExecutionProvider']
+
+        self.model_path = self._resolve_batched_model(model_path)
+        self.session = onnxruntime.InferenceSession(self.model_path, providers=providers)
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.output_names = [o.name for o in self.session.get_outputs()]
+        self.batched = not isinstance(model_input.shape[0], int) or model_input.shape[0] != 1
+
+        # 입력 해상도가 고정된 모델은 그 크기를 사용
+        height, width = model_input.shape[2], model_input.shape[3]
+        if isinstance(height, int) and isinstance(width, int):
+            self.input_size = (width, height)
+        else:
+            self.input_size = tuple(det_size)
+
+        if len(self.output_names) not in _OUTPUT_LAYOUTS:
+            raise RuntimeError(f"Unsupported SCRFD ONNX outputs: {len(self.output_names)}")
+        self._fmc, self._num_anchors = _OUTPUT_LAYOUTS[len(self.output_names)]
+        self._strides = _STRIDES[self._fmc]
+        self._anchor_centers = [self._build_anchor_centers(stride) for stride in self._strides]
+
+        # 해상도별 letterbox 크기 캐시 (영상 프레임은 모두 같은 크기)
+        self._letterbox_cache = {}
+
+        if self.verbose:
+            print(f"[SCRFD ONNX] Loaded {self.model_path} (providers={self.session.get_providers()}, "
+                  f"input={self.input_size}, batched={self.batched})")
+
+    def _resolve_batched_model(self, model_path):
+        """입력 batch 축이 1로 고정되어 있으면 동적 batch 사본(<name>_dynamic.onnx)을 만들어 사용"""
+        session = onnxruntime.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+        batch_dim = session.get_inputs()[0].shape[0]
+        del session
+        if not (isinstance(batch_dim, int) and batch_dim == 1):
+            return model_path
+
+        dynamic_path = os.path.splitext(model_path)[0] + '_dynamic.onnx'
+        if os.path.isfile(dynamic_path):
+            return dynamic_path
+        try:
+            make_batch_dynamic(model_path, dynamic_path)
+            if self.verbose:
+                print(f"[SCRFD ONNX] Converted to dynamic batch model: {dynamic_path}")
+            return dynamic_path
+        except Exception as e:
+            # onnx 미설치 / 쓰기 권한 없음: 이미지 단위 실행 (전처리/decode는 동일하게 벡터화)
+            if self.verbose:
+                print(f"[SCRFD ONNX] ⚠️ Could not convert to dynamic batch ({e}), running one image per call")
+            return model_path
+
+    def _build_anchor_centers(self, stride):
+        """stride별 anchor 중심 좌표 (N, 2) [x, y] - 입력 해상도 고정이므로 한 번만 계산"""
+        width, height = self.input_size
+        ys, xs = np.mgrid[:height // stride, :width // stride]
+        centers = (np.stack([xs, ys], axis=-1).astype(np.float32) * stride).reshape(-1, 2)
+        if self._num_anchors > 1:
+            centers = np.repeat(centers, self._num_anchors, axis=0)
+        return centers
+
+    def _letterbox(self, images):
+        """
+        비율 유지 리사이즈 후 좌상단 정렬로 입력 크기에 배치하고 정규화
+
+        Returns:
+            (blob (B, 3, H, W) float32, 이미지별 scale (B,))
+        """
+        det_w, det_h = self.input_size
+        canvas = np.zeros((len(images), det_h, det_w, 3), dtype=np.uint8)
+        scales = np.empty(len(images), dtype=np.float32)
+
+        for i, image in enumerate(images):
+            h, w = image.shape[:2]
+            if (h, w) not in self._letterbox_cache:
+                if h / w > det_h / det_w:
+                    new_h = det_h
+                    new_w = int(new_h * w / h)
+                else:
+                    new_w = det_w
+                    new_h = int(new_w * h / w)
+                self._letterbox_cache[(h, w)] = (new_w, new_h, new_h / h)
+            new_w, new_h, scales[i] = self._letterbox_cache[(h, w)]
+            canvas[i, :new_h, :new_w] = cv2.resize(image, (new_w, new_h))
+
+        # (x - 127.5) / 128 정규화와 NHWC -> NCHW 변환을 배치 전체에 한 번에 적용
+        blob = np.empty((len(images), 3, det_h, det_w), dtype=np.float32)
+        np.subtract(canvas.transpose(0, 3, 1, 2), 127.5, out=blob)
+        blob *= 1.0 / 128.0
+        return blob, scales
+
+    def _decode(self, outputs, batch_size):
+        """
+        stride별 출력을 배치 단위로 decode
+
+        Returns:
+            (scores (B, N), boxes (B, N, 4)) - 입력 해상도 좌표
+        """
+        scores, boxes = [], []
+        for idx, stride in enumerate(self._strides):
+            # 배치 출력 (B, N, C)와 batch 축이 합쳐진 출력 (B*N, C) 모두 처리
+            level_scores = outputs[idx].reshape(batch_size, -1)
+            distances = outputs[idx + self._fmc].reshape(batch_size, -1, 4) * stride
+            centers = self._anchor_centers[idx]
+            level_boxes = np.concatenate([centers - distances[..., :2], centers + distances[..., 2:]], axis=-1)
+            scores.append(level_scores)
+            boxes.append(level_boxes)
+        return np.concatenate(scores, axis=1), np.concatenate(boxes, axis=1)
+
+    def _run(self, blob):
+        if self.batched:
+            return self.session.run(self.output_names, {self.input_name: blob})
+        # 고정 batch=1 모델: 이미지 단위 실행 후 batch 축으로 결합
+        per_image = [self.session.run(self.output_names, {self.input_name: blob[i:i + 1]}) for i in range(len(blob))]
+        return [np.concatenate([outs[k] for outs in per_image], axis=0) for k in range(len(self.output_names))]
+
+    def _detect_chunk(self, images):
+        blob, scales = self._letterbox(images)
+        try:
+            outputs = self._run(blob)
+        except Exception as e:
+            if not self.batched:
+                raise
+            # 변환한 모델이 batch > 1을 지원하지 않는 경우 (reshape 상수 등): 이미지 단위 실행으로 전환
+            if self.verbose:
+                print(f"[SCRFD ONNX] ⚠️ Batched run failed ({e}), falling back to one image per call")
+            self.batched = False
+            outputs = self._run(blob)
+
+        scores, boxes = self._decode(outputs, len(images))
+
+        results = []
+        for i in range(len(images)):
+            mask = scores[i] >= self.det_thresh
+            if not np.any(mask):
+                results.append(np.zeros((0, 5), dtype=np.float32))
+                continue
+            dets = np.hstack([boxes[i][mask] / scales[i], scores[i][mask, None]]).astype(np.float32)
+            dets = dets[np.argsort(dets[:, 4])[::-1]]
+            results.append(dets[nms(dets, self.nms_thresh)])
+        return results
+
+    def detect_from_image(self, tensor_or_path):
+        """Detect faces from a single BGR image"""
+        image = self.tensor_or_path_to_ndarray(tensor_or_path, rgb=False)
+        return [list(d) for d in self._detect_chunk([image[..., ::-1]])[0]]
+
+    def detect_from_batch(self, images):
+        """Detect faces from a batch of RGB images (max_batch_size 단위로 한 번의 session.run)"""
+        if len(images) == 0:
+            return []
+        results = []
+        for start in range(0, len(images), self.max_batch_size):
+            results.extend(self._detect_chunk(images[start:start + self.max_batch_size]))
+        return results
+
+    @property
+    def reference_scale(self):
+        """Reference scale for face alignment (SCRFD specific)"""
+        return 195
+
+    @property
+    def reference_x_shift(self):
+        """Reference x shift for face alignment"""
+        return 0
+
+    @property
+    def reference_y_shift(self):
+        """Reference y shift for face alignment"""
+        return 0
@@ -0,0 +1,209 @@
+"""
+Wav2Lip mel 엔진
+
+audio.melspectrogram과 같은 mel을 계산하되
+- STFT 창과 mel filterbank를 한 번만 만들어 재사용 (NumPy rfft 또는 지정 device의 torch.stft)
+- 16프레임 mel chunk를 sliding window view로 만들어 chunk마다 복사하지 않음
+- 같은 가이드 오디오(파일 digest + 배속)의 mel과 배속 트랙을 메모리 LRU에 캐시 (재제출 시 Step 1 생략)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import audio
+from hparams import hparams as hp
+
+MEL_STEP_SIZE = 16
+
+# mel 계산 로직/hparams가 바뀌면 올려서 이전 캐시를 무효화
+MEL_CACHE_VERSION = 1
+_DIGEST_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def chunk_starts(n_frames, fps, step=MEL_STEP_SIZE):
+	"""
+	비디오 프레임 i에 대응하는 mel chunk 시작 인덱스 (기존 mel_chunks 루프와 동일)
+
+	int(i * 80 / fps) + step이 mel 길이를 넘기 전까지 + 마지막 chunk는 끝에 맞춤
+	"""
+	if n_frames < step:
+		raise ValueError(f'Audio too short: {n_frames} mel frames < {step}')
+	mult = 80. / fps
+	candidates = (np.arange(int((n_frames - step) / mult) + 2) * mult).astype(np.int64)
+	starts = candidates[candidates + step <= n_frames]
+	return np.append(starts, n_frames - step)
+
+
+class MelChunks:
+	"""
+	mel chunk 시퀀스 (기존 mel_chunks 리스트 대체)
+
+	각 항목은 mel의 (num_mels, step) view이고 전체가 하나의 sliding window view를 공유한다.
+	"""
+
+	def __init__(self, mel, fps, step=MEL_STEP_SIZE):
+		self.mel = mel
+		self.starts = chunk_starts(mel.shape[1], fps, step)
+		# (T - step + 1, num_mels, step) view
+		self.windows = sliding_window_view(mel, step, axis=1).transpose(1, 0, 2)
+
+	def __len__(self):
+		return len(self.starts)
+
+	def __getitem__(self, i):
+		return self.windows[self.starts[i]]
+
+	def __iter__(self):
+		for start in self.starts:
+			yield self.windows[start]
+
+
+class MelEngine:
+	"""
+	창/filterbank를 캐시한 mel spectrogram 계산기 (hparams 기준, audio.melspectrogram과 같은 결과)
+
+	device가 'cuda' 등이면 STFT와 mel 투영을 torch로 해당 device에서 실행한다.
+	"""
+
+	def __init__(self, device=None):
+		self.device = device
+		self.n_fft = hp.n_fft
+		self.hop = audio.get_hop_size()
+		win_size = hp.win_size or hp.n_fft
+		# librosa.stft 기본 창: periodic Hann을 n_fft 중앙에 배치
+		window = np.zeros(self.n_fft, dtype=np.float32)
+		offset = (self.n_fft - win_size) // 2
+		window[offset:offset + win_size] = np.hanning(win_size + 1)[:-1]
+		self.window = window
+		self.mel_basis = audio._build_mel_basis().astype(np.float32)
+		self._min_level = np.float32(np.exp(hp.min_level_db / 20 * np.log(10)))
+
+		self._torch_window = None
+		self._torch_basis = None
+		if device is not None and device != 'cpu':
+			import torch
+			self._torch_window = torch.from_numpy(window[offset:offset + win_size].copy()).to(device)
+			self._torch_basis = torch.from_numpy(self.mel_basis).to(device)
+
+	def _magnitude_numpy(self, y):
+		"""center=True, zero padding STFT 크기 (n_fft // 2 + 1, n_frames)"""
+		pad = self.n_fft // 2
+		y = np.pad(y.astype(np.float32, copy=False), pad, mode='constant')
+		frames = sliding_window_view(y, self.n_fft)[::self.hop]
+		return np.abs(np.fft.rfft(frames * self.window, axis=1)).T.astype(np.float32)
+
+	def _mel_torch(self, y):
+		import torch
+		y = torch.from_numpy(np.ascontiguousarray(y, dtype=np.float32)).to(self.device)
+		spec = torch.stft(
+			y, n_fft=self.n_fft, hop_length=self.hop, win_length=self._torch_window.shape[0],
+			window=self._torch_window, center=True, pad_mode='constant', return_complex=True
+		)
+		mel = self._torch_basis @ spec.abs()
+		return mel.cpu().numpy()
+
+	def melspectrogram(self, wav):
+		"""audio.melspectrogram과 같은 정규화 mel (num_mels, T)"""
+		y = audio.preemphasis(wav, hp.preemphasis, hp.preemphasize)
+		if self._torch_basis is not None:
+			mel = self._mel_torch(y)
+		else:
+			mel = self.mel_basis @ self._magnitude_numpy(y)
+		S = 20 * np.log10(np.maximum(self._min_level, mel)) - hp.ref_level_db
+		if hp.signal_normalization:
+			return audio._normalize(S).astype(np.float32, copy=False)
+		return S.astype(np.float32, copy=False)
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_mel_engine(device=None):
+	"""device별 MelEngine 싱글턴 (창/filterbank 재사용)"""
+	with _engines_lock:
+		engine = _engines.get(device)
+		if engine is None:
+			engine = _engines[device] = MelEngine(device)
+		return engine
+
+
+class MelCache:
+	"""
+	가이드 오디오 mel 메모리 캐시 (LRU, 총 바이트 제한)
+
+	값은 (mel, 배속 트랙 float32 또는 None, 샘플레이트). 배속 트랙은 hit 시 mux용 WAV를 다시 쓰는 데 사용한다.
+	"""
+
+	def __init__(self, max_bytes=64 * 1024 * 1024):
+		self.max_bytes = max_bytes
+		self._lock = threading.Lock()
+		self._entries = OrderedDict()  # key -> (mel, track, sr, size_bytes)
+		self._bytes = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	@staticmethod
+	def audio_digest(path):
+		"""오디오 파일 내용의 digest (경로/파일명과 무관)"""
+		hasher = hashlib.blake2b()
+		with open(path, 'rb') as f:
+			for chunk in iter(lambda: f.read(_DIGEST_CHUNK_SIZE), b''):
+				hasher.update(chunk)
+		return hasher.hexdigest()
+
+	@staticmethod
+	def make_key(digest, audio_speed):
+		"""캐시 키: 오디오 파일 digest + 배속 + mel 파라미터"""
+		params = 'v{}|{}|{}|{}|{}|{}'.format(MEL_CACHE_VERSION, float(audio_speed), hp.n_fft, hp.hop_size, hp.num_mels, hp.sample_rate)
+		return '{}_{}'.format(digest, hashlib.sha1(params.encode()).hexdigest()[:12])
+
+	def get(self, key):
+		"""(mel, track, sr) 또는 None"""
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				self.misses += 1
+				return None
+			self._entries.move_to_end(key)
+			self.hits += 1
+			return entry[:3]
+
+	def put(self, key, mel, track, sr):
+		mel = np.ascontiguousarray(mel)
+		if track is not None:
+			track = np.ascontiguousarray(track, dtype=np.float32)
+			track.setflags(write=False)
+		size = mel.nbytes + (track.nbytes if track is not None else 0)
+		if size > self.max_bytes:
+			return
+		mel.setflags(write=False)
+		with self._lock:
+			old = self._entries.pop(key, None)
+			if old is not None:
+				self._bytes -= old[3]
+			self._entries[key] = (mel, track, sr, size)
+			self._bytes += size
+			while self._bytes > self.max_bytes:
+				_, evicted = self._entries.popitem(last=False)
+				self._bytes -= evicted[3]
+				self.evictions += 1
+
+	def stats(self):
+		"""hit/miss 카운터와 현재 사용량"""
+		with self._lock:
+			lookups = self.hits + self.misses
+			return {
+				'entries': len(self._entries),
+				'bytes': self._bytes,
+				'max_bytes': self.max_bytes,
+				'hits': self.hits,
+				'misses': self.misses,
+				'hit_rate': (self.hits / lookups) if lookups else 0.0,
+				'evictions': self.evictions,
+			}
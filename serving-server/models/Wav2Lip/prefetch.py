@@ -0,0 +1,197 @@
+"""
+Wav2Lip inference 루프 파이프라이닝
+
+- BackgroundIterator: 배치 제너레이터(datagen: 디코딩/얼굴 crop/리사이즈)를 백그라운드 스레드에서 미리 생성
+- CudaBatchRunner: pinned host 버퍼 + 전용 CUDA stream으로 H2D 복사 → forward → D2H 복사를 비동기 실행
+  (슬롯 2개를 번갈아 써서 배치 i+1이 GPU에서 도는 동안 CPU는 배치 i를 합성)
+- ThreadBatchRunner: CPU 전용 호스트 / 요청 간 스케줄러(predict_fn)용. 같은 submit/result 인터페이스를 단일 워커 스레드로 제공
+
+submit()은 바로 반환하고 result()에서 완료를 기다린다. 결과는 합성에 바로 쓰는 (N, H, W, 3) 배열.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+
+_END = object()
+
+
+class BackgroundIterator:
+	"""
+	이터레이터를 백그라운드 스레드에서 depth개까지 미리 소비 (예외는 소비 쪽에서 다시 발생)
+
+	produce_time: 생성에 걸린 누적 시간 (백그라운드), wait_time: 소비 쪽이 다음 항목을 기다린 누적 시간
+	"""
+
+	def __init__(self, iterable, depth=2):
+		self._queue = queue.Queue(maxsize=max(1, depth))
+		self._stop = threading.Event()
+		self.produce_time = 0.0
+		self.wait_time = 0.0
+		self._thread = threading.Thread(target=self._run, args=(iter(iterable),), name='wav2lip-prefetch', daemon=True)
+		self._thread.start()
+
+	def _put(self, item):
+		"""소비 쪽이 close()하면 버리고 종료할 수 있도록 timeout을 두고 넣음"""
+		while not self._stop.is_set():
+			try:
+				self._queue.put(item, timeout=0.1)
+				return True
+			except queue.Full:
+				continue
+		return False
+
+	def _run(self, iterator):
+		try:
+			while not self._stop.is_set():
+				start = time.perf_counter()
+				try:
+					item = next(iterator)
+				except StopIteration:
+					break
+				self.produce_time += time.perf_counter() - start
+				if not self._put(item):
+					return
+			self._put(_END)
+		except BaseException as e:  # 소비 쪽에 그대로 전달
+			self._put((_END, e))
+		finally:
+			close = getattr(iterator, 'close', None)
+			if close is not None:
+				close()
+
+	def __iter__(self):
+		return self
+
+	def __next__(self):
+		start = time.perf_counter()
+		item = self._queue.get()
+		self.wait_time += time.perf_counter() - start
+		if item is _END:
+			raise StopIteration
+		if isinstance(item, tuple) and len(item) == 2 and item[0] is _END:
+			raise item[1]
+		return item
+
+	def close(self):
+		"""생성 스레드 중단 (소비 도중 오류가 난 경우)"""
+		self._stop.set()
+		self._thread.join(timeout=5)
+
+
+class _Slot:
+	"""pinned host 입력/출력 버퍼 한 벌 (더 큰 배치가 오거나 입력 모양이 바뀔 때만 다시 할당)"""
+
+	__slots__ = ('capacity', 'shapes', 'img', 'mel', 'out', 'start', 'done')
+
+	def __init__(self):
+		self.capacity = 0
+		self.shapes = None
+
+
+class _CudaPending:
+	__slots__ = ('runner', 'slot', 'n')
+
+	def __init__(self, runner, slot, n):
+		self.runner = runner
+		self.slot = slot
+		self.n = n
+
+	def result(self):
+		self.slot.done.synchronize()
+		self.runner.forward_time += self.slot.start.elapsed_time(self.slot.done) / 1000.0
+		return self.slot.out[:self.n].numpy()
+
+
+class CudaBatchRunner:
+	"""
+	pinned 메모리 + 비동기 복사 기반 Wav2Lip forward
+
+	입력은 datagen의 (N, 96, 96, 6) 0~1 배열과 (N, 80, 16, 1) mel 배열.
+	CPU에서 pinned 버퍼로 dtype 변환 복사 → 전용 stream에서 non_blocking H2D, 채널 순서 변환,
+	forward, 0~255 uint8 변환 (compositor와 같은 절삭) → non_blocking D2H.
+
+	result()가 돌려주는 배열은 pinned 버퍼의 view이므로 slots개 뒤의 submit 전까지만 유효하다
+	(inference 루프는 합성을 마친 뒤 다음 배치를 제출하므로 안전).
+	"""
+
+	def __init__(self, model, device='cuda', slots=2):
+		self.model = model
+		self.device = torch.device(device)
+		self.dtype = next(model.parameters()).dtype
+		self.stream = torch.cuda.Stream(device=self.device)
+		self._slots = [_Slot() for _ in range(slots)]
+		self._next = 0
+		self.forward_time = 0.0  # GPU에서 H2D + forward + D2H에 걸린 누적 시간 (CUDA event)
+
+	@staticmethod
+	def available(device):
+		return str(device).startswith('cuda') and torch.cuda.is_available()
+
+	def _prepare_slot(self, slot, img_shape, mel_shape):
+		n = img_shape[0]
+		shapes = (img_shape[1:], mel_shape[1:])
+		if slot.shapes == shapes and n <= slot.capacity:
+			return
+		h, w = img_shape[1:3]
+		slot.img = torch.empty((n, *img_shape[1:]), dtype=self.dtype, pin_memory=True)
+		slot.mel = torch.empty((n, *mel_shape[1:]), dtype=self.dtype, pin_memory=True)
+		slot.out = torch.empty((n, h, w, 3), dtype=torch.uint8, pin_memory=True)
+		slot.start = torch.cuda.Event(enable_timing=True)
+		slot.done = torch.cuda.Event(enable_timing=True)
+		slot.capacity, slot.shapes = n, shapes
+
+	def submit(self, img_batch, mel_batch):
+		slot = self._slots[self._next]
+		self._next = (self._next + 1) % len(self._slots)
+		n = len(img_batch)
+		if slot.shapes is not None:
+			# 이전 사용이 끝나기 전에 pinned 버퍼를 덮어쓰지 않음
+			slot.done.synchronize()
+		self._prepare_slot(slot, img_batch.shape, mel_batch.shape)
+		np.copyto(slot.img[:n].numpy(), img_batch, casting='unsafe')
+		np.copyto(slot.mel[:n].numpy(), mel_batch, casting='unsafe')
+
+		with torch.cuda.stream(self.stream), torch.no_grad():
+			slot.start.record(self.stream)
+			img = slot.img[:n].to(self.device, non_blocking=True).permute(0, 3, 1, 2)
+			mel = slot.mel[:n].to(self.device, non_blocking=True).permute(0, 3, 1, 2)
+			if self.dtype == torch.float16:
+				with torch.amp.autocast('cuda'):
+					pred = self.model(mel, img)
+			else:
+				pred = self.model(mel, img)
+			pred = (pred.float().permute(0, 2, 3, 1) * 255.).to(torch.uint8)
+			slot.out[:n].copy_(pred, non_blocking=True)
+			slot.done.record(self.stream)
+		return _CudaPending(self, slot, n)
+
+	def run(self, img_batch, mel_batch):
+		"""동기 실행 (요청 간 스케줄러 forward용). 반환 배열은 복사본"""
+		return self.submit(img_batch, mel_batch).result().copy()
+
+
+class ThreadBatchRunner:
+	"""predict(img_batch, mel_batch)를 단일 워커 스레드에서 실행 (CPU 전용 / 스케줄러 경로)"""
+
+	def __init__(self, predict):
+		self._predict = predict
+		self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='wav2lip-forward')
+		self.forward_time = 0.0
+
+	def _timed(self, img_batch, mel_batch):
+		start = time.perf_counter()
+		try:
+			return self._predict(img_batch, mel_batch)
+		finally:
+			self.forward_time += time.perf_counter() - start
+
+	def submit(self, img_batch, mel_batch):
+		return self._executor.submit(self._timed, img_batch, mel_batch)
+
+	def close(self):
+		self._executor.shutdown(wait=True)
@@ -0,0 +1,177 @@
+"""
+Wav2Lip forward 배치 크기 bucketing (torch.compile / CUDA graph 재컴파일 방지)
+
+torch.compile(mode='reduce-overhead')는 입력 shape마다 그래프를 새로 캡처한다.
+datagen의 마지막 배치, 요청 간 스케줄러가 합친 배치 등은 크기가 제각각이므로
+BucketedModel이 배치를 고정된 bucket 크기(2의 거듭제곱 ~ 최대 배치)로 0 패딩해 실행하고
+패딩 부분의 출력은 버린다. bucket보다 큰 배치는 최대 bucket 단위로 나눠 실행한다.
+
+CUDA graph 재생 출력은 같은 bucket을 다시 실행하면 덮어써지므로 나눠 실행한 chunk 출력은 복사해서 합친다.
+"""
+
+import threading
+import time
+from collections import deque
+
+import torch
+
+
+# torch.compile CUDA graph의 새 iteration 표시 (이전 재생 출력을 덮어써도 된다고 알림, 없는 버전은 None)
+_cudagraph_mark_step_begin = getattr(getattr(torch, "compiler", None), "cudagraph_mark_step_begin", None)
+
+
+def bucket_sizes(max_batch):
+	"""2의 거듭제곱 bucket + max_batch (예: 48 → [1, 2, 4, 8, 16, 32, 48])"""
+	max_batch = max(1, int(max_batch))
+	sizes = []
+	size = 1
+	while size < max_batch:
+		sizes.append(size)
+		size *= 2
+	sizes.append(max_batch)
+	return sizes
+
+
+class _BucketStats:
+	__slots__ = ("calls", "frames", "padded_frames", "timed", "total_ms", "max_ms", "last_ms")
+
+	def __init__(self):
+		self.calls = 0
+		self.frames = 0
+		self.padded_frames = 0
+		self.timed = 0
+		self.total_ms = 0.0
+		self.max_ms = 0.0
+		self.last_ms = 0.0
+
+
+class BucketedModel:
+	"""
+	model(mel, img)을 bucket 크기로 패딩해 실행하는 래퍼 (nn.Module처럼 호출 / parameters() 지원)
+
+	반환값은 다음 호출 전까지만 유효할 수 있으므로 (CUDA graph 출력 버퍼) 호출 측은 바로 복사/전송해야 한다.
+
+	per-batch 지연은 CUDA event로 기록하고 metrics() 호출 시 완료된 것만 집계하므로
+	forward 경로에 동기화를 추가하지 않는다.
+	"""
+
+	_MAX_PENDING_EVENTS = 256
+
+	def __init__(self, model, buckets):
+		self.model = model
+		self.buckets = sorted(set(int(b) for b in buckets))
+		self._lock = threading.Lock()
+		self._stats = {b: _BucketStats() for b in self.buckets}
+		self._shapes = set()  # 모델에 실제로 들어간 입력 shape (bucket당 한 번이어야 정상)
+		self._pending_events = deque()  # (bucket, start_event, end_event)
+
+	def parameters(self):
+		return self.model.parameters()
+
+	def bucket_for(self, n):
+		"""n 이상인 가장 작은 bucket (최대 bucket보다 크면 최대 bucket)"""
+		for bucket in self.buckets:
+			if n <= bucket:
+				return bucket
+		return self.buckets[-1]
+
+	def __call__(self, mel, img):
+		n = mel.shape[0]
+		largest = self.buckets[-1]
+		if n > largest:
+			# 각 chunk 출력은 다음 chunk의 graph 재생에 덮어써지므로 복사
+			return torch.cat([
+				self(mel[i:i + largest], img[i:i + largest]).clone() for i in range(0, n, largest)
+			], dim=0)
+
+		bucket = self.bucket_for(n)
+		if bucket > n:
+			mel = torch.cat([mel, mel.new_zeros((bucket - n, *mel.shape[1:]))], dim=0)
+			img = torch.cat([img, img.new_zeros((bucket - n, *img.shape[1:]))], dim=0)
+
+		if _cudagraph_mark_step_begin is not None:
+			_cudagraph_mark_step_begin()
+		start = self._start_timer(mel)
+		pred = self.model(mel, img)
+		self._record(bucket, n, tuple(mel.shape), tuple(img.shape), start, pred)
+		return pred[:n]
+
+	@staticmethod
+	def _start_timer(tensor):
+		if tensor.is_cuda:
+			event = torch.cuda.Event(enable_timing=True)
+			event.record()
+			return event
+		return time.perf_counter()
+
+	def _record(self, bucket, n, mel_shape, img_shape, start, pred):
+		if isinstance(start, float):
+			elapsed_ms = (time.perf_counter() - start) * 1000
+			end = None
+		else:
+			end = torch.cuda.Event(enable_timing=True)
+			end.record()
+		with self._lock:
+			stats = self._stats[bucket]
+			stats.calls += 1
+			stats.frames += n
+			stats.padded_frames += bucket - n
+			self._shapes.add((mel_shape, img_shape, str(pred.dtype)))
+			if end is None:
+				self._add_latency(stats, elapsed_ms)
+			else:
+				self._pending_events.append((bucket, start, end))
+				if len(self._pending_events) > self._MAX_PENDING_EVENTS:
+					self._drain_events()
+
+	@staticmethod
+	def _add_latency(stats, elapsed_ms):
+		stats.timed += 1
+		stats.total_ms += elapsed_ms
+		stats.max_ms = max(stats.max_ms, elapsed_ms)
+		stats.last_ms = elapsed_ms
+
+	def _drain_events(self):
+		"""완료된 CUDA event 쌍만 지연 시간으로 집계 (락 보유 상태에서 호출)"""
+		remaining = deque()
+		while self._pending_events:
+			bucket, start, end = self._pending_events.popleft()
+			if end.query():
+				self._add_latency(self._stats[bucket], start.elapsed_time(end))
+			elif len(remaining) < self._MAX_PENDING_EVENTS:
+				remaining.append((bucket, start, end))
+		self._pending_events = remaining
+
+	def metrics(self):
+		"""bucket별 호출 수 / 패딩 비율 / forward 지연, 관측된 입력 shape 수와 dynamo 재컴파일 카운터"""
+		with self._lock:
+			self._drain_events()
+			buckets = {}
+			for bucket, stats in self._stats.items():
+				buckets[str(bucket)] = {
+					"calls": stats.calls,
+					"frames": stats.frames,
+					"padding_ratio": (stats.padded_frames / (stats.frames + stats.padded_frames)) if stats.calls else 0.0,
+					"avg_forward_ms": (stats.total_ms / stats.timed) if stats.timed else 0.0,
+					"max_forward_ms": stats.max_ms,
+					"last_forward_ms": stats.last_ms,
+				}
+			return {
+				"buckets": buckets,
+				"distinct_input_shapes": len(self._shapes),
+				"dynamo": _dynamo_counters(),
+			}
+
+
+def _dynamo_counters():
+	"""torch._dynamo 컴파일 카운터 (unique_graphs가 bucket 수에서 멈춰 있으면 캐시가 유지되는 것)"""
+	try:
+		from torch._dynamo.utils import counters
+	except Exception:
+		return None
+	stats = counters.get("stats", {})
+	return {
+		"unique_graphs": stats.get("unique_graphs", 0),
+		"calls_captured": stats.get("calls_captured", 0),
+		"recompiles": sum(counters.get("recompiles", {}).values()),
+	}
@@ -0,0 +1,236 @@
+"""
+Wav2Lip 결과 영상 단일 패스 인코더
+
+합성된 BGR 프레임을 raw 그대로 ffmpeg stdin 파이프로 보내고,
+ffmpeg 한 프로세스에서 스케일 + FPS 변환 + 오디오 합성 + 최종 인코딩을 한 번에 수행한다.
+(기존: DIVX result.avi 기록 → 오디오 mux 재인코딩 → 해상도/FPS 리사이즈 재인코딩)
+
+upload가 주어지면 조각(fragmented) MP4를 stdout으로 내보내고 별도 스레드가 청크를 업로드에 바로 기록하여
+인코딩과 업로드를 겹친다 (업로드 객체: write(bytes) / close() 완료 / abort() 취소).
+
+ffmpeg 프로세스는 open_process(cmd, read_stdout)로 띄운다 (서빙 서버: media_tools.thread_pipe_opener로
+이벤트 루프의 비동기 subprocess에 위임하여 timeout / 취소 처리를 공유). 주어지지 않으면 subprocess.Popen으로 직접 실행한다.
+"""
+
+import subprocess
+import threading
+import time
+
+import numpy as np
+
+OUTPUT_CHUNK_SIZE = 1024 * 1024  # 조각 MP4 stdout 한 번에 읽는 최대 크기 (나온 만큼 바로 업로드)
+FRAGMENT_SECONDS = 2  # 조각 MP4 키프레임 간격 (업로드 지연의 상한)
+
+
+def encoder_args(gpu_encoding=False, bitrate=None):
+	"""
+	최종 H.264 인코딩 옵션 (AIService 리사이즈 후처리와 동일한 설정)
+
+	Args:
+		gpu_encoding: True면 h264_nvenc, 아니면 libx264
+		bitrate: 원본 비트레이트 (예: "5000k"). None이면 NVENC QP 21 / CRF 18
+	"""
+	args = [
+		"-c:v", "h264_nvenc" if gpu_encoding else "libx264",
+		"-preset", "fast",
+	]
+	if bitrate:
+		args += [
+			"-b:v", bitrate,
+			"-maxrate", bitrate,
+			"-bufsize", f"{int(bitrate.replace('k', '')) * 2}k",
+		]
+	elif gpu_encoding:
+		args += ["-rc", "constqp", "-qp", "21"]
+	else:
+		args += ["-crf", "18", "-threads", "0"]
+	return args + ["-pix_fmt", "yuv420p"]
+
+
+def build_pipe_command(output_path, frame_size, fps, audio_path, resolution=None, target_fps=None, gpu_encoding=False, bitrate=None, fragmented=False):
+	"""
+	raw BGR 프레임(stdin) + 오디오 파일 → 최종 mp4 ffmpeg 명령
+
+	Args:
+		frame_size: 입력 프레임 (width, height)
+		fps: 입력 프레임률 (Wav2Lip 출력은 18fps 고정)
+		resolution: 출력 해상도 "widthxheight" (None이면 입력 크기 유지)
+		target_fps: 출력 프레임률 (None이면 fps 유지)
+		fragmented: True면 조각 MP4 (moov를 앞에 쓰고 키프레임마다 fragment 출력 → seek 없이 파이프로 출력 가능)
+	"""
+	width, height = frame_size
+	filters = []
+	if resolution and resolution != f"{width}x{height}":
+		filters.append(f"scale={resolution.replace('x', ':')}:flags=fast_bilinear")
+	if target_fps and float(target_fps) != float(fps):
+		filters.append(f"fps={target_fps}")
+
+	cmd = [
+		"ffmpeg", "-y", "-loglevel", "error",
+		"-f", "rawvideo", "-pix_fmt", "bgr24",
+		"-s", f"{width}x{height}", "-r", f"{fps}",
+		"-i", "pipe:0",
+		"-i", audio_path,
+		"-map", "0:v:0", "-map", "1:a:0",
+	]
+	if filters:
+		cmd += ["-vf", ",".join(filters)]
+	cmd += encoder_args(gpu_encoding, bitrate)
+	if fragmented:
+		gop = int(round(float(target_fps or fps) * FRAGMENT_SECONDS))
+		cmd += ["-g", str(gop), "-c:a", "aac", "-movflags", "+frag_keyframe+empty_moov+default_base_moof", "-f", "mp4", output_path]
+	else:
+		cmd += ["-c:a", "aac", "-movflags", "+faststart", output_path]
+	return cmd
+
+
+class _PopenPipe:
+	"""
+	open_process가 없을 때 (CLI / 벤치마크) 쓰는 subprocess.Popen 기반 파이프 프로세스
+
+	media_tools.ThreadPipe와 같은 인터페이스 (write / read / close_stdin / wait / kill / error_output).
+	stderr는 별도 스레드가 계속 읽어 파이프 버퍼가 차서 멈추는 일이 없게 한다.
+	"""
+
+	def __init__(self, cmd, read_stdout=False):
+		self._proc = subprocess.Popen(
+			cmd,
+			stdin=subprocess.PIPE,
+			stdout=subprocess.PIPE if read_stdout else subprocess.DEVNULL,
+			stderr=subprocess.PIPE,
+		)
+		self._stderr = bytearray()
+		self._stderr_reader = threading.Thread(target=self._drain_stderr, name='encoder-stderr', daemon=True)
+		self._stderr_reader.start()
+
+	def _drain_stderr(self):
+		for chunk in iter(lambda: self._proc.stderr.read1(65536), b''):
+			self._stderr += chunk
+
+	def write(self, data):
+		self._proc.stdin.write(data)
+
+	def read(self, size):
+		return self._proc.stdout.read1(size)
+
+	def close_stdin(self):
+		try:
+			self._proc.stdin.close()
+		except (BrokenPipeError, ValueError):
+			pass
+
+	def wait(self):
+		returncode = self._proc.wait()
+		self._stderr_reader.join()
+		return returncode
+
+	def kill(self):
+		self._proc.kill()
+
+	def error_output(self):
+		return self._stderr.decode(errors="replace").strip()
+
+
+class FFmpegPipeWriter:
+	"""
+	cv2.VideoWriter와 같은 write(frame) / release() 인터페이스의 ffmpeg 파이프 writer
+
+	ffmpeg가 실패하면 stderr 내용을 담아 RuntimeError를 낸다.
+
+	upload가 주어지면 output_path 대신 stdout으로 조각 MP4를 출력하고, 펌프 스레드가 청크를 upload.write로 보낸다.
+	release()에서 인코딩이 성공하면 upload.close()로 완료하고, 인코딩/업로드가 실패하거나 abort()되면 upload.abort()한다.
+	"""
+
+	def __init__(self, output_path, frame_size, fps, audio_path, resolution=None, target_fps=None, gpu_encoding=False, bitrate=None, upload=None, open_process=None):
+		"""
+		Args:
+			upload: 스트리밍 업로드 객체 (write / close / abort). None이면 output_path에 기록
+			open_process: open_process(cmd, read_stdout) → 파이프 프로세스. None이면 subprocess.Popen으로 직접 실행
+		"""
+		self.frame_size = tuple(frame_size)
+		self.upload = upload
+		target = 'pipe:1' if upload is not None else output_path
+		self.command = build_pipe_command(target, frame_size, fps, audio_path, resolution, target_fps, gpu_encoding, bitrate, fragmented=upload is not None)
+		self.frames_written = 0
+		self.bytes_uploaded = 0
+		self.chunks_uploaded = 0
+		self.first_chunk_at = None
+		self._upload_error = None
+		self._pump = None
+		self._proc = (open_process or _PopenPipe)(self.command, read_stdout=upload is not None)
+		if upload is not None:
+			self._pump = threading.Thread(target=self._pump_output, name='encoder-upload', daemon=True)
+			self._pump.start()
+
+	def _pump_output(self):
+		"""stdout의 조각 MP4를 읽어 순서대로 업로드 (업로드 실패 시 ffmpeg를 종료하고 남은 출력은 버림)"""
+		while True:
+			chunk = self._proc.read(OUTPUT_CHUNK_SIZE)
+			if not chunk:
+				break
+			if self._upload_error is not None:
+				continue
+			try:
+				self.upload.write(chunk)
+			except Exception as e:
+				self._upload_error = e
+				self._proc.kill()
+				continue
+			if self.first_chunk_at is None:
+				self.first_chunk_at = time.time()
+			self.bytes_uploaded += len(chunk)
+			self.chunks_uploaded += 1
+
+	def _join_pump(self):
+		if self._pump is not None:
+			self._pump.join()
+
+	def _abort_upload(self):
+		if self.upload is not None:
+			try:
+				self.upload.abort()
+			except Exception as e:
+				print(f"  [Encoder] Failed to abort streaming upload: {e}")
+
+	def write(self, frame):
+		if frame.shape[1] != self.frame_size[0] or frame.shape[0] != self.frame_size[1]:
+			raise ValueError(f"Frame size {frame.shape[1]}x{frame.shape[0]} does not match encoder input {self.frame_size[0]}x{self.frame_size[1]}")
+		try:
+			self._proc.write(np.ascontiguousarray(frame, dtype=np.uint8).data)
+		except BrokenPipeError:
+			returncode = self._proc.wait()
+			if self._upload_error is not None:
+				raise RuntimeError(f"Streaming upload failed: {self._upload_error}")
+			raise RuntimeError(f"ffmpeg encoder exited early (code {returncode}): {self._proc.error_output()}")
+		self.frames_written += 1
+
+	def release(self):
+		"""stdin을 닫고 인코딩 완료까지 대기 → 스트리밍 업로드 완료 (실패 시 업로드 취소 후 RuntimeError)"""
+		try:
+			self._proc.close_stdin()
+			returncode = self._proc.wait()
+			encoded_at = time.time()
+			self._join_pump()
+			if self._upload_error is not None:
+				raise RuntimeError(f"Streaming upload failed: {self._upload_error}")
+			if returncode != 0:
+				raise RuntimeError(f"ffmpeg encoder failed (code {returncode}): {self._proc.error_output()}")
+			if self.upload is not None:
+				self.upload.close()
+				print(f"  [Encoder] Streamed {self.bytes_uploaded / (1024 * 1024):.1f}MB in {self.chunks_uploaded} chunks, "
+				      f"finalized {time.time() - encoded_at:.2f}s after encoder exit")
+		except Exception:
+			self._abort_upload()
+			raise
+
+	def abort(self):
+		"""인코딩 중단 (inference 오류 시 ffmpeg 프로세스 정리, 스트리밍 업로드 취소)"""
+		try:
+			self._proc.kill()
+			self._proc.close_stdin()
+			self._join_pump()
+			self._proc.wait()
+		except Exception as e:
+			print(f"  [Encoder] Encoder did not shut down cleanly: {e}")
+		finally:
+			self._abort_upload()
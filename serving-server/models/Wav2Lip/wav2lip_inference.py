@@ -5,34 +5,52 @@ import numpy as np
 import cv2
 import os
 import subprocess
-import platform
 import torch
 import face_detection
-import audio
+import audio_stage
+import mel_engine
+from compositor import FeatherCompositor
+from prefetch import BackgroundIterator, CudaBatchRunner, ThreadBatchRunner
+from video_encoder import FFmpegPipeWriter
 from models import Wav2Lip
 from tqdm import tqdm
 import time
 
 mel_step_size = 16
 
-def increase_frames(frames, target_length):
+# progress_callback에 전달되는 단계 이름 (로그의 [Step N] 섹션과 1:1 대응)
+PIPELINE_STEPS = {
+	0: 'step0_read_video',
+	1: 'step1_audio',
+	2: 'step2_frame_adjust',
+	3: 'step3_face_detection',
+	4: 'step4_inference',
+	5: 'step5_audio_mux',
+}
+
+def _report_progress(progress_callback, step):
+	"""단계 시작을 progress_callback(stage_name)으로 알림 (콜백 오류는 파이프라인에 영향 없음)"""
+	if progress_callback is None:
+		return
+	try:
+		progress_callback(PIPELINE_STEPS[step])
+	except Exception as e:
+		print(f"[Progress] callback failed for step {step}: {e}")
+
+def build_frame_index_map(original_len, target_length):
 	"""
-	영상 프레임을 오디오 길이에 맞춰 균등하게 확장 (벡터화 최적화)
-	프레임을 복제하여 목표 길이까지 늘림 (순환 재생이 아닌 연속 확장)
+	목표 프레임 인덱스 → 원본 프레임 인덱스 매핑 생성
+	increase_frames / expand_face_det_results / 스트리밍 모드가 모두 같은 규칙을 사용
 	
 	Args:
-		frames: 원본 프레임 리스트
+		original_len: 원본 프레임 수
 		target_length: 목표 프레임 수
 		
 	Returns:
-		확장된 프레임 리스트
+		길이 target_length의 원본 인덱스 배열 (단조 증가)
 	"""
-	if len(frames) >= target_length:
-		return frames[:target_length]
-	
-	# 벡터화된 확장: 각 프레임의 반복 횟수를 미리 계산
-	original_len = len(frames)
-	ratio = target_length / original_len
+	if original_len >= target_length:
+		return np.arange(target_length)
 	
 	# 각 프레임이 몇 번 반복되어야 하는지 계산
 	repeat_counts = np.ones(original_len, dtype=int)
@@ -51,15 +69,25 @@ def increase_frames(frames, target_length):
 				added += 1
 			next_dup += dup_every
 	
-	# NumPy 배열로 변환하여 벡터화된 확장 수행
-	frames_array = np.array(frames)
-	expanded_frames = []
+	return np.repeat(np.arange(original_len), repeat_counts)[:target_length]
+
+def increase_frames(frames, target_length):
+	"""
+	영상 프레임을 오디오 길이에 맞춰 균등하게 확장 (벡터화 최적화)
+	프레임을 복제하여 목표 길이까지 늘림 (순환 재생이 아닌 연속 확장)
 	
-	for i, count in enumerate(repeat_counts):
-		for _ in range(count):
-			expanded_frames.append(frames[i])
+	Args:
+		frames: 원본 프레임 리스트
+		target_length: 목표 프레임 수
+		
+	Returns:
+		확장된 프레임 리스트
+	"""
+	if len(frames) >= target_length:
+		return frames[:target_length]
 	
-	return expanded_frames[:target_length]
+	index_map = build_frame_index_map(len(frames), target_length)
+	return [frames[i] for i in index_map]
 
 def expand_face_det_results(face_det_results, target_length):
 	"""
@@ -76,34 +104,9 @@ def expand_face_det_results(face_det_results, target_length):
 	if len(face_det_results) >= target_length:
 		return face_det_results[:target_length]
 	
-	original_len = len(face_det_results)
-	ratio = target_length / original_len
-	
-	# 각 결과의 반복 횟수 계산
-	repeat_counts = np.ones(original_len, dtype=int)
-	remaining = target_length - original_len
-	
-	if remaining > 0:
-		dup_every = original_len / remaining
-		next_dup = 0.0
-		added = 0
-		
-		while added < remaining and next_dup < original_len:
-			idx = int(next_dup)
-			if idx < original_len:
-				repeat_counts[idx] += 1
-				added += 1
-			next_dup += dup_every
-	
-	# 얼굴 감지 결과 확장 (이미지 복사보다 훨씬 빠름)
-	expanded_results = []
-	for i, count in enumerate(repeat_counts):
-		for _ in range(count):
-			# 얼굴 영역과 좌표를 복사 (이미지 자체는 참조)
-			face_img, coords = face_det_results[i]
-			expanded_results.append([face_img, coords])
-	
-	return expanded_results[:target_length]
+	# 얼굴 영역과 좌표를 복사 (이미지 자체는 참조)
+	index_map = build_frame_index_map(len(face_det_results), target_length)
+	return [list(face_det_results[i]) for i in index_map]
 
 def get_smoothened_boxes(boxes, T):
 	for i in range(len(boxes)):
@@ -126,8 +129,8 @@ def _get_thread_lock():
 		_detector_cache_lock = threading.Lock()
 	return _detector_cache_lock
 
-def face_detect(images, device, face_detector='scrfd', face_det_batch_size=16, pads=[0, 10, 0, 0], nosmooth=False):
-	# Detector 캐싱: 동일한 device와 face_detector 조합은 재사용
+def _get_face_detector(device, face_detector):
+	"""Detector 캐싱: 동일한 device와 face_detector 조합은 재사용"""
 	cache_key = (device, face_detector)
 	
 	# Thread-safe 캐시 조회
@@ -145,10 +148,15 @@ def face_detect(images, device, face_detector='scrfd', face_det_batch_size=16, p
 		else:
 			print(f"[Face Detection] 🚀 Using cached {face_detector} detector on {device} (fast path)")
 		
-		detector = _detector_cache[cache_key]
+		return _detector_cache[cache_key]
 
-	batch_size = face_det_batch_size
+def _detect_rects(detector, images, batch_size):
+	"""
+	배치 단위 얼굴 감지 (OOM 발생 시 배치 크기를 절반으로 줄여 재시도)
 	
+	Returns:
+		(프레임별 감지 결과 리스트, 최종 사용된 배치 크기)
+	"""
 	while 1:
 		predictions = []
 		try:
@@ -178,12 +186,34 @@ def face_detect(images, device, face_detector='scrfd', face_det_batch_size=16, p
 			print('Recovering from OOM error; New batch size: {}'.format(batch_size))
 			continue
 		break
+	
+	return predictions, batch_size
 
+def warmup_face_detector(device, face_detector='scrfd', face_det_batch_size=16, frame_size=(1280, 720)):
+	"""
+	빈 프레임 배치로 detector 초기화 + 감지 한 번 실행 (세션 생성/cuDNN autotune을 서버 시작 시점에)
+
+	Returns:
+		(초기화 시간, 첫 감지 시간) 초
+	"""
+	start = time.time()
+	detector = _get_face_detector(device, face_detector)
+	init_time = time.time() - start
+
+	width, height = frame_size
+	images = [np.zeros((height, width, 3), dtype=np.uint8)] * face_det_batch_size
+	start = time.time()
+	_detect_rects(detector, images, face_det_batch_size)
+	return init_time, time.time() - start
+
+def _rects_to_boxes(rects, images, pads, temp_dir='temp'):
+	"""감지 결과에 패딩을 적용해 [x1, y1, x2, y2] 박스 리스트로 변환"""
 	results = []
 	pady1, pady2, padx1, padx2 = pads
-	for rect, image in zip(predictions, images):
+	for rect, image in zip(rects, images):
 		if rect is None:
-			cv2.imwrite('temp/faulty_frame.jpg', image)
+			os.makedirs(temp_dir, exist_ok=True)
+			cv2.imwrite(os.path.join(temp_dir, 'faulty_frame.jpg'), image)
 			raise ValueError('Face not detected! Ensure the video contains a face in all the frames.')
 
 		y1 = int(max(0, rect[1] - pady1))
@@ -192,13 +222,183 @@ def face_detect(images, device, face_detector='scrfd', face_det_batch_size=16, p
 		x2 = int(min(image.shape[1], rect[2] + padx2))
 		
 		results.append([x1, y1, x2, y2])
+	return results
 
-	boxes = np.array(results)
+def _motion_thumbnail(image):
+	"""움직임 비교용 64x64 grayscale 썸네일"""
+	gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+	return cv2.resize(gray, (64, 64), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+def select_keyframes(images, keyframe_interval=1, motion_threshold=None):
+	"""
+	얼굴 감지를 실행할 키프레임 인덱스 선택
+	
+	- 마지막 키프레임에서 keyframe_interval 프레임이 지나면 키프레임
+	- motion_threshold 지정 시, 마지막 키프레임 대비 썸네일 평균 밝기 차(0~255)가 임계값을 넘으면 즉시 키프레임
+	  (이때 keyframe_interval <= 1이면 간격 제한 없이 움직임으로만 키프레임 선택)
+	- 첫 프레임과 마지막 프레임은 항상 키프레임 (보간 구간의 양 끝)
+	"""
+	n = len(images)
+	if n == 0:
+		return []
+	if keyframe_interval <= 1 and motion_threshold is None:
+		return list(range(n))
+	
+	keyframes = [0]
+	key_thumb = _motion_thumbnail(images[0]) if motion_threshold is not None else None
+	for i in range(1, n):
+		is_key = i == n - 1 or (keyframe_interval > 1 and i - keyframes[-1] >= keyframe_interval)
+		if not is_key and motion_threshold is not None:
+			thumb = _motion_thumbnail(images[i])
+			is_key = float(np.mean(np.abs(thumb - key_thumb))) > motion_threshold
+		if is_key:
+			keyframes.append(i)
+			if motion_threshold is not None:
+				key_thumb = _motion_thumbnail(images[i])
+	return keyframes
+
+def interpolate_boxes(keyframes, key_boxes, n_frames):
+	"""키프레임 박스를 좌표별 선형 보간하여 (n_frames, 4) 정수 박스로 확장"""
+	key_boxes = np.asarray(key_boxes, dtype=np.float64)
+	if len(keyframes) == n_frames:
+		return key_boxes.astype(np.int64)
+	frame_idx = np.arange(n_frames)
+	boxes = np.stack([np.interp(frame_idx, keyframes, key_boxes[:, c]) for c in range(4)], axis=1)
+	return np.rint(boxes).astype(np.int64)
+
+def _detect_boxes(detector, images, batch_size, pads, temp_dir, keyframe_interval=1, motion_threshold=None):
+	"""
+	키프레임만 감지하고 나머지는 보간 (keyframe_interval=1, motion_threshold=None이면 전 프레임 감지)
+	
+	Returns:
+		(np.ndarray (N, 4) 박스, 최종 배치 크기, 감지한 프레임 수)
+	"""
+	keyframes = select_keyframes(images, keyframe_interval, motion_threshold)
+	if len(keyframes) == len(images):
+		predictions, batch_size = _detect_rects(detector, images, batch_size)
+		return np.array(_rects_to_boxes(predictions, images, pads, temp_dir)), batch_size, len(images)
+	
+	key_images = [images[i] for i in keyframes]
+	predictions, batch_size = _detect_rects(detector, key_images, batch_size)
+	key_boxes = _rects_to_boxes(predictions, key_images, pads, temp_dir)
+	return interpolate_boxes(keyframes, key_boxes, len(images)), batch_size, len(keyframes)
+
+def detect_face_boxes(images, device, face_detector='scrfd', face_det_batch_size=16, pads=[0, 10, 0, 0], temp_dir='temp', keyframe_interval=1, motion_threshold=None):
+	"""프레임별 패딩 적용 박스 (N, 4) [x1, y1, x2, y2] - 스무딩 전 (박스 캐시 저장 단위)"""
+	detector = _get_face_detector(device, face_detector)
+	boxes, _, detected = _detect_boxes(detector, images, face_det_batch_size, pads, temp_dir, keyframe_interval, motion_threshold)
+	if detected < len(images):
+		print(f"  - Keyframe detection: {detected}/{len(images)} frames sent to detector")
+	return boxes
+
+def boxes_to_face_results(images, boxes, nosmooth=False):
+	"""박스에 스무딩을 적용하고 [얼굴 crop, (y1, y2, x1, x2)] 리스트로 변환 (boxes는 변경하지 않음)"""
+	boxes = np.array(boxes)
 	if not nosmooth: boxes = get_smoothened_boxes(boxes, T=5)
-	results = [[image[y1: y2, x1:x2], (y1, y2, x1, x2)] for image, (x1, y1, x2, y2) in zip(images, boxes)]
+	return [[image[y1: y2, x1:x2], (y1, y2, x1, x2)] for image, (x1, y1, x2, y2) in zip(images, boxes)]
 
-	del detector
-	return results 
+def face_detect(images, device, face_detector='scrfd', face_det_batch_size=16, pads=[0, 10, 0, 0], nosmooth=False, temp_dir='temp', keyframe_interval=1, motion_threshold=None):
+	boxes = detect_face_boxes(images, device, face_detector, face_det_batch_size, pads, temp_dir, keyframe_interval, motion_threshold)
+	return boxes_to_face_results(images, boxes, nosmooth)
+
+def detect_face_boxes_streaming(frames, device, face_detector='scrfd', face_det_batch_size=16, pads=[0, 10, 0, 0], window_size=64, temp_dir='temp', keyframe_interval=1, motion_threshold=None):
+	"""
+	프레임 이터레이터를 window 단위로 감지하고 박스만 보관 (스트리밍 모드용)
+	프레임 이미지는 window가 끝나면 버려지므로 메모리 사용량이 영상 길이와 무관
+	키프레임 모드에서는 window마다 첫/마지막 프레임을 키프레임으로 두고 window 안에서 보간
+	
+	Returns:
+		np.ndarray: (N, 4) [x1, y1, x2, y2] 박스 배열 (스무딩 전)
+	"""
+	detector = _get_face_detector(device, face_detector)
+	batch_size = face_det_batch_size
+	
+	results = []
+	detected = 0
+	window = []
+	for frame in frames:
+		window.append(frame)
+		if len(window) >= window_size:
+			boxes, batch_size, window_detected = _detect_boxes(detector, window, batch_size, pads, temp_dir, keyframe_interval, motion_threshold)
+			results.append(boxes)
+			detected += window_detected
+			window = []
+	if len(window) > 0:
+		boxes, batch_size, window_detected = _detect_boxes(detector, window, batch_size, pads, temp_dir, keyframe_interval, motion_threshold)
+		results.append(boxes)
+		detected += window_detected
+	
+	if len(results) == 0:
+		raise ValueError('No frames to run face detection on')
+	boxes = np.concatenate(results, axis=0)
+	if detected < len(boxes):
+		print(f"  - Keyframe detection: {detected}/{len(boxes)} frames sent to detector")
+	return boxes
+
+def face_detect_streaming(frames, device, face_detector='scrfd', face_det_batch_size=16, pads=[0, 10, 0, 0], nosmooth=False, window_size=64, temp_dir='temp', keyframe_interval=1, motion_threshold=None):
+	"""
+	detect_face_boxes_streaming + 스무딩
+	
+	Returns:
+		np.ndarray: (N, 4) [x1, y1, x2, y2] 박스 배열 (face_detect와 동일한 스무딩 적용)
+	"""
+	boxes = detect_face_boxes_streaming(frames, device, face_detector, face_det_batch_size, pads, window_size, temp_dir, keyframe_interval, motion_threshold)
+	if not nosmooth: boxes = get_smoothened_boxes(boxes, T=5)
+	return boxes
+
+def _face_box_cache_key(box_cache, face_video_path, face_detector, pads, resize_factor, keyframe_interval=1, motion_threshold=None, mode=''):
+	"""
+	박스 캐시 키 계산 (캐시 미사용 또는 실패 시 None)
+	
+	mode: 감지 방식 구분 (스트리밍은 window 단위로 키프레임을 나누므로 'stream<window>'로 따로 저장)
+	"""
+	if box_cache is None:
+		return None
+	variants = []
+	if mode:
+		variants.append(mode)
+	if keyframe_interval > 1 or motion_threshold is not None:
+		variants.append(f'kf{keyframe_interval}_motion{motion_threshold}')
+	variant = '_'.join(variants)
+	try:
+		digest_start = time.time()
+		key = box_cache.make_key(box_cache.video_digest(face_video_path), face_detector, pads, resize_factor, variant)
+		print(f"  [3-0] Video digest computed in {time.time() - digest_start:.3f}s")
+		return key
+	except OSError as e:
+		print(f"  [3-0] Face box cache disabled for this request: {e}")
+		return None
+
+def _load_cached_boxes(box_cache, cache_key, n_frames):
+	"""박스 캐시 조회 (미스 또는 프레임 수 불일치 시 None)"""
+	if cache_key is None:
+		return None
+	boxes = box_cache.get(cache_key, n_frames)
+	if boxes is None:
+		print("  [3-0] Face box cache miss")
+		return None
+	print(f"  [3-0] Face box cache hit: {len(boxes)} frames (skipping face detection)")
+	return boxes
+
+def _store_cached_boxes(box_cache, cache_key, boxes, complete):
+	"""감지 결과 저장 (캐시 오류는 inference에 영향 없음)"""
+	if cache_key is None:
+		return
+	try:
+		box_cache.put(cache_key, boxes, complete)
+	except OSError as e:
+		print(f"  [3-0] Failed to store face boxes in cache: {e}")
+
+def _prepare_model_inputs(img_batch, mel_batch, img_size):
+	"""얼굴/mel 리스트를 모델 입력 배열로 변환 (하단 절반 마스킹 + 6채널 결합)"""
+	img_batch, mel_batch = np.asarray(img_batch), np.asarray(mel_batch)
+
+	img_masked = img_batch.copy()
+	img_masked[:, img_size//2:] = 0
+
+	img_batch = np.concatenate((img_masked, img_batch), axis=3) / 255.
+	mel_batch = np.reshape(mel_batch, [len(mel_batch), mel_batch.shape[1], mel_batch.shape[2], 1])
+	return img_batch, mel_batch
 
 def datagen(frames, mels, static=False, box=[-1, -1, -1, -1], face_det_results=None, img_size=96, batch_size=128):
 	img_batch, mel_batch, frame_batch, coords_batch = [], [], [], []
@@ -233,27 +433,350 @@ def datagen(frames, mels, static=False, box=[-1, -1, -1, -1], face_det_results=N
 		coords_batch.append(coords)
 
 		if len(img_batch) >= batch_size:
-			img_batch, mel_batch = np.asarray(img_batch), np.asarray(mel_batch)
+			img_batch, mel_batch = _prepare_model_inputs(img_batch, mel_batch, img_size)
+			yield img_batch, mel_batch, frame_batch, coords_batch
+			img_batch, mel_batch, frame_batch, coords_batch = [], [], [], []
+
+	if len(img_batch) > 0:
+		img_batch, mel_batch = _prepare_model_inputs(img_batch, mel_batch, img_size)
+		yield img_batch, mel_batch, frame_batch, coords_batch
+
+def iter_video_frames(face_video_path, resize_factor=1, limit=None):
+	"""영상을 한 프레임씩 디코딩하는 제너레이터 (limit 지정 시 앞에서부터 limit 프레임만)"""
+	video_stream = cv2.VideoCapture(face_video_path)
+	try:
+		count = 0
+		while limit is None or count < limit:
+			still_reading, frame = video_stream.read()
+			if not still_reading:
+				break
+			
+			if resize_factor > 1:
+				frame = cv2.resize(frame, (frame.shape[1]//resize_factor, frame.shape[0]//resize_factor))
+			yield frame
+			count += 1
+	finally:
+		video_stream.release()
 
-			img_masked = img_batch.copy()
-			img_masked[:, img_size//2:] = 0
+class _LimitedFrames:
+	"""
+	프레임 이터레이터를 앞에서부터 limit 프레임까지만 내보냄
+	
+	끝난 뒤 exhausted는 영상이 limit 안에서 끝났는지 (= 영상 끝까지 읽었는지).
+	정확히 limit 프레임인 영상도 구분하기 위해 limit에 도달하면 한 프레임을 더 읽어 본다.
+	"""
 
-			img_batch = np.concatenate((img_masked, img_batch), axis=3) / 255.
-			mel_batch = np.reshape(mel_batch, [len(mel_batch), mel_batch.shape[1], mel_batch.shape[2], 1])
+	def __init__(self, frames, limit):
+		self.frames = frames
+		self.limit = limit
+		self.exhausted = False
+
+	def __iter__(self):
+		count = 0
+		try:
+			for frame in self.frames:
+				if count >= self.limit:
+					return
+				yield frame
+				count += 1
+			self.exhausted = True
+		finally:
+			close = getattr(self.frames, 'close', None)
+			if close is not None:
+				close()
 
+def stream_datagen(face_video_path, mels, index_map, boxes, resize_factor=1, img_size=96, batch_size=128):
+	"""
+	datagen의 스트리밍 버전: 영상을 다시 디코딩하면서 목표 프레임을 배치 단위로 생성
+	
+	index_map이 단조 증가하므로 디코더를 앞으로만 진행시키고,
+	반복(확장)되는 프레임은 현재 디코딩된 프레임을 복사해서 사용한다.
+	한 번에 메모리에 올라가는 원본 프레임은 최대 batch_size개.
+	
+	Args:
+		face_video_path: 얼굴 영상 경로
+		mels: mel chunk 시퀀스 (목표 프레임 수와 동일한 길이)
+		index_map: 목표 프레임 → 원본 프레임 인덱스 (build_frame_index_map)
+		boxes: 원본 프레임별 [x1, y1, x2, y2] 박스 (face_detect_streaming)
+	"""
+	img_batch, mel_batch, frame_batch, coords_batch = [], [], [], []
+	frames = iter_video_frames(face_video_path, resize_factor)
+	current_idx = -1
+	current_frame = None
+
+	for i, m in enumerate(mels):
+		src_idx = int(index_map[min(i, len(index_map) - 1)])
+		while current_idx < src_idx:
+			current_frame = next(frames)
+			current_idx += 1
+
+		x1, y1, x2, y2 = boxes[src_idx]
+		coords = (y1, y2, x1, x2)
+		face = cv2.resize(current_frame[y1: y2, x1:x2], (img_size, img_size))
+
+		img_batch.append(face)
+		mel_batch.append(m)
+		frame_batch.append(current_frame.copy())
+		coords_batch.append(coords)
+
+		if len(img_batch) >= batch_size:
+			img_batch, mel_batch = _prepare_model_inputs(img_batch, mel_batch, img_size)
 			yield img_batch, mel_batch, frame_batch, coords_batch
 			img_batch, mel_batch, frame_batch, coords_batch = [], [], [], []
 
+	frames.close()
+
 	if len(img_batch) > 0:
-		img_batch, mel_batch = np.asarray(img_batch), np.asarray(mel_batch)
+		img_batch, mel_batch = _prepare_model_inputs(img_batch, mel_batch, img_size)
+		yield img_batch, mel_batch, frame_batch, coords_batch
 
-		img_masked = img_batch.copy()
-		img_masked[:, img_size//2:] = 0
+def predict_batch(model, img_batch, mel_batch, device):
+	"""Wav2Lip forward 한 번 실행 → (N, H, W, 3) 0~255 float 배열"""
+	if next(model.parameters()).dtype == torch.float16:
+		img_batch = torch.HalfTensor(np.transpose(img_batch, (0, 3, 1, 2))).to(device)
+		mel_batch = torch.HalfTensor(np.transpose(mel_batch, (0, 3, 1, 2))).to(device)
+	else:
+		img_batch = torch.FloatTensor(np.transpose(img_batch, (0, 3, 1, 2))).to(device)
+		mel_batch = torch.FloatTensor(np.transpose(mel_batch, (0, 3, 1, 2))).to(device)
 
-		img_batch = np.concatenate((img_masked, img_batch), axis=3) / 255.
-		mel_batch = np.reshape(mel_batch, [len(mel_batch), mel_batch.shape[1], mel_batch.shape[2], 1])
+	with torch.no_grad():
+		if device == 'cuda' and next(model.parameters()).dtype == torch.float16:
+			with torch.amp.autocast('cuda'):
+				pred = model(mel_batch, img_batch)
+		else:
+			pred = model(mel_batch, img_batch)
 
-		yield img_batch, mel_batch, frame_batch, coords_batch
+	# CUDA 텐서를 CPU로 이동 후 numpy로 변환
+	return pred.cpu().numpy().transpose(0, 2, 3, 1) * 255.
+
+def _run_inference_loop(model, gen, total_batches, device, out, predict_fn=None, prefetch_depth=0):
+	"""
+	배치 제너레이터를 소비하며 모델 inference → 합성 → VideoWriter 기록
+
+	predict_fn(img_batch, mel_batch)가 주어지면 모델을 직접 호출하지 않고 위임한다
+	(예: 여러 요청의 배치를 모아 한 번에 forward 하는 스케줄러).
+	prefetch_depth > 0이면 _run_pipelined_loop로 단계를 겹쳐 실행한다.
+
+	Returns:
+		(inference_time, postprocess_time)
+	"""
+	if prefetch_depth > 0:
+		return _run_pipelined_loop(model, gen, total_batches, device, out, predict_fn, prefetch_depth)
+
+	inference_start = time.time()
+	postprocess_time = 0
+	compositor = FeatherCompositor()  # 크기별 마스크/버퍼 캐시 (요청 단위)
+	
+	for i, (img_batch, mel_batch, frames, coords) in enumerate(tqdm(gen, total=total_batches)):
+		# 4-1 ~ 4-2. 입력 변환 + 모델 Inference
+		if i == 0:
+			model_start = time.time()
+		if predict_fn is not None:
+			pred = predict_fn(img_batch, mel_batch)
+		else:
+			pred = predict_batch(model, img_batch, mel_batch, device)
+		if i == 0:
+			model_time = time.time() - model_start
+			print(f"  [4-2] First batch input conversion + model inference: {model_time:.3f}s")
+
+		# 4-3. 후처리 (원본 프레임에 in-place 합성 후 바로 기록)
+		postprocess_start = time.time()
+		compositor.composite_batch(pred, frames, coords, out.write)
+		postprocess_time += time.time() - postprocess_start
+	
+	inference_time = time.time() - inference_start
+	return inference_time, postprocess_time
+
+def _make_batch_runner(model, device, predict_fn):
+	"""
+	파이프라인 루프용 forward 실행기
+	- predict_fn 지정 (요청 간 스케줄러): 워커 스레드에서 predict_fn 호출
+	- CUDA: pinned 버퍼 + 전용 stream 비동기 복사 (CudaBatchRunner)
+	- CPU 전용 호스트: 워커 스레드에서 predict_batch 호출
+	"""
+	if predict_fn is not None:
+		return ThreadBatchRunner(predict_fn)
+	if CudaBatchRunner.available(device):
+		return CudaBatchRunner(model, device)
+	return ThreadBatchRunner(lambda img_batch, mel_batch: predict_batch(model, img_batch, mel_batch, device))
+
+def _run_pipelined_loop(model, gen, total_batches, device, out, predict_fn, prefetch_depth):
+	"""
+	_run_inference_loop의 파이프라인 버전 (결과 프레임/순서 동일)
+
+	- 배치 생성(디코딩/crop/리사이즈/입력 변환)은 백그라운드 스레드가 prefetch_depth개 앞서 진행
+	- 배치 i+1의 forward를 제출한 뒤 배치 i를 합성 → GPU forward와 CPU 합성/인코딩이 겹침
+	단계별 누적 시간과 wall 시간의 차이(겹친 시간)를 출력한다.
+	"""
+	inference_start = time.time()
+	postprocess_time = 0
+	forward_wait_time = 0
+	compositor = FeatherCompositor()
+	batches = BackgroundIterator(gen, prefetch_depth)
+	runner = _make_batch_runner(model, device, predict_fn)
+
+	def composite(pending, first=False):
+		nonlocal postprocess_time, forward_wait_time
+		handle, frames, coords = pending
+		wait_start = time.time()
+		pred = handle.result()
+		forward_wait_time += time.time() - wait_start
+		if first:
+			print(f"  [4-2] First batch input conversion + model inference: {time.time() - inference_start:.3f}s")
+		postprocess_start = time.time()
+		compositor.composite_batch(pred, frames, coords, out.write)
+		postprocess_time += time.time() - postprocess_start
+
+	pending = None
+	composited = 0
+	try:
+		for img_batch, mel_batch, frames, coords in tqdm(batches, total=total_batches):
+			# 4-1 ~ 4-2. 다음 배치 forward 제출 (비동기)
+			handle = runner.submit(img_batch, mel_batch)
+			# 4-3. 이전 배치 합성 (forward와 겹쳐 실행)
+			if pending is not None:
+				composite(pending, first=composited == 0)
+				composited += 1
+			pending = (handle, frames, coords)
+		if pending is not None:
+			composite(pending, first=composited == 0)
+	finally:
+		batches.close()
+		if isinstance(runner, ThreadBatchRunner):
+			runner.close()
+
+	inference_time = time.time() - inference_start
+	busy_time = batches.produce_time + runner.forward_time + postprocess_time
+	overlap = max(0.0, busy_time - inference_time)
+	print(f"  [4-P] Pipeline stages (prefetch_depth={prefetch_depth}, {type(runner).__name__}):")
+	print(f"    - batch generation: {batches.produce_time:.2f}s (main thread waited {batches.wait_time:.2f}s)")
+	print(f"    - transfer + forward: {runner.forward_time:.2f}s (main thread waited {forward_wait_time:.2f}s)")
+	print(f"    - composite + write: {postprocess_time:.2f}s")
+	print(f"    - wall: {inference_time:.2f}s, overlapped: {overlap:.2f}s ({overlap / busy_time * 100 if busy_time else 0:.0f}% of stage time)")
+	return inference_time, postprocess_time
+
+def _run_ffmpeg(args, run_command=None):
+	"""
+	ffmpeg -y <args> 실행 (실패 시 예외)
+
+	run_command(cmd)가 주어지면 위임한다 (서빙 서버: 이벤트 루프의 비동기 media_tools로 실행).
+	"""
+	cmd = ['ffmpeg', '-y', '-loglevel', 'error', *args]
+	if run_command is not None:
+		run_command(cmd)
+		return
+	result = subprocess.run(cmd, capture_output=True, text=True)
+	if result.returncode != 0:
+		raise RuntimeError(f"ffmpeg failed (code {result.returncode}): {result.stderr.strip()}")
+
+def _prepare_audio(audio_path, audio_speed, fps, temp_dir='temp', mel_cache=None, mel_device=None):
+	"""
+	1단계: 오디오 디코딩/배속 조정/리샘플을 메모리 안에서 처리한 뒤 mel chunk 생성
+	(배속 조정 시 mux용 트랙만 temp_dir에 한 번 기록)
+	
+	mel_cache(mel_engine.MelCache)가 주어지면 같은 오디오 파일 + 배속의 mel과 배속 트랙을 재사용한다.
+	
+	Returns:
+		(mel_chunks (mel_engine.MelChunks), 최종 오디오 경로)
+	"""
+	slowed_audio_path = os.path.join(temp_dir, 'temp_slowed.wav')
+	if audio_speed != 1.0:
+		os.makedirs(temp_dir, exist_ok=True)
+	
+	cache_key = _mel_cache_key(mel_cache, audio_path, audio_speed)
+	cached = mel_cache.get(cache_key) if cache_key is not None else None
+	if cached is not None:
+		mel, track, sr = cached
+		print(f"  [1-0] Mel cache hit: shape {mel.shape} (skipping decode/speed/mel)")
+		if track is not None:
+			audio_stage.write_wav(slowed_audio_path, track, sr)
+			audio_path = slowed_audio_path
+	else:
+		# 1-1 ~ 1-2. 한 번 디코딩 → 배속 조정 (WSOLA, 피치 유지) → 16kHz 리샘플
+		prep_start = time.time()
+		if audio_speed != 1.0:
+			print(f"  [1-1] Decoding audio and adjusting speed to {audio_speed}x in memory...")
+		else:
+			print("  [1-1] Decoding audio in memory (audio_speed=1.0, no speed adjustment)...")
+		wav, audio_path, track, sr = audio_stage.prepare_audio(audio_path, audio_speed, slowed_audio_path)
+		prep_time = time.time() - prep_start
+		print(f"  [1-2] Audio prepared: {len(wav) / audio_stage.MEL_SAMPLE_RATE:.2f}s @ {audio_stage.MEL_SAMPLE_RATE}Hz in {prep_time:.2f}s")
+
+		# 1-3. Mel spectrogram 생성 (캐시된 창/filterbank)
+		mel_start = time.time()
+		print("  [1-3] Generating mel spectrogram...")
+		mel = mel_engine.get_mel_engine(mel_device).melspectrogram(wav)
+		mel_time = time.time() - mel_start
+		print(f"  [1-3] Mel spectrogram generated: shape {mel.shape} in {mel_time:.2f}s")
+
+		if np.isnan(mel.reshape(-1)).sum() > 0:
+			raise ValueError('Mel contains nan! Using a TTS voice? Add a small epsilon noise to the wav file and try again')
+		if cache_key is not None:
+			mel_cache.put(cache_key, mel, track, sr)
+
+	# 1-4. Mel chunks 생성 (느려진 오디오 길이 기준, 하나의 strided view)
+	mel_chunks = mel_engine.MelChunks(mel, fps, mel_step_size)
+	print(f"  [1-4] Created {len(mel_chunks)} mel chunks")
+
+	return mel_chunks, audio_path
+
+def _mel_cache_key(mel_cache, audio_path, audio_speed):
+	"""mel 캐시 키 계산 (캐시 미사용 또는 실패 시 None)"""
+	if mel_cache is None:
+		return None
+	try:
+		return mel_cache.make_key(mel_cache.audio_digest(audio_path), audio_speed)
+	except OSError as e:
+		print(f"  [1-0] Mel cache disabled for this request: {e}")
+		return None
+
+def _mux_audio(audio_path, video_path, output_path, run_command=None):
+	"""5단계: 오디오 + 영상 합성"""
+	_run_ffmpeg(['-i', audio_path, '-i', video_path, '-strict', '-2', '-q:v', '1', output_path], run_command)
+
+def _open_video_writer(temp_dir, frame_w, frame_h, fps, audio_path, output_path, encode_options):
+	"""
+	4단계 출력 writer 생성
+
+	encode_options가 주어지면 ffmpeg 파이프로 최종 mp4를 바로 인코딩 (스케일/FPS/오디오 합성 포함),
+	없으면 기존처럼 temp_dir/result.avi (DIVX)에 기록하고 5단계에서 오디오를 합성한다.
+
+	Returns:
+		(writer, result_avi_path 또는 단일 패스면 None)
+	"""
+	print(f"  - Video output settings: {frame_w}x{frame_h} @ {fps:.2f}fps")
+	if encode_options is not None:
+		out = FFmpegPipeWriter(output_path, (frame_w, frame_h), fps, audio_path, **encode_options)
+		print(f"  - Single-pass encoder: {' '.join(out.command)}")
+		return out, None
+	os.makedirs(temp_dir, exist_ok=True)
+	result_avi_path = os.path.join(temp_dir, 'result.avi')
+	out = cv2.VideoWriter(result_avi_path, 
+							cv2.VideoWriter_fourcc(*'DIVX'), fps, (frame_w, frame_h))
+	return out, result_avi_path
+
+def _write_video(model, gen, total_batches, device, out, predict_fn, prefetch_depth=0):
+	"""_run_inference_loop 실행 후 writer 종료 (오류 시 ffmpeg 파이프 인코더는 중단)"""
+	try:
+		result = _run_inference_loop(model, gen, total_batches, device, out, predict_fn, prefetch_depth)
+	except Exception:
+		if isinstance(out, FFmpegPipeWriter):
+			out.abort()
+		raise
+	out.release()
+	return result
+
+def _finish_audio(audio_path, result_avi_path, output_path, progress_callback, run_command=None):
+	"""5단계: 오디오 합성 (단일 패스 인코딩이면 4단계에서 이미 합성됨)"""
+	step_start = time.time()
+	_report_progress(progress_callback, 5)
+	if result_avi_path is None:
+		print("[Step 5] Audio-video synthesis skipped (muxed by single-pass encoder)")
+		return
+	print("[Step 5] Audio-video synthesis started")
+	_mux_audio(audio_path, result_avi_path, output_path, run_command)
+	step_time = time.time() - step_start
+	print(f"[Step 5] Audio-video synthesis completed in {step_time:.2f}s")
 
 def run_wav2lip_inference(
 	model,
@@ -270,7 +793,20 @@ def run_wav2lip_inference(
 	static: bool = False,
 	nosmooth: bool = False,
 	video_speed: float = 1.0,
-	audio_speed: float = 0.8
+	audio_speed: float = 0.8,
+	streaming: bool = False,
+	stream_window_size: int = 64,
+	temp_dir: str = 'temp',
+	predict_fn=None,
+	progress_callback=None,
+	box_cache=None,
+	keyframe_interval: int = 1,
+	motion_threshold: float = None,
+	encode_options: dict = None,
+	run_command=None,
+	mel_cache=None,
+	mel_device: str = None,
+	prefetch_depth: int = 0
 ):
 	"""
 	Wav2Lip inference 실행 (모델 재사용)
@@ -291,15 +827,43 @@ def run_wav2lip_inference(
 		nosmooth: 얼굴 감지 스무딩 비활성화
 		video_speed: 영상 배속 조절 (1.0 = 정상, 0.5 = 2배 느리게, 2.0 = 2배 빠르게)
 		audio_speed: 오디오 배속 조절 (1.0 = 정상, 0.8 = 1.25배 느리게, 0.5 = 2배 느리게)
+		streaming: 스트리밍 모드 (전체 프레임을 메모리에 올리지 않고 window 단위로 처리, 결과 동일)
+		stream_window_size: 스트리밍 모드 얼굴 감지 window 크기 (프레임 수)
+		temp_dir: 중간 파일(result.avi, temp.wav 등) 디렉토리. 동시 요청 시 요청별로 분리해야 함
+		predict_fn: (img_batch, mel_batch) -> pred 배열. 지정 시 model 대신 사용 (요청 간 배치 스케줄러)
+		progress_callback: 각 단계 시작 시 PIPELINE_STEPS 이름으로 호출되는 콜백 (작업 상태 조회용)
+		box_cache: 얼굴 박스 캐시 (서빙 서버: api.service.box_cache.FaceBoxCache, video_digest / make_key / get / put).
+			지정 시 같은 영상의 감지 결과를 재사용 (재제출/재시도)
+		keyframe_interval: k > 1이면 k 프레임마다만 얼굴 감지하고 사이 박스는 선형 보간
+		motion_threshold: 지정 시 마지막 키프레임 대비 움직임(썸네일 평균 차이)이 임계값을 넘으면 즉시 재감지
+			(keyframe_interval <= 1과 함께 쓰면 간격 제한 없이 움직임으로만 재감지)
+		encode_options: 지정 시 프레임을 ffmpeg 파이프로 보내 최종 영상을 한 번에 인코딩
+			(video_encoder.FFmpegPipeWriter 인자: resolution, target_fps, gpu_encoding, bitrate, upload, open_process)
+		run_command: cmd 리스트를 받아 ffmpeg를 실행하는 함수. 지정 시 5단계 오디오 합성 ffmpeg 호출을 위임
+		mel_cache: mel_engine.MelCache. 지정 시 같은 가이드 오디오의 mel/배속 트랙을 재사용 (재제출)
+		mel_device: mel STFT를 실행할 torch device (None이면 NumPy)
+		prefetch_depth: > 0이면 배치 생성을 백그라운드 스레드에서 이만큼 미리 하고
+			forward(CUDA: pinned 버퍼 비동기 복사)와 합성을 겹쳐 실행. 0이면 기존 순차 루프
 	"""
+	is_image = os.path.isfile(face_video_path) and face_video_path.split('.')[-1] in ['jpg', 'png', 'jpeg']
+	if streaming and not is_image and not static:
+		return _run_wav2lip_inference_streaming(
+			model, face_video_path, audio_path, output_path, device,
+			wav2lip_batch_size, face_det_batch_size, face_detector, pads,
+			resize_factor, box, nosmooth, audio_speed, stream_window_size, temp_dir, predict_fn,
+			progress_callback, box_cache, keyframe_interval, motion_threshold, encode_options,
+			run_command, mel_cache, mel_device, prefetch_depth
+		)
+
 	pipeline_start = time.time()  # 전체 파이프라인 시작 시간
 	
 	# ============================================
 	# 0단계: 영상 읽기
 	# ============================================
 	step_start = time.time()
+	_report_progress(progress_callback, 0)
 	fps = 18.0  # 무조건 18fps로 고정
-	if os.path.isfile(face_video_path) and face_video_path.split('.')[-1] in ['jpg', 'png', 'jpeg']:
+	if is_image:
 		full_frames = [cv2.imread(face_video_path)]
 		static = True
 		print(f"[Step 0] Reading image file: {face_video_path}")
@@ -307,19 +871,11 @@ def run_wav2lip_inference(
 		video_stream = cv2.VideoCapture(face_video_path)
 		# 원본 FPS는 읽기만 하고 사용하지 않음 (18fps로 고정)
 		original_fps_read = video_stream.get(cv2.CAP_PROP_FPS)
+		video_stream.release()
 		print(f"[Step 0] Reading video file: {face_video_path}")
 		print(f"  - Original video FPS (not used): {original_fps_read:.2f}, using fixed 18.0 fps")
 
-		full_frames = []
-		while 1:
-			still_reading, frame = video_stream.read()
-			if not still_reading:
-				video_stream.release()
-				break
-			
-			if resize_factor > 1:
-				frame = cv2.resize(frame, (frame.shape[1]//resize_factor, frame.shape[0]//resize_factor))
-			full_frames.append(frame)
+		full_frames = list(iter_video_frames(face_video_path, resize_factor))
 
 	step_time = time.time() - step_start
 	print(f"[Step 0] Video reading completed: {len(full_frames)} frames in {step_time:.2f}s")
@@ -328,75 +884,9 @@ def run_wav2lip_inference(
 	# 1단계: 오디오 처리 및 배속 조정
 	# ============================================
 	step_start = time.time()
-	print(f"[Step 1] Audio processing started")
-	
-	# 1-1. 오디오 변환 (필요한 경우)
-	if not audio_path.endswith('.wav'):
-		convert_start = time.time()
-		print(f"  [1-1] Converting audio to WAV format...")
-		temp_wav = 'temp/temp.wav'
-		os.makedirs('temp', exist_ok=True)
-		command = f'ffmpeg -y -i {audio_path} -strict -2 {temp_wav}'
-		subprocess.call(command, shell=platform.system() != 'Windows')
-		audio_path = temp_wav
-		convert_time = time.time() - convert_start
-		print(f"  [1-1] Audio conversion completed in {convert_time:.2f}s")
-	else:
-		print(f"  [1-1] Audio already in WAV format, skipping conversion")
-
-	# 1-2. 오디오 배속 조정 (느리게 만들기)
-	if audio_speed != 1.0:
-		speed_start = time.time()
-		print(f"  [1-2] Adjusting audio speed to {audio_speed}x (slower)...")
-		slowed_audio_path = 'temp/temp_slowed.wav'
-		os.makedirs('temp', exist_ok=True)
-		# atempo 필터 사용 (0.5 ~ 2.0 범위, 그 이상은 체인 필요)
-		if audio_speed < 0.5:
-			# 0.5보다 작으면 여러 번 체인
-			atempo_value = 0.5
-			chain_count = int(np.ceil(np.log(audio_speed) / np.log(0.5)))
-			atempo_filter = ','.join(['atempo=0.5'] * chain_count)
-		elif audio_speed > 2.0:
-			# 2.0보다 크면 여러 번 체인
-			atempo_value = 2.0
-			chain_count = int(np.ceil(np.log(audio_speed) / np.log(2.0)))
-			atempo_filter = ','.join(['atempo=2.0'] * chain_count)
-		else:
-			atempo_filter = f'atempo={audio_speed}'
-		
-		command = f'ffmpeg -y -i {audio_path} -af "{atempo_filter}" -strict -2 {slowed_audio_path}'
-		subprocess.call(command, shell=platform.system() != 'Windows')
-		audio_path = slowed_audio_path
-		speed_time = time.time() - speed_start
-		print(f"  [1-2] Audio speed adjustment completed in {speed_time:.2f}s")
-	else:
-		print(f"  [1-2] Audio speed adjustment skipped (audio_speed=1.0)")
-
-	# 1-3. Mel spectrogram 생성
-	mel_start = time.time()
-	print(f"  [1-3] Generating mel spectrogram...")
-	wav = audio.load_wav(audio_path, 16000)
-	mel = audio.melspectrogram(wav)
-	mel_time = time.time() - mel_start
-	print(f"  [1-3] Mel spectrogram generated: shape {mel.shape} in {mel_time:.2f}s")
-
-	if np.isnan(mel.reshape(-1)).sum() > 0:
-		raise ValueError('Mel contains nan! Using a TTS voice? Add a small epsilon noise to the wav file and try again')
-
-	# 1-4. Mel chunks 생성 (느려진 오디오 길이 기준)
-	chunks_start = time.time()
-	print(f"  [1-4] Creating mel chunks...")
-	mel_chunks = []
-	mel_idx_multiplier = 80./fps  # 원본 FPS 기준
-	i = 0
-	while 1:
-		start_idx = int(i * mel_idx_multiplier)
-		if start_idx + mel_step_size > len(mel[0]):
-			mel_chunks.append(mel[:, len(mel[0]) - mel_step_size:])
-			break
-		mel_chunks.append(mel[:, start_idx : start_idx + mel_step_size])
-		i += 1
-	chunks_time = time.time() - chunks_start
+	_report_progress(progress_callback, 1)
+	print("[Step 1] Audio processing started")
+	mel_chunks, audio_path = _prepare_audio(audio_path, audio_speed, fps, temp_dir, mel_cache, mel_device)
 	target_frame_count = len(mel_chunks)
 	
 	step_time = time.time() - step_start
@@ -404,11 +894,13 @@ def run_wav2lip_inference(
 	print(f"  - Audio length: {target_frame_count} frames (mel chunks)")
 	print(f"  - Original video frames: {len(full_frames)}")
 
+
 	# ============================================
 	# 2단계: 배속 조정된 오디오 길이에 맞춰 영상 길이 조정
 	# ============================================
 	step_start = time.time()
-	print(f"[Step 2] Video frame adjustment started")
+	_report_progress(progress_callback, 2)
+	print("[Step 2] Video frame adjustment started")
 	original_frames = full_frames.copy()
 	# 원본 FPS는 그대로 유지 (24fps 등)
 	
@@ -428,7 +920,7 @@ def run_wav2lip_inference(
 		print(f"  [2-1] Frame trimming completed in {trim_time:.2f}s")
 		# FPS는 그대로 유지 (프레임 수만 줄임)
 	else:
-		print(f"  [2-1] Video and audio lengths match perfectly, no adjustment needed")
+		print("  [2-1] Video and audio lengths match perfectly, no adjustment needed")
 	
 	step_time = time.time() - step_start
 	print(f"[Step 2] Video frame adjustment completed in {step_time:.2f}s")
@@ -438,15 +930,21 @@ def run_wav2lip_inference(
 	# 3단계: 조정된 영상에서 얼굴 탐지 (최적화)
 	# ============================================
 	step_start = time.time()
-	print(f"[Step 3] Face detection started")
+	_report_progress(progress_callback, 3)
+	print("[Step 3] Face detection started")
 	if box[0] == -1:
 		if not static:
+			cache_key = _face_box_cache_key(box_cache, face_video_path, face_detector, pads, resize_factor, keyframe_interval, motion_threshold)
 			# 최적화: 원본 프레임만 얼굴 감지 후 결과 확장
 			if len(original_frames) < target_frame_count:
 				# 영상이 확장된 경우: 원본만 감지 후 결과 확장
 				print(f"  [3-1] Optimized face detection: detecting {len(original_frames)} original frames, then expanding results...")
 				face_det_start = time.time()
-				face_det_results_original = face_detect(original_frames, device, face_detector, face_det_batch_size, pads, nosmooth)
+				raw_boxes = _load_cached_boxes(box_cache, cache_key, len(original_frames))
+				if raw_boxes is None or len(raw_boxes) != len(original_frames):
+					raw_boxes = detect_face_boxes(original_frames, device, face_detector, face_det_batch_size, pads, temp_dir, keyframe_interval, motion_threshold)
+					_store_cached_boxes(box_cache, cache_key, raw_boxes, complete=True)
+				face_det_results_original = boxes_to_face_results(original_frames, raw_boxes, nosmooth)
 				face_det_time = time.time() - face_det_start
 				print(f"  [3-1] Face detection completed in {face_det_time:.2f}s")
 				
@@ -459,13 +957,17 @@ def run_wav2lip_inference(
 				# 영상이 잘린 경우: 잘린 프레임에 대해 감지
 				print(f"  [3-1] Face detection on {len(full_frames)} frames...")
 				face_det_start = time.time()
-				face_det_results = face_detect(full_frames, device, face_detector, face_det_batch_size, pads, nosmooth)
+				raw_boxes = _load_cached_boxes(box_cache, cache_key, len(full_frames))
+				if raw_boxes is None or len(raw_boxes) != len(full_frames):
+					raw_boxes = detect_face_boxes(full_frames, device, face_detector, face_det_batch_size, pads, temp_dir, keyframe_interval, motion_threshold)
+					_store_cached_boxes(box_cache, cache_key, raw_boxes, complete=len(full_frames) == len(original_frames))
+				face_det_results = boxes_to_face_results(full_frames, raw_boxes, nosmooth)
 				face_det_time = time.time() - face_det_start
 				print(f"  [3-1] Face detection completed in {face_det_time:.2f}s")
 		else:
-			print(f"  [3-1] Static mode: detecting face on first frame only...")
+			print("  [3-1] Static mode: detecting face on first frame only...")
 			face_det_start = time.time()
-			face_det_results = face_detect([full_frames[0]], device, face_detector, face_det_batch_size, pads, nosmooth)
+			face_det_results = face_detect([full_frames[0]], device, face_detector, face_det_batch_size, pads, nosmooth, temp_dir)
 			face_det_time = time.time() - face_det_start
 			print(f"  [3-1] Face detection completed in {face_det_time:.2f}s")
 			# static 모드에서도 확장 필요
@@ -491,112 +993,159 @@ def run_wav2lip_inference(
 	# 4단계: Inference 실행
 	# ============================================
 	step_start = time.time()
-	print(f"[Step 4] Wav2Lip inference started")
+	_report_progress(progress_callback, 4)
+	print("[Step 4] Wav2Lip inference started")
 	batch_size = wav2lip_batch_size
 	gen = datagen(full_frames.copy(), mel_chunks, static, box, face_det_results, img_size=96, batch_size=batch_size)
 	
 	frame_h, frame_w = full_frames[0].shape[:-1]
-	os.makedirs('temp', exist_ok=True)
 	
 	# FPS 하드코딩: 무조건 18fps
 	fps = 18.0
-	print(f"  - Video output settings: {frame_w}x{frame_h} @ {fps:.2f}fps")
-	out = cv2.VideoWriter('temp/result.avi', 
-							cv2.VideoWriter_fourcc(*'DIVX'), fps, (frame_w, frame_h))
+	out, result_avi_path = _open_video_writer(temp_dir, frame_w, frame_h, fps, audio_path, output_path, encode_options)
 
-	inference_start = time.time()
-	postprocess_start = None
-	postprocess_time = 0
+	total_batches = int(np.ceil(float(len(mel_chunks))/batch_size))
+	inference_time, postprocess_time = _write_video(model, gen, total_batches, device, out, predict_fn, prefetch_depth)
 	
-	for i, (img_batch, mel_batch, frames, coords) in enumerate(tqdm(gen, 
-										total=int(np.ceil(float(len(mel_chunks))/batch_size)))):
-		if i == 0:
-			batch_start = time.time()
-		
-		# 4-1. 입력 변환
-		if i == 0:
-			convert_start = time.time()
-		if next(model.parameters()).dtype == torch.float16:
-			img_batch = torch.HalfTensor(np.transpose(img_batch, (0, 3, 1, 2))).to(device)
-			mel_batch = torch.HalfTensor(np.transpose(mel_batch, (0, 3, 1, 2))).to(device)
-		else:
-			img_batch = torch.FloatTensor(np.transpose(img_batch, (0, 3, 1, 2))).to(device)
-			mel_batch = torch.FloatTensor(np.transpose(mel_batch, (0, 3, 1, 2))).to(device)
-		if i == 0:
-			convert_time = time.time() - convert_start
-			print(f"  [4-1] First batch input conversion: {convert_time:.3f}s")
+	step_time = time.time() - step_start
+	print(f"[Step 4] Wav2Lip inference completed in {step_time:.2f}s")
+	print(f"  - Total inference time: {inference_time:.2f}s")
+	print(f"  - Post-processing time: {postprocess_time:.2f}s")
+	print(f"  - Processed {len(mel_chunks)} frames in {total_batches} batches")
 
-		# 4-2. 모델 Inference
-		if i == 0:
-			model_start = time.time()
-		with torch.no_grad():
-			if device == 'cuda' and next(model.parameters()).dtype == torch.float16:
-				with torch.amp.autocast('cuda'):
-					pred = model(mel_batch, img_batch)
-			else:
-				pred = model(mel_batch, img_batch)
-		if i == 0:
-			model_time = time.time() - model_start
-			print(f"  [4-2] First batch model inference: {model_time:.3f}s")
+	# ============================================
+	# 5단계: 오디오 합성
+	# ============================================
+	_finish_audio(audio_path, result_avi_path, output_path, progress_callback, run_command)
+	
+	total_time = time.time() - pipeline_start
+	print(f"\n[Summary] Output saved to: {output_path}")
+	print(f"  - Total pipeline time: {total_time:.2f}s")
 
-		# 4-3. 후처리 시작 시간 측정
-		if postprocess_start is None:
-			postprocess_start = time.time()
-		
-		# CUDA 텐서를 CPU로 이동 후 numpy로 변환
-		pred = pred.cpu().numpy().transpose(0, 2, 3, 1) * 255.
-		
-		for p, f, c in zip(pred, frames, coords):
-			y1, y2, x1, x2 = c
-			y1, y2, x1, x2 = int(y1), int(y2), int(x1), int(x2)
-			
-			target_width = x2 - x1
-			target_height = y2 - y1
-			p = cv2.resize(p.astype(np.uint8), (target_width, target_height))
-			
-			# 페더링
-			feather_amount = min(15, max(5, target_width // 15, target_height // 15))
-			
-			if feather_amount > 0:
-				mask = np.ones((target_height, target_width), dtype=np.float32)
-				fade_range = np.arange(feather_amount, dtype=np.float32) / feather_amount
-				
-				mask[:feather_amount, :] *= fade_range[:, np.newaxis]
-				mask[-feather_amount:, :] *= fade_range[::-1, np.newaxis]
-				mask[:, :feather_amount] *= fade_range[np.newaxis, :]
-				mask[:, -feather_amount:] *= fade_range[::-1, np.newaxis].T
-				
-				mask = mask[:, :, np.newaxis]
-				original_region = f[y1:y2, x1:x2].astype(np.float32)
-				blended = (p.astype(np.float32) * mask + original_region * (1 - mask)).astype(np.uint8)
-				
-				f[y1:y2, x1:x2] = blended
-			else:
-				f[y1:y2, x1:x2] = p
-			
-			out.write(f)
+def _run_wav2lip_inference_streaming(
+	model,
+	face_video_path,
+	audio_path,
+	output_path,
+	device,
+	wav2lip_batch_size,
+	face_det_batch_size,
+	face_detector,
+	pads,
+	resize_factor,
+	box,
+	nosmooth,
+	audio_speed,
+	window_size,
+	temp_dir,
+	predict_fn,
+	progress_callback,
+	box_cache,
+	keyframe_interval,
+	motion_threshold,
+	encode_options,
+	run_command,
+	mel_cache,
+	mel_device,
+	prefetch_depth
+):
+	"""
+	run_wav2lip_inference의 스트리밍 모드 (영상 파일 전용)
 	
-	postprocess_time = time.time() - postprocess_start if postprocess_start else 0
-	inference_time = time.time() - inference_start
-	out.release()
+	전체 프레임 리스트 대신 영상을 두 번 디코딩한다.
+	- 1차 패스: window 단위로 얼굴 감지 → 박스 (N, 4)만 보관
+	- 2차 패스: 다시 디코딩하며 배치 단위로 inference + 합성 + 기록
+	프레임 확장/잘라내기는 build_frame_index_map 인덱스로 처리하므로
+	기존 경로와 동일한 프레임/박스/mel 조합이 만들어진다.
+	"""
+	pipeline_start = time.time()  # 전체 파이프라인 시작 시간
+	fps = 18.0  # 무조건 18fps로 고정
 	
+	# ============================================
+	# 0단계: 영상 열기 (프레임 크기 확인, 디코딩은 1차 패스에서)
+	# ============================================
+	_report_progress(progress_callback, 0)
+	print(f"[Step 0] Streaming video file: {face_video_path}")
+	first_frame = next(iter_video_frames(face_video_path, resize_factor, limit=1))
+	frame_h, frame_w = first_frame.shape[:-1]
+	del first_frame
+
+	# ============================================
+	# 1단계: 오디오 처리 및 배속 조정 (목표 프레임 수를 먼저 알아야 함)
+	# ============================================
+	step_start = time.time()
+	_report_progress(progress_callback, 1)
+	print("[Step 1] Audio processing started (streaming mode)")
+	mel_chunks, audio_path = _prepare_audio(audio_path, audio_speed, fps, temp_dir, mel_cache, mel_device)
+	target_frame_count = len(mel_chunks)
+	step_time = time.time() - step_start
+	print(f"[Step 1] Audio processing completed in {step_time:.2f}s")
+	print(f"  - Audio length: {target_frame_count} frames (mel chunks)")
+
+	# ============================================
+	# 2단계: 영상 길이 조정 - 오디오보다 긴 부분은 디코딩하지 않음 (확장은 3단계 후 인덱스 매핑)
+	# ============================================
+	_report_progress(progress_callback, 2)
+	frames = _LimitedFrames(iter_video_frames(face_video_path, resize_factor), target_frame_count)
+
+	# ============================================
+	# 3단계: 영상 스트리밍 디코딩 + 얼굴 탐지 (1차 패스)
+	# ============================================
+	step_start = time.time()
+	_report_progress(progress_callback, 3)
+	if box[0] == -1:
+		print(f"[Step 3] Face detection started (window={window_size} frames)")
+		cache_key = _face_box_cache_key(
+			box_cache, face_video_path, face_detector, pads, resize_factor, keyframe_interval, motion_threshold,
+			mode=f'stream{window_size}'
+		)
+		boxes = _load_cached_boxes(box_cache, cache_key, target_frame_count)
+		if boxes is None:
+			boxes = detect_face_boxes_streaming(frames, device, face_detector, face_det_batch_size, pads, window_size, temp_dir, keyframe_interval, motion_threshold)
+			# 영상 끝까지 읽었을 때만 전체 감지 결과 (목표 프레임에서 잘렸으면 앞부분)
+			_store_cached_boxes(box_cache, cache_key, boxes, complete=frames.exhausted)
+		if not nosmooth: boxes = get_smoothened_boxes(boxes.copy(), T=5)
+	else:
+		print('  [3-1] Using the specified bounding box instead of face detection...')
+		y1, y2, x1, x2 = box
+		frame_count = sum(1 for _ in frames)
+		boxes = np.tile(np.array([[x1, y1, x2, y2]]), (frame_count, 1))
+	original_frame_count = len(boxes)
+	step_time = time.time() - step_start
+	print(f"[Step 3] Face detection completed in {step_time:.2f}s")
+	print(f"  - Original video frames: {original_frame_count}")
+
+	# 목표 프레임 → 원본 프레임 인덱스 매핑 (2단계의 확장/잘라내기)
+	index_map = build_frame_index_map(original_frame_count, target_frame_count)
+	if original_frame_count < target_frame_count:
+		print(f"[Step 2] Extending video frames from {original_frame_count} to {target_frame_count} (index mapping)")
+	elif original_frame_count > target_frame_count:
+		print(f"[Step 2] Trimming video frames from {original_frame_count} to {target_frame_count} (index mapping)")
+
+	# ============================================
+	# 4단계: Inference 실행 (2차 패스)
+	# ============================================
+	step_start = time.time()
+	_report_progress(progress_callback, 4)
+	print("[Step 4] Wav2Lip inference started (streaming mode)")
+	batch_size = wav2lip_batch_size
+	gen = stream_datagen(face_video_path, mel_chunks, index_map, boxes, resize_factor, img_size=96, batch_size=batch_size)
+	out, result_avi_path = _open_video_writer(temp_dir, frame_w, frame_h, fps, audio_path, output_path, encode_options)
+
+	total_batches = int(np.ceil(float(len(mel_chunks))/batch_size))
+	inference_time, postprocess_time = _write_video(model, gen, total_batches, device, out, predict_fn, prefetch_depth)
+
 	step_time = time.time() - step_start
 	print(f"[Step 4] Wav2Lip inference completed in {step_time:.2f}s")
 	print(f"  - Total inference time: {inference_time:.2f}s")
 	print(f"  - Post-processing time: {postprocess_time:.2f}s")
-	print(f"  - Processed {len(mel_chunks)} frames in {int(np.ceil(float(len(mel_chunks))/batch_size))} batches")
+	print(f"  - Processed {len(mel_chunks)} frames in {total_batches} batches")
 
 	# ============================================
 	# 5단계: 오디오 합성
 	# ============================================
-	step_start = time.time()
-	print(f"[Step 5] Audio-video synthesis started")
-	command = f'ffmpeg -y -i {audio_path} -i temp/result.avi -strict -2 -q:v 1 {output_path}'
-	subprocess.call(command, shell=platform.system() != 'Windows')
-	step_time = time.time() - step_start
-	print(f"[Step 5] Audio-video synthesis completed in {step_time:.2f}s")
-	
+	_finish_audio(audio_path, result_avi_path, output_path, progress_callback, run_command)
+
 	total_time = time.time() - pipeline_start
 	print(f"\n[Summary] Output saved to: {output_path}")
 	print(f"  - Total pipeline time: {total_time:.2f}s")
-
@@ -0,0 +1,62 @@
+"""
+Pytest 설정 및 공통 Fixtures
+
+모델 / ffmpeg / 얼굴 이미지가 필요한 테스트는 해당 자원이 없는 환경에서 skip 된다.
+- 얼굴 이미지: SERVING_TEST_FACE_IMAGE 환경변수, 없으면 insightface 내장 샘플 이미지 (t1)
+"""
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+SERVING_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WAV2LIP_DIR = os.path.join(SERVING_DIR, "models", "Wav2Lip")
+
+for path in (SERVING_DIR, WAV2LIP_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture(scope="session")
+def ffmpeg():
+    """ffmpeg / ffprobe 실행 파일 (없으면 skip)"""
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        pytest.skip("ffmpeg/ffprobe가 설치되어 있지 않습니다")
+    return "ffmpeg"
+
+
+@pytest.fixture(scope="session")
+def face_image():
+    """얼굴이 포함된 BGR 이미지 (numpy 배열)"""
+    cv2 = pytest.importorskip("cv2")
+    path = os.getenv("SERVING_TEST_FACE_IMAGE")
+    if path:
+        image = cv2.imread(path)
+        if image is None:
+            pytest.fail(f"SERVING_TEST_FACE_IMAGE를 읽을 수 없습니다: {path}")
+        return image
+    insightface_data = pytest.importorskip("insightface.data")
+    return insightface_data.get_image("t1")
+
+
+@pytest.fixture(scope="session")
+def face_video(tmp_path_factory, ffmpeg, face_image):
+    """얼굴 이미지를 반복한 3초 / 25fps 영상"""
+    import cv2
+
+    work_dir = tmp_path_factory.mktemp("face_video")
+    image_path = str(work_dir / "face.png")
+    video_path = str(work_dir / "face.mp4")
+    cv2.imwrite(image_path, face_image)
+    subprocess.run(
+        [
+            ffmpeg, "-y", "-loglevel", "error",
+            "-loop", "1", "-i", image_path, "-t", "3", "-r", "25",
+            "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p", video_path,
+        ],
+        check=True,
+    )
+    return video_path
@@ -0,0 +1,122 @@
+"""
+동시 /api/v1/lip-video 요청 검증
+
+한 이벤트 루프에서 N개의 요청을 실제 라우트로 동시에 보내고 (httpx ASGITransport),
+각 결과가 자기 입력과 일치하는지 확인한다. GCS 대신 LocalStorageClient를 사용한다.
+- 요청마다 오디오 길이와 사인파 주파수를 다르게 만들어 두므로 중간 파일이 섞이면 길이 / 주파수가 어긋난다.
+- 배속(0.8)은 피치를 유지하므로 결과 오디오의 주된 주파수는 입력과 같아야 한다.
+"""
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+httpx = pytest.importorskip("httpx")
+
+NUM_JOBS = 4
+AUDIO_SPEED = 0.8  # AIService가 사용하는 audio_speed
+SAMPLE_RATE = 16000
+
+
+def _probe(path: str) -> dict:
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration:stream=codec_type,width,height",
+        "-of", "json", path,
+    ]
+    return json.loads(subprocess.run(cmd, capture_output=True, text=True, check=True).stdout)
+
+
+def _duration(path: str) -> float:
+    return float(_probe(path)["format"]["duration"])
+
+
+def _video_size(path: str) -> tuple:
+    stream = next(s for s in _probe(path)["streams"] if s["codec_type"] == "video")
+    return stream["width"], stream["height"]
+
+
+def _dominant_frequency(path: str) -> float:
+    """결과 파일 오디오 트랙의 주된 주파수 (Hz)"""
+    cmd = [
+        "ffmpeg", "-v", "error", "-i", path,
+        "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-",
+    ]
+    pcm = np.frombuffer(subprocess.run(cmd, capture_output=True, check=True).stdout, dtype=np.int16)
+    spectrum = np.abs(np.fft.rfft(pcm.astype(np.float32) * np.hanning(len(pcm))))
+    return float(np.fft.rfftfreq(len(pcm), 1.0 / SAMPLE_RATE)[np.argmax(spectrum)])
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    """PORT=8000 (Wav2Lip) 앱, 스토리지는 tmp_path 아래 로컬 디렉토리"""
+    monkeypatch.setenv("PORT", "8000")
+    from api.main import app
+    from api.service.ai_service import ai_service
+    from api.utils.async_storage import AsyncStorage
+    from api.utils.gcs_client import LocalStorageClient
+
+    if ai_service._wav2lip_model is None:
+        pytest.skip("Wav2Lip 모델이 로드되지 않았습니다 (체크포인트 필요)")
+    # gs://fake/<path> → tmp_path/fake/<path>
+    monkeypatch.setattr(ai_service, "storage", AsyncStorage(LocalStorageClient(str(tmp_path))))
+    return app
+
+
+def _make_jobs(root, face_video, ffmpeg):
+    inputs_dir = os.path.join(root, "fake", "inputs")
+    os.makedirs(inputs_dir, exist_ok=True)
+    shutil.copyfile(face_video, os.path.join(inputs_dir, "video.mp4"))
+
+    jobs = []
+    for i in range(NUM_JOBS):
+        frequency = 300 + 200 * i
+        length = 2.0 - 0.3 * i
+        audio_path = os.path.join(inputs_dir, f"audio_{i}.wav")
+        subprocess.run(
+            [
+                ffmpeg, "-y", "-loglevel", "error",
+                "-f", "lavfi", "-i", f"sine=frequency={frequency}:sample_rate={SAMPLE_RATE}:duration={length}",
+                audio_path,
+            ],
+            check=True,
+        )
+        jobs.append({
+            "request": {
+                "user_video_gs": "gs://fake/inputs/video.mp4",
+                "gen_audio_gs": f"gs://fake/inputs/audio_{i}.wav",
+                "output_video_gs": f"gs://fake/outputs/result_{i}.mp4",
+            },
+            "output": os.path.join(root, "fake", "outputs", f"result_{i}.mp4"),
+            "frequency": frequency,
+            "duration": _duration(audio_path) / AUDIO_SPEED,
+        })
+    return jobs
+
+
+async def test_concurrent_requests_produce_own_outputs(app, tmp_path, face_video, ffmpeg):
+    jobs = _make_jobs(str(tmp_path), face_video, ffmpeg)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+        responses = await asyncio.gather(*[
+            client.post("/api/v1/lip-video", json=job["request"]) for job in jobs
+        ])
+
+    expected_size = _video_size(face_video)
+    for i, (job, response) in enumerate(zip(jobs, responses)):
+        assert response.status_code == 200, f"job {i}: {response.text}"
+        body = response.json()
+        assert body["success"] is True
+        assert body["result_video_gs"] == job["request"]["output_video_gs"]
+        assert os.path.exists(job["output"]), f"job {i}: 결과 파일 없음"
+
+        assert _duration(job["output"]) == pytest.approx(job["duration"], abs=0.25), f"job {i}: 길이 불일치"
+        assert _video_size(job["output"]) == expected_size, f"job {i}: 해상도 불일치"
+        assert _dominant_frequency(job["output"]) == pytest.approx(job["frequency"], abs=20), \
+            f"job {i}: 다른 요청의 오디오가 섞였습니다"
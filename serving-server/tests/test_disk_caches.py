@@ -0,0 +1,177 @@
+"""
+디스크 캐시 검증 (DiskLRUCache / STTResultCache, tmp_path만 사용)
+
+- put/get 왕복, 재시작 후 인덱스 복원
+- TTL이 지난 STT 결과는 miss
+- 총 바이트 한도를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+- 시작 시 임계 시간보다 오래된 <key>.<uuid>.tmp 파일만 삭제
+"""
+import os
+import time
+
+import numpy as np
+import pytest
+
+from api.service.stt_cache import STTResultCache, file_digest, pcm_digest
+from api.utils import disk_lru
+from api.utils.disk_lru import DiskLRUCache
+
+
+class BytesCache(DiskLRUCache):
+    """DiskLRUCache 인덱스 동작만 확인하기 위한 bytes 값 캐시"""
+
+    def __init__(self, cache_dir, **limits):
+        super().__init__(cache_dir, ".bin", **limits)
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._touch(key)
+            with open(self._path(key), "rb") as f:
+                return f.read()
+
+    def put(self, key, data):
+        tmp_path = self.temp_path(key)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            self._install(key, tmp_path)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """disk_lru / stt_cache가 보는 time.time()을 수동으로 진행시키는 시계"""
+    now = [1_000_000.0]
+
+    def advance(seconds=1.0):
+        now[0] += seconds
+
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return advance
+
+
+def test_lru_round_trip_and_restart(tmp_path):
+    cache = BytesCache(str(tmp_path))
+    cache.put("a", b"alpha")
+
+    assert cache.get("a") == b"alpha"
+    assert cache.get("missing") is None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    reopened = BytesCache(str(tmp_path))
+    assert reopened.get("a") == b"alpha"
+    assert reopened.stats()["entries"] == 1 and reopened.stats()["bytes"] == 5
+
+
+def test_lru_evicts_oldest_over_byte_budget(tmp_path, clock):
+    cache = BytesCache(str(tmp_path), max_bytes=250)
+    for key in ("a", "b"):
+        cache.put(key, b"x" * 100)
+        clock()
+    # a를 다시 사용했으므로 한도를 넘으면 b가 먼저 삭제된다
+    assert cache.get("a") is not None
+    clock()
+    cache.put("c", b"x" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert not os.path.exists(cache._path("b"))
+    stats = cache.stats()
+    assert stats["bytes"] == 200 and stats["evictions"] == 1
+
+
+def test_lru_evicts_by_entry_count(tmp_path, clock):
+    cache = BytesCache(str(tmp_path), max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, b"x")
+        clock()
+
+    assert cache.get("a") is None
+    assert cache.get("b") == b"x" and cache.get("c") == b"x"
+
+
+def test_only_stale_cache_temp_files_are_removed(tmp_path):
+    cache = BytesCache(str(tmp_path))
+    stale = cache.temp_path("a")
+    fresh = cache.temp_path("b")
+    other = str(tmp_path / "upload.tmp")  # 이 캐시가 만든 이름 형식이 아님
+    for path in (stale, fresh, other):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+    old = time.time() - disk_lru.STALE_TEMP_SECONDS - 60
+    os.utime(stale, (old, old))
+    os.utime(other, (old, old))
+
+    reopened = BytesCache(str(tmp_path))
+
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh) and os.path.exists(other)
+    assert reopened.stats()["entries"] == 0
+
+
+def test_stt_round_trip(tmp_path):
+    cache = STTResultCache(str(tmp_path))
+    key = cache.make_key(pcm_digest(np.zeros(16000, dtype=np.float32)), "large-v3", "ko")
+    cache.put(key, "안녕하세요", "ko", "large-v3")
+
+    entry = STTResultCache(str(tmp_path)).get(key)
+    assert entry["transcription"] == "안녕하세요"
+    assert entry["language"] == "ko" and entry["model_size"] == "large-v3"
+
+
+def test_stt_key_depends_on_audio_model_and_language(tmp_path):
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"RIFF....WAVE")
+    silence = pcm_digest(np.zeros(16000, dtype=np.float32))
+    tone = pcm_digest(np.ones(16000, dtype=np.float32))
+
+    keys = {
+        STTResultCache.make_key(silence, "large-v3", "ko"),
+        STTResultCache.make_key(tone, "large-v3", "ko"),
+        STTResultCache.make_key(silence, "medium", "ko"),
+        STTResultCache.make_key(silence, "large-v3", None),
+        STTResultCache.make_key(file_digest(str(audio)), "large-v3", "ko"),
+    }
+    assert len(keys) == 5
+    # float64 입력도 같은 PCM이면 같은 digest
+    assert pcm_digest(np.zeros(16000, dtype=np.float64)) == silence
+
+
+def test_stt_expired_entry_is_missed(tmp_path, clock):
+    cache = STTResultCache(str(tmp_path), ttl_seconds=60)
+    cache.put("k", "text", "ko", "large-v3")
+
+    clock(59)
+    assert cache.get("k") is not None
+    clock(2)
+    assert cache.get("k") is None
+    assert not os.path.exists(cache._path("k"))
+    stats = cache.stats()
+    assert stats["expired"] == 1 and stats["entries"] == 0
+
+
+def test_stt_corrupt_entry_is_missed(tmp_path):
+    cache = STTResultCache(str(tmp_path))
+    cache.put("k", "text", "ko", "large-v3")
+    with open(cache._path("k"), "w", encoding="utf-8") as f:
+        f.write("{not json")
+
+    assert cache.get("k") is None
+    assert not os.path.exists(cache._path("k"))
+
+
+def test_stt_evicts_oldest_over_byte_budget(tmp_path, clock):
+    probe = STTResultCache(str(tmp_path / "probe"))
+    probe.put("k0", "x" * 100, "ko", "large-v3")
+    entry_bytes = probe.stats()["bytes"]
+
+    cache = STTResultCache(str(tmp_path / "cache"), max_bytes=entry_bytes * 2)
+    for i in range(3):
+        cache.put(f"k{i}", "x" * 100, "ko", "large-v3")
+        clock()
+
+    assert cache.get("k0") is None
+    assert cache.get("k1") is not None and cache.get("k2") is not None
+    assert cache.stats()["evictions"] == 1
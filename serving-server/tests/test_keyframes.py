@@ -0,0 +1,29 @@
+"""
+키프레임 선택 (select_keyframes) 검증
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("torch")
+
+from wav2lip_inference import select_keyframes  # noqa: E402
+
+
+def _frames(levels):
+    return [np.full((96, 96, 3), level, dtype=np.uint8) for level in levels]
+
+
+def test_interval_one_without_motion_detects_every_frame():
+    assert select_keyframes(_frames([0] * 6), keyframe_interval=1) == list(range(6))
+
+
+def test_motion_only_when_interval_is_one():
+    # 간격 제한 없이 움직임이 큰 프레임과 양 끝만 키프레임
+    frames = _frames([0] * 5 + [100] * 5)
+    assert select_keyframes(frames, keyframe_interval=1, motion_threshold=10.0) == [0, 5, 9]
+
+
+def test_interval_and_motion_combined():
+    frames = _frames([0] * 5 + [100] * 5)
+    assert select_keyframes(frames, keyframe_interval=4, motion_threshold=10.0) == [0, 4, 5, 9]
@@ -0,0 +1,190 @@
+"""
+미디어 캐시 검증 (MediaCache claim / commit / release, AsyncStorage._cached)
+
+GCS 대신 호출 횟수를 세는 FakeClient를 사용한다.
+- 같은 (경로, generation)을 동시에 요청하면 다운로드는 한 번
+- 다운로드가 실패하면 claim이 풀려 다음 요청이 다시 받는다
+- 같은 경로라도 generation이 바뀌면 miss
+"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from api.utils.media_cache import MediaCache
+
+DATA = b"user video bytes" * 1024
+
+
+class FakeClient:
+    """get_object_info / download_file만 제공하는 스토리지 클라이언트 대체 객체"""
+
+    def __init__(self, data=DATA, delay=0.2):
+        self.data = data
+        self.generation = "1"
+        self.delay = delay
+        self.fail = False
+        self.downloads = 0
+        self._lock = threading.Lock()
+
+    def get_object_info(self, gs_path):
+        return {"size": len(self.data), "generation": self.generation}
+
+    def download_file(self, gs_path, local_path):
+        with self._lock:
+            self.downloads += 1
+        time.sleep(self.delay)  # 다른 요청이 같은 객체를 요청할 시간
+        if self.fail:
+            return False
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        with open(local_path, "wb") as f:
+            f.write(self.data)
+        return True
+
+
+def _temp_files(cache):
+    return [name for name in os.listdir(cache.cache_dir) if name.endswith(".tmp")]
+
+
+def _write_temp(cache, key, data=b"data"):
+    tmp_path = cache.temp_path(key)
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    return tmp_path
+
+
+def test_claim_coalesces_until_release(tmp_path):
+    cache = MediaCache(str(tmp_path))
+    key = cache.make_key("gs://bucket/a.mp4", "1")
+
+    future, owner = cache.claim(key)
+    waiter, waiter_owner = cache.claim(key)
+    assert owner and not waiter_owner
+    assert waiter is future and not waiter.done()
+
+    path = cache.commit(key, _write_temp(cache, key))
+    cache.release(key, future, path)
+
+    assert waiter.result(timeout=0) == path
+    assert cache.lookup(key) == path
+    # 채워진 뒤의 claim은 바로 캐시 경로를 돌려준다
+    done, owner = cache.claim(key)
+    assert not owner and done.result(timeout=0) == path
+    assert cache.stats()["coalesced"] == 1 and cache.stats()["filling"] == 0
+
+
+def test_release_without_commit_lets_next_caller_claim(tmp_path):
+    cache = MediaCache(str(tmp_path))
+    key = cache.make_key("gs://bucket/a.mp4", "1")
+
+    future, owner = cache.claim(key)
+    waiter, _ = cache.claim(key)
+    cache.release(key, future, None)
+
+    assert waiter.result(timeout=0) is None
+    _, owner = cache.claim(key)
+    assert owner
+
+
+def test_commit_rejects_object_over_budget(tmp_path):
+    cache = MediaCache(str(tmp_path), max_bytes=10)
+    key = cache.make_key("gs://bucket/big.mp4", "1")
+
+    assert not cache.admits(11) and not cache.admits(None)
+    assert cache.commit(key, _write_temp(cache, key, b"x" * 11)) is None
+    assert cache.lookup(key) is None and not _temp_files(cache)
+
+
+def test_commit_keeps_new_entry_and_evicts_oldest(tmp_path):
+    cache = MediaCache(str(tmp_path), max_bytes=150)
+    keys = [cache.make_key(f"gs://bucket/{i}.mp4", "1") for i in range(2)]
+    cache.commit(keys[0], _write_temp(cache, keys[0], b"x" * 100))
+    cache.commit(keys[1], _write_temp(cache, keys[1], b"x" * 100))
+
+    assert cache.lookup(keys[0]) is None
+    assert cache.lookup(keys[1]) is not None
+
+
+def test_key_depends_on_generation():
+    assert MediaCache.make_key("gs://bucket/a.mp4", "1") != MediaCache.make_key("gs://bucket/a.mp4", "2")
+
+
+@pytest.fixture
+def storage(monkeypatch, tmp_path):
+    """FakeClient + MediaCache를 쓰는 AsyncStorage (전역 gcs_client는 로컬 백엔드로 생성)"""
+    pytest.importorskip("google.cloud.storage")
+    for name, value in (("GCP_PROJECT_ID", "test"), ("GCS_BUCKET", "test"), ("GCS_CREDENTIAL_PATH", "")):
+        monkeypatch.setenv(name, os.environ.get(name, value))
+    monkeypatch.setenv("STORAGE_BACKEND", "local")
+    monkeypatch.setenv("STORAGE_LOCAL_ROOT", str(tmp_path / "local"))
+    from api.utils.async_storage import AsyncStorage
+
+    return AsyncStorage(FakeClient(), max_workers=8, cache=MediaCache(str(tmp_path / "cache")))
+
+
+async def test_concurrent_downloads_fetch_once(storage, tmp_path):
+    paths = [str(tmp_path / "work" / f"{i}" / "video.mp4") for i in range(4)]
+
+    results = await asyncio.gather(*(storage.download_file("gs://bucket/a.mp4", path) for path in paths))
+
+    assert results == [True] * 4
+    assert storage.client.downloads == 1
+    for path in paths:
+        with open(path, "rb") as f:
+            assert f.read() == DATA
+    # 작업 경로는 캐시 파일의 복사본이므로 수정해도 캐시 항목은 그대로
+    with open(paths[0], "wb") as f:
+        f.write(b"modified")
+    assert await storage.download_file("gs://bucket/a.mp4", paths[1])
+    with open(paths[1], "rb") as f:
+        assert f.read() == DATA
+    assert storage.client.downloads == 1
+
+
+async def test_failed_download_releases_claim(storage, tmp_path):
+    local_path = str(tmp_path / "work" / "video.mp4")
+    storage.client.fail = True
+
+    # 캐시 채우기 실패 후 직접 다운로드도 실패
+    assert not await storage.download_file("gs://bucket/a.mp4", local_path)
+    assert storage.client.downloads == 2
+    stats = storage.cache.stats()
+    assert stats["filling"] == 0 and stats["entries"] == 0
+    assert not _temp_files(storage.cache)
+
+    storage.client.fail = False
+    assert await storage.download_file("gs://bucket/a.mp4", local_path)
+    assert storage.client.downloads == 3
+    assert storage.cache.stats()["entries"] == 1
+
+
+async def test_cached_failure_reaches_waiters(storage):
+    storage.client.fail = True
+    info = storage.client.get_object_info("gs://bucket/a.mp4")
+
+    async def fetch(tmp_path):
+        return await storage._run(storage.client.download_file, "gs://bucket/a.mp4", tmp_path)
+
+    results = await asyncio.gather(*(storage._cached("gs://bucket/a.mp4", info, fetch) for _ in range(3)))
+
+    assert results == [None] * 3
+    assert storage.client.downloads == 1
+    assert storage.cache.stats()["filling"] == 0
+
+
+async def test_new_generation_misses_cache(storage, tmp_path):
+    local_path = str(tmp_path / "work" / "video.mp4")
+    assert await storage.download_file("gs://bucket/a.mp4", local_path)
+    assert await storage.download_file("gs://bucket/a.mp4", local_path)
+    assert storage.client.downloads == 1
+
+    storage.client.generation = "2"
+    storage.client.data = b"replaced video bytes"
+    assert await storage.download_file("gs://bucket/a.mp4", local_path)
+
+    assert storage.client.downloads == 2
+    with open(local_path, "rb") as f:
+        assert f.read() == b"replaced video bytes"
+    assert storage.cache.stats()["entries"] == 2
@@ -0,0 +1,56 @@
+"""
+SCRFD ONNX 배치 감지기와 기존 insightface SCRFD 감지기의 결과 비교 (CPUExecutionProvider)
+
+같은 det_10g 모델을 쓰므로 전처리 / anchor decode / NMS가 같다면 박스가 거의 일치해야 한다.
+"""
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("insightface")
+
+from face_detection.detection.scrfd.scrfd_detector import SCRFDDetector  # noqa: E402
+from face_detection.detection.scrfd_onnx.scrfd_onnx_detector import (  # noqa: E402
+    DEFAULT_MODEL_PATH,
+    SCRFDOnnxDetector,
+)
+
+
+def _iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / (area_a + area_b - inter)
+
+
+@pytest.fixture(scope="module")
+def detectors():
+    reference = SCRFDDetector(device="cpu", verbose=False)  # buffalo_l 모델을 내려받음
+    if not os.path.isfile(DEFAULT_MODEL_PATH):
+        pytest.skip(f"SCRFD ONNX 모델이 없습니다: {DEFAULT_MODEL_PATH}")
+    onnx = SCRFDOnnxDetector(device="cpu", verbose=False, providers=["CPUExecutionProvider"])
+    return reference, onnx
+
+
+def test_onnx_boxes_match_insightface(detectors, face_image):
+    reference, onnx = detectors
+    # FaceAlignment.get_detections_for_batch와 같은 입력 (채널 반전한 배치)
+    batch = np.ascontiguousarray(np.stack([face_image, face_image[:, ::-1]])[..., ::-1])
+
+    expected = reference.detect_from_batch(batch.copy())
+    actual = onnx.detect_from_batch(batch.copy())
+
+    assert len(actual) == len(expected)
+    for ref_faces, onnx_faces in zip(expected, actual):
+        assert len(ref_faces) > 0, "기준 감지기가 얼굴을 찾지 못했습니다 (fixture 이미지 확인)"
+        assert len(onnx_faces) == len(ref_faces)
+        for ref_box in ref_faces:
+            best = max(onnx_faces, key=lambda box: _iou(box, ref_box))
+            assert _iou(best, ref_box) > 0.95
+            np.testing.assert_allclose(best[:4], ref_box[:4], atol=2.0)
+            assert best[4] == pytest.approx(ref_box[4], abs=0.02)
@@ -0,0 +1,98 @@
+"""
+배치 크기 bucketing (BucketedModel) 검증 (CPU, 작은 stub 모델)
+
+- bucket보다 작은 배치는 0 패딩 후 실행하고 패딩 부분 출력은 버린다
+- 최대 bucket보다 큰 배치는 최대 bucket 단위로 나눠 실행한다
+두 경우 모두 출력은 bucketing 없이 전체 배치를 한 번에 넣은 결과와 같아야 한다.
+stub 모델은 CUDA graph처럼 같은 shape의 출력 버퍼를 재사용하므로 chunk 출력 복사도 함께 확인한다.
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from shape_buckets import BucketedModel, bucket_sizes  # noqa: E402
+
+MAX_BATCH = 4
+IMG_SIZE = 8
+
+
+class StubWav2Lip(torch.nn.Module):
+    """Wav2Lip과 같은 (mel, img) → 3채널 얼굴 출력 형태의 작은 모델"""
+
+    def __init__(self, reuse_output=False):
+        super().__init__()
+        self.conv = torch.nn.Conv2d(6, 3, kernel_size=3, padding=1)
+        self.mel_proj = torch.nn.Linear(80 * 16, 3)
+        self.reuse_output = reuse_output
+        self.batch_sizes = []
+        self._outputs = {}  # shape → 재사용하는 출력 버퍼 (CUDA graph 재생 출력 흉내)
+
+    def forward(self, mel, img):
+        self.batch_sizes.append(mel.shape[0])
+        out = torch.sigmoid(self.conv(img) + self.mel_proj(mel.flatten(1))[:, :, None, None])
+        if not self.reuse_output:
+            return out
+        buffer = self._outputs.setdefault(tuple(out.shape), torch.empty_like(out))
+        buffer.copy_(out)
+        return buffer
+
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    return StubWav2Lip().eval()
+
+
+def _inputs(n):
+    generator = torch.Generator().manual_seed(n)
+    mel = torch.rand((n, 1, 80, 16), generator=generator)
+    img = torch.rand((n, 6, IMG_SIZE, IMG_SIZE), generator=generator)
+    return mel, img
+
+
+def test_bucket_sizes():
+    assert bucket_sizes(48) == [1, 2, 4, 8, 16, 32, 48]
+    assert bucket_sizes(4) == [1, 2, 4]
+    assert bucket_sizes(0) == [1]
+
+
+@pytest.mark.parametrize("n", [1, 3, 4, 11])
+def test_bucketed_output_matches_unbucketed(model, n):
+    mel, img = _inputs(n)
+    with torch.no_grad():
+        expected = model(mel, img).clone()
+        model.reuse_output = True
+        model.batch_sizes.clear()
+        bucketed = BucketedModel(model, bucket_sizes(MAX_BATCH))
+        pred = bucketed(mel, img)
+
+    assert pred.shape == expected.shape
+    torch.testing.assert_close(pred, expected)
+    # 모델에는 bucket 크기의 배치만 들어간다
+    assert set(model.batch_sizes) <= set(bucketed.buckets)
+
+
+def test_oversized_batch_runs_in_largest_buckets(model):
+    n = 2 * MAX_BATCH + 3
+    mel, img = _inputs(n)
+    bucketed = BucketedModel(model, bucket_sizes(MAX_BATCH))
+    with torch.no_grad():
+        bucketed(mel, img)
+
+    # 마지막 chunk(3)도 최대 bucket으로 패딩
+    assert model.batch_sizes == [MAX_BATCH] * 3
+    largest = bucketed.metrics()["buckets"][str(MAX_BATCH)]
+    assert largest["calls"] == 3 and largest["frames"] == n
+    assert largest["padding_ratio"] == pytest.approx(1 / (3 * MAX_BATCH))
+
+
+def test_padded_batch_records_padding(model):
+    bucketed = BucketedModel(model, bucket_sizes(MAX_BATCH))
+    with torch.no_grad():
+        bucketed(*_inputs(3))
+        bucketed(*_inputs(3))
+
+    metrics = bucketed.metrics()
+    assert model.batch_sizes == [4, 4]
+    assert metrics["buckets"]["4"]["padding_ratio"] == pytest.approx(0.25)
+    assert metrics["distinct_input_shapes"] == 1
@@ -0,0 +1,163 @@
+"""
+인코딩 중 스트리밍 업로드 검증 (GPU/GCS 없이 ffmpeg만 필요)
+
+FFmpegPipeWriter에 청크 도착 시각을 기록하는 업로드 대체 객체(RecordingUpload)를 연결하고
+합성 프레임을 실시간 inference 속도(FPS)로 흘려보낸다.
+- 청크가 인코더가 끝나기 전(마지막 프레임 기록 전)부터 도착하는지, 받은 조각 MP4의 길이가 맞는지
+- inference 오류 → writer.abort() → 업로드 abort() (close() 없음)
+- 업로드 write 실패 → RuntimeError, 업로드 abort()
+- media_tools 경로: timeout이 지나면 인코더가 종료되고 MediaToolTimeout
+
+인코더 프로세스는 기본 subprocess 경로와 서빙 서버가 쓰는 media_tools.thread_pipe_opener 경로 둘 다 확인한다.
+"""
+import asyncio
+import json
+import subprocess
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from api.utils import media_tools
+from video_encoder import FFmpegPipeWriter
+
+SECONDS = 4.0
+FPS = 18.0
+SIZE = (640, 360)
+
+
+class RecordingUpload:
+    """write/close/abort 호출과 청크 도착 시각 / 내용을 기록하는 업로드 대체 객체"""
+
+    def __init__(self, fail_after_chunks=None):
+        self.chunks = []  # (도착 시각, 데이터)
+        self.data = bytearray()
+        self.closed = 0
+        self.aborted = 0
+        self.fail_after_chunks = fail_after_chunks
+
+    def write(self, data):
+        if self.fail_after_chunks is not None and len(self.chunks) >= self.fail_after_chunks:
+            raise IOError("simulated upload failure")
+        self.chunks.append((time.time(), bytes(data)))
+        self.data += data
+
+    def close(self):
+        self.closed += 1
+
+    def abort(self):
+        self.aborted += 1
+
+
+@pytest.fixture
+def event_loop_thread():
+    """서빙 서버의 메인 루프 역할을 하는 백그라운드 이벤트 루프"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+@pytest.fixture(params=["subprocess", "media_tools"])
+def open_process(request):
+    """FFmpegPipeWriter의 open_process (None이면 기본 subprocess 경로)"""
+    if request.param == "subprocess":
+        return None
+    loop = request.getfixturevalue("event_loop_thread")
+    return media_tools.thread_pipe_opener(loop, timeout=60)
+
+
+@pytest.fixture
+def audio(tmp_path, ffmpeg):
+    path = str(tmp_path / "audio.wav")
+    subprocess.run(
+        [ffmpeg, "-y", "-loglevel", "error", "-f", "lavfi", "-i", f"sine=frequency=440:duration={SECONDS}", path],
+        check=True,
+    )
+    return path
+
+
+def _feed(writer, n_frames, fail_at=None):
+    """실시간 inference처럼 1/FPS 간격으로 노이즈 프레임 기록"""
+    width, height = SIZE
+    base = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    for i in range(n_frames):
+        if fail_at is not None and i == fail_at:
+            raise RuntimeError("simulated inference failure")
+        writer.write(np.roll(base, i * 4, axis=1))
+        time.sleep(1.0 / FPS)
+
+
+def _duration(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "json", path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return float(json.loads(out)["format"]["duration"])
+
+
+def test_chunks_arrive_before_encoder_exits(tmp_path, audio, open_process):
+    upload = RecordingUpload()
+    writer = FFmpegPipeWriter(None, SIZE, FPS, audio, upload=upload, open_process=open_process)
+    _feed(writer, int(SECONDS * FPS))
+    # stdin을 닫기 전이므로 인코더는 아직 끝날 수 없다
+    frames_done = time.time()
+    writer.release()
+
+    assert upload.closed == 1 and upload.aborted == 0
+    # 헤더(ftyp + 빈 moov)만이 아니라 영상 조각(moof)이 인코딩 도중 업로드되어야 한다
+    early = b"".join(data for arrived, data in upload.chunks if arrived < frames_done)
+    assert b"moof" in early, "no fragment arrived before the encoder finished"
+    assert writer.first_chunk_at is not None and writer.first_chunk_at < frames_done
+    assert writer.bytes_uploaded == len(upload.data)
+    assert _duration(str(tmp_path / "streamed.mp4"), bytes(upload.data)) == pytest.approx(SECONDS, abs=0.5)
+
+
+def test_inference_failure_aborts_upload(audio, open_process):
+    upload = RecordingUpload()
+    n_frames = int(SECONDS * FPS)
+    writer = FFmpegPipeWriter(None, SIZE, FPS, audio, upload=upload, open_process=open_process)
+    with pytest.raises(RuntimeError, match="simulated inference failure"):
+        try:
+            _feed(writer, n_frames, fail_at=n_frames // 2)
+        finally:
+            writer.abort()
+
+    assert upload.closed == 0 and upload.aborted == 1
+
+
+def test_upload_failure_stops_encoder(audio, open_process):
+    upload = RecordingUpload(fail_after_chunks=1)
+    writer = FFmpegPipeWriter(None, SIZE, FPS, audio, upload=upload, open_process=open_process)
+    with pytest.raises(RuntimeError, match="upload"):
+        try:
+            _feed(writer, int(SECONDS * FPS))
+            writer.release()
+        except RuntimeError:
+            writer.abort()
+            raise
+
+    assert upload.closed == 0 and upload.aborted >= 1
+
+
+def test_media_tools_timeout_terminates_encoder(audio, event_loop_thread):
+    upload = RecordingUpload()
+    open_process = media_tools.thread_pipe_opener(event_loop_thread, timeout=1.0)
+    writer = FFmpegPipeWriter(None, SIZE, FPS, audio, upload=upload, open_process=open_process)
+    started = time.time()
+    with pytest.raises(media_tools.MediaToolTimeout):
+        try:
+            _feed(writer, int(SECONDS * FPS))
+            writer.release()
+        except media_tools.MediaToolTimeout:
+            writer.abort()
+            raise
+
+    assert time.time() - started < SECONDS
+    assert upload.closed == 0 and upload.aborted == 1
@@ -0,0 +1,141 @@
+"""
+STTMicroBatcher 검증 (모델 없이 가짜 transcribe_fn 사용)
+
+- max_wait 안에 들어온 요청은 한 번의 transcribe_fn 호출로 묶인다
+- 언어가 다르면 언어별로 따로 호출된다
+- 묶음 실행이 실패하면 요청별로 다시 실행하고, 각 요청은 자기 결과 또는 자기 오류만 받는다
+"""
+import asyncio
+import threading
+
+import pytest
+
+from api.service.stt_batcher import STTMicroBatcher
+
+
+class FakeTranscriber:
+    """호출 기록을 남기고 입력 이름을 그대로 돌려주는 transcribe_fn 대체 객체"""
+
+    def __init__(self, fail_inputs=(), fail_batches=False):
+        self.calls = []  # (inputs, langs, batch_size)
+        self.fail_inputs = set(fail_inputs)
+        self.fail_batches = fail_batches
+        self._lock = threading.Lock()
+
+    def __call__(self, inputs, langs, batch_size):
+        with self._lock:
+            self.calls.append((list(inputs), langs, batch_size))
+        if self.fail_batches and len(inputs) > 1:
+            raise RuntimeError("simulated batch failure")
+        bad = self.fail_inputs.intersection(inputs)
+        if bad:
+            raise ValueError(f"bad audio: {sorted(bad)[0]}")
+        return [f"text:{name}" for name in inputs]
+
+
+async def _gather(batcher, requests):
+    """(audio_input, lang) 목록을 동시에 제출하고 결과 / 예외를 요청 순서대로 반환"""
+    return await asyncio.gather(
+        *(batcher.transcribe(audio, lang) for audio, lang in requests),
+        return_exceptions=True,
+    )
+
+
+async def test_requests_within_window_share_one_call():
+    fake = FakeTranscriber()
+    batcher = STTMicroBatcher(fake, max_batch=8, max_wait_ms=200)
+
+    results = await _gather(batcher, [(f"a{i}.wav", "ko") for i in range(4)])
+
+    assert results == [f"text:a{i}.wav" for i in range(4)]
+    assert fake.calls == [([f"a{i}.wav" for i in range(4)], ["ko"] * 4, 4)]
+    assert batcher.metrics()["batches_run"] == 1
+
+
+async def test_late_request_after_window_runs_separately():
+    fake = FakeTranscriber()
+    batcher = STTMicroBatcher(fake, max_batch=8, max_wait_ms=50)
+
+    first = asyncio.ensure_future(batcher.transcribe("a.wav", "ko"))
+    await asyncio.sleep(0.3)
+    second = await batcher.transcribe("b.wav", "ko")
+
+    assert await first == "text:a.wav"
+    assert second == "text:b.wav"
+    assert [call[0] for call in fake.calls] == [["a.wav"], ["b.wav"]]
+
+
+async def test_max_batch_limits_group_size():
+    fake = FakeTranscriber()
+    batcher = STTMicroBatcher(fake, max_batch=2, max_wait_ms=200)
+
+    results = await _gather(batcher, [(f"a{i}.wav", None) for i in range(5)])
+
+    assert results == [f"text:a{i}.wav" for i in range(5)]
+    assert [call[2] for call in fake.calls] == [2, 2, 1]
+
+
+async def test_languages_are_split():
+    fake = FakeTranscriber()
+    batcher = STTMicroBatcher(fake, max_batch=8, max_wait_ms=200)
+
+    results = await _gather(batcher, [
+        ("ko1.wav", "ko"), ("en1.wav", "en"), ("ko2.wav", "ko"), ("auto.wav", None),
+    ])
+
+    assert results == ["text:ko1.wav", "text:en1.wav", "text:ko2.wav", "text:auto.wav"]
+    assert sorted(fake.calls) == sorted([
+        (["ko1.wav", "ko2.wav"], ["ko", "ko"], 2),
+        (["en1.wav"], ["en"], 1),
+        (["auto.wav"], None, 1),  # 언어 미지정은 langs=None (자동 감지)
+    ])
+
+
+async def test_batch_failure_falls_back_to_per_item_calls():
+    fake = FakeTranscriber(fail_batches=True)
+    batcher = STTMicroBatcher(fake, max_batch=8, max_wait_ms=200)
+
+    results = await _gather(batcher, [(f"a{i}.wav", "ko") for i in range(3)])
+
+    assert results == [f"text:a{i}.wav" for i in range(3)]
+    assert [call[0] for call in fake.calls] == [
+        ["a0.wav", "a1.wav", "a2.wav"], ["a0.wav"], ["a1.wav"], ["a2.wav"],
+    ]
+    assert batcher.metrics()["fallbacks"] == 1
+
+
+async def test_each_caller_gets_own_result_or_error():
+    fake = FakeTranscriber(fail_inputs={"bad.wav"})
+    batcher = STTMicroBatcher(fake, max_batch=8, max_wait_ms=200)
+
+    results = await _gather(batcher, [("a.wav", "ko"), ("bad.wav", "ko"), ("b.wav", "ko")])
+
+    assert results[0] == "text:a.wav"
+    assert isinstance(results[1], ValueError) and "bad.wav" in str(results[1])
+    assert results[2] == "text:b.wav"
+
+
+async def test_single_request_failure_is_not_retried():
+    fake = FakeTranscriber(fail_inputs={"bad.wav"})
+    batcher = STTMicroBatcher(fake, max_batch=8, max_wait_ms=20)
+
+    with pytest.raises(ValueError, match="bad.wav"):
+        await batcher.transcribe("bad.wav", "ko")
+
+    assert len(fake.calls) == 1
+    assert batcher.metrics()["fallbacks"] == 0
+
+
+async def test_wrong_result_count_falls_back_to_per_item_calls():
+    calls = []
+
+    def short_transcribe(inputs, langs, batch_size):
+        calls.append(list(inputs))
+        return [f"text:{inputs[0]}"]  # 묶음이어도 결과를 하나만 반환
+
+    batcher = STTMicroBatcher(short_transcribe, max_batch=8, max_wait_ms=200)
+
+    results = await _gather(batcher, [("a.wav", "ko"), ("b.wav", "ko")])
+
+    assert results == ["text:a.wav", "text:b.wav"]
+    assert calls == [["a.wav", "b.wav"], ["a.wav"], ["b.wav"]]
@@ -0,0 +1,116 @@
+"""
+Wav2LipBatchScheduler 검증 (GPU / 체크포인트 없이 numpy stub 모델 사용)
+
+- max_wait 안에 들어온 여러 요청의 배치는 한 번의 forward로 합쳐진다
+- 합친 결과는 요청별로 잘려 각 요청이 자기 프레임의 예측만 받는다
+- 한 요청의 배치에서 forward가 실패하면 그 요청만 오류를 받는다
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from api.service.wav2lip_scheduler import Wav2LipBatchScheduler
+
+IMG_SIZE = 8
+
+
+class StubModel:
+    """프레임별로 결정적인 값을 내는 Wav2Lip forward 대체 객체 (NaN 프레임이 있으면 실패)"""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def __call__(self, img_batch, mel_batch):
+        with self._lock:
+            self.batch_sizes.append(len(img_batch))
+        if np.isnan(img_batch).any():
+            raise ValueError("invalid face crop")
+        return expected_pred(img_batch, mel_batch)
+
+
+def expected_pred(img_batch, mel_batch):
+    """입력 프레임 하나만으로 정해지는 예측 (배치 구성과 무관)"""
+    return img_batch[:, :3] + mel_batch.mean(axis=(1, 2, 3))[:, None, None, None]
+
+
+def make_batch(request_id, frames):
+    rng = np.random.default_rng(request_id)
+    img_batch = rng.random((frames, 6, IMG_SIZE, IMG_SIZE), dtype=np.float32)
+    mel_batch = rng.random((frames, 1, 80, 16), dtype=np.float32)
+    return img_batch, mel_batch
+
+
+def submit_concurrently(scheduler, batches):
+    """요청별 inference 스레드처럼 동시에 predict()를 호출하고 결과 / 예외를 요청 순서대로 반환"""
+    barrier = threading.Barrier(len(batches))
+
+    def run(batch):
+        barrier.wait()
+        try:
+            return scheduler.predict(*batch)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=len(batches)) as pool:
+        return list(pool.map(run, batches))
+
+
+def test_concurrent_requests_share_one_forward():
+    model = StubModel()
+    scheduler = Wav2LipBatchScheduler(model, max_batch=32, max_wait_ms=200)
+    batches = [make_batch(i, frames) for i, frames in enumerate([3, 5, 1, 4])]
+
+    results = submit_concurrently(scheduler, batches)
+
+    assert model.batch_sizes == [13]
+    for (img_batch, mel_batch), pred in zip(batches, results):
+        assert pred.shape == (len(img_batch), 3, IMG_SIZE, IMG_SIZE)
+        np.testing.assert_array_equal(pred, expected_pred(img_batch, mel_batch))
+    metrics = scheduler.metrics()
+    assert metrics["batches_run"] == 1 and metrics["avg_requests_per_batch"] == 4
+
+
+def test_batch_over_max_goes_to_next_forward():
+    model = StubModel()
+    scheduler = Wav2LipBatchScheduler(model, max_batch=8, max_wait_ms=200)
+    batches = [make_batch(i, 5) for i in range(3)]
+
+    results = submit_concurrently(scheduler, batches)
+
+    # 배치를 쪼개지 않으므로 5 + 5 > 8 이면 각자 forward
+    assert model.batch_sizes == [5, 5, 5]
+    for (img_batch, mel_batch), pred in zip(batches, results):
+        np.testing.assert_array_equal(pred, expected_pred(img_batch, mel_batch))
+
+
+def test_error_reaches_only_affected_request():
+    model = StubModel()
+    scheduler = Wav2LipBatchScheduler(model, max_batch=32, max_wait_ms=200)
+    batches = [make_batch(i, 4) for i in range(3)]
+    batches[1][0][2] = np.nan
+
+    results = submit_concurrently(scheduler, batches)
+
+    assert isinstance(results[1], ValueError)
+    for i in (0, 2):
+        np.testing.assert_array_equal(results[i], expected_pred(*batches[i]))
+    # 합친 forward 한 번 + 요청별 재실행
+    assert model.batch_sizes == [12, 4, 4, 4]
+    assert scheduler.metrics()["fallbacks"] == 1
+
+
+def test_single_request_error_is_raised():
+    model = StubModel()
+    scheduler = Wav2LipBatchScheduler(model, max_batch=32, max_wait_ms=10)
+    img_batch, mel_batch = make_batch(0, 2)
+    img_batch[0] = np.nan
+
+    with pytest.raises(ValueError, match="invalid face crop"):
+        scheduler.predict(img_batch, mel_batch)
+
+    # 실패 후에도 워커는 다음 요청을 처리한다
+    np.testing.assert_array_equal(scheduler.predict(*make_batch(1, 2)), expected_pred(*make_batch(1, 2)))
+    assert model.batch_sizes == [2, 2]